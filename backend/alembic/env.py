@@ -17,10 +17,12 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # check` see the full schema. Both share the same Base
 # (mystic_auth.database.base.Base, re-exported as app.app_sdk.Base), so one
 # alembic env/migration history covers both.
+from app.access.company_access_model import UserCompanyAccess  # noqa: F401
 from app.balance_sheets.balance_sheet_model import BalanceSheet  # noqa: F401
-from app.companies.company_model import Company  # noqa: F401
+from app.companies.company_model import Company, CompanyClosure  # noqa: F401
 from mystic_auth.audit_log.audit_log_model import AuditLog  # noqa: F401
 from mystic_auth.authorization.models.audit_log_model import AuthorizationAuditLog  # noqa: F401
+from mystic_auth.authorization.models.audit_rollup_model import AuthorizationAuditRollup  # noqa: F401
 from mystic_auth.authorization.models.policy_history_model import PolicyHistory  # noqa: F401
 from mystic_auth.authorization.models.policy_model import Policy, UserPolicy  # noqa: F401
 from mystic_auth.database.base import Base
@@ -0,0 +1,52 @@
+"""add companies.parent_name and keyset pagination indexes
+
+Revision ID: a9c3e7b5d1f2
+Revises: e5a7c9b1d3f4
+Create Date: 2026-10-19 00:10:00.000000
+
+GET /companies/ gains a keyset (cursor) mode alongside LIMIT/OFFSET (see
+backend/app/companies/company_crud.py's list_companies_in_scope). Keyset
+pagination only pays off if every allowed sort_by can be served by an index
+ending in id, so each gets a (column, id) composite here.
+
+sort_by=parent used to order by the joined parent row's name, which no index
+on companies can serve. parent_name is now a denormalized column maintained
+by company_crud.py (set on create/reparent, rewritten on the parent's
+rename), backfilled below from the current parent_company_id links.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c3e7b5d1f2'
+down_revision: str | Sequence[str] | None = 'e5a7c9b1d3f4'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('companies', sa.Column('parent_name', sa.String(), nullable=True))
+    op.execute(
+        """
+        UPDATE companies AS child
+        SET parent_name = parent.name
+        FROM companies AS parent
+        WHERE child.parent_company_id = parent.id
+        """
+    )
+
+    op.create_index('ix_companies_name_id', 'companies', ['name', 'id'], unique=False)
+    op.create_index('ix_companies_ticker_id', 'companies', ['ticker', 'id'], unique=False)
+    op.create_index('ix_companies_created_at_id', 'companies', ['created_at', 'id'], unique=False)
+    op.create_index('ix_companies_parent_name_id', 'companies', ['parent_name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_companies_parent_name_id', table_name='companies')
+    op.drop_index('ix_companies_created_at_id', table_name='companies')
+    op.drop_index('ix_companies_ticker_id', table_name='companies')
+    op.drop_index('ix_companies_name_id', table_name='companies')
+    op.drop_column('companies', 'parent_name')
@@ -0,0 +1,68 @@
+"""add pg_trgm indexes for substring search
+
+Revision ID: b4d8f2a6c0e3
+Revises: a9c3e7b5d1f2
+Create Date: 2026-10-19 00:20:00.000000
+
+Every list endpoint's `search` param is a case-insensitive substring match
+(`ILIKE '%term%'`): company name/ticker, user name/email, and user_email on
+both audit logs. A leading wildcard gives a B-tree index nothing to seek on,
+so each of those searches was a sequential scan of its whole table, and the
+two audit tables are the ones that grow on every request.
+
+pg_trgm's GIN operator class indexes every three-character substring of a
+value, which is exactly what an unanchored ILIKE needs: Postgres intersects
+the trigram posting lists for the search term and rechecks only the
+candidate rows. The search helpers in
+backend/mystic_auth/database/text_search.py are written to match (one
+escaped ILIKE per indexed column, ranked by pg_trgm's similarity()). See
+tests/backend/mystic_auth/performance/test_trigram_search_performance.py for
+the 100k-row benchmark and plan check.
+
+pg_trgm ships with every standard Postgres build (contrib) and has been a
+trusted extension since Postgres 13, so the application's own database role
+can create it without superuser.
+
+security_audit_log.ip_address is deliberately left out: it's filtered far
+less often than user_email and is mostly searched by prefix (a subnet), and
+every extra GIN index is paid for again on each audit insert.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8f2a6c0e3'
+down_revision: str | Sequence[str] | None = 'a9c3e7b5d1f2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (index name, table, column)
+_TRIGRAM_INDEXES = (
+    ('ix_companies_name_trgm', 'companies', 'name'),
+    ('ix_companies_ticker_trgm', 'companies', 'ticker'),
+    ('ix_users_name_trgm', 'users', 'name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_authorization_audit_log_user_email_trgm', 'authorization_audit_log', 'user_email'),
+    ('ix_security_audit_log_user_email_trgm', 'security_audit_log', 'user_email'),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table, column in _TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for index_name, table, _column in reversed(_TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table, postgresql_using='gin')
+    # The extension itself is left installed: other schemas/tools on the
+    # same database may have come to rely on it, and it costs nothing idle.
@@ -0,0 +1,116 @@
+"""add user_company_access table
+
+Revision ID: c6e0a2f4b8d1
+Revises: b4d8f2a6c0e3
+Create Date: 2026-10-19 00:30:00.000000
+
+Materializes every user's per-company grants (see
+backend/app/access/company_access_model.py): one row per (user, action,
+company, granting policy), derived from active assigned policies'
+resource_attributes exactly the way app/access/scope.py's
+get_company_scope reads them. Scoped queries from any table carrying a
+company_id can then join it on its primary key instead of rebuilding an OR of
+id/group_root_id/subtree filters from policy JSON.
+
+Backfilled below from the current policies, assignments and companies;
+from then on backend/app/access/company_access.py maintains it in the same
+transaction as each assignment, policy edit and company insert/reparent,
+and the FK cascades drop rows on revocation and on any deletion.
+
+The action list in the backfill is company_access.py's SCOPED_ACTIONS as of
+this revision, spelled out rather than imported so this migration keeps
+producing the same schema and data however that module changes later.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e0a2f4b8d1'
+down_revision: str | Sequence[str] | None = 'b4d8f2a6c0e3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_company_access',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('policy_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['user_id', 'policy_id'],
+            ['user_policies.user_id', 'user_policies.policy_id'],
+            ondelete='CASCADE',
+        ),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'action', 'company_id', 'policy_id'),
+    )
+    op.create_index('ix_user_company_access_policy_id', 'user_company_access', ['policy_id'], unique=False)
+    op.create_index('ix_user_company_access_company_id', 'user_company_access', ['company_id'], unique=False)
+
+    op.execute(
+        r"""
+        INSERT INTO user_company_access (user_id, action, company_id, policy_id)
+        WITH grants AS (
+            SELECT
+                user_policies.user_id,
+                scoped_actions.action,
+                policies.id AS policy_id,
+                COALESCE(policies.conditions -> 'resource_attributes', '{}'::jsonb) AS attributes
+            FROM user_policies
+            JOIN policies ON policies.id = user_policies.policy_id AND policies.is_active
+            JOIN (
+                VALUES
+                    ('company:read', 'company'),
+                    ('company:update', 'company'),
+                    ('company:delete', 'company'),
+                    ('balance_sheet:read', 'balance_sheet'),
+                    ('balance_sheet:import', 'balance_sheet'),
+                    ('balance_sheet:delete', 'balance_sheet'),
+                    ('llm:chat', 'llm')
+            ) AS scoped_actions (action, resource_type)
+                ON scoped_actions.action = ANY (policies.actions)
+                AND policies.resource_type IN (scoped_actions.resource_type, '*')
+        ),
+        typed_grants AS (
+            SELECT
+                user_id,
+                action,
+                policy_id,
+                attributes IN ('{}'::jsonb, 'null'::jsonb) AS unrestricted,
+                CASE WHEN jsonb_typeof(attributes -> 'company_id') = 'number'
+                          AND attributes ->> 'company_id' ~ '^-?[0-9]+$'
+                     THEN (attributes ->> 'company_id')::int END AS company_id,
+                CASE WHEN jsonb_typeof(attributes -> 'group_root_id') = 'number'
+                          AND attributes ->> 'group_root_id' ~ '^-?[0-9]+$'
+                     THEN (attributes ->> 'group_root_id')::int END AS group_root_id,
+                CASE WHEN jsonb_typeof(attributes -> 'subtree_root_id') = 'number'
+                          AND attributes ->> 'subtree_root_id' ~ '^-?[0-9]+$'
+                     THEN (attributes ->> 'subtree_root_id')::int END AS subtree_root_id
+            FROM grants
+        )
+        SELECT typed_grants.user_id, typed_grants.action, companies.id, typed_grants.policy_id
+        FROM typed_grants
+        JOIN companies ON (
+            typed_grants.unrestricted
+            OR companies.id = typed_grants.company_id
+            OR companies.group_root_id = typed_grants.group_root_id
+            OR EXISTS (
+                SELECT 1 FROM company_closure
+                WHERE company_closure.ancestor_id = typed_grants.subtree_root_id
+                  AND company_closure.descendant_id = companies.id
+            )
+        )
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_company_access_company_id', table_name='user_company_access')
+    op.drop_index('ix_user_company_access_policy_id', table_name='user_company_access')
+    op.drop_table('user_company_access')
@@ -0,0 +1,86 @@
+"""add authorization_audit_rollup table
+
+Revision ID: d2f8b4c6a1e7
+Revises: c6e0a2f4b8d1
+Create Date: 2026-10-19 00:40:00.000000
+
+Per-minute counters of routine allowed authorization decisions, written
+instead of one authorization_audit_log row each when
+AUTHORIZATION_AUDIT_MODE="aggregate_allows" (see
+backend/mystic_auth/authorization/services/audit_policy.py). Denials and
+sensitive actions keep going to authorization_audit_log in full.
+
+uq_authorization_audit_rollup_key is the upsert target: every flush adds to
+its minute's row with INSERT ... ON CONFLICT DO UPDATE. The other indexes
+mirror authorization_audit_log's own (per-user newest-first, last_seen_at,
+action, and the user_email trigram index for `search`), because the audit
+listing reads both tables as one UNION ALL (models/audit_record_model.py)
+and each branch needs its own index to keep that listing index-driven.
+
+Nothing to backfill: the table starts empty and stays empty in the default
+"full" mode.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8b4c6a1e7'
+down_revision: str | Sequence[str] | None = 'c6e0a2f4b8d1'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'authorization_audit_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_email', sa.String(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('resource_type', sa.String(), nullable=False),
+        sa.Column('allowed', sa.Boolean(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('decision_count', sa.Integer(), nullable=False),
+        sa.Column('first_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'uq_authorization_audit_rollup_key',
+        'authorization_audit_rollup',
+        ['user_email', 'action', 'resource_type', 'allowed', 'bucket_start'],
+        unique=True,
+    )
+    op.create_index(
+        'ix_audit_rollup_user_email_last_seen_at',
+        'authorization_audit_rollup',
+        ['user_email', sa.text('last_seen_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        op.f('ix_authorization_audit_rollup_action'), 'authorization_audit_rollup', ['action'], unique=False
+    )
+    op.create_index(
+        op.f('ix_authorization_audit_rollup_last_seen_at'), 'authorization_audit_rollup', ['last_seen_at'], unique=False
+    )
+    op.create_index(
+        'ix_authorization_audit_rollup_user_email_trgm',
+        'authorization_audit_rollup',
+        ['user_email'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'user_email': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_authorization_audit_rollup_user_email_trgm', table_name='authorization_audit_rollup', postgresql_using='gin'
+    )
+    op.drop_index(op.f('ix_authorization_audit_rollup_last_seen_at'), table_name='authorization_audit_rollup')
+    op.drop_index(op.f('ix_authorization_audit_rollup_action'), table_name='authorization_audit_rollup')
+    op.drop_index('ix_audit_rollup_user_email_last_seen_at', table_name='authorization_audit_rollup')
+    op.drop_index('uq_authorization_audit_rollup_key', table_name='authorization_audit_rollup')
+    op.drop_table('authorization_audit_rollup')
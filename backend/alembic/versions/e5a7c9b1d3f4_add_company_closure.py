@@ -0,0 +1,66 @@
+"""add company_closure table
+
+Revision ID: e5a7c9b1d3f4
+Revises: c1a2b3c4d5e6
+Create Date: 2026-10-19 00:00:00.000000
+
+Adds the transitive closure of companies.parent_company_id (see
+backend/app/companies/company_model.py's CompanyClosure docstring): one
+(ancestor_id, descendant_id, depth) row per path, including every company's
+own depth-0 row.
+
+group_root_id alone can only express "one company" or "a whole group", and
+fixing every descendant's group_root_id when a company with subsidiaries was
+reparented wasn't supported at all, so update_company refused to. With the
+closure table, "this vertical and everything below it" is one indexed lookup
+and a subtree move is a fixed handful of set-based statements.
+
+Existing hierarchies are backfilled here with a single recursive CTE rooted
+at every company's own self-path; from then on company_crud.py maintains the
+table in the same transaction as each companies write.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9b1d3f4'
+down_revision: str | Sequence[str] | None = 'c1a2b3c4d5e6'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'company_closure',
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index(
+        'ix_company_closure_descendant_id', 'company_closure', ['descendant_id', 'depth'], unique=False
+    )
+
+    op.execute(
+        """
+        INSERT INTO company_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM companies
+            UNION ALL
+            SELECT paths.ancestor_id, companies.id, paths.depth + 1
+            FROM paths
+            JOIN companies ON companies.parent_company_id = paths.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM paths
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_company_closure_descendant_id', table_name='company_closure')
+    op.drop_table('company_closure')
@@ -0,0 +1,143 @@
+"""partition the audit log tables by month
+
+Revision ID: f1b3d5e7a9c2
+Revises: d2f8b4c6a1e7
+Create Date: 2026-10-19 00:50:00.000000
+
+authorization_audit_log and security_audit_log are append-only and grow on
+every request. As single heap tables they never shrink: every newest-first
+listing and every get_login_trend read sits on top of the whole history, and
+removing old rows would mean a DELETE over millions of them. This rebuilds
+both as tables range-partitioned on created_at, one partition per UTC
+calendar month, so those reads touch only the recent partitions and
+retention drops whole months in O(1) (see
+backend/mystic_auth/database/partitions.py, which creates future months and
+drops expired ones from here on).
+
+Postgres can't convert a table to a partitioned one in place, so for each
+table this:
+1. renames the existing table to <table>_unpartitioned and drops its
+   secondary indexes, freeing the names;
+2. creates the partitioned parent LIKE it, so the columns, NOT NULLs and
+   defaults (including the id sequence's nextval) are identical. The
+   primary key becomes (id, created_at), because a partitioned table's
+   unique constraints must include the partition key; id stays unique on
+   its own, since it still comes from the one sequence;
+3. recreates every index on the parent, so each partition gets its own copy;
+4. creates one partition per month from the oldest row's month through
+   three months ahead, plus a DEFAULT partition as a safety net;
+5. copies the rows across, hands the id sequence to the new table, and
+   drops the old one.
+
+Step 5 copies the whole history inside the migration's transaction, so on a
+large deployment schedule it like any other table rewrite. The month and
+index lists are spelled out here rather than imported, so this migration
+keeps producing the same schema however partitions.py or the models change
+later.
+"""
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b3d5e7a9c2'
+down_revision: str | Sequence[str] | None = 'd2f8b4c6a1e7'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_MONTHS_AHEAD = 3
+
+# table -> (CREATE INDEX statements for the parent, in the original order).
+# {table} is filled in for the table being rebuilt.
+_INDEXES = {
+    'authorization_audit_log': (
+        'CREATE INDEX ix_authorization_audit_log_id ON {table} (id)',
+        'CREATE INDEX ix_authorization_audit_log_action ON {table} (action)',
+        'CREATE INDEX ix_authorization_audit_log_created_at ON {table} (created_at)',
+        'CREATE INDEX ix_audit_log_user_email_created_at ON {table} (user_email, created_at DESC, id DESC)',
+        'CREATE INDEX ix_authorization_audit_log_user_email_trgm ON {table} USING gin (user_email gin_trgm_ops)',
+    ),
+    'security_audit_log': (
+        'CREATE INDEX ix_security_audit_log_id ON {table} (id)',
+        'CREATE INDEX ix_security_audit_log_user_email ON {table} (user_email)',
+        'CREATE INDEX ix_security_audit_log_event_type ON {table} (event_type)',
+        'CREATE INDEX ix_security_audit_log_created_at ON {table} (created_at)',
+        'CREATE INDEX ix_security_audit_log_user_email_trgm ON {table} USING gin (user_email gin_trgm_ops)',
+    ),
+}
+
+
+def _index_names(table: str) -> list[str]:
+    return [statement.split()[2] for statement in _INDEXES[table]]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _months_to_create(table: str) -> list[date]:
+    oldest = op.get_bind().execute(sa.text(f'SELECT min(created_at) FROM {table}_unpartitioned')).scalar()
+    current = datetime.now(UTC).date().replace(day=1)
+    month = oldest.astimezone(UTC).date().replace(day=1) if oldest is not None else current
+    last = _add_months(current, _MONTHS_AHEAD)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = _add_months(month, 1)
+    return months
+
+
+def _partition(table: str) -> None:
+    old = f'{table}_unpartitioned'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+    for index_name in _index_names(table):
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+    op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)')
+    for statement in _INDEXES[table]:
+        op.execute(statement.format(table=table))
+
+    for month in _months_to_create(table):
+        op.execute(
+            f'CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} '
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f'DROP TABLE {old}')
+
+
+def _unpartition(table: str) -> None:
+    partitioned = f'{table}_partitioned'
+    op.execute(f'ALTER TABLE {table} RENAME TO {partitioned}')
+    op.execute(f'ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey')
+    for index_name in _index_names(table):
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+    op.execute(f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)')
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+    op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+    for statement in _INDEXES[table]:
+        op.execute(statement.format(table=table))
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    # Dropping the parent drops every partition with it.
+    op.execute(f'DROP TABLE {partitioned}')
+
+
+def upgrade() -> None:
+    for table in _INDEXES:
+        _partition(table)
+
+
+def downgrade() -> None:
+    for table in reversed(list(_INDEXES)):
+        _unpartition(table)
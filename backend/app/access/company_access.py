@@ -0,0 +1,250 @@
+"""
+Maintenance of user_company_access (see company_access_model.py), the
+materialized form of get_company_scope, and its one reader,
+list_company_access_holders (GET /companies/{id}/access).
+
+Forward lookups ("which companies can this user read?") deliberately stay
+on get_company_scope's predicate rather than joining this table: that scope
+is cached per user and serves unrestricted users with no filter at all,
+where the table holds one row per company for them. The table earns its
+write cost on the reverse lookup, which the scope can't answer without an
+authorization check per user.
+
+Every write here is one set-based INSERT ... SELECT (preceded by a DELETE
+when rebuilding) over the same derivation, _derived_access: active
+assigned policies, joined to the per-company actions they grant, joined to
+the companies their resource_attributes select. It mirrors
+get_company_scope's reading of a policy exactly, so the table and the
+policy-derived scope never disagree:
+
+    no/empty resource_attributes   -> every company
+    {"company_id": X}              -> company X
+    {"group_root_id": X}           -> every company whose group_root_id is X
+    {"subtree_root_id": X}         -> X and every company under it (company_closure)
+
+(several keys on one policy are OR'd, as get_company_scope does), and any key
+may carry {"in": [X, Y, ...]} instead of a single id, granting each listed id
+as above.
+
+Maintenance is incremental, scoped to what a change can affect:
+
+    policy assigned           -> that (user, policy)'s rows are added
+    policy edited/rolled back -> that policy's rows are rebuilt
+    company created/reparented-> that company's (or moved subtree's) rows are rebuilt
+    revocation, any deletion  -> FK cascades, nothing to do here
+
+The policy side arrives through mystic-auth's policy_change_hooks (the hook
+is registered when this module is imported, which company_crud.py does);
+the company side is called directly by company_crud.py.
+"""
+
+from sqlalchemy import (
+    ColumnClause,
+    Integer,
+    Select,
+    String,
+    and_,
+    any_,
+    case,
+    column,
+    delete,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..app_sdk import MEMBERSHIP_OPERATOR, Policy, PolicyChangeHook, User, UserPolicy, any_of, policy_change_hooks
+from ..companies.company_model import Company, CompanyClosure
+from .company_access_model import UserCompanyAccess
+from .permissions import (
+    BALANCE_SHEET_DELETE,
+    BALANCE_SHEET_IMPORT,
+    BALANCE_SHEET_READ,
+    COMPANY_DELETE,
+    COMPANY_READ,
+    COMPANY_UPDATE,
+    LLM_CHAT,
+    RESOURCE_BALANCE_SHEET,
+    RESOURCE_COMPANY,
+    RESOURCE_LLM,
+)
+
+# Every action this app authorizes against one specific company, and the
+# resource type it's checked with. COMPANY_CREATE isn't here: there's no
+# company yet to scope it to (see company_routes.py's add_company).
+SCOPED_ACTIONS: dict[str, str] = {
+    COMPANY_READ: RESOURCE_COMPANY,
+    COMPANY_UPDATE: RESOURCE_COMPANY,
+    COMPANY_DELETE: RESOURCE_COMPANY,
+    BALANCE_SHEET_READ: RESOURCE_BALANCE_SHEET,
+    BALANCE_SHEET_IMPORT: RESOURCE_BALANCE_SHEET,
+    BALANCE_SHEET_DELETE: RESOURCE_BALANCE_SHEET,
+    LLM_CHAT: RESOURCE_LLM,
+}
+
+_ACCESS_COLUMNS = ["user_id", "action", "company_id", "policy_id"]
+
+
+def _resource_attribute(key: str):
+    """A resource_attributes value as an integer id, or NULL when it's
+    missing or not an integer. A CASE rather than an AND'd type check:
+    Postgres doesn't promise to evaluate AND operands in order, and an
+    unguarded cast of a non-numeric value would abort the whole statement."""
+    value = Policy.conditions["resource_attributes"][key]
+    return case(
+        (
+            and_(func.jsonb_typeof(value) == "number", value.astext.regexp_match(r"^-?[0-9]+$")),
+            value.astext.cast(Integer),
+        ),
+        else_=None,
+    )
+
+
+def _resource_attribute_contains(key: str, company_column):
+    """
+    True when a resource_attributes value is {"in": [...]} and the list
+    holds `company_column`'s value. Tested with `@>`: a JSONB array contains
+    a scalar when it has an element equal to it, so non-integer entries
+    simply never match, no cast needed. The array check matters: `@>` on
+    two equal scalars is true too, and a malformed {"in": 7} must not grant
+    what ResourceAttributesCondition would deny; so does the "no other key"
+    check, for the same reason (written as equality with a rebuilt
+    {"in": ...} object rather than `value - 'in'`, which would raise on a
+    plain numeric value). A plain id yields no match here and is handled by
+    _resource_attribute instead.
+    """
+    value = Policy.conditions["resource_attributes"][key]
+    members = value[MEMBERSHIP_OPERATOR]
+    return and_(
+        func.jsonb_typeof(members) == "array",
+        value == func.jsonb_build_object(MEMBERSHIP_OPERATOR, members),
+        members.contains(func.to_jsonb(company_column)),
+    )
+
+
+def _derived_access(*criteria) -> Select:
+    """(user_id, action, company_id, policy_id) for every grant matching
+    `criteria`, see module docstring."""
+    scoped_actions = values(column("action", String), column("resource_type", String), name="scoped_actions").data(
+        list(SCOPED_ACTIONS.items())
+    )
+    # get_company_scope's `not resource_attrs`: absent, JSON null, or {}.
+    empty_object: ColumnClause = literal_column("'{}'::jsonb")
+    attributes = func.coalesce(Policy.conditions["resource_attributes"], empty_object)
+    grants_company = or_(
+        attributes.in_([empty_object, literal_column("'null'::jsonb")]),
+        Company.id == _resource_attribute("company_id"),
+        Company.group_root_id == _resource_attribute("group_root_id"),
+        exists().where(
+            CompanyClosure.ancestor_id == _resource_attribute("subtree_root_id"),
+            CompanyClosure.descendant_id == Company.id,
+        ),
+        _resource_attribute_contains("company_id", Company.id),
+        _resource_attribute_contains("group_root_id", Company.group_root_id),
+        exists().where(
+            _resource_attribute_contains("subtree_root_id", CompanyClosure.ancestor_id),
+            CompanyClosure.descendant_id == Company.id,
+        ),
+    )
+    return (
+        select(UserPolicy.user_id, scoped_actions.c.action, Company.id, Policy.id)
+        .select_from(UserPolicy)
+        .join(Policy, and_(Policy.id == UserPolicy.policy_id, Policy.is_active.is_(True)))
+        .join(
+            scoped_actions,
+            and_(
+                scoped_actions.c.action == any_(Policy.actions),
+                or_(Policy.resource_type == scoped_actions.c.resource_type, Policy.resource_type == "*"),
+            ),
+        )
+        .join(Company, grants_company)
+        .where(*criteria)
+    )
+
+
+async def _insert_derived_access(db: AsyncSession, *criteria) -> None:
+    await db.execute(
+        pg_insert(UserCompanyAccess)
+        .from_select(_ACCESS_COLUMNS, _derived_access(*criteria))
+        .on_conflict_do_nothing()
+    )
+
+
+async def add_assignment_access(user_id: int, policy_id: int, db: AsyncSession) -> None:
+    """Rows for a just-assigned policy. Purely additive: a new assignment
+    can only grant more."""
+    await _insert_derived_access(db, UserPolicy.user_id == user_id, UserPolicy.policy_id == policy_id)
+
+
+async def rebuild_policy_access(policy_id: int, db: AsyncSession) -> None:
+    """Re-derives every row granted through `policy_id`, for all of its
+    holders at once. An edit can narrow a grant as well as widen it, so the
+    old rows are dropped first rather than diffed."""
+    await db.execute(delete(UserCompanyAccess).where(UserCompanyAccess.policy_id == policy_id))
+    await _insert_derived_access(db, Policy.id == policy_id)
+
+
+async def rebuild_company_access(company_ids: Select | list[int], db: AsyncSession) -> None:
+    """
+    Re-derives every row for the given companies: `company_ids` is a list
+    of ids or a select of them (e.g. a moved subtree's descendant ids). A new
+    company can be reached by existing group/subtree/unrestricted grants, and
+    a reparented one can gain and lose them, so this runs after the
+    companies and company_closure rows are already in their new state.
+    """
+    def matches(column):
+        # A literal list goes in as one array parameter (a bulk create's ids
+        # vary in number on every call), a select as a plain subquery.
+        return column.in_(company_ids) if isinstance(company_ids, Select) else any_of(column, company_ids)
+
+    await db.execute(
+        delete(UserCompanyAccess)
+        .where(matches(UserCompanyAccess.company_id))
+        .execution_options(synchronize_session=False)
+    )
+    await _insert_derived_access(db, matches(Company.id))
+
+
+async def list_company_access_holders(company_id: int, db: AsyncSession) -> list[dict]:
+    """
+    Everyone who can reach `company_id`, each with the (action, policy) pairs that grant it, for
+    access reviews. This table already is the inverted index from a
+    company to its holders (ix_user_company_access_company_id), so this is
+    one indexed lookup joined to users and policies, rather than an
+    authorization check per user over the whole user base.
+
+    Covers exactly what the table materializes: resource_attributes
+    grants, the same reading list scoping uses. Context conditions (time
+    windows, IP ranges, ...) are evaluated per request and aren't
+    reflected here.
+    """
+    result = await db.execute(
+        select(User.id, User.email, User.name, UserCompanyAccess.action, Policy.id, Policy.name)
+        .select_from(UserCompanyAccess)
+        .join(User, User.id == UserCompanyAccess.user_id)
+        .join(Policy, Policy.id == UserCompanyAccess.policy_id)
+        .where(UserCompanyAccess.company_id == company_id)
+        .order_by(User.email, UserCompanyAccess.action, Policy.name)
+    )
+    holders: dict[int, dict] = {}
+    for user_id, email, name, action, policy_id, policy_name in result:
+        holder = holders.setdefault(user_id, {"user_id": user_id, "email": email, "name": name, "grants": []})
+        holder["grants"].append({"action": action, "policy_id": policy_id, "policy_name": policy_name})
+    return list(holders.values())
+
+
+class CompanyAccessHook(PolicyChangeHook):
+    async def policy_assigned(self, user_id: int, policy_id: int, db: AsyncSession) -> None:
+        await add_assignment_access(user_id, policy_id, db)
+
+    async def policy_changed(self, policy_id: int, db: AsyncSession) -> None:
+        await rebuild_policy_access(policy_id, db)
+
+
+company_access_hook = CompanyAccessHook()
+policy_change_hooks.register(company_access_hook)
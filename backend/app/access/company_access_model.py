@@ -0,0 +1,53 @@
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..app_sdk import Base
+
+
+class UserCompanyAccess(Base):
+    """
+    Materialized form of app/access/scope.py's get_company_scope: one row
+    per (user, action, company) a user's active policies grant, with the
+    policy that grants it. Read by company, through
+    ix_user_company_access_company_id, it answers "who can access this
+    company?" in one query (company_access.py's list_company_access_holders)
+    instead of an authorization check per user. List scoping doesn't read it:
+    see company_access.py's module docstring.
+
+    `action` is one of this app's per-company actions (see
+    company_access.py's SCOPED_ACTIONS); the row already accounts for the
+    policy's resource_type matching that action's resource type (or "*").
+    Unrestricted grants (no resource_attributes) are materialized too, one
+    row per company, so an unrestricted holder shows up in every company's
+    access review.
+
+    Maintained only by company_access.py, always in the same transaction as
+    the change it follows: a policy assignment or edit (through mystic-auth's
+    policy_change_hooks), or a company insert/reparent (company_crud.py).
+    Everything that *removes* a grant is handled by FK cascades instead: the
+    (user_id, policy_id) FK follows user_policies, so revocation, policy
+    deletion and user deletion all drop the rows they invalidate, and the
+    company FK follows company deletion.
+    """
+
+    __tablename__ = "user_company_access"
+    # company_id's index serves the access-review lookup and the FK cascade
+    # from companies; policy_id's serves rebuilding one policy's rows. The
+    # primary key (user_id, action, company_id, policy_id) keeps maintenance
+    # idempotent and serves the cascade from user_policies.
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["user_id", "policy_id"],
+            ["user_policies.user_id", "user_policies.policy_id"],
+            ondelete="CASCADE",
+        ),
+        Index("ix_user_company_access_policy_id", "policy_id"),
+        Index("ix_user_company_access_company_id", "company_id"),
+    )
+
+    user_id: Mapped[int] = mapped_column(primary_key=True)
+    action: Mapped[str] = mapped_column(String, primary_key=True)
+    company_id: Mapped[int] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    # Part of the key because two policies can grant the same (user,
+    # action, company): revoking one must leave the other's row behind.
+    policy_id: Mapped[int] = mapped_column(primary_key=True)
@@ -7,16 +7,29 @@ flat equality against fields on the resource passed to authorize()/require()
 no built-in "any descendant of X" traversal. To model "a CEO sees only their
 company" and "a group executive sees their whole group" on top of that, every
 policy we seed for this app's resources (company/balance_sheet/llm) uses one
-of exactly two condition shapes:
+of exactly these condition shapes:
 
     {"resource_attributes": {"company_id": <id>}}       # scoped to one company
     {"resource_attributes": {"group_root_id": <id>}}     # scoped to a whole group
+    {"resource_attributes": {"subtree_root_id": <id>}}   # a company and everything below it
     (absent/empty conditions)                            # unrestricted (e.g. admin)
 
+and any of the three keys may list several ids with mystic-auth's membership
+operator instead, e.g. {"company_id": {"in": [3, 7, 12]}}: one policy for an
+analyst covering five unrelated companies, rather than five policies each
+evaluated, cached and audited on every check.
+
 `group_root_id` is a denormalized column on Company (see company_model.py):
 the top-most ancestor's id, so "every company in Reliance's group" is a flat
 equality on one column instead of a recursive parent_company_id walk.
 
+`subtree_root_id` is the one multi-valued attribute: the resource carries
+the frozenset of every ancestor of its company (itself included), read from
+the company_closure table, and resource_attributes matches a scalar policy
+value against a set-valued resource field by membership. So "Reliance
+Retail and every vertical under it" matches any company whose ancestor set
+contains Reliance Retail's id, at any depth.
+
 Every resource we ever pass to authorization_service.authorize()/.require()
 for these resource types is built via resource_scope_dict() below, so the
 same two condition keys work identically whether the resource being checked
@@ -25,17 +38,43 @@ company, so the evaluator never needs resource-type-specific condition logic.
 """
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..app_sdk import policy_repository
+from ..app_sdk import MEMBERSHIP_OPERATOR, authorization_cache_service, policy_repository
+from ..companies.company_model import Company, CompanyClosure
 
 
-def resource_scope_dict(company_id: int, group_root_id: int) -> dict:
+def resource_scope_dict(
+    company_id: int, group_root_id: int, ancestor_ids: frozenset[int] = frozenset()
+) -> dict:
     """The `resource=` payload passed to every authorize()/require() call
-    for a company-scoped resource, see module docstring."""
-    return {"company_id": company_id, "group_root_id": group_root_id}
+    for a company-scoped resource, see module docstring. Prefer
+    company_resource_scope() below, which also fills in ancestor_ids so
+    subtree-scoped policies can match."""
+    return {"company_id": company_id, "group_root_id": group_root_id, "subtree_root_id": ancestor_ids}
+
+
+async def company_resource_scope(company: Company, db: AsyncSession) -> dict:
+    """resource_scope_dict() for an already-fetched company, with its
+    ancestor set read from company_closure in one primary-key lookup."""
+    result = await db.execute(select(CompanyClosure.ancestor_id).where(CompanyClosure.descendant_id == company.id))
+    return resource_scope_dict(company.id, company.group_root_id, frozenset(result.scalars().all()))
+
+
+def _attribute_ids(value) -> list[int]:
+    """The ids one resource_attributes value grants: its {"in": [...]}
+    list, or the plain value itself. Anything that isn't an integer id can
+    never equal a company's id or group_root_id, so it's dropped here
+    rather than bound into the SQL filter (the same values
+    company_access.py's derivation ignores)."""
+    values = value.get(MEMBERSHIP_OPERATOR) if isinstance(value, dict) else [value]
+    if not isinstance(values, list):
+        return []
+    return [item for item in values if isinstance(item, int) and not isinstance(item, bool)]
 
 
 @dataclass
@@ -46,11 +85,46 @@ class CompanyScope:
     unrestricted: bool
     company_ids: frozenset[int]
     group_root_ids: frozenset[int]
+    subtree_root_ids: frozenset[int] = frozenset()
 
     def is_empty(self) -> bool:
         """True if this scope grants access to nothing at all. The caller
         should short-circuit to an empty result rather than run a query."""
-        return not self.unrestricted and not self.company_ids and not self.group_root_ids
+        return (
+            not self.unrestricted and not self.company_ids and not self.group_root_ids and not self.subtree_root_ids
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Stable identity of what this scope grants, for downstream caches
+        (company_cache.py's tree/stats entries, list results) to key on
+        instead of the user: two users whose policies compile to the same
+        scope share one entry. Equal scopes always give equal fingerprints,
+        across processes and restarts: frozensets have no stable iteration
+        order, so the ids are sorted before hashing, never hash()'d.
+        """
+        if self.unrestricted:
+            return "all"
+        canonical = f"{sorted(self.company_ids)}|{sorted(self.group_root_ids)}|{sorted(self.subtree_root_ids)}"
+        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    def to_dict(self) -> dict:
+        return {
+            "unrestricted": self.unrestricted,
+            "company_ids": sorted(self.company_ids),
+            "group_root_ids": sorted(self.group_root_ids),
+            "subtree_root_ids": sorted(self.subtree_root_ids),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CompanyScope:
+        return cls(
+            unrestricted=data["unrestricted"],
+            company_ids=frozenset(data["company_ids"]),
+            group_root_ids=frozenset(data["group_root_ids"]),
+            subtree_root_ids=frozenset(data["subtree_root_ids"]),
+        )
 
 
 async def get_company_scope(
@@ -66,14 +140,44 @@ async def get_company_scope(
 
     Single-resource GET/POST/DELETE endpoints do NOT use this: they fetch
     the specific row first and call authorization_service.require(...,
-    resource=resource_scope_dict(...)) directly, so exactly one audit entry
+    resource=company_resource_scope(...)) directly, so exactly one audit entry
     is written per real access to a specific resource.
+
+    The compiled result is cached per (user_email, action, resource_type)
+    next to the user's cached policy list (see _compile_company_scope), so
+    the list, stats and tree endpoints re-deriving it on every page flip
+    cost one Redis read instead of a policy-list load and walk.
+    """
+    cache_name = f"company_scope:{action}:{resource_type}"
+    cached = await authorization_cache_service.get_user_derived(user_email, cache_name)
+    if cached is not None:
+        try:
+            return CompanyScope.from_dict(cached)
+        except (KeyError, TypeError):
+            pass  # an entry from an older shape: recompile and overwrite it
+
+    scope = await _compile_company_scope(user_email, action, resource_type, db)
+    await authorization_cache_service.set_user_derived(user_email, cache_name, scope.to_dict())
+    return scope
+
+
+async def _compile_company_scope(
+    user_email: str, action: str, resource_type: str, db: AsyncSession
+) -> CompanyScope:
+    """
+    The uncached derivation behind get_company_scope. A CompanyScope is a
+    pure function of the user's policy list and (action, resource_type), so
+    caching it through authorization_cache_service's user_derived hook means
+    every invalidation of that list (assignment, revocation, any policy
+    edit) drops it too, with the same TTL backstop: it can never outlive the
+    grants it was compiled from.
     """
     policies = await policy_repository.get_active_policies_for_user(user_email, db)
 
     unrestricted = False
     company_ids: set[int] = set()
     group_root_ids: set[int] = set()
+    subtree_root_ids: set[int] = set()
 
     for policy in policies:
         if policy.resource_type not in (resource_type, "*"):
@@ -87,12 +191,15 @@ async def get_company_scope(
             continue
 
         if "company_id" in resource_attrs:
-            company_ids.add(resource_attrs["company_id"])
+            company_ids.update(_attribute_ids(resource_attrs["company_id"]))
         if "group_root_id" in resource_attrs:
-            group_root_ids.add(resource_attrs["group_root_id"])
+            group_root_ids.update(_attribute_ids(resource_attrs["group_root_id"]))
+        if "subtree_root_id" in resource_attrs:
+            subtree_root_ids.update(_attribute_ids(resource_attrs["subtree_root_id"]))
 
     return CompanyScope(
         unrestricted=unrestricted,
         company_ids=frozenset(company_ids),
         group_root_ids=frozenset(group_root_ids),
+        subtree_root_ids=frozenset(subtree_root_ids),
     )
@@ -7,7 +7,7 @@ from ...access.permissions import (
     BALANCE_SHEET_READ,
     RESOURCE_BALANCE_SHEET,
 )
-from ...access.scope import resource_scope_dict
+from ...access.scope import company_resource_scope
 from ...app_sdk import rate_limiter_service
 from ...balance_sheets.balance_sheet_crud import (
     YFinanceFetchError,
@@ -42,7 +42,7 @@ async def list_company_balance_sheets(
         BALANCE_SHEET_READ,
         RESOURCE_BALANCE_SHEET,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
     return await list_balance_sheets_for_company(company_id, db)
 
@@ -60,7 +60,7 @@ async def get_company_balance_sheet(
         BALANCE_SHEET_READ,
         RESOURCE_BALANCE_SHEET,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
     return await get_or_404(get_balance_sheet(company_id, year, db), "Balance sheet not found")
 
@@ -89,7 +89,7 @@ async def create_company_balance_sheet(
         BALANCE_SHEET_IMPORT,
         RESOURCE_BALANCE_SHEET,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
     try:
         return await import_balance_sheet(company_id, year, company.ticker, db)
@@ -112,7 +112,7 @@ async def delete_company_balance_sheet(
         BALANCE_SHEET_DELETE,
         RESOURCE_BALANCE_SHEET,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
     balance_sheet = await get_or_404(get_balance_sheet(company_id, year, db), "Balance sheet not found")
     await delete_balance_sheet_row(balance_sheet, db)
@@ -1,28 +1,44 @@
-import asyncio
-
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...access.permissions import COMPANY_CREATE, COMPANY_DELETE, COMPANY_READ, COMPANY_UPDATE, RESOURCE_COMPANY
-from ...access.scope import get_company_scope, resource_scope_dict
-from ...app_sdk import rate_limiter_service
+from ...access.company_access import list_company_access_holders
+from ...access.permissions import (
+    BALANCE_SHEET_READ,
+    COMPANY_CREATE,
+    COMPANY_DELETE,
+    COMPANY_READ,
+    COMPANY_UPDATE,
+    RESOURCE_BALANCE_SHEET,
+    RESOURCE_COMPANY,
+)
+from ...access.scope import company_resource_scope, get_company_scope
+from ...app_sdk import Permission, rate_limiter_service, set_total_count_headers
 from ...companies.company_crud import (
+    BulkCreateError,
     HierarchyScope,
     TickerLookupError,
-    count_companies_in_scope,
+    bulk_create_companies,
     create_company,
     delete_company,
+    encode_company_cursor,
     get_company_by_id,
+    get_company_stats_in_scope,
+    get_company_tree_in_scope,
+    is_similarity_ranked,
     list_companies_in_scope,
     lookup_company_name_by_ticker,
+    page_companies_in_scope,
     search_company_tickers,
     update_company,
 )
 from ...companies.company_schema import (
+    CompanyAccessHolder,
+    CompanyBulkCreate,
     CompanyCreate,
     CompanyListItem,
     CompanyResponse,
     CompanyStatsRead,
+    CompanyTreeNode,
     CompanyUpdate,
     TickerLookupResponse,
     TickerSearchResponse,
@@ -41,6 +57,11 @@ async def list_companies(
     # GET /users/list_all_users.
     limit: int = Query(default=1000, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(
+        default=None,
+        description="Opaque X-Next-Cursor value from the previous page. Switches to keyset pagination: "
+        "offset must be 0, and X-Total-Count is not computed.",
+    ),
     search: str | None = Query(default=None, description="Case-insensitive substring match on name or ticker"),
     hierarchy: HierarchyScope | None = Query(
         default=None,
@@ -63,25 +84,54 @@ async def list_companies(
 
     X-Total-Count (not part of the response body) mirrors mystic_auth's own
     GET /users/ pagination convention, so CompaniesPage can render numbered
-    pages without a second round trip.
+    pages without a second request; it comes back in the same query as the
+    page (page_companies_in_scope), and past PAGINATION_EXACT_COUNT_LIMIT
+    matches it's the planner's estimate, flagged by X-Total-Count-Estimated.
+
+    Every full page also carries X-Next-Cursor, in either mode: passing it
+    back as `cursor` continues from the last row with a keyset seek instead
+    of a growing OFFSET (see list_companies_in_scope). Cursor mode skips the
+    total count, since counting every match is exactly the full scan it
+    exists to avoid; a short page (no X-Next-Cursor) means the end. The
+    exception is an offset page ranked by similarity (`search` with no
+    `sort_by`): a cursor can only resume id order, which would skip or
+    repeat rows of the ranked page, so none is sent and the client pages on
+    by offset.
     """
+    if cursor is not None and offset:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pass either cursor or offset, not both")
+
     scope = await get_company_scope(current_user["email"], COMPANY_READ, RESOURCE_COMPANY, db)
-    total = await count_companies_in_scope(scope, db, search=search, hierarchy_scope=hierarchy)
-    response.headers["X-Total-Count"] = str(total)
-    rows = await list_companies_in_scope(
-        scope,
-        db,
-        limit=limit,
-        offset=offset,
-        search=search,
-        hierarchy_scope=hierarchy,
-        sort_by=sort_by,
-        sort_dir=sort_dir,
-    )
-    return [
-        CompanyListItem(**CompanyResponse.model_validate(company).model_dump(), parent_name=parent_name)
-        for company, parent_name in rows
-    ]
+    try:
+        if cursor is None:
+            page = await page_companies_in_scope(
+                scope,
+                db,
+                limit=limit,
+                offset=offset,
+                search=search,
+                hierarchy_scope=hierarchy,
+                sort_by=sort_by,
+                sort_dir=sort_dir,
+            )
+            set_total_count_headers(response, page)
+            companies = page.items
+        else:
+            companies = await list_companies_in_scope(
+                scope,
+                db,
+                limit=limit,
+                cursor=cursor,
+                search=search,
+                hierarchy_scope=hierarchy,
+                sort_by=sort_by,
+                sort_dir=sort_dir,
+            )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if len(companies) == limit and not (cursor is None and is_similarity_ranked(search, sort_by)):
+        response.headers["X-Next-Cursor"] = encode_company_cursor(companies[-1], sort_by, sort_dir)
+    return [CompanyListItem.model_validate(company) for company in companies]
 
 
 @router.get("/stats", response_model=CompanyStatsRead)
@@ -92,19 +142,43 @@ async def get_company_stats(
     """
     Same scope as the list itself (get_company_scope, not a separate
     permission): counts are of whatever this user is permitted to see, not a
-    system-wide total. Mirrors mystic_auth's own GET /users/stats with three
-    independent counts, run concurrently rather than awaited one at a time.
+    system-wide total. Every count comes from one aggregate query (see
+    get_company_stats_in_scope), cached per scope until the next company or
+    balance-sheet write.
     Registered ahead of GET /{company_id} below: route order matters here,
     an unparameterized "/stats" must be matched before the "/{company_id}"
     path can try (and fail) to parse "stats" as an int.
     """
     scope = await get_company_scope(current_user["email"], COMPANY_READ, RESOURCE_COMPANY, db)
-    total, group_roots, subsidiaries = await asyncio.gather(
-        count_companies_in_scope(scope, db),
-        count_companies_in_scope(scope, db, hierarchy_scope="root"),
-        count_companies_in_scope(scope, db, hierarchy_scope="subsidiary"),
-    )
-    return CompanyStatsRead(total=total, group_roots=group_roots, subsidiaries=subsidiaries)
+    return CompanyStatsRead(**await get_company_stats_in_scope(scope, db))
+
+
+@router.get("/tree", response_model=list[CompanyTreeNode])
+async def get_company_tree(
+    include_metrics: bool = Query(
+        default=False,
+        description="Inline each company's latest-year headline balance-sheet figures, "
+        "where the caller may also read that company's balance sheets.",
+    ),
+    root_id: int | None = Query(default=None, description="Only this company's subtree (itself and every descendant)."),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(database.get_session),
+):
+    """
+    The caller's scoped companies as a nested parent -> subsidiaries tree,
+    so a group-structure view doesn't have to page through GET /companies/
+    and stitch parents together itself. Same get_company_scope as the list;
+    a company whose parent is out of scope is returned as a root.
+
+    Metrics are gated by the caller's own balance_sheet:read scope, not
+    company:read, so the tree never exposes figures GET /balance-sheets/
+    would refuse. Registered ahead of GET /{company_id}, same as /stats.
+    """
+    scope = await get_company_scope(current_user["email"], COMPANY_READ, RESOURCE_COMPANY, db)
+    metrics_scope = None
+    if include_metrics:
+        metrics_scope = await get_company_scope(current_user["email"], BALANCE_SHEET_READ, RESOURCE_BALANCE_SHEET, db)
+    return await get_company_tree_in_scope(scope, db, metrics_scope=metrics_scope, root_id=root_id)
 
 
 @router.post("/", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
@@ -125,6 +199,28 @@ async def add_company(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
+@router.post("/bulk", response_model=list[CompanyResponse], status_code=status.HTTP_201_CREATED)
+async def add_companies_bulk(
+    data: CompanyBulkCreate,
+    current_user: dict = Depends(require_authorization(COMPANY_CREATE, RESOURCE_COMPANY)),
+    db: AsyncSession = Depends(database.get_session),
+):
+    """
+    Creates a whole parent/child forest in one transaction (see
+    bulk_create_companies). Same coarse COMPANY_CREATE check as add_company,
+    for the same reason. A rejected batch is still a 400, but its detail is
+    `{message, errors: [{index, ticker, error}]}` rather than add_company's
+    plain string, so every bad row is reported at once.
+    """
+    try:
+        return await bulk_create_companies(data, db)
+    except BulkCreateError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": str(exc), "errors": [error.model_dump() for error in exc.errors]},
+        ) from exc
+
+
 @router.get("/lookup/{ticker}", response_model=TickerLookupResponse)
 @rate_limiter_service.rate_limited(
     "company_ticker_lookup", account_key_func=lambda kwargs: kwargs["current_user"]["email"]
@@ -188,11 +284,30 @@ async def get_company(
         COMPANY_READ,
         RESOURCE_COMPANY,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
     return company
 
 
+@router.get("/{company_id}/access", response_model=list[CompanyAccessHolder])
+async def get_company_access(
+    company_id: int,
+    current_user: dict = Depends(require_authorization(Permission.POLICIES_READ.value, "policies")),
+    db: AsyncSession = Depends(database.get_session),
+):
+    """
+    "Who can access this company?": every user holding a grant on it, with
+    the action and policy behind each, for access reviews that used to mean
+    one /authorization/users/{email}/authorization-check call per user.
+    Answered from user_company_access in one indexed query (see
+    list_company_access_holders). Gated by POLICIES_READ, the same
+    permission as that per-user check: it reveals other users' grants, which
+    company:read on the company itself never did.
+    """
+    await get_or_404(get_company_by_id(company_id, db), "Company not found")
+    return await list_company_access_holders(company_id, db)
+
+
 @router.patch("/{company_id}", response_model=CompanyResponse)
 async def edit_company(
     company_id: int,
@@ -206,7 +321,7 @@ async def edit_company(
         COMPANY_UPDATE,
         RESOURCE_COMPANY,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
     try:
         return await update_company(company, data, db)
@@ -226,7 +341,7 @@ async def remove_company(
         COMPANY_DELETE,
         RESOURCE_COMPANY,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
     try:
         await delete_company(company, db)
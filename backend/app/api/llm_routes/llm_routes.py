@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...access.permissions import LLM_CHAT, RESOURCE_LLM
-from ...access.scope import resource_scope_dict
+from ...access.scope import company_resource_scope
 from ...app_sdk import rate_limiter_service
 from ...balance_sheets.balance_sheet_crud import list_balance_sheets_for_company_years
 from ...companies.company_crud import get_company_by_id
@@ -41,7 +41,7 @@ async def chat(
         LLM_CHAT,
         RESOURCE_LLM,
         db,
-        resource=resource_scope_dict(company.id, company.group_root_id),
+        resource=await company_resource_scope(company, db),
     )
 
     balance_sheets = await list_balance_sheets_for_company_years(company.id, payload.years, db)
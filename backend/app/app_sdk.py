@@ -38,6 +38,35 @@ def _m(path: str):
 # companies/balance sheets. See app/access/scope.py's own docstring.
 policy_repository = _m("authorization.repositories.policy_repository").policy_repository
 
+# app/access/company_access.py materializes every user's per-company grants
+# into user_company_access straight from these two tables, and keeps it in
+# step with assignments/edits by registering a PolicyChangeHook on
+# policy_change_hooks (see mystic_auth's policy_change_hooks.py).
+_policy_model = _m("authorization.models.policy_model")
+Policy = _policy_model.Policy
+UserPolicy = _policy_model.UserPolicy
+_policy_change_hooks = _m("authorization.repositories.policy_change_hooks")
+PolicyChangeHook = _policy_change_hooks.PolicyChangeHook
+policy_change_hooks = _policy_change_hooks.policy_change_hooks
+
+# GET /companies/{id}/access (access reviews) names the users holding each
+# grant and is gated the same way as mystic-auth's own per-user
+# authorization-check endpoint, by POLICIES_READ.
+User = _m("user_table.user_model").User
+Permission = _m("authorization.permissions").Permission
+
+# The {"in": [...]} membership operator a resource_attributes value may use
+# (see mystic_auth's resource_attributes_condition.py): app/access/scope.py
+# and company_access.py read policy conditions directly, so they must spell
+# it the same way the evaluator does.
+MEMBERSHIP_OPERATOR = _m("authorization.conditions.condition_types.resource_attributes_condition").MEMBERSHIP_OPERATOR
+
+# Lets app/access/scope.py cache each user's compiled CompanyScope alongside
+# their policy list (get_user_derived/set_user_derived), so it's dropped by
+# exactly the same invalidations (policy assignment, revocation, edit) with
+# no second invalidation path for this app to keep in sync.
+authorization_cache_service = _m("authorization.caching.authorization_cache_service").authorization_cache_service
+
 # The shared declarative base: this app's own models (company_model.py,
 # balance_sheet_model.py) inherit from THIS Base, not a new one of their own,
 # so a single alembic env.py/metadata covers both mystic_auth's and this
@@ -52,6 +81,29 @@ Base = _m("database.base").Base
 # limiter implementation.
 rate_limiter_service = _m("auth.security.rate_limiter_service").rate_limiter_service
 
+# The same trigram-backed substring search + similarity ranking mystic_auth's
+# own users/audit-log lists use (see mystic_auth/database/text_search.py),
+# so GET /companies/'s `search` is served by the companies table's pg_trgm
+# indexes the same way instead of a second hand-rolled ILIKE.
+_text_search = _m("database.text_search")
+substring_match = _text_search.substring_match
+similarity_rank = _text_search.similarity_rank
+
+# One-query page + X-Total-Count for GET /companies/, the same helper
+# mystic_auth's own user and audit-log lists use (see
+# mystic_auth/database/pagination.py), including its planner-estimate
+# fallback past PAGINATION_EXACT_COUNT_LIMIT.
+_pagination = _m("database.pagination")
+Page = _pagination.Page
+fetch_page = _pagination.fetch_page
+set_total_count_headers = _pagination.set_total_count_headers
+
+# `column = ANY(:array)` for every per-request id list (scoped company ids,
+# bulk tickers, requested years), so the SQL text doesn't change with the
+# list's length and asyncpg's prepared-statement cache keeps hitting (see
+# mystic_auth/database/array_params.py).
+any_of = _m("database.array_params").any_of
+
 # Needed only by app/seed/seed_demo_data.py to create demo users with real
 # hashed passwords and role assignments through mystic_auth's own user
 # creation path, rather than inserting rows by hand.
@@ -60,8 +112,22 @@ user_crud = _m("user_crud.user_crud_collector").user_crud
 
 __all__ = [
     "policy_repository",
+    "authorization_cache_service",
+    "Policy",
+    "UserPolicy",
+    "PolicyChangeHook",
+    "policy_change_hooks",
+    "User",
+    "Permission",
+    "MEMBERSHIP_OPERATOR",
     "Base",
     "rate_limiter_service",
+    "substring_match",
+    "similarity_rank",
+    "Page",
+    "fetch_page",
+    "set_total_count_headers",
+    "any_of",
     "password_service",
     "user_crud",
 ]
@@ -6,6 +6,8 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..app_sdk import any_of
+from ..companies.company_cache import invalidate_company_caches
 from .balance_sheet_model import YFINANCE_COLUMN_NAMES, BalanceSheet
 from .sanitize_fields import sanitize_dict
 from .yfinance_field_map import YFINANCE_TO_DB_FIELDS
@@ -95,6 +97,8 @@ async def import_balance_sheet(company_id: int, year: int, ticker: str, db: Asyn
         # the route layer's single except-ValueError branch covers both.
         await db.rollback()
         raise ValueError(f"Balance sheet for company {company_id}, year {year} already exists") from exc
+    # GET /companies/tree inlines each company's latest-year figures.
+    await invalidate_company_caches()
     await db.refresh(balance_sheet)
     return balance_sheet
 
@@ -121,7 +125,7 @@ async def list_balance_sheets_for_company_years(
     in only the years the caller asked about (None = every year on file)."""
     stmt = select(BalanceSheet).where(BalanceSheet.company_id == company_id)
     if years:
-        stmt = stmt.where(BalanceSheet.year.in_(years))
+        stmt = stmt.where(any_of(BalanceSheet.year, years))
     result = await db.execute(stmt.order_by(BalanceSheet.year))
     return list(result.scalars().all())
 
@@ -129,3 +133,4 @@ async def list_balance_sheets_for_company_years(
 async def delete_balance_sheet(balance_sheet: BalanceSheet, db: AsyncSession) -> None:
     await db.delete(balance_sheet)
     await db.commit()
+    await invalidate_company_caches()
@@ -0,0 +1,100 @@
+"""
+Redis cache for scope-derived company read models (GET /companies/tree).
+
+Entries are keyed by the *scope* that produced them, not by the user: two
+users whose policies collapse to the same CompanyScope (see
+app/access/scope.py) get byte-for-byte the same tree, so they share one
+entry instead of each paying for their own query.
+
+Invalidation is a single global generation counter rather than tracking
+which scopes a given company write affects: a company create/rename/reparent
+or a balance-sheet import can change the answer for any number of scopes at
+once (a group-scoped entry, every unrestricted entry, ...), and working out
+exactly which would cost more than it saves for an admin-edited, rarely-
+written table. Every mutation just INCRs the counter; each entry stores the
+generation it was built under and is ignored once that no longer matches,
+then ages out on its own TTL.
+
+Same fail-safe posture as mystic_auth's AuthorizationCacheService: a Redis
+failure is logged and treated as a cache miss (or a skipped write), never
+surfaced to the caller, since the database is always the source of truth.
+"""
+
+import json
+import traceback
+from typing import Any
+
+from ..access.scope import CompanyScope
+from ..sdk import get_logger, redis_client
+
+logger = get_logger(__name__)
+
+_GENERATION_KEY = "app:companies:generation"
+_ENTRY_KEY_TEMPLATE = "app:companies:{kind}:{variant}"
+
+# Backstop only: a stale entry is already ignored the moment the generation
+# moves on, so this just bounds how long an orphaned one lingers in Redis.
+_TTL_SECONDS = 300
+
+
+def scope_cache_key(scope: CompanyScope | None) -> str:
+    """Deterministic key for a scope's contents: its fingerprint (see
+    CompanyScope.fingerprint), or "none" when there's no scope at all (e.g.
+    metrics not requested)."""
+    if scope is None:
+        return "none"
+    return scope.fingerprint
+
+
+async def get_cached(kind: str, variant: str) -> tuple[Any | None, str | None]:
+    """
+    (payload, generation) for (kind, variant). payload is None on a miss or
+    a stale entry; generation is the counter's value as of this read, to be
+    handed back to set_cached() once the caller has rebuilt the payload, or
+    None if Redis is unreachable (the caller then skips caching entirely).
+    The generation and the entry are read in one MGET, so a hit costs the
+    same single round trip as an uncached key.
+    """
+    try:
+        generation, raw = await redis_client.mget(
+            _GENERATION_KEY, _ENTRY_KEY_TEMPLATE.format(kind=kind, variant=variant)
+        )
+        generation = generation or "0"
+        if raw is None:
+            return None, generation
+        entry = json.loads(raw)
+        if entry.get("generation") != generation:
+            return None, generation
+        return entry["payload"], generation
+    except Exception:
+        logger.warning("Company cache read failed for %s/%s:\n%s", kind, variant, traceback.format_exc())
+        return None, None
+
+
+async def set_cached(kind: str, variant: str, generation: str | None, payload: Any) -> None:
+    """
+    Stores `payload` (anything json.dumps accepts) tagged with the
+    generation get_cached() saw *before* the caller ran its query, not the
+    current one: a write that lands mid-query bumps the counter, so the
+    payload it may have missed is born stale instead of being passed off as
+    fresh for the whole TTL.
+    """
+    if generation is None:
+        return
+    try:
+        await redis_client.set(
+            _ENTRY_KEY_TEMPLATE.format(kind=kind, variant=variant),
+            json.dumps({"generation": generation, "payload": payload}),
+            ex=_TTL_SECONDS,
+        )
+    except Exception:
+        logger.warning("Company cache write failed for %s/%s:\n%s", kind, variant, traceback.format_exc())
+
+
+async def invalidate_company_caches() -> None:
+    """Called after every committed company or balance-sheet write. One INCR
+    retires every cached entry at once, see module docstring."""
+    try:
+        await redis_client.incr(_GENERATION_KEY)
+    except Exception:
+        logger.warning("Company cache invalidation failed:\n%s", traceback.format_exc())
@@ -1,20 +1,55 @@
 import asyncio
+import base64
+import binascii
+import json
+from collections import defaultdict
+from datetime import datetime
 from typing import Literal
 
 import yfinance as yf
 from curl_cffi import requests as curl_requests
-from sqlalchemy import asc, desc, func, or_, select
+from sqlalchemy import (
+    CompoundSelect,
+    Integer,
+    Select,
+    and_,
+    asc,
+    column,
+    delete,
+    desc,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import InstrumentedAttribute, aliased
+from sqlalchemy.orm import aliased
 
+from ..access.company_access import rebuild_company_access
 from ..access.scope import CompanyScope
-from .company_model import Company
-from .company_schema import CompanyCreate, CompanyUpdate
+from ..app_sdk import Page, any_of, fetch_page, similarity_rank, substring_match
+from ..balance_sheets.balance_sheet_model import BalanceSheet
+from .company_cache import get_cached, invalidate_company_caches, scope_cache_key, set_cached
+from .company_model import Company, CompanyClosure
+from .company_schema import CompanyBulkCreate, CompanyBulkItem, CompanyBulkRowError, CompanyCreate, CompanyUpdate
 
 # Allowlisted sort keys, same rationale as mystic_auth's _SORTABLE_COLUMN_NAMES.
-# "parent" is handled separately because it sorts on the joined parent's name.
-_SORTABLE_COLUMN_NAMES = {"name", "ticker", "created_at"}
+# Each has a matching (column, id) composite index on companies, see
+# company_model.py. "parent" sorts on the denormalized parent_name column.
+_SORTABLE_COLUMNS = {
+    "name": Company.name,
+    "ticker": Company.ticker,
+    "created_at": Company.created_at,
+    "parent": Company.parent_name,
+}
 
 HierarchyScope = Literal["root", "subsidiary"]
 
@@ -23,6 +58,13 @@ HierarchyScope = Literal["root", "subsidiary"]
 # curl_cffi session with browser impersonation or Yahoo blocks the request.
 _YFINANCE_TIMEOUT_SECONDS = 15
 
+# pg_advisory_xact_lock key serializing every write that reads or rewrites
+# company_closure paths (an insert under a parent, a subtree move). Two
+# concurrent moves could otherwise each pass the cycle check against the
+# other's pre-move paths (A under B and B under A at once). Hierarchy edits
+# are rare admin actions, so one global lock costs nothing in practice.
+_HIERARCHY_LOCK_KEY = 0x636F6D70  # "comp"
+
 
 class TickerLookupError(RuntimeError):
     """A yfinance/network failure while looking up a ticker's company name,
@@ -88,6 +130,10 @@ async def create_company(data: CompanyCreate, db: AsyncSession) -> Company:
     already exist to be referenced), so no recursive walk is needed either way.
     See company_model.py's docstring for why group_root_id exists at all.
 
+    Also writes the new row's company_closure paths (see
+    _insert_closure_paths) and the user_company_access rows existing grants
+    give it (see access/company_access.py) in the same transaction.
+
     Raises ValueError (translated to HTTP 400 by the route layer) if
     parent_company_id doesn't exist, or if `ticker` is already taken:
     tickers are unique (see company_model.py), and two concurrent requests
@@ -95,6 +141,7 @@ async def create_company(data: CompanyCreate, db: AsyncSession) -> Company:
     """
     parent = None
     if data.parent_company_id is not None:
+        await _lock_hierarchy(db)
         parent = await db.get(Company, data.parent_company_id)
         if parent is None:
             raise ValueError(f"parent_company_id {data.parent_company_id} does not exist")
@@ -103,6 +150,7 @@ async def create_company(data: CompanyCreate, db: AsyncSession) -> Company:
         name=data.name,
         ticker=data.ticker,
         parent_company_id=data.parent_company_id,
+        parent_name=parent.name if parent is not None else None,
         group_root_id=0,  # placeholder until we have this row's own id
     )
     db.add(company)
@@ -115,14 +163,238 @@ async def create_company(data: CompanyCreate, db: AsyncSession) -> Company:
         # because flush() alone already raised, unguarded).
         await db.flush()  # assigns company.id without ending the transaction
         company.group_root_id = parent.group_root_id if parent is not None else company.id
+        await _insert_closure_paths(company.id, data.parent_company_id, db)
+        await db.flush()  # group_root_id must be on the row before access is derived from it
+        await rebuild_company_access([company.id], db)
         await db.commit()
     except IntegrityError as exc:
         await db.rollback()
         raise ValueError(f"A company with ticker '{data.ticker}' already exists") from exc
+    await invalidate_company_caches()
     await db.refresh(company)
     return company
 
 
+class BulkCreateError(ValueError):
+    """
+    Raised by bulk_create_companies when any row of the request can't be
+    inserted. Nothing from the request is written in that case (the whole
+    batch is one transaction); `errors` carries one CompanyBulkRowError per
+    offending row so the caller can fix them all at once instead of
+    discovering them one retry at a time. Still a ValueError, so it reads as
+    a client error anywhere the generic translation applies.
+    """
+
+    def __init__(self, errors: list[CompanyBulkRowError]):
+        super().__init__(f"{len(errors)} of the submitted companies could not be created")
+        self.errors = errors
+
+
+def plan_bulk_levels(items: list[CompanyBulkItem]) -> tuple[list[list[int]], list[CompanyBulkRowError]]:
+    """
+    Orders a bulk create's rows (by index into `items`) into insertion
+    levels: level 0 is every row whose parent_ticker isn't another row of the
+    request (a new group root, or a child of an already-existing company),
+    level n + 1 the rows whose parent is in level n. Inserting level by level
+    means every parent already has its id, group_root_id and closure paths
+    by the time its children go in.
+
+    Pure (no DB) so the forest's own consistency is checked before the
+    hierarchy lock is taken: a ticker repeated within the request, a row
+    naming itself as its parent, and parent_ticker cycles come back as
+    per-row errors (with an empty plan) instead.
+    """
+    errors: list[CompanyBulkRowError] = []
+    index_by_ticker: dict[str, int] = {}
+    for index, item in enumerate(items):
+        if item.ticker in index_by_ticker:
+            errors.append(
+                CompanyBulkRowError(
+                    index=index,
+                    ticker=item.ticker,
+                    error=f"Ticker '{item.ticker}' already appears at row {index_by_ticker[item.ticker]} "
+                    "of this request",
+                )
+            )
+        else:
+            index_by_ticker[item.ticker] = index
+    if errors:
+        # A repeated ticker makes parent_ticker references to it ambiguous,
+        # so there's no meaningful plan to build past this point.
+        return [], errors
+
+    children: defaultdict[int, list[int]] = defaultdict(list)
+    level: list[int] = []
+    for index, item in enumerate(items):
+        parent_index = index_by_ticker.get(item.parent_ticker) if item.parent_ticker is not None else None
+        if parent_index is None:
+            level.append(index)
+        else:
+            children[parent_index].append(index)
+
+    levels: list[list[int]] = []
+    while level:
+        levels.append(level)
+        level = [child for parent in level for child in children[parent]]
+
+    # Anything never reached from a level-0 row hangs off a cycle.
+    placed = {index for placed_level in levels for index in placed_level}
+    for index, item in enumerate(items):
+        if index not in placed:
+            message = (
+                "A company cannot be its own parent"
+                if item.parent_ticker == item.ticker
+                else f"parent_ticker '{item.parent_ticker}' is part of a cycle within this request"
+            )
+            errors.append(CompanyBulkRowError(index=index, ticker=item.ticker, error=message))
+    return (levels, []) if not errors else ([], errors)
+
+
+async def bulk_create_companies(data: CompanyBulkCreate, db: AsyncSession) -> list[Company]:
+    """
+    Set-based counterpart to create_company for onboarding a whole group at
+    once. create_company costs about four round trips per company (parent
+    lookup, flush for the id, group_root_id fix-up, commit); here the
+    statement count depends only on the forest's depth:
+
+      - one lookup of every ticker the request mentions (its own, to report
+        ones already taken, and any existing parents it hangs rows under),
+      - per level (see plan_bulk_levels): one multi-row INSERT ... RETURNING
+        for the companies, one INSERT ... SELECT for all of their
+        company_closure paths,
+      - one UPDATE setting every new root's group_root_id to its own id,
+        the same placeholder-then-resolve dance create_company does per row,
+      - one user_company_access rebuild for all of the new companies.
+
+    A child's group_root_id and parent_name are its parent's, already known
+    in memory from the previous level, so no recursive walk is needed.
+
+    All in one transaction under _lock_hierarchy: either the whole forest is
+    created or nothing is. Raises BulkCreateError listing every bad row
+    (repeated ticker, cycle, unknown parent, ticker already taken) otherwise.
+    The INSERTs use ON CONFLICT (ticker) DO NOTHING rather than letting the
+    unique constraint abort the transaction, so a ticker taken by a
+    concurrent create between the lookup and the insert is still reported
+    against its own row instead of as one opaque IntegrityError.
+
+    Returns the created companies in request order.
+    """
+    items = data.companies
+    levels, errors = plan_bulk_levels(items)
+    if errors:
+        raise BulkCreateError(errors)
+
+    own_tickers = {item.ticker for item in items}
+    parent_tickers = {item.parent_ticker for item in items if item.parent_ticker is not None} - own_tickers
+
+    await _lock_hierarchy(db)
+    existing = {
+        row.ticker: row
+        for row in await db.execute(
+            select(Company.id, Company.ticker, Company.name, Company.group_root_id).where(
+                any_of(Company.ticker, own_tickers | parent_tickers)
+            )
+        )
+    }
+    for index, item in enumerate(items):
+        if item.ticker in existing:
+            errors.append(
+                CompanyBulkRowError(
+                    index=index, ticker=item.ticker, error=f"A company with ticker '{item.ticker}' already exists"
+                )
+            )
+        elif item.parent_ticker in parent_tickers and item.parent_ticker not in existing:
+            errors.append(
+                CompanyBulkRowError(
+                    index=index, ticker=item.ticker, error=f"parent_ticker '{item.parent_ticker}' does not exist"
+                )
+            )
+    if errors:
+        await db.rollback()
+        raise BulkCreateError(errors)
+
+    # ticker -> (id, group_root_id, name) of every company a row may name
+    # as its parent: the existing ones now, each level's new rows as
+    # they're inserted.
+    resolved: dict[str, tuple[int, int, str]] = {
+        ticker: (existing[ticker].id, existing[ticker].group_root_id, existing[ticker].name)
+        for ticker in parent_tickers
+    }
+    created_ids: dict[str, int] = {}
+
+    for level in levels:
+        rows = []
+        for index in level:
+            item = items[index]
+            parent = resolved[item.parent_ticker] if item.parent_ticker is not None else None
+            rows.append(
+                {
+                    "name": item.name,
+                    "ticker": item.ticker,
+                    "parent_company_id": parent[0] if parent is not None else None,
+                    "parent_name": parent[2] if parent is not None else None,
+                    "group_root_id": parent[1] if parent is not None else 0,  # roots resolved below
+                }
+            )
+        inserted: dict[str, int] = dict(
+            (
+                await db.execute(
+                    pg_insert(Company)
+                    .values(rows)
+                    .on_conflict_do_nothing(index_elements=[Company.ticker])
+                    .returning(Company.ticker, Company.id)
+                )
+            )
+            .tuples()
+            .all()
+        )
+
+        raced = [index for index in level if items[index].ticker not in inserted]
+        if raced:
+            await db.rollback()
+            raise BulkCreateError(
+                [
+                    CompanyBulkRowError(
+                        index=index,
+                        ticker=items[index].ticker,
+                        error=f"A company with ticker '{items[index].ticker}' already exists",
+                    )
+                    for index in raced
+                ]
+            )
+
+        root_ids = [inserted[items[index].ticker] for index in level if items[index].parent_ticker is None]
+        if root_ids:
+            await db.execute(
+                update(Company)
+                .where(any_of(Company.id, root_ids))
+                .values(group_root_id=Company.id)
+                .execution_options(synchronize_session=False)
+            )
+
+        edges: list[tuple[int, int | None]] = []
+        for index in level:
+            item = items[index]
+            company_id = inserted[item.ticker]
+            if item.parent_ticker is None:
+                resolved[item.ticker] = (company_id, company_id, item.name)
+                edges.append((company_id, None))
+            else:
+                parent_id, group_root_id, _ = resolved[item.parent_ticker]
+                resolved[item.ticker] = (company_id, group_root_id, item.name)
+                edges.append((company_id, parent_id))
+            created_ids[item.ticker] = company_id
+        await _insert_bulk_closure_paths(edges, db)
+
+    await rebuild_company_access(list(created_ids.values()), db)
+    await db.commit()
+    await invalidate_company_caches()
+
+    result = await db.scalars(select(Company).where(any_of(Company.id, created_ids.values())))
+    companies = {company.id: company for company in result}
+    return [companies[created_ids[item.ticker]] for item in items]
+
+
 async def update_company(company: Company, data: CompanyUpdate, db: AsyncSession) -> Company:
     """
     Same group_root_id re-resolution as create_company (see its docstring):
@@ -130,14 +402,18 @@ async def update_company(company: Company, data: CompanyUpdate, db: AsyncSession
     since re-walking it unconditionally on every field-only-rename would
     otherwise risk clobbering a correct value with a stale read.
 
+    Reparenting moves the company's whole subtree with it: its descendants'
+    company_closure paths and group_root_id are rewritten set-based in the
+    same transaction (see _move_subtree), however deep the subtree is, and
+    so are the subtree's user_company_access rows, since group and subtree
+    grants can both change with a move.
+    A rename likewise rewrites every direct child's denormalized parent_name.
+
     Raises ValueError (translated to HTTP 400 by the route layer) for the
     same reasons create_company does, plus: a company can't be set as its
     own parent (create_company doesn't need this guard, since a brand-new
-    row has no id yet to reference), and a company with subsidiaries can't
-    be reparented at all. Same reasoning as delete_company's subsidiary
-    guard: reparenting would leave every subsidiary's group_root_id pointing
-    at a group this company no longer roots, and unlike delete there's no
-    ON DELETE SET NULL to fall back on here.
+    row has no id yet to reference), nor moved under one of its own
+    descendants, which would turn the hierarchy into a cycle.
     """
     fields = data.model_dump(exclude_unset=True)
 
@@ -145,25 +421,33 @@ async def update_company(company: Company, data: CompanyUpdate, db: AsyncSession
         new_parent_id = fields["parent_company_id"]
         if new_parent_id == company.id:
             raise ValueError("A company cannot be its own parent")
-        subsidiary_count = await db.scalar(
-            select(func.count()).select_from(Company).where(Company.parent_company_id == company.id)
-        )
-        if subsidiary_count:
-            raise ValueError(
-                f"Cannot reparent '{company.name}': it has {subsidiary_count} subsidiary company(ies), "
-                "whose group_root_id would then be left pointing at the wrong group."
-            )
+        await _lock_hierarchy(db)
         if new_parent_id is None:
-            company.group_root_id = company.id
+            new_group_root_id = company.id
+            company.parent_name = None
         else:
             parent = await db.get(Company, new_parent_id)
             if parent is None:
                 raise ValueError(f"parent_company_id {new_parent_id} does not exist")
-            company.group_root_id = parent.group_root_id
+            if await _is_descendant(new_parent_id, company.id, db):
+                raise ValueError(f"Cannot move '{company.name}' under one of its own subsidiaries")
+            new_group_root_id = parent.group_root_id
+            company.parent_name = parent.name
+        await _move_subtree(company.id, new_parent_id, new_group_root_id, db)
+        await rebuild_company_access(
+            select(CompanyClosure.descendant_id).where(CompanyClosure.ancestor_id == company.id), db
+        )
         company.parent_company_id = new_parent_id
+        company.group_root_id = new_group_root_id
 
-    if "name" in fields:
+    if "name" in fields and fields["name"] != company.name:
         company.name = fields["name"]
+        await db.execute(
+            update(Company)
+            .where(Company.parent_company_id == company.id)
+            .values(parent_name=fields["name"])
+            .execution_options(synchronize_session=False)
+        )
     if "ticker" in fields:
         company.ticker = fields["ticker"]
 
@@ -172,10 +456,107 @@ async def update_company(company: Company, data: CompanyUpdate, db: AsyncSession
     except IntegrityError as exc:
         await db.rollback()
         raise ValueError(f"A company with ticker '{fields.get('ticker')}' already exists") from exc
+    await invalidate_company_caches()
     await db.refresh(company)
     return company
 
 
+async def _lock_hierarchy(db: AsyncSession) -> None:
+    """Transaction-scoped, released by the caller's commit/rollback. See
+    _HIERARCHY_LOCK_KEY."""
+    await db.execute(select(func.pg_advisory_xact_lock(_HIERARCHY_LOCK_KEY)))
+
+
+async def _insert_closure_paths(company_id: int, parent_id: int | None, db: AsyncSession) -> None:
+    """A new leaf's paths: its own depth-0 row, plus one row per ancestor of
+    its parent (the parent's own self-row included) at that depth + 1. One
+    INSERT ... SELECT, no matter how deep the parent sits."""
+    self_path = select(literal(company_id), literal(company_id), literal(0))
+    source: Select | CompoundSelect = self_path
+    if parent_id is not None:
+        inherited = select(CompanyClosure.ancestor_id, literal(company_id), CompanyClosure.depth + 1).where(
+            CompanyClosure.descendant_id == parent_id
+        )
+        source = union_all(inherited, self_path)
+    await db.execute(insert(CompanyClosure).from_select(["ancestor_id", "descendant_id", "depth"], source))
+
+
+async def _insert_bulk_closure_paths(edges: list[tuple[int, int | None]], db: AsyncSession) -> None:
+    """_insert_closure_paths for a whole level of (company_id, parent_id)
+    pairs (parent_id None for a new root) in one statement: the pairs go in
+    as VALUES lists, the parented ones joined against their parent's
+    existing paths. Parents must already have theirs (a previous level, or
+    an existing company). Roots are kept out of the joined list rather than
+    carried as NULL parents: a VALUES column that's NULL in every row has no
+    type for Postgres to compare against an integer."""
+    new_ids = values(column("company_id", Integer), name="new_ids").data([(company_id,) for company_id, _ in edges])
+    source: Select | CompoundSelect = select(new_ids.c.company_id, new_ids.c.company_id, literal(0))
+    parented = [(company_id, parent_id) for company_id, parent_id in edges if parent_id is not None]
+    if parented:
+        new_edges = values(column("company_id", Integer), column("parent_id", Integer), name="new_edges").data(
+            parented
+        )
+        inherited = select(CompanyClosure.ancestor_id, new_edges.c.company_id, CompanyClosure.depth + 1).join(
+            new_edges, CompanyClosure.descendant_id == new_edges.c.parent_id
+        )
+        source = union_all(source, inherited)
+    await db.execute(insert(CompanyClosure).from_select(["ancestor_id", "descendant_id", "depth"], source))
+
+
+async def _is_descendant(candidate_id: int, ancestor_id: int, db: AsyncSession) -> bool:
+    return bool(
+        await db.scalar(
+            select(
+                exists().where(CompanyClosure.ancestor_id == ancestor_id, CompanyClosure.descendant_id == candidate_id)
+            )
+        )
+    )
+
+
+async def _move_subtree(company_id: int, new_parent_id: int | None, new_group_root_id: int, db: AsyncSession) -> None:
+    """
+    Re-hangs the subtree rooted at `company_id` under `new_parent_id` (None:
+    make it a root) with three set-based statements, independent of the
+    subtree's size:
+
+      1. drop every path from a strict ancestor of `company_id` to any node
+         in its subtree (paths *within* the subtree are unaffected by the move),
+      2. insert the cross product of the new parent's ancestors (itself
+         included) and the subtree's nodes, depths summed,
+      3. point the whole subtree's group_root_id at the new group.
+
+    The caller has already taken _lock_hierarchy and ruled out a cycle.
+    """
+    subtree_ids = select(CompanyClosure.descendant_id).where(CompanyClosure.ancestor_id == company_id)
+    old_ancestor_ids = select(CompanyClosure.ancestor_id).where(
+        CompanyClosure.descendant_id == company_id, CompanyClosure.ancestor_id != company_id
+    )
+    await db.execute(
+        delete(CompanyClosure)
+        .where(CompanyClosure.descendant_id.in_(subtree_ids), CompanyClosure.ancestor_id.in_(old_ancestor_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+    if new_parent_id is not None:
+        above = aliased(CompanyClosure)
+        below = aliased(CompanyClosure)
+        await db.execute(
+            insert(CompanyClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1).where(
+                    above.descendant_id == new_parent_id, below.ancestor_id == company_id
+                ),
+            )
+        )
+
+    await db.execute(
+        update(Company)
+        .where(Company.id.in_(subtree_ids))
+        .values(group_root_id=new_group_root_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
 async def delete_company(company: Company, db: AsyncSession) -> None:
     """
     Raises ValueError (translated to HTTP 400 by the route layer) if `company`
@@ -205,6 +586,7 @@ async def delete_company(company: Company, db: AsyncSession) -> None:
         )
     await db.delete(company)
     await db.commit()
+    await invalidate_company_caches()
 
 
 async def get_company_by_id(company_id: int, db: AsyncSession) -> Company | None:
@@ -227,25 +609,44 @@ def _hierarchy_filter(hierarchy_scope: HierarchyScope | None):
     return None
 
 
+def _scope_clause(scope: CompanyScope):
+    """The WHERE clause restricting Company rows to `scope`, or None when
+    the scope is unrestricted. Callers short-circuit an empty scope first.
+
+    Each id set is one array parameter (any_of), so a user scoped to 3
+    companies and one scoped to 3,000 run the same prepared statement
+    rather than one IN-list shape per scope size."""
+    if scope.unrestricted:
+        return None
+    clauses = []
+    if scope.company_ids:
+        clauses.append(any_of(Company.id, scope.company_ids))
+    if scope.group_root_ids:
+        clauses.append(any_of(Company.group_root_id, scope.group_root_ids))
+    if scope.subtree_root_ids:
+        clauses.append(
+            Company.id.in_(
+                select(CompanyClosure.descendant_id).where(any_of(CompanyClosure.ancestor_id, scope.subtree_root_ids))
+            )
+        )
+    return or_(*clauses)
+
+
 def _apply_scope_and_filters(
     stmt,
     scope: CompanyScope,
     search: str | None,
     hierarchy_scope: HierarchyScope | None,
 ):
-    if not scope.unrestricted:
-        clauses = []
-        if scope.company_ids:
-            clauses.append(Company.id.in_(scope.company_ids))
-        if scope.group_root_ids:
-            clauses.append(Company.group_root_id.in_(scope.group_root_ids))
-        stmt = stmt.where(or_(*clauses))
+    scope_clause = _scope_clause(scope)
+    if scope_clause is not None:
+        stmt = stmt.where(scope_clause)
 
     if search:
         # Server-side search is required because the paginated UI no longer
-        # has every scoped company loaded client-side.
-        pattern = f"%{search}%"
-        stmt = stmt.where(or_(Company.name.ilike(pattern), Company.ticker.ilike(pattern)))
+        # has every scoped company loaded client-side. Served by the name/
+        # ticker pg_trgm indexes, see company_model.py.
+        stmt = stmt.where(substring_match(search, Company.name, Company.ticker))
 
     hierarchy_clause = _hierarchy_filter(hierarchy_scope)
     if hierarchy_clause is not None:
@@ -254,47 +655,179 @@ def _apply_scope_and_filters(
     return stmt
 
 
+class InvalidCursorError(ValueError):
+    """A GET /companies/ cursor that doesn't decode, or was issued for a
+    different sort_by/sort_dir than the request now asks for. A ValueError
+    subclass, so the route's usual ValueError -> 400 translation applies."""
+
+
+def _cursor_value(company: Company, sort_by: str | None):
+    if sort_by not in _SORTABLE_COLUMNS:
+        return None
+    value = getattr(company, _SORTABLE_COLUMNS[sort_by].key)
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_company_cursor(company: Company, sort_by: str | None, sort_dir: str) -> str:
+    """
+    Opaque (to the client) cursor pointing just past `company` in the
+    (sort key, id) order list_companies_in_scope uses. Carries the sort it
+    was issued for, so a cursor can't silently be replayed against a
+    different ordering and skip or repeat rows.
+    """
+    payload: dict[str, object] = {"s": sort_by if sort_by in _SORTABLE_COLUMNS else None, "d": sort_dir}
+    payload["v"] = _cursor_value(company, sort_by)
+    payload["id"] = company.id
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_company_cursor(cursor: str, sort_by: str | None, sort_dir: str) -> tuple[str | datetime | None, int]:
+    """(sort key value, id) from encode_company_cursor's output. Raises
+    InvalidCursorError on anything malformed or mismatched, including a
+    sort key value of the wrong type (only parent_name and the id fallback
+    carry None; every other key is a string)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        expected_sort = sort_by if sort_by in _SORTABLE_COLUMNS else None
+        if payload["s"] != expected_sort or payload["d"] != sort_dir or not isinstance(payload["id"], int):
+            raise InvalidCursorError("Cursor was issued for a different sort_by/sort_dir")
+        value = payload["v"]
+        if isinstance(value, str):
+            return (datetime.fromisoformat(value) if expected_sort == "created_at" else value), payload["id"]
+        if value is None and expected_sort in (None, "parent"):
+            return None, payload["id"]
+        raise InvalidCursorError("Malformed cursor")
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+
+def _after_cursor_clause(sort_by: str | None, descending: bool, value: str | datetime | None, last_id: int):
+    """
+    "Rows strictly after (value, last_id)" in ORDER BY (sort key, id). For
+    the NOT NULL sort keys that's a single row-value comparison, which
+    Postgres turns into a range seek on the matching (column, id) index.
+    parent_name is nullable, so it spells out Postgres's own NULL placement
+    instead (NULLS LAST ascending, NULLS FIRST descending): a bare row-value
+    comparison against NULL would never be true and would end the listing
+    early at the first root company.
+    """
+    if sort_by not in _SORTABLE_COLUMNS:
+        return Company.id < last_id if descending else Company.id > last_id
+
+    column = _SORTABLE_COLUMNS[sort_by]
+    row = tuple_(column, Company.id)
+    bound = tuple_(literal(value, column.type), literal(last_id, Company.id.type))
+    if sort_by != "parent":
+        return row < bound if descending else row > bound
+
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), Company.id < last_id), column.isnot(None))
+        return and_(column.isnot(None), row < bound)
+    if value is None:
+        return and_(column.is_(None), Company.id > last_id)
+    return or_(row > bound, column.is_(None))
+
+
+def is_similarity_ranked(search: str | None, sort_by: str | None) -> bool:
+    """Whether an offset-mode page is ordered by search similarity (a
+    search with no explicit sort), an order no keyset cursor can resume:
+    the route doesn't hand out X-Next-Cursor for such a page."""
+    return bool(search) and sort_by not in _SORTABLE_COLUMNS
+
+
+def _company_order_by(sort_by: str | None, sort_dir: str, ranked_search: str | None) -> list:
+    order_column = _SORTABLE_COLUMNS.get(sort_by, Company.id) if sort_by is not None else Company.id
+    direction = desc if sort_dir != "asc" else asc
+    # id as a secondary key for stable ordering, same as mystic_auth's own
+    # UserBaseCRUD._order_by, and the cursor's tiebreaker.
+    order_by = [direction(order_column), direction(Company.id)]
+    if is_similarity_ranked(ranked_search, sort_by):
+        # A search with no explicit sort puts the closest name/ticker first.
+        # Offset mode only (callers pass None otherwise): a similarity score
+        # isn't something a keyset cursor can seek past, so cursor pages
+        # keep the plain id order.
+        order_by.insert(0, desc(similarity_rank(ranked_search, Company.name, Company.ticker)))
+    return order_by
+
+
 async def list_companies_in_scope(
     scope: CompanyScope,
     db: AsyncSession,
     *,
     limit: int = 1000,
     offset: int = 0,
+    cursor: str | None = None,
     search: str | None = None,
     hierarchy_scope: HierarchyScope | None = None,
     sort_by: str | None = None,
     sort_dir: str = "asc",
-) -> list[tuple[Company, str | None]]:
+) -> list[Company]:
     """
     The companies `scope` (see app/access/scope.py) grants access to,
     paginated and optionally filtered/sorted. An empty scope short-circuits
     to no query at all, since the caller already knows the answer is
     "nothing".
 
-    Returns (company, parent_name) pairs. parent_name comes from a self-join
-    rather than one lookup per row, which also enables server-side parent sort.
+    Two pagination modes. `offset` is the original one, kept for callers
+    that jump to a numbered page. `cursor` (from encode_company_cursor on
+    the previous page's last row) is keyset pagination instead: it seeks
+    past the cursor's (sort key, id) on the sort's composite index rather
+    than scanning and discarding `offset` rows, so every page costs the
+    same as the first. Pass one or the other; `cursor` wins if both are set.
+
+    A `search` without a `sort_by` is ranked by trigram similarity to the
+    name/ticker, in offset mode only.
+
+    Each Company carries its own denormalized parent_name (see
+    company_model.py), so no self-join is needed to show or sort by it.
+    Raises InvalidCursorError for a bad cursor.
     """
     if scope.is_empty():
         return []
 
-    parent = aliased(Company)
-    stmt = select(Company, parent.name).outerjoin(parent, Company.parent_company_id == parent.id)
-    stmt = _apply_scope_and_filters(stmt, scope, search, hierarchy_scope)
+    stmt = _apply_scope_and_filters(select(Company), scope, search, hierarchy_scope)
 
-    order_column: InstrumentedAttribute
-    if sort_by == "parent":
-        order_column = parent.name
-    elif sort_by in _SORTABLE_COLUMN_NAMES:
-        order_column = getattr(Company, sort_by)
-    else:
-        order_column = Company.id
-    direction = asc if sort_dir == "asc" else desc
-    # id as a secondary key for stable ordering, same as mystic_auth's own
-    # UserBaseCRUD._order_by.
-    stmt = stmt.order_by(direction(order_column), direction(Company.id)).limit(limit).offset(offset)
+    descending = sort_dir != "asc"
+    if cursor is not None:
+        value, last_id = decode_company_cursor(cursor, sort_by, sort_dir)
+        stmt = stmt.where(_after_cursor_clause(sort_by, descending, value, last_id))
+        offset = 0
+
+    order_by = _company_order_by(sort_by, sort_dir, search if cursor is None else None)
+    stmt = stmt.order_by(*order_by).limit(limit).offset(offset)
 
     result = await db.execute(stmt)
-    return [(row[0], row[1]) for row in result.all()]
+    return list(result.scalars().all())
+
+
+async def page_companies_in_scope(
+    scope: CompanyScope,
+    db: AsyncSession,
+    *,
+    limit: int = 1000,
+    offset: int = 0,
+    search: str | None = None,
+    hierarchy_scope: HierarchyScope | None = None,
+    sort_by: str | None = None,
+    sort_dir: str = "asc",
+) -> Page[Company]:
+    """
+    Offset-mode list_companies_in_scope plus count_companies_in_scope's
+    total, fetched in one query (see mystic_auth's database/pagination.py)
+    for GET /companies/'s X-Total-Count. Cursor mode doesn't need this: it
+    never reports a total.
+    """
+    if scope.is_empty():
+        return Page(items=[], total=0)
+
+    stmt = _apply_scope_and_filters(select(Company), scope, search, hierarchy_scope)
+    return await fetch_page(
+        stmt, db, order_by=_company_order_by(sort_by, sort_dir, search), limit=limit, offset=offset
+    )
 
 
 async def count_companies_in_scope(
@@ -305,10 +838,181 @@ async def count_companies_in_scope(
     hierarchy_scope: HierarchyScope | None = None,
 ) -> int:
     """Total matching rows, ignoring limit/offset. Lets a caller compute how
-    many pages exist (GET /companies/'s X-Total-Count header) or build
-    CompanyStatsCard's aggregate counts (GET /companies/stats)."""
+    many pages exist (GET /companies/'s X-Total-Count header)."""
     if scope.is_empty():
         return 0
 
     stmt = _apply_scope_and_filters(select(func.count()).select_from(Company), scope, search, hierarchy_scope)
     return await db.scalar(stmt)
+
+
+async def get_company_stats_in_scope(scope: CompanyScope, db: AsyncSession) -> dict[str, int]:
+    """
+    Every CompanyStatsCard count for `scope` in one scan: each is a
+    COUNT(*) FILTER (WHERE ...) over the same scoped rows, rather than one
+    count_companies_in_scope query per tile. The balance-sheet split is a
+    correlated EXISTS per company, answered from BalanceSheet.company_id's
+    index without fanning the count out across every year on file.
+
+    Cached per scope under company_cache's generation counter, so the result
+    holds until the next company or balance-sheet write.
+    """
+    if scope.is_empty():
+        return dict.fromkeys(
+            ("total", "group_roots", "subsidiaries", "with_balance_sheets", "without_balance_sheets"), 0
+        )
+
+    variant = scope_cache_key(scope)
+    cached, generation = await get_cached("stats", variant)
+    if cached is not None:
+        return cached
+
+    has_balance_sheet = exists().where(BalanceSheet.company_id == Company.id)
+    stmt = _apply_scope_and_filters(
+        select(
+            func.count().label("total"),
+            func.count().filter(Company.parent_company_id.is_(None)).label("group_roots"),
+            func.count().filter(Company.parent_company_id.isnot(None)).label("subsidiaries"),
+            func.count().filter(has_balance_sheet).label("with_balance_sheets"),
+        ).select_from(Company),
+        scope,
+        None,
+        None,
+    )
+    row = (await db.execute(stmt)).one()
+    stats = dict(row._mapping)
+    stats["without_balance_sheets"] = stats["total"] - stats["with_balance_sheets"]
+
+    await set_cached("stats", variant, generation, stats)
+    return stats
+
+
+# The handful of balance-sheet line items GET /companies/tree can inline per
+# node, enough for an at-a-glance group overview without a second request.
+_HEADLINE_METRIC_COLUMNS = (
+    "total_assets",
+    "total_liabilities_net_minority_interest",
+    "stockholders_equity",
+    "total_debt",
+)
+
+
+def build_company_tree(rows: list[dict]) -> list[dict]:
+    """
+    Assembles flat company rows (each with at least id and parent_company_id)
+    into nested nodes in O(n): one pass to index every row by id, one to
+    attach each row to its parent, one post-order pass for descendant counts.
+    Input order is preserved among siblings, so the caller's ORDER BY decides
+    how each level is sorted.
+
+    A row whose parent is not itself among `rows` becomes a root: a CEO
+    scoped to one subsidiary sees that subsidiary as the top of their tree,
+    not an orphan under a parent they can't read. For the same reason
+    subsidiary_count/descendant_count only count visible companies, so the
+    tree never reveals how many out-of-scope companies exist below a node.
+    """
+    nodes: dict[int, dict] = {
+        row["id"]: {**row, "subsidiary_count": 0, "descendant_count": 0, "children": []} for row in rows
+    }
+
+    roots: list[dict] = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_company_id"]) if node["parent_company_id"] is not None else None
+        if parent is None:
+            roots.append(node)
+        else:
+            parent["children"].append(node)
+            parent["subsidiary_count"] += 1
+
+    # Iterative post-order (parents are only finalized after all their
+    # children), so an arbitrarily deep hierarchy can't hit the recursion limit.
+    stack: list[tuple[dict, bool]] = [(root, False) for root in roots]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            node["descendant_count"] = sum(1 + child["descendant_count"] for child in node["children"])
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node["children"])
+
+    return roots
+
+
+async def get_company_tree_in_scope(
+    scope: CompanyScope,
+    db: AsyncSession,
+    *,
+    metrics_scope: CompanyScope | None = None,
+    root_id: int | None = None,
+) -> list[dict]:
+    """
+    Every company in `scope` as a nested tree (see build_company_tree), from
+    a single flat scoped query rather than a recursive walk: `scope` already
+    names every visible row, so there is nothing left for a recursive CTE to
+    discover, and a flat SELECT keeps the exact same scope filter as
+    GET /companies/.
+
+    `metrics_scope` (the caller's balance_sheet:read scope, None to skip
+    metrics entirely) attaches each company's latest-year headline figures.
+    It's applied as the metrics join's own condition, separately from
+    `scope`: being able to see a company in the tree doesn't imply being
+    allowed to read its balance sheets.
+
+    `root_id` narrows the result to that company's subtree (itself and every
+    descendant, via company_closure), still intersected with `scope`.
+
+    Cached per (scope, metrics_scope, root_id) in company_cache.py, since
+    the result depends only on those and the current data, never on who
+    asked.
+    """
+    if scope.is_empty():
+        return []
+
+    variant = f"{scope_cache_key(scope)}:{scope_cache_key(metrics_scope)}:{root_id}"
+    cached, generation = await get_cached("tree", variant)
+    if cached is not None:
+        return cached
+
+    columns = [Company.id, Company.name, Company.ticker, Company.parent_company_id, Company.group_root_id]
+    include_metrics = metrics_scope is not None and not metrics_scope.is_empty()
+    if metrics_scope is not None and include_metrics:
+        # DISTINCT ON (company_id) ... ORDER BY company_id, year DESC: one
+        # latest row per company, served by uq_balance_sheet_company_year.
+        latest = (
+            select(
+                BalanceSheet.company_id,
+                BalanceSheet.year,
+                *(getattr(BalanceSheet, name) for name in _HEADLINE_METRIC_COLUMNS),
+            )
+            .distinct(BalanceSheet.company_id)
+            .order_by(BalanceSheet.company_id, BalanceSheet.year.desc())
+            .subquery()
+        )
+        join_condition = latest.c.company_id == Company.id
+        metrics_clause = _scope_clause(metrics_scope)
+        if metrics_clause is not None:
+            join_condition = and_(join_condition, metrics_clause)
+        metric_columns = (latest.c[name] for name in _HEADLINE_METRIC_COLUMNS)
+        stmt = select(*columns, latest.c.year, *metric_columns).outerjoin(latest, join_condition)
+    else:
+        stmt = select(*columns)
+
+    stmt = _apply_scope_and_filters(stmt, scope, None, None).order_by(Company.name, Company.id)
+    if root_id is not None:
+        stmt = stmt.where(
+            Company.id.in_(select(CompanyClosure.descendant_id).where(CompanyClosure.ancestor_id == root_id))
+        )
+    result = await db.execute(stmt)
+
+    rows = []
+    for row in result.mappings():
+        node = {key: row[key] for key in ("id", "name", "ticker", "parent_company_id", "group_root_id")}
+        if include_metrics and row["year"] is not None:
+            node["latest_metrics"] = {"year": row["year"], **{name: row[name] for name in _HEADLINE_METRIC_COLUMNS}}
+        else:
+            node["latest_metrics"] = None
+        rows.append(node)
+
+    tree = build_company_tree(rows)
+    await set_cached("tree", variant, generation, tree)
+    return tree
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -22,9 +22,30 @@ class Company(Base):
     (see app/access/scope.py's module docstring), since mystic-auth's
     resource_attributes condition only supports flat equality, not walking
     parent_company_id recursively at authorization time.
+
+    Arbitrary-depth questions ("this vertical and everything below it",
+    "every ancestor of this company") go through CompanyClosure below
+    instead, which is maintained alongside parent_company_id.
     """
 
     __tablename__ = "companies"
+    # One composite index per GET /companies/ sort_by, each ending in id: the
+    # list's keyset (cursor) mode seeks straight to "(sort key, id) after the
+    # cursor" in these, so page N costs the same as page 1 (see
+    # company_crud.py's list_companies_in_scope).
+    __table_args__ = (
+        Index("ix_companies_name_id", "name", "id"),
+        Index("ix_companies_ticker_id", "ticker", "id"),
+        Index("ix_companies_created_at_id", "created_at", "id"),
+        Index("ix_companies_parent_name_id", "parent_name", "id"),
+        # pg_trgm GIN indexes serving the list's substring `search` on name
+        # and ticker (see mystic_auth/database/text_search.py), declared here
+        # so alembic's autogenerate sees what migration b4d8f2a6c0e3 created.
+        Index("ix_companies_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_companies_ticker_trgm", "ticker", postgresql_using="gin", postgresql_ops={"ticker": "gin_trgm_ops"}
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
@@ -42,6 +63,13 @@ class Company(Base):
     # a route/request body. See class docstring for why this exists.
     group_root_id: Mapped[int] = mapped_column(index=True)
 
+    # Denormalized copy of the parent's name, also maintained only by
+    # company_crud.py (set on create/reparent, rewritten on every child when
+    # the parent is renamed). Exists so GET /companies/ can sort by parent
+    # name off an index (ix_companies_parent_name_id) instead of a self-join
+    # whose joined column no index can serve.
+    parent_name: Mapped[str | None] = mapped_column(String, nullable=True)
+
     # Explicit DateTime(timezone=True), matching mystic_auth's own User model
     # convention; SQLAlchemy's default `Mapped[datetime]` mapping is naive
     # DateTime() otherwise, which drifted from the migration's
@@ -53,3 +81,28 @@ class Company(Base):
 
     parent_company: Mapped[Company | None] = relationship(remote_side=[id], back_populates="subsidiaries")
     subsidiaries: Mapped[list[Company]] = relationship(back_populates="parent_company")
+
+
+class CompanyClosure(Base):
+    """
+    Transitive closure of the parent_company_id hierarchy: one row per
+    (ancestor, descendant) pair at every distance, including each company's
+    own (self, self, 0) row. Turns "every company under X at any depth" and
+    "every ancestor of X" into a single indexed lookup instead of a
+    recursive walk, and lets a whole subtree be moved with a fixed number of
+    set-based statements regardless of its size (see company_crud.py's
+    _move_subtree).
+
+    Maintained only by company_crud.py, in the same transaction as the
+    companies row it describes, never written by a route directly. Both FKs
+    cascade, so deleting a company also drops every path through it.
+    """
+
+    __tablename__ = "company_closure"
+    # The primary key (ancestor_id, descendant_id) already serves subtree
+    # reads; ancestor lookups ("which subtrees contain X") need their own.
+    __table_args__ = (Index("ix_company_closure_descendant_id", "descendant_id", "depth"),)
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    depth: Mapped[int]
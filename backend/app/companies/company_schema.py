@@ -13,6 +13,38 @@ class CompanyCreate(CompanyBase):
     pass
 
 
+# One POST /companies/bulk request is one transaction holding the hierarchy
+# lock (see company_crud.py's bulk_create_companies), so it's capped the
+# same way list pages are rather than left unbounded.
+BULK_CREATE_MAX_COMPANIES = 1000
+
+
+class CompanyBulkItem(BaseModel):
+    """
+    One row of a bulk create. The forest is keyed by ticker rather than id,
+    since none of the new rows has an id until it's inserted: parent_ticker
+    names either another row in the same request or a company that already
+    exists. Omit it for a new group root.
+    """
+
+    name: str = Field(min_length=1, max_length=255)
+    ticker: str = Field(min_length=1, max_length=32)
+    parent_ticker: str | None = Field(default=None, min_length=1, max_length=32)
+
+
+class CompanyBulkCreate(BaseModel):
+    companies: list[CompanyBulkItem] = Field(min_length=1, max_length=BULK_CREATE_MAX_COMPANIES)
+
+
+class CompanyBulkRowError(BaseModel):
+    """Why one row of a rejected bulk create couldn't be inserted. `index`
+    is the row's position in the request's `companies` list."""
+
+    index: int
+    ticker: str
+    error: str
+
+
 class CompanyUpdate(BaseModel):
     """
     All fields optional (PATCH semantics): a request only sends the fields
@@ -34,8 +66,8 @@ class CompanyResponse(CompanyBase):
 
 
 class CompanyListItem(CompanyResponse):
-    """CompanyResponse plus the parent's name, resolved by GET /companies/'s
-    own join (see company_crud.py's list_companies_in_scope) instead of a
+    """CompanyResponse plus the parent's name, read from the company's own
+    denormalized parent_name column (see company_model.py) instead of a
     lookup per row. Needed because CompaniesPage is now paginated (see its
     own comment on why): the table shows every row's parent by name, and can
     no longer resolve that itself from an already-fully-loaded company list."""
@@ -43,10 +75,66 @@ class CompanyListItem(CompanyResponse):
     parent_name: str | None = None
 
 
+class CompanyHeadlineMetrics(BaseModel):
+    """A company's latest fiscal year on file, reduced to the few line items
+    a group overview needs. See company_crud.py's _HEADLINE_METRIC_COLUMNS."""
+
+    year: int
+    total_assets: float | None = None
+    total_liabilities_net_minority_interest: float | None = None
+    stockholders_equity: float | None = None
+    total_debt: float | None = None
+
+
+class CompanyTreeNode(BaseModel):
+    """
+    One node of GET /companies/tree. subsidiary_count is direct children,
+    descendant_count the whole visible subtree below this node; both only
+    count companies the caller can see (see company_crud.py's
+    build_company_tree). latest_metrics is None when metrics weren't
+    requested, the caller can't read this company's balance sheets, or none
+    are on file.
+    """
+
+    id: int
+    name: str
+    ticker: str
+    parent_company_id: int | None
+    group_root_id: int
+    subsidiary_count: int
+    descendant_count: int
+    latest_metrics: CompanyHeadlineMetrics | None = None
+    children: list[CompanyTreeNode] = []
+
+
 class CompanyStatsRead(BaseModel):
     total: int
     group_roots: int
     subsidiaries: int
+    # Companies with at least one balance sheet on file vs none yet, so the
+    # dashboard can show how much of the scoped portfolio still needs an
+    # import. Counted from the same scoped rows as `total`, not filtered by
+    # balance_sheet:read: it's a fact about the company, not the sheet data.
+    with_balance_sheets: int
+    without_balance_sheets: int
+
+
+class CompanyAccessGrant(BaseModel):
+    action: str
+    # The policy that grants `action`; one row per granting policy, so an
+    # access review can see which assignment to revoke.
+    policy_id: int
+    policy_name: str
+
+
+class CompanyAccessHolder(BaseModel):
+    """One user who can reach a company through GET /companies/{id}/access,
+    with every (action, policy) that grants it."""
+
+    user_id: int
+    email: str
+    name: str
+    grants: list[CompanyAccessGrant]
 
 
 class TickerLookupResponse(BaseModel):
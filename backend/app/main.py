@@ -1,6 +1,6 @@
 import asyncio
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -19,7 +19,9 @@ from .api.llm_routes import llm_routes  # noqa: E402
 from .sdk import (  # noqa: E402 (must follow load_dotenv() above, since sdk.py reads env-dependent settings at import time)
     CorrelationIdMiddleware,
     LoggingMiddleware,
+    RequestPolicyMemoMiddleware,
     SecurityHeadersMiddleware,
+    audit_log_writer,
     auth_router,
     authorization_check_router,
     capture_exception,
@@ -27,14 +29,17 @@ from .sdk import (  # noqa: E402 (must follow load_dotenv() above, since sdk.py
     get_logger,
     health_router,
     init_sentry,
+    listen_for_policy_invalidations,
     pbac_audit_log_router,
     policy_assignment_router,
     policy_crud_router,
     policy_history_router,
     redis_client,
     refresh_token_router,
+    run_partition_maintenance,
     security_audit_router,
     settings,
+    startup_warmup,
     user_lifecycle_router,
     user_management_query_router,
     user_management_update_router,
@@ -64,14 +69,40 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None]:
     Never awaited, so it can't delay startup or block a single request;
     cancelled on shutdown along with everything else.
 
+    Also starts the authorization audit writer's background flusher (see
+    audit_log_writer.py). On shutdown it is stopped *first* and drains its
+    queue while the DB pool still exists, so a graceful restart loses no
+    audit rows.
+
+    The audit tables' partition maintenance (see database/partitions.py)
+    runs in the background too, at startup and every few hours after, so
+    next month's partitions always exist before it starts.
+
+    With STARTUP_WARMUP_ENABLED, the startup warm-up (see
+    core/startup_warmup.py) runs in the background as well: startup isn't
+    delayed by it, but /health/ready holds readiness until it's done.
+
     On shutdown (SIGTERM from `docker stop` / orchestrator rolling
     restarts) explicitly dispose the DB connection pool and close the Redis
     client instead of relying on the process dying and the OS reclaiming
     the sockets.
     """
     dsn_watcher = asyncio.create_task(watch_for_late_dsn())
+    policy_invalidation_listener = asyncio.create_task(listen_for_policy_invalidations())
+    partition_maintenance = asyncio.create_task(run_partition_maintenance())
+    audit_log_writer.start()
+    if settings.STARTUP_WARMUP_ENABLED:
+        startup_warmup.start()
     yield
+    await startup_warmup.stop()
+    await audit_log_writer.stop()
     dsn_watcher.cancel()
+    policy_invalidation_listener.cancel()
+    partition_maintenance.cancel()
+    with suppress(asyncio.CancelledError):
+        await policy_invalidation_listener
+    with suppress(asyncio.CancelledError):
+        await partition_maintenance
     await database.engine.dispose()
     await redis_client.aclose()
 
@@ -101,9 +132,15 @@ app.add_middleware(
     # Custom response headers are invisible to browser JS by default even
     # when the request itself succeeds; without this, X-Total-Count (see
     # list_all_users) is present on the wire but unreadable via axios.
-    expose_headers=["X-Total-Count"],
+    # X-Next-Cursor is GET /companies/'s keyset-pagination cursor.
+    expose_headers=["X-Total-Count", "X-Total-Count-Estimated", "X-Next-Cursor"],
 )
 
+# One fetch of each user's active policies per request, however many
+# authorization checks the request makes (see request_policy_memo.py). Inside
+# LoggingMiddleware so its per-request hit/miss line carries the request ID.
+app.add_middleware(RequestPolicyMemoMiddleware)
+
 app.add_middleware(LoggingMiddleware)
 
 # Security-hardening response headers (X-Frame-Options, CSP, HSTS, etc.), see
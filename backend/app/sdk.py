@@ -94,6 +94,29 @@ LoggingMiddleware = _m("logging.logging_middleware").LoggingMiddleware
 CorrelationIdMiddleware = _m("logging.correlation_id_middleware").CorrelationIdMiddleware
 get_logger = _m("logging.logging_config").get_logger
 
+# Scopes a per-request memo of users' active policies, so get_current_user,
+# require_authorization and a route's own checks share one policy fetch,
+# wired up in main.py. See request_policy_memo.py.
+RequestPolicyMemoMiddleware = _m("authorization.caching.request_policy_memo").RequestPolicyMemoMiddleware
+
+# Keeps every worker's in-process policy cache in step with invalidations
+# made by any worker; run for the app's lifetime from main.py's lifespan.
+# See local_policy_cache.py.
+listen_for_policy_invalidations = _m("authorization.caching.local_policy_cache").listen_for_policy_invalidations
+
+# Creates upcoming monthly audit partitions and drops expired ones, run in
+# the background by main.py's lifespan. See database/partitions.py.
+run_partition_maintenance = _m("database.partitions").run_partition_maintenance
+
+# Optional startup warm-up of connections, hot statements and policy caches,
+# started by main.py's lifespan and awaited by /health/ready. See
+# core/startup_warmup.py.
+startup_warmup = _m("core.startup_warmup").startup_warmup
+
+# Write-behind queue for authorization audit rows, started and drained by
+# main.py's lifespan. See audit_log_writer.py for its durability policy.
+audit_log_writer = _m("authorization.services.audit_log_writer").audit_log_writer
+
 # Error monitoring: init_sentry() is called once at import time in
 # main.py; capture_exception() reports a caught-but-still-noteworthy
 # exception the same way an unhandled one gets reported automatically. Both
@@ -136,6 +159,11 @@ __all__ = [
     "LoggingMiddleware",
     "CorrelationIdMiddleware",
     "get_logger",
+    "RequestPolicyMemoMiddleware",
+    "listen_for_policy_invalidations",
+    "run_partition_maintenance",
+    "startup_warmup",
+    "audit_log_writer",
     "init_sentry",
     "capture_exception",
     "watch_for_late_dsn",
@@ -11,6 +11,7 @@ from ...auth.current_user.current_user_dependency import get_current_user
 from ...authorization.dependencies.authorization_dependency import require_authorization
 from ...authorization.permissions import Permission
 from ...database.connection import database
+from ...database.pagination import set_total_count_headers
 
 router = APIRouter(prefix="/audit", tags=["Audit Logs"])
 
@@ -44,13 +45,10 @@ async def list_security_audit_log(
 ):
     """Security events across every user, newest first by default."""
     # X-Total-Count (see list_all_users' identical pattern) lets the
-    # frontend render numbered pages without a separate round trip. Computed
-    # from the same filters so the page count always matches what's
-    # actually being paged through.
-    response.headers["X-Total-Count"] = str(
-        await audit_log_repository.count(db, search=search, event_type=event_type, ip_address=ip_address, success=success)
-    )
-    return await audit_log_repository.get_all(
+    # frontend render numbered pages without a separate request. Fetched
+    # with the page itself (get_page) so the page count always matches
+    # what's actually being paged through.
+    page = await audit_log_repository.get_page(
         db,
         limit=limit,
         offset=offset,
@@ -61,6 +59,8 @@ async def list_security_audit_log(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
+    set_total_count_headers(response, page)
+    return page.items
 
 
 @router.get("/security-log/login-trend", response_model=list[LoginTrendPoint])
@@ -106,12 +106,7 @@ async def list_my_security_audit_log(
     operation, and the caller cannot request another user's entries through
     this endpoint.
     """
-    response.headers["X-Total-Count"] = str(
-        await audit_log_repository.count_for_user(
-            current_user["email"], db, event_type=event_type, ip_address=ip_address, success=success
-        )
-    )
-    return await audit_log_repository.get_for_user(
+    page = await audit_log_repository.get_page_for_user(
         current_user["email"],
         db,
         limit=limit,
@@ -122,3 +117,5 @@ async def list_my_security_audit_log(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
+    set_total_count_headers(response, page)
+    return page.items
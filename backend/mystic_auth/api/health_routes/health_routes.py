@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.startup_warmup import startup_warmup
 from ...database.connection import database
 from ...logging.logging_config import get_logger
 from ...redis.client import redis_client
@@ -28,6 +29,11 @@ async def health_ready(db: AsyncSession = Depends(database.get_session)):
     Readiness probe: confirms Postgres and Redis connectivity. Each check is
     independently wrapped in try/except : one dependency being down must still
     report the other's real status, not mask it behind an unrelated exception.
+
+    With STARTUP_WARMUP_ENABLED, also reports the startup warm-up
+    (core/startup_warmup.py), and is not ready while it's still "pending":
+    a worker isn't handed traffic before its connections and caches are
+    warm.
     """
     checks: dict[str, str] = {}
 
@@ -45,6 +51,10 @@ async def health_ready(db: AsyncSession = Depends(database.get_session)):
         logger.error("Readiness check: redis connectivity failed", exc_info=True)
         checks["redis"] = "error"
 
+    warmup_state = startup_warmup.state
+    if warmup_state is not None:
+        checks["warmup"] = warmup_state
+
     all_ok = all(status == "ok" for status in checks.values())
     return JSONResponse(
         content={"status": "ok" if all_ok else "error", "checks": checks},
@@ -9,6 +9,7 @@ from ...authorization.dependencies.policy_route_dependencies import READ_DEPENDE
 from ...authorization.repositories.audit_log_repository import audit_log_repository
 from ...authorization.schemas.audit_log_schema import AuditLogEntryRead
 from ...database.connection import database
+from ...database.pagination import set_total_count_headers
 from ...user_crud.user_crud_collector import user_crud
 from ..get_or_404.get_or_404 import get_or_404
 
@@ -43,13 +44,10 @@ async def list_audit_log(
     these rows automatically (see AuthorizationService._log_decision) :
     nothing needs to opt in."""
     # X-Total-Count (see list_all_users' identical pattern) lets the
-    # frontend render numbered pages without a separate round trip. Computed
-    # from the same filters so the page count always matches what's
-    # actually being paged through.
-    response.headers["X-Total-Count"] = str(
-        await audit_log_repository.count(db, search=search, action=action, resource_type=resource_type, allowed=allowed)
-    )
-    return await audit_log_repository.get_all(
+    # frontend render numbered pages without a separate request. Fetched
+    # with the page itself (get_page) so the page count always matches
+    # what's actually being paged through.
+    page = await audit_log_repository.get_page(
         db,
         limit=limit,
         offset=offset,
@@ -60,6 +58,8 @@ async def list_audit_log(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
+    set_total_count_headers(response, page)
+    return page.items
 
 
 @router.get("/audit-log/me", response_model=list[AuditLogEntryRead])
@@ -83,12 +83,7 @@ async def list_my_audit_log(
     cannot request another user's entries through this endpoint (see
     list_audit_log_for_user for that, which does require policies:read).
     """
-    response.headers["X-Total-Count"] = str(
-        await audit_log_repository.count_for_user(
-            current_user["email"], db, action=action, resource_type=resource_type, allowed=allowed
-        )
-    )
-    return await audit_log_repository.get_for_user(
+    page = await audit_log_repository.get_page_for_user(
         current_user["email"],
         db,
         limit=limit,
@@ -99,6 +94,8 @@ async def list_my_audit_log(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
+    set_total_count_headers(response, page)
+    return page.items
 
 
 @router.get("/audit-log/users/{user_email}", response_model=list[AuditLogEntryRead])
@@ -119,12 +116,7 @@ async def list_audit_log_for_user(
 
     await get_or_404(user_crud.get_by_email(user_email, db), "User not found")
 
-    response.headers["X-Total-Count"] = str(
-        await audit_log_repository.count_for_user(
-            user_email, db, action=action, resource_type=resource_type, allowed=allowed
-        )
-    )
-    return await audit_log_repository.get_for_user(
+    page = await audit_log_repository.get_page_for_user(
         user_email,
         db,
         limit=limit,
@@ -135,3 +127,5 @@ async def list_audit_log_for_user(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
+    set_total_count_headers(response, page)
+    return page.items
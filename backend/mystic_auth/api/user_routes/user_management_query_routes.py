@@ -9,6 +9,7 @@ from ...authorization.dependencies.authorization_dependency import require_autho
 # static role-permission helpers.
 from ...authorization.permissions import Permission
 from ...database.connection import database
+from ...database.pagination import set_total_count_headers
 from ...user_crud.user_crud_collector import UserStatus, user_crud
 from ...user_table.user_model import UserRole
 from ...user_table.user_schema import UserRead, UserStatsRead
@@ -66,11 +67,10 @@ async def list_all_users(
 ):
     # X-Total-Count (not part of the response body, response_model stays
     # list[UserRead]) lets the frontend render numbered pages without a
-    # separate round trip: computed from the same filters so the page count
-    # always matches what's actually being paged through.
-    total = await user_crud.count(db, search=search, role=role, is_verified=is_verified, status=status)
-    response.headers["X-Total-Count"] = str(total)
-    return await user_crud.get_all(
+    # separate request: fetched in the same query as the page itself (see
+    # database/pagination.py) so the page count always matches what's
+    # actually being paged through.
+    page = await user_crud.get_page(
         db,
         limit=limit,
         offset=offset,
@@ -81,3 +81,5 @@ async def list_all_users(
         sort_by=sort_by,
         sort_dir=sort_dir,
     )
+    set_total_count_headers(response, page)
+    return page.items
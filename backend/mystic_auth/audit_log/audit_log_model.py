@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
@@ -25,6 +25,17 @@ class AuditLog(Base):
     """
 
     __tablename__ = "security_audit_log"
+    __table_args__ = (
+        # Serves the audit log's substring `search` on user_email (a plain
+        # B-tree index can't serve an unanchored ILIKE); see migration
+        # b4d8f2a6c0e3.
+        Index(
+            "ix_security_audit_log_user_email_trgm",
+            "user_email",
+            postgresql_using="gin",
+            postgresql_ops={"user_email": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -50,4 +61,7 @@ class AuditLog(Base):
     # secrets/passwords/tokens.
     event_metadata = Column("metadata", JSONB, nullable=True)
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # In the primary key because the table is range-partitioned on it by
+    # month, same as AuthorizationAuditLog (see its created_at comment and
+    # database/partitions.py).
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True, primary_key=True)
@@ -1,10 +1,12 @@
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime, time, timedelta
 
 from sqlalchemy import Column, Select, asc, case, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql.elements import UnaryExpression
 
+from ..database.pagination import Page, fetch_page
+from ..database.text_search import similarity_rank, substring_match
 from .audit_log_model import AuditLog
 
 # Duplicated from audit_log_service.py's LOGIN_SUCCESS/LOGIN_FAILURE/
@@ -28,12 +30,20 @@ _SORTABLE_COLUMNS: dict[str, Column] = {
 }
 
 
-def _order_by(sort_by: str | None, sort_dir: str) -> list[UnaryExpression]:
+def _order_by(sort_by: str | None, sort_dir: str, search: str | None = None) -> list[UnaryExpression]:
     """`id` rides along as a secondary key in the same direction as the
     requested column, purely for stable ordering (e.g. many rows sharing the
     same event_type) - not itself a sortable column."""
-    column = _SORTABLE_COLUMNS.get(sort_by or "", AuditLog.created_at)
     direction = asc if sort_dir == "asc" else desc
+    if search and sort_by not in _SORTABLE_COLUMNS:
+        # A search with no explicit sort ranks the closest user_email first,
+        # then falls back to the usual newest-first order among equal matches.
+        return [
+            desc(similarity_rank(search, AuditLog.user_email)),
+            direction(AuditLog.created_at),
+            direction(AuditLog.id),
+        ]
+    column = _SORTABLE_COLUMNS.get(sort_by or "", AuditLog.created_at)
     return [direction(column), direction(AuditLog.id)]
 
 
@@ -44,14 +54,14 @@ def _apply_filters(
     ip_address: str | None,
     success: bool | None,
 ) -> Select:
-    """Shared by get_all/get_for_user (row fetch) and count/count_for_user
-    (X-Total-Count), so a filtered page's total always matches what's
+    """Shared by get_all/get_for_user (row fetch), count/count_for_user, and
+    get_page/get_page_for_user (row fetch + X-Total-Count together), so a filtered page's total always matches what's
     actually being paged through. `search` (user_email) and `ip_address` are
     substring matches on free-text fields; `event_type`/`success` are exact
     matches against fixed vocabularies (this module's own event_type
     constants, and a bool)."""
     if search:
-        stmt = stmt.where(AuditLog.user_email.ilike(f"%{search}%"))
+        stmt = stmt.where(substring_match(search, AuditLog.user_email))
     if event_type == "login":
         # UI-only alias (see frontend securityEventTypes.ts): the filter
         # dropdown offers one "login" option instead of separately listing
@@ -100,12 +110,30 @@ class AuditLogRepository:
         NULL, see audit_log_service.py) never match a non-empty search, same
         as they'd never match a literal email typed into a search box.
         `sort_by`/`sort_dir` default to newest-first by created_at, same as
-        before sorting existed."""
+        before sorting existed; a `search` without a `sort_by` ranks the
+        closest user_email match first instead (see database/text_search.py)."""
         stmt = _apply_filters(select(AuditLog), search, event_type, ip_address, success)
-        stmt = stmt.order_by(*_order_by(sort_by, sort_dir)).limit(limit).offset(offset)
+        stmt = stmt.order_by(*_order_by(sort_by, sort_dir, search)).limit(limit).offset(offset)
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        limit: int = 100,
+        offset: int = 0,
+        search: str | None = None,
+        event_type: str | None = None,
+        ip_address: str | None = None,
+        success: bool | None = None,
+        sort_by: str | None = None,
+        sort_dir: str = "desc",
+    ) -> Page[AuditLog]:
+        """get_all's page plus count's total in one round trip (see
+        database/pagination.py), for the list route's X-Total-Count."""
+        stmt = _apply_filters(select(AuditLog), search, event_type, ip_address, success)
+        return await fetch_page(stmt, db, order_by=_order_by(sort_by, sort_dir, search), limit=limit, offset=offset)
+
     @staticmethod
     async def get_for_user(
         user_email: str,
@@ -127,6 +155,23 @@ class AuditLogRepository:
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_page_for_user(
+        user_email: str,
+        db: AsyncSession,
+        limit: int = 100,
+        offset: int = 0,
+        event_type: str | None = None,
+        ip_address: str | None = None,
+        success: bool | None = None,
+        sort_by: str | None = None,
+        sort_dir: str = "desc",
+    ) -> Page[AuditLog]:
+        """get_for_user's page plus count_for_user's total in one round trip."""
+        stmt = select(AuditLog).where(AuditLog.user_email == user_email)
+        stmt = _apply_filters(stmt, None, event_type, ip_address, success)
+        return await fetch_page(stmt, db, order_by=_order_by(sort_by, sort_dir), limit=limit, offset=offset)
+
     @staticmethod
     async def count(
         db: AsyncSession,
@@ -174,6 +219,11 @@ class AuditLogRepository:
         # timezone or the DB session's timezone setting to agree with it:
         # otherwise events near midnight can land in the wrong day bucket.
         since = datetime.now(UTC).date() - timedelta(days=days - 1)
+        # The cutoff as a bare bound on created_at, not on the day
+        # expression below: that's what lets Postgres skip every monthly
+        # partition before it (see database/partitions.py) and use the
+        # created_at index within the rest.
+        since_start = datetime.combine(since, time.min, tzinfo=UTC)
 
         day_expr = func.date(func.timezone("UTC", AuditLog.created_at))
         stmt = (
@@ -183,7 +233,7 @@ class AuditLogRepository:
                 func.sum(case((AuditLog.success.is_(False), 1), else_=0)).label("failure"),
             )
             .where(AuditLog.event_type.in_(_LOGIN_EVENT_TYPES))
-            .where(day_expr >= since)
+            .where(AuditLog.created_at >= since_start)
         )
         if user_email:
             stmt = stmt.where(AuditLog.user_email == user_email)
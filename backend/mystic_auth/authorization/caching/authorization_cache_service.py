@@ -1,23 +1,81 @@
 import json
 import traceback
+from collections.abc import Collection, Sequence
+from typing import Any
 
 from ...logging.logging_config import get_logger
 from ...redis.client import redis_client
+from ..evaluators.policy_set import PolicySet
 from ..models.policy_model import Policy
 
+# Worker-local L1 of already-deserialized lists in front of Redis, kept in
+# step across workers by pub/sub, see local_policy_cache.py.
+from .local_policy_cache import local_policy_cache, publish_policy_invalidation, publish_policy_invalidations
+
+# The current request's own copy of the policy lists cached here; every
+# invalidation below drops it too, so a request that changes a user's
+# policies doesn't go on to authorize against what it read before.
+from .request_policy_memo import request_policy_memo
+
 logger = get_logger(__name__)
 
-# authz:user_policies:{email} -> a user's active, assigned policy list
-# (JSON array of serialized policies). This is the ONE cache target this
-# module currently implements. See the class docstring for why
-# "policy lookup by name" and "evaluation results" (both also mentioned in
-# the authorization performance layer) are deliberately NOT cached.
+# authz:policy_generation -> a counter every key below embeds. Bumping it
+# (invalidate_all_user_policies) moves every reader onto a new, empty
+# namespace in one INCR, however many users are cached; the previous
+# generation's keys are never read again and expire on their own TTL. The
+# same idea as app/companies/company_cache.py's generation, except that
+# here it's part of the key rather than stored in the entry, and each worker
+# mirrors it (local_policy_cache.policy_generation), so a lookup still costs
+# one round trip, not two.
+_POLICY_GENERATION_KEY = "authz:policy_generation"
+
+# authz:user_policies:{generation}:{email} -> a user's active, assigned
+# policy list (JSON array of serialized policies). This is the ONE primary
+# cache target this module implements (user_derived below only hangs off
+# it). See the class docstring for why "policy lookup by name" and
+# "evaluation results" (both also mentioned in the authorization
+# performance layer) are deliberately NOT cached.
 _USER_POLICIES_KEY_PREFIX = "authz:user_policies:"
-_USER_POLICIES_KEY_PATTERN = f"{_USER_POLICIES_KEY_PREFIX}*"
 
 
-def _user_policies_key(user_email: str) -> str:
-    return f"{_USER_POLICIES_KEY_PREFIX}{user_email}"
+def _user_policies_key(user_email: str, policy_generation: int) -> str:
+    return f"{_USER_POLICIES_KEY_PREFIX}{policy_generation}:{user_email}"
+
+
+# authz:user_derived:{generation}:{email} -> a Redis hash of values *computed from* that
+# user's policy list by code outside this module (e.g. the app's compiled
+# list-filter scopes, see app/access/scope.py), one field per derived value.
+# Kept per-user and invalidated together with user_policies (see the
+# invalidate_* methods), so nothing derived from a policy list can outlive
+# the policy list it was derived from. One hash per user rather than one key
+# per value so a single DEL drops all of them without a SCAN. Under the
+# same generation as the policy lists, so a bump retires both at once.
+_USER_DERIVED_KEY_PREFIX = "authz:user_derived:"
+
+
+def _user_derived_key(user_email: str, policy_generation: int) -> str:
+    return f"{_USER_DERIVED_KEY_PREFIX}{policy_generation}:{user_email}"
+
+
+async def _policy_generation(mirrored: bool = True) -> int:
+    """
+    The current policy generation: this worker's mirror when it has one,
+    otherwise read from Redis (and mirrored, if the listener is live).
+    Raises on a Redis failure; every caller already treats that as a miss.
+
+    Invalidations pass mirrored=False: a mirror that hasn't yet heard about
+    another worker's bump would point their DEL at the previous
+    generation's keys and leave the live ones in place.
+    """
+    if mirrored:
+        known = local_policy_cache.policy_generation
+        if known is not None:
+            return known
+    generation = local_policy_cache.generation
+    raw = await redis_client.get(_POLICY_GENERATION_KEY)
+    policy_generation = int(raw) if raw is not None else 0
+    local_policy_cache.set_policy_generation(policy_generation, generation)
+    return policy_generation
 
 
 # TTL bounds how long a cached policy list can outlive an invalidation this
@@ -26,6 +84,18 @@ def _user_policies_key(user_email: str) -> str:
 # invalidation mechanism (which is the explicit invalidate_* calls below).
 _USER_POLICIES_TTL_SECONDS = 60
 
+# invalidate_users_policies deletes in DEL commands of at most this many
+# keys, all queued on one pipeline: still one round trip however many
+# holders a policy has, without building one enormous command for Redis to
+# parse while it blocks everything else.
+_DELETE_BATCH_SIZE = 500
+
+# Above this many users, invalidate_users_policies tells the other workers
+# to drop their whole L1 instead of publishing one message per user: each
+# L1 holds at most a thousand or so lists of recently active users anyway,
+# so a policy held this widely would empty most of it regardless.
+_TARGETED_PUBLISH_LIMIT = 100
+
 
 def _serialize_policy(policy: Policy) -> dict:
     return {
@@ -73,6 +143,13 @@ class AuthorizationCacheService:
         join), rarely changes, and is only ever read-consumed downstream
         (never fed back into a database mutation).
 
+    Plus, as an extension point rather than a second target of its own:
+        values other modules derive purely from that same policy list
+        (get_user_derived/set_user_derived), stored per user and dropped by
+        the same invalidate_* calls, so a template-based app can cache e.g.
+        a compiled list-filter scope without owning a separate, easy-to-
+        forget invalidation path for it.
+
     Explicitly NOT cached in this pass, and why:
         - "Policy lookup [by name]": get_by_name's result is routinely
           fetched immediately before being passed into
@@ -99,8 +176,11 @@ class AuthorizationCacheService:
           already removes the one expensive part (the DB round trip);
           evaluating that list against the current resource/context is
           pure in-memory computation, so there is no meaningful
-          performance case left for caching the decision itself, only
-          correctness risk.
+          performance case left for caching the decision itself in
+          Redis, only correctness risk. The one exception lives in memory,
+          not here: checks whose candidate policies are all context-free
+          are memoized on the user's PolicySet (evaluators/policy_set.py),
+          which is replaced whenever anything cached here is invalidated.
 
     Fail-closed, precisely: every method here fails closed *with respect to
     the cache*, never with respect to authorization itself. Any Redis
@@ -119,11 +199,19 @@ class AuthorizationCacheService:
     """
 
     @staticmethod
-    async def get_user_policies(user_email: str) -> list[Policy] | None:
+    async def get_user_policies(user_email: str) -> PolicySet | None:
         """Returns None on a cache miss or any cache failure: both are
-        treated identically by the caller: fall through to the database."""
+        treated identically by the caller: fall through to the database.
+        Checks this worker's L1 (local_policy_cache.py) before Redis, and
+        fills it from every Redis hit. Deserialized straight into an indexed
+        PolicySet (evaluators/policy_set.py), so the L1 shares it as-is."""
+        local = local_policy_cache.get(user_email)
+        if local is not None:
+            return local
+
+        generation = local_policy_cache.generation
         try:
-            raw = await redis_client.get(_user_policies_key(user_email))
+            raw = await redis_client.get(_user_policies_key(user_email, await _policy_generation()))
         except Exception:
             logger.warning("Authorization cache read failed (user_policies):\n%s", traceback.format_exc())
             return None
@@ -132,54 +220,158 @@ class AuthorizationCacheService:
             return None
 
         try:
-            return [_deserialize_policy(item) for item in json.loads(raw)]
+            policies = PolicySet(_deserialize_policy(item) for item in json.loads(raw))
         except Exception:
             logger.warning("Authorization cache payload corrupt (user_policies):\n%s", traceback.format_exc())
             return None
 
+        local_policy_cache.put(user_email, policies, generation)
+        return policies
+
     @staticmethod
-    async def set_user_policies(user_email: str, policies: list[Policy]) -> None:
+    async def set_user_policies(user_email: str, policies: Sequence[Policy]) -> None:
         """Best-effort populate: a write failure here must never surface
         to the caller (the database query it's caching already
         succeeded; this is purely a subsequent-request optimization)."""
         try:
             payload = json.dumps([_serialize_policy(policy) for policy in policies])
-            await redis_client.set(_user_policies_key(user_email), payload, ex=_USER_POLICIES_TTL_SECONDS)
+            key = _user_policies_key(user_email, await _policy_generation())
+            await redis_client.set(key, payload, ex=_USER_POLICIES_TTL_SECONDS)
         except Exception:
             logger.warning("Authorization cache write failed (user_policies):\n%s", traceback.format_exc())
 
+    @staticmethod
+    async def get_user_derived(user_email: str, name: str) -> Any | None:
+        """
+        A value previously stored with set_user_derived for this user, or
+        None on a miss or any cache failure (same contract as
+        get_user_policies: the caller recomputes it from the policy list).
+
+        The hook for caching things *derived from* a user's policies outside
+        this module without scattering a second invalidation path: entries
+        live and die with the user's policy list (see _USER_DERIVED_KEY_PREFIX).
+        `name` identifies the value within the user's hash and should encode
+        every input besides the policy list that the value depends on.
+        """
+        try:
+            raw = await redis_client.hget(_user_derived_key(user_email, await _policy_generation()), name)
+        except Exception:
+            logger.warning("Authorization cache read failed (user_derived):\n%s", traceback.format_exc())
+            return None
+
+        if raw is None:
+            return None
+
+        try:
+            return json.loads(raw)
+        except Exception:
+            logger.warning("Authorization cache payload corrupt (user_derived):\n%s", traceback.format_exc())
+            return None
+
+    @staticmethod
+    async def set_user_derived(user_email: str, name: str, payload: Any) -> None:
+        """Best-effort, like set_user_policies. `payload` is anything
+        json.dumps accepts. The hash's TTL is refreshed on every write and
+        matches the policy list's, so the backstop for a missed
+        invalidation is the same for both."""
+        try:
+            key = _user_derived_key(user_email, await _policy_generation())
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, name, json.dumps(payload))
+                pipe.expire(key, _USER_POLICIES_TTL_SECONDS)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Authorization cache write failed (user_derived):\n%s", traceback.format_exc())
+
     @staticmethod
     async def invalidate_user_policies(user_email: str) -> None:
         """
         Called on policy assignment/revocation for this specific user:
         precise invalidation, since exactly one user's effective policy
-        set changed.
+        set changed. Drops everything derived from it in the same DEL.
+        """
+        request_policy_memo.invalidate(user_email)
+        local_policy_cache.invalidate(user_email)
+        try:
+            policy_generation = await _policy_generation(mirrored=False)
+            await redis_client.delete(
+                _user_policies_key(user_email, policy_generation), _user_derived_key(user_email, policy_generation)
+            )
+        except Exception:
+            logger.warning("Authorization cache invalidation failed (user_policies):\n%s", traceback.format_exc())
+        # After the DEL, so a worker that drops its L1 entry on this message
+        # and re-reads Redis can't pick up the old list again.
+        await publish_policy_invalidation(user_email)
+
+    @staticmethod
+    async def invalidate_users_policies(user_emails: Collection[str]) -> None:
         """
+        Called on any policy update/delete, with every user who holds that
+        policy: a policy's own definition changing (actions, conditions,
+        resource_type, is_active) can affect each of its holders, and only
+        them. The holders come from user_policies itself (see
+        PolicyRepository.get_holder_emails), the same table every cached
+        list was read from, so there is no second index to keep in step.
+
+        Exactly those users' policy lists and derived hashes are deleted,
+        in one pipelined round trip (see _DELETE_BATCH_SIZE), so everyone
+        else keeps their cache through a policy edit instead of the whole
+        user base missing at once. Other workers' L1s get one message per
+        user, or a single drop-everything message past
+        _TARGETED_PUBLISH_LIMIT.
+        """
+        if not user_emails:
+            return
+
+        for user_email in user_emails:
+            request_policy_memo.invalidate(user_email)
+            local_policy_cache.invalidate(user_email)
+
         try:
-            await redis_client.delete(_user_policies_key(user_email))
+            policy_generation = await _policy_generation(mirrored=False)
+            keys = [
+                key
+                for email in user_emails
+                for key in (_user_policies_key(email, policy_generation), _user_derived_key(email, policy_generation))
+            ]
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for start in range(0, len(keys), _DELETE_BATCH_SIZE):
+                    pipe.delete(*keys[start:start + _DELETE_BATCH_SIZE])
+                await pipe.execute()
         except Exception:
             logger.warning("Authorization cache invalidation failed (user_policies):\n%s", traceback.format_exc())
 
+        # After the DEL, for the same reason as invalidate_user_policies.
+        if len(user_emails) > _TARGETED_PUBLISH_LIMIT:
+            await publish_policy_invalidation(None)
+        else:
+            await publish_policy_invalidations(user_emails)
+
     @staticmethod
     async def invalidate_all_user_policies() -> None:
         """
-        Called on any policy update/delete: a policy's own definition
-        changing (actions, conditions, resource_type, is_active) can affect
-        every user who holds it, and there is no cheap reverse index from
-        policy -> its holders, so this flushes the whole user_policies
-        namespace rather than guessing which users are affected. Policy
-        edits are rare relative to authorization checks, so a full-
-        namespace flush on (infrequent) writes is a deliberate, safe
-        trade-off: never serve a stale grant after a policy edit. Uses
-        SCAN (not KEYS), so it never blocks Redis even on a large keyspace.
+        Flushes the whole user_policies namespace (and user_derived with
+        it), for when the set of affected users can't be named: a bulk
+        change made outside PolicyRepository, or an operator clearing the
+        cache by hand. Policy edits don't come here any more; they name
+        their holders (invalidate_users_policies).
+
+        One INCR of the policy generation (see _POLICY_GENERATION_KEY), so
+        it costs the same with ten cached users or a million: nothing is
+        deleted, every worker just stops reading the old keys once the
+        drop-everything message clears its mirror.
         """
+        request_policy_memo.invalidate_all()
+        local_policy_cache.invalidate_all()
         try:
-            async for key in redis_client.scan_iter(match=_USER_POLICIES_KEY_PATTERN):
-                await redis_client.delete(key)
+            generation = local_policy_cache.generation
+            policy_generation = await redis_client.incr(_POLICY_GENERATION_KEY)
+            local_policy_cache.set_policy_generation(policy_generation, generation)
         except Exception:
             logger.warning(
                 "Authorization cache namespace flush failed (user_policies):\n%s", traceback.format_exc()
             )
+        await publish_policy_invalidation(None)
 
 
 authorization_cache_service = AuthorizationCacheService()
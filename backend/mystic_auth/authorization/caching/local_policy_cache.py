@@ -0,0 +1,230 @@
+"""
+In-process L1 in front of AuthorizationCacheService's Redis cache of users'
+active policy lists.
+
+A Redis hit still costs a network round trip, a JSON decode of the whole
+list and one Policy construction per entry, on every authorized request.
+This worker-local LRU holds the already-deserialized lists for a few
+seconds, so a user making a burst of requests is served from memory and the
+hot path makes no network call at all.
+
+Correctness rests on invalidation reaching every worker, not just the one
+that made the change: AuthorizationCacheService's invalidate_* methods drop
+their own worker's entries directly and PUBLISH on _INVALIDATION_CHANNEL;
+listen_for_policy_invalidations (started in the app's lifespan) applies
+those messages here in every other worker. Two backstops on top of that:
+
+- Entries live _LOCAL_TTL_SECONDS, far below the Redis TTL, so a message
+  lost between publish and delivery leaves a grant stale for seconds, not
+  a minute.
+- The L1 only serves (or stores) while the listener is subscribed. A
+  process that never started it (scripts, tests) or whose subscription
+  dropped falls straight through to Redis, exactly as before this existed,
+  and everything held is discarded, since messages may have been missed.
+
+Only lists read back from Redis are stored here, never the repository's
+freshly queried ones: those are attached to the request's session, and a
+list shared across requests must be plain, detached Policy objects. Each
+entry is the immutable PolicySet (evaluators/policy_set.py) the Redis read
+produced, indexed once and handed to every later request as-is, of objects
+every consumer only ever reads, the same read-only contract the Redis cache
+already relies on (see authorization_cache_service._deserialize_policy).
+
+A store is dropped if any invalidation landed between the Redis read it
+came from and the store itself (see generation), so a read racing an
+invalidation can't put the pre-invalidation list back.
+
+The same object mirrors the Redis policy generation every cache key embeds
+(see authorization_cache_service._POLICY_GENERATION_KEY), so building a key
+doesn't cost a round trip of its own. It follows the entries' rules: only
+kept while listening, cleared by every drop-everything message (which is
+what a generation bump publishes), not stored from a read that raced an
+invalidation, and expiring after the same TTL. The expiry matters more here
+than for any one entry: a worker that missed a bump's message would
+otherwise keep reading and refilling the old generation's Redis keys, which
+other workers' invalidations no longer touch, for as long as Redis keeps
+them.
+"""
+
+import asyncio
+import time
+import traceback
+from collections import OrderedDict
+from collections.abc import Collection
+from contextlib import suppress
+
+from ...logging.logging_config import get_logger
+from ...redis.client import redis_client
+from ..evaluators.policy_set import PolicySet
+
+logger = get_logger(__name__)
+
+# Pub/sub channel every worker listens on. A message's payload is the email
+# whose policy list changed, or _ALL for "every user" (a full flush, or a
+# policy edit with too many holders to name one by one).
+_INVALIDATION_CHANNEL = "authz:policy_invalidations"
+_ALL = "*"
+
+# Short on purpose: the TTL is what bounds staleness if an invalidation
+# message never arrives, and at a few seconds it still absorbs the bursts of
+# requests (a page load's parallel API calls) this cache is for.
+_LOCAL_TTL_SECONDS = 5.0
+
+# Entries are small (a handful of policies each), so this is about bounding
+# memory against a large user base, not about the hot set not fitting.
+_LOCAL_MAX_ENTRIES = 1024
+
+# Pause before resubscribing after the listener's connection fails, so a
+# Redis outage doesn't become a tight reconnect loop.
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+class LocalPolicyCache:
+    def __init__(self, max_entries: int = _LOCAL_MAX_ENTRIES, ttl_seconds: float = _LOCAL_TTL_SECONDS) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, PolicySet]] = OrderedDict()
+        self._generation = 0
+        self._policy_generation: int | None = None
+        self._policy_generation_expires_at = 0.0
+        self._listening = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every invalidation. Read it before the Redis read
+        whose result goes to put(); put() ignores the result if it moved."""
+        return self._generation
+
+    @property
+    def policy_generation(self) -> int | None:
+        """The mirrored Redis policy generation, or None when it isn't
+        known (not listening, cleared by a drop-everything message, or
+        older than the TTL)."""
+        if self._policy_generation is not None and self._policy_generation_expires_at <= time.monotonic():
+            self._policy_generation = None
+        return self._policy_generation
+
+    def set_policy_generation(self, policy_generation: int, generation: int) -> None:
+        """Mirrors a policy generation just read from (or INCRed in) Redis,
+        under the same conditions as put()."""
+        if not self._listening or generation != self._generation:
+            return
+        self._policy_generation = policy_generation
+        self._policy_generation_expires_at = time.monotonic() + self._ttl_seconds
+
+    def get(self, user_email: str) -> PolicySet | None:
+        """The user's cached policy list, or None on a miss, an expired
+        entry, or while the invalidation listener isn't subscribed."""
+        if not self._listening:
+            return None
+        entry = self._entries.get(user_email)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires_at, policies = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_email]
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(user_email)
+        self._hits += 1
+        return policies
+
+    def put(self, user_email: str, policies: PolicySet, generation: int) -> None:
+        if not self._listening or generation != self._generation:
+            return
+        self._entries[user_email] = (time.monotonic() + self._ttl_seconds, policies)
+        self._entries.move_to_end(user_email)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, user_email: str) -> None:
+        self._generation += 1
+        self._invalidations += 1
+        self._entries.pop(user_email, None)
+
+    def invalidate_all(self) -> None:
+        self._generation += 1
+        self._invalidations += 1
+        self._entries.clear()
+        self._policy_generation = None
+
+    def set_listening(self, listening: bool) -> None:
+        """Turns the L1 on once the invalidation subscription is live, and
+        off (discarding everything) once it isn't."""
+        self.invalidate_all()
+        self._listening = listening
+
+    def stats(self) -> dict[str, int | bool | None]:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+            "size": len(self._entries),
+            "listening": self._listening,
+            "policy_generation": self.policy_generation,
+        }
+
+
+local_policy_cache = LocalPolicyCache()
+
+
+async def publish_policy_invalidation(user_email: str | None) -> None:
+    """Tells every worker's L1 to drop `user_email`'s entry, or everyone's
+    for None. Best-effort like every other cache write: a failed publish
+    leaves other workers stale for at most _LOCAL_TTL_SECONDS."""
+    try:
+        await redis_client.publish(_INVALIDATION_CHANNEL, user_email if user_email is not None else _ALL)
+    except Exception:
+        logger.warning("Authorization cache invalidation publish failed:\n%s", traceback.format_exc())
+
+
+async def publish_policy_invalidations(user_emails: Collection[str]) -> None:
+    """publish_policy_invalidation for several users at once: one message
+    per user, as the listener expects, sent in one pipelined round trip."""
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for user_email in user_emails:
+                pipe.publish(_INVALIDATION_CHANNEL, user_email)
+            await pipe.execute()
+    except Exception:
+        logger.warning("Authorization cache invalidation publish failed:\n%s", traceback.format_exc())
+
+
+async def listen_for_policy_invalidations() -> None:
+    """
+    Runs for the life of the process (started and cancelled by the app's
+    lifespan): applies every worker's invalidation messages to this
+    worker's L1, and keeps the L1 switched off whenever the subscription
+    isn't live, resubscribing after any failure.
+    """
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(_INVALIDATION_CHANNEL)
+            local_policy_cache.set_listening(True)
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                if message["data"] == _ALL:
+                    local_policy_cache.invalidate_all()
+                else:
+                    local_policy_cache.invalidate(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Authorization cache invalidation listener failed:\n%s", traceback.format_exc())
+        finally:
+            local_policy_cache.set_listening(False)
+            with suppress(Exception):
+                await pubsub.aclose()
+        await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
@@ -0,0 +1,133 @@
+"""
+Per-request memo of users' active policy lists, in front of
+AuthorizationCacheService's Redis cache.
+
+One request commonly asks for the same user's policies several times:
+get_current_user builds `permissions` from them, require_authorization
+checks the route's own action, and the route body then calls
+authorization_service.require()/authorize() (and the app's
+get_company_scope) on top. Each of those is a Redis GET plus a JSON decode
+of the whole policy list, or a DB join on a cold cache, for an answer that
+can't change mid-request unless the request itself changes it.
+
+RequestPolicyMemoMiddleware gives every HTTP request an empty memo in a
+contextvar; PolicyRepository.get_active_policies_for_user consults it
+before Redis and fills it on a miss, so every authorization entry point
+shares one fetch per user per request without threading anything through
+signatures. Outside a request (background tasks, scripts, tests calling the
+repository directly) there is no memo and every call goes through as
+before.
+
+A request that changes policies (assigning, revoking, editing) must not
+then authorize against its own stale memo: AuthorizationCacheService's
+invalidate_* methods drop the affected entries here too.
+
+Hit/miss counters are kept both per request (logged at DEBUG when the
+request ends) and process-wide (stats()), so the saving is verifiable.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ...logging.logging_config import get_logger
+from ..evaluators.policy_set import PolicySet
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _RequestMemo:
+    policies: dict[str, PolicySet] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+
+_memo_ctx_var: ContextVar[_RequestMemo | None] = ContextVar("request_policy_memo", default=None)
+
+
+class RequestPolicyMemo:
+    def __init__(self) -> None:
+        self._hits = 0
+        self._misses = 0
+        self._requests = 0
+
+    def get(self, user_email: str) -> PolicySet | None:
+        """The memoized policy list for `user_email` in the current
+        request, or None on a miss or outside a request."""
+        memo = _memo_ctx_var.get()
+        if memo is None:
+            return None
+        policies = memo.policies.get(user_email)
+        if policies is None:
+            memo.misses += 1
+            self._misses += 1
+        else:
+            memo.hits += 1
+            self._hits += 1
+        return policies
+
+    def set(self, user_email: str, policies: PolicySet) -> None:
+        memo = _memo_ctx_var.get()
+        if memo is not None:
+            memo.policies[user_email] = policies
+
+    def invalidate(self, user_email: str) -> None:
+        memo = _memo_ctx_var.get()
+        if memo is not None:
+            memo.policies.pop(user_email, None)
+
+    def invalidate_all(self) -> None:
+        memo = _memo_ctx_var.get()
+        if memo is not None:
+            memo.policies.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Process-wide counters since startup: `hits` are policy fetches
+        answered from a request's memo, `misses` the ones that went on to
+        Redis/the DB, `requests` how many requests had a memo at all."""
+        return {"hits": self._hits, "misses": self._misses, "requests": self._requests}
+
+    def current_stats(self) -> dict[str, int] | None:
+        """The current request's own counters, or None outside a request."""
+        memo = _memo_ctx_var.get()
+        if memo is None:
+            return None
+        return {"hits": memo.hits, "misses": memo.misses}
+
+
+request_policy_memo = RequestPolicyMemo()
+
+
+class RequestPolicyMemoMiddleware:
+    """
+    Scopes a fresh memo to each HTTP request. Plain ASGI rather than
+    BaseHTTPMiddleware: it only sets and resets a contextvar around the
+    downstream app, so there's nothing to gain from wrapping the request
+    and response objects, and the memo object itself is shared (not
+    copied) with whatever tasks the downstream app spawns.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        memo = _RequestMemo()
+        token = _memo_ctx_var.set(memo)
+        request_policy_memo._requests += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _memo_ctx_var.reset(token)
+            if memo.hits or memo.misses:
+                logger.debug(
+                    "Policy memo for %s %s: %d hit(s), %d miss(es)",
+                    scope.get("method"), scope.get("path"), memo.hits, memo.misses,
+                )
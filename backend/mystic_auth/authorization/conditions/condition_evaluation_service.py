@@ -1,5 +1,11 @@
+from .condition_handler import CompiledCondition
 from .condition_registry import ConditionRegistry, default_condition_registry
 
+# A policy's whole conditions block bound to its handlers: one (key,
+# compiled condition) pair per key, None for a key with no registered
+# handler. See ConditionEvaluationService.compile.
+CompiledConditions = tuple[tuple[str, CompiledCondition | None], ...]
+
 
 class ConditionEvaluationService:
     """
@@ -28,11 +34,18 @@ class ConditionEvaluationService:
         """
         `conditions` is a policy's whole conditions block, e.g.
         {"self_only": True, "time": {...}}; None/empty means an
-        unconditional grant. Thin wrapper over evaluate_detailed (mirrors
-        PolicyEvaluationEngine.evaluate's relationship to its own
-        evaluate_detailed): one evaluation code path, not two.
+        unconditional grant. The bool-only counterpart of evaluate_detailed
+        (as PolicyEvaluationEngine.evaluate is of its own evaluate_detailed):
+        stops at the first failing key, since nobody will ask which keys
+        failed. Always agrees with evaluate_detailed's "satisfied".
         """
-        return self.evaluate_detailed(conditions, user_email, resource, context)["satisfied"]
+        if not conditions:
+            return True
+        for key, value in conditions.items():
+            handler = self._registry.get(key)
+            if handler is None or not handler.evaluate(value, user_email, resource, context):
+                return False
+        return True
 
     def evaluate_detailed(
         self,
@@ -56,13 +69,70 @@ class ConditionEvaluationService:
 
         Returns {"satisfied": bool, "failed_keys": list[str]}.
         """
+        return self.evaluate_compiled(self.compile(conditions), user_email, resource, context)
+
+    def compile(self, conditions: dict | None) -> CompiledConditions:
+        """
+        Binds every key of a policy's conditions block to its handler's
+        compiled form (ConditionHandler.compile), so a policy evaluated
+        many times has its config parsed once. Done for every policy when
+        a user's list is loaded (evaluators/policy_set.py); evaluate_detailed
+        compiles on the spot for a raw block.
+        """
         if not conditions:
-            return {"satisfied": True, "failed_keys": []}
+            return ()
+        compiled: list[tuple[str, CompiledCondition | None]] = []
+        for key, value in conditions.items():
+            handler = self._registry.get(key)
+            compiled.append((key, None if handler is None else handler.compile(value)))
+        return tuple(compiled)
 
-        failed_keys: list[str] = []
+    def resource_fields(self, conditions: dict | None) -> frozenset[str] | None:
+        """
+        Every resource field a policy's conditions block reads, if all of
+        its keys are context-free (ConditionHandler.resource_fields), else
+        None. An unconditional grant reads nothing; a key with no
+        registered handler counts as context-dependent, like any key whose
+        handler doesn't say otherwise. Classified once per policy when a
+        user's list is loaded (evaluators/policy_set.py).
+        """
+        if not conditions:
+            return frozenset()
+        fields: set[str] = set()
         for key, value in conditions.items():
             handler = self._registry.get(key)
-            if handler is None or not handler.evaluate(value, user_email, resource, context):
+            key_fields = None if handler is None else handler.resource_fields(value)
+            if key_fields is None:
+                return None
+            fields.update(key_fields)
+        return frozenset(fields)
+
+    @staticmethod
+    def is_satisfied_compiled(
+        compiled: CompiledConditions,
+        user_email: str,
+        resource: dict | object | None,
+        context: dict | None,
+    ) -> bool:
+        """evaluate() for a block already run through compile(): stops at
+        the first failing key."""
+        return all(
+            condition is not None and condition(user_email, resource, context) for _, condition in compiled
+        )
+
+    @staticmethod
+    def evaluate_compiled(
+        compiled: CompiledConditions,
+        user_email: str,
+        resource: dict | object | None,
+        context: dict | None,
+    ) -> dict:
+        """evaluate_detailed for a block already run through compile():
+        same result shape, same every-key-checked, unknown-key-fails
+        rules."""
+        failed_keys: list[str] = []
+        for key, condition in compiled:
+            if condition is None or not condition(user_email, resource, context):
                 failed_keys.append(key)
 
         return {"satisfied": len(failed_keys) == 0, "failed_keys": failed_keys}
@@ -1,4 +1,16 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+# A condition value already bound to its handler: called with
+# (user_email, resource, context), returns whether the condition holds.
+# What ConditionHandler.compile returns, see there.
+CompiledCondition = Callable[[str, dict | object | None, dict | None], bool]
+
+
+def unsatisfiable(user_email, resource, context) -> bool:
+    """The compiled form of a condition config that can never pass
+    (missing or malformed), see ConditionHandler.compile."""
+    return False
 
 
 class ConditionHandler(ABC):
@@ -33,3 +45,42 @@ class ConditionHandler(ABC):
         see class docstring).
         """
         raise NotImplementedError
+
+    def compile(self, condition_value) -> CompiledCondition:
+        """
+        Binds `condition_value` once, for a policy that will be evaluated
+        many times (ConditionEvaluationService.compile, run when a user's
+        policies are loaded, see evaluators/policy_set.py). A handler whose
+        config needs parsing (CIDRs, timezones, dates) overrides this to do
+        that parsing here, so each check is plain comparisons; the default
+        just defers to evaluate().
+
+        Overrides must decide exactly as evaluate() would for every input,
+        including failing safe: a config that can't be parsed compiles to
+        something that always returns False, never to a raise. The handlers
+        that override it implement evaluate() as compile(...)(...), so
+        there is only one code path.
+        """
+
+        def compiled(user_email, resource, context) -> bool:
+            return self.evaluate(condition_value, user_email, resource, context)
+
+        return compiled
+
+    def resource_fields(self, condition_value) -> frozenset[str] | None:
+        """
+        The resource fields this condition's result depends on, for a
+        condition that depends on nothing else: not the request context,
+        not the clock, only the acting user's email and those fields of the
+        resource (and whether there is a resource at all). Such a condition
+        is "context-free", and a decision made only by context-free
+        conditions can be reused for any later check with the same
+        user, action, resource_type and field values (see
+        PolicySet.decision_key).
+
+        None, the default, means "context-dependent": the decision is
+        never reused. A handler overrides this only when that is certain;
+        wrongly returning a set would serve a stale decision, wrongly
+        returning None only costs a re-evaluation.
+        """
+        return None
@@ -4,10 +4,12 @@ from zoneinfo import ZoneInfo
 
 from ....logging.logging_config import get_logger
 from ..clock import resolve_current_datetime
-from ..condition_handler import ConditionHandler
+from ..condition_handler import CompiledCondition, ConditionHandler, unsatisfiable
 
 logger = get_logger(__name__)
 
+_UTC = ZoneInfo("UTC")
+
 
 class DateRangeCondition(ConditionHandler):
     """
@@ -26,24 +28,41 @@ class DateRangeCondition(ConditionHandler):
     "date_range" condition with no recognizable bound (e.g. a legacy/typo'd
     field name that isn't "start"/"end") must never be treated as
     unconstrained, or if a supplied bound isn't a valid ISO date.
+
+    Compiled (see ConditionHandler.compile) once per loaded policy: both
+    bounds are parsed up front, so a check only reads the clock and
+    compares dates.
     """
 
     def evaluate(self, condition_value, user_email, resource, context) -> bool:
+        return self.compile(condition_value)(user_email, resource, context)
+
+    def compile(self, condition_value) -> CompiledCondition:
         try:
             start_str = condition_value.get("start")
             end_str = condition_value.get("end")
             if start_str is None and end_str is None:
-                return False
-
-            current_date = resolve_current_datetime(context, ZoneInfo("UTC")).date()
+                return unsatisfiable
 
-            if start_str and current_date < date.fromisoformat(start_str):
-                return False
-            return not (end_str and current_date > date.fromisoformat(end_str))
+            start = date.fromisoformat(start_str) if start_str else None
+            end = date.fromisoformat(end_str) if end_str else None
         except Exception:
             # Fails safe (see class docstring): a malformed condition value
             # (bad ISO date, etc.) denies rather than raising, but logged so
             # a misconfigured policy doesn't silently deny forever with no
             # trail an operator can find.
-            logger.warning("date_range condition failed to evaluate, denying:\n%s", traceback.format_exc())
-            return False
+            logger.warning("date_range condition failed to compile, denying:\n%s", traceback.format_exc())
+            return unsatisfiable
+
+        def compiled(user_email, resource, context) -> bool:
+            try:
+                current_date = resolve_current_datetime(context, _UTC).date()
+            except Exception:
+                # A malformed "current_time" override (see clock.py).
+                logger.warning("date_range condition failed to evaluate, denying:\n%s", traceback.format_exc())
+                return False
+            if start is not None and current_date < start:
+                return False
+            return end is None or current_date <= end
+
+        return compiled
@@ -1,12 +1,42 @@
 import ipaddress
 import traceback
+from bisect import bisect_right
+from collections.abc import Iterable
 
 from ....logging.logging_config import get_logger
-from ..condition_handler import ConditionHandler
+from ..condition_handler import CompiledCondition, ConditionHandler, unsatisfiable
 
 logger = get_logger(__name__)
 
 
+class _AddressRanges:
+    """
+    A set of IPs/CIDRs as sorted, non-overlapping [first, last] integer
+    ranges per IP version, so a lookup is one bisect instead of parsing and
+    testing every entry. Single IPs are just one-address ranges. Versions
+    are kept apart because an IPv4 caller never matches an IPv6 entry (or
+    vice versa), same as `address in network` across versions.
+    """
+
+    def __init__(self, networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network]) -> None:
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        ipv4 = [network for network in networks if isinstance(network, ipaddress.IPv4Network)]
+        ipv6 = [network for network in networks if isinstance(network, ipaddress.IPv6Network)]
+        self._add(4, ipaddress.collapse_addresses(ipv4))
+        self._add(6, ipaddress.collapse_addresses(ipv6))
+
+    def _add(self, version: int, collapsed: Iterable[ipaddress.IPv4Network | ipaddress.IPv6Network]) -> None:
+        ranges = sorted((int(network.network_address), int(network.broadcast_address)) for network in collapsed)
+        self._starts[version] = [start for start, _ in ranges]
+        self._ends[version] = [end for _, end in ranges]
+
+    def __contains__(self, address: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+        value = int(address)
+        index = bisect_right(self._starts[address.version], value) - 1
+        return index >= 0 and value <= self._ends[address.version][index]
+
+
 class NetworkCondition(ConditionHandler):
     """
     "network": {"allowed_ips": ["10.0.0.0/8", "203.0.113.7"]}: the
@@ -18,30 +48,55 @@ class NetworkCondition(ConditionHandler):
     ip_address at all, or either address string fails to parse, per
     missing IP context and invalid IP
     rejection" requirements.
+
+    Compiled (see ConditionHandler.compile) into _AddressRanges once per
+    loaded policy, so a check parses only the caller's IP. Entries are
+    matched as if tried in order: a malformed entry denies any caller not
+    already matched by an entry listed before it, exactly as a per-check
+    walk of the list that stops at the bad entry would.
     """
 
     def evaluate(self, condition_value, user_email, resource, context) -> bool:
+        return self.compile(condition_value)(user_email, resource, context)
+
+    def compile(self, condition_value) -> CompiledCondition:
         try:
             allowed_ips = condition_value.get("allowed_ips")
-            if not allowed_ips:
-                return False
-
-            caller_ip = (context or {}).get("ip_address")
-            if not caller_ip:
-                return False
-            caller_address = ipaddress.ip_address(caller_ip)
+        except Exception:
+            logger.warning("network condition failed to compile, denying:\n%s", traceback.format_exc())
+            return unsatisfiable
+        if not allowed_ips:
+            return unsatisfiable
 
+        networks = []
+        malformed = False
+        try:
             for entry in allowed_ips:
                 if "/" in entry:
-                    if caller_address in ipaddress.ip_network(entry, strict=False):
-                        return True
-                elif caller_address == ipaddress.ip_address(entry):
-                    return True
-            return False
+                    networks.append(ipaddress.ip_network(entry, strict=False))
+                else:
+                    networks.append(ipaddress.ip_network(ipaddress.ip_address(entry)))
         except Exception:
             # Fails safe (see class docstring): a malformed IP/CIDR entry
             # denies rather than raising, but logged so a misconfigured
             # policy doesn't silently deny forever with no trail an
             # operator can find.
-            logger.warning("network condition failed to evaluate, denying:\n%s", traceback.format_exc())
-            return False
+            logger.warning("network condition has a malformed entry, denying past it:\n%s", traceback.format_exc())
+            malformed = True
+        ranges = _AddressRanges(networks)
+
+        def compiled(user_email, resource, context) -> bool:
+            try:
+                caller_ip = (context or {}).get("ip_address")
+                if not caller_ip:
+                    return False
+                if ipaddress.ip_address(caller_ip) in ranges:
+                    return True
+                if malformed:
+                    logger.warning("network condition has a malformed entry, denying")
+                return False
+            except Exception:
+                logger.warning("network condition failed to evaluate, denying:\n%s", traceback.format_exc())
+                return False
+
+        return compiled
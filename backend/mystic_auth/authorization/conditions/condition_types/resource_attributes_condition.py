@@ -1,14 +1,83 @@
 from ..condition_handler import ConditionHandler
 from ..resource_field import get_field
 
+# The membership operator a resource_attributes value may use instead of a
+# plain expected value: {"company_id": {"in": [3, 7, 12]}}. Kept as a named
+# constant since ConditionValidator and downstream code that reads policy
+# conditions directly (e.g. an app compiling a list filter from them) must
+# spell it identically.
+MEMBERSHIP_OPERATOR = "in"
+
+# Frozensets built from {"in": [...]} lists, keyed by the list's identity.
+# A policy's conditions are evaluated many times per loaded policy (every
+# check in a request, every item of a batch), so the list is turned into a
+# frozenset once and each later match is one hash lookup, however many
+# values the policy lists. The list itself is kept in the entry, which both
+# keeps its id from being reused while cached and lets the lookup confirm
+# it's the very same object. Bounded: cleared wholesale when full, since a
+# rebuild costs one pass over a list and is never wrong.
+_MEMBERSHIP_SETS_MAX = 1024
+_membership_sets: dict[int, tuple[list, frozenset]] = {}
+
+
+def membership_set(values: list) -> frozenset:
+    """The frozenset of an {"in": values} list, precomputed per list (see
+    _membership_sets)."""
+    entry = _membership_sets.get(id(values))
+    if entry is not None and entry[0] is values:
+        return entry[1]
+    if len(_membership_sets) >= _MEMBERSHIP_SETS_MAX:
+        _membership_sets.clear()
+    members = frozenset(values)
+    _membership_sets[id(values)] = (values, members)
+    return members
+
+
+def _matches(actual, expected) -> bool:
+    """
+    Flat equality, except that a set-valued resource field (a set or
+    frozenset, which only ever comes from code building the resource, never
+    from JSON policy data) matches by membership. That lets a resource
+    expose a multi-valued attribute, e.g. every ancestor of a node in a
+    hierarchy, and a policy grant "anything under X" with the same plain
+    {field: X} shape as any other resource_attributes condition.
+
+    An expected value of {"in": [...]} matches when the actual value is one
+    of the listed values (or, for a set-valued field, when the two overlap),
+    so one policy can grant many unrelated values at the cost of a single
+    set lookup. Anything unusable (a list that isn't a list, unhashable
+    members, an unhashable plain value against a set-valued field) fails
+    safe to no match.
+    """
+    if isinstance(expected, dict):
+        values = expected.get(MEMBERSHIP_OPERATOR)
+        if len(expected) != 1 or not isinstance(values, list):
+            return False
+        try:
+            members = membership_set(values)
+            if isinstance(actual, (set, frozenset)):
+                return not members.isdisjoint(actual)
+            return actual in members
+        except TypeError:
+            return False
+    if isinstance(actual, (set, frozenset)):
+        # An unhashable expected value (a list stored as a plain value) can
+        # never be a member; fail safe rather than raise into the request.
+        try:
+            return expected in actual
+        except TypeError:
+            return False
+    return actual == expected
+
 
 class ResourceAttributesCondition(ConditionHandler):
     """
     "resource_attributes": {field: expected_value, ...}: every listed
     field must equal its expected value on the actual resource (e.g.
-    {"status": "published"} for a resource-state-scoped grant). An empty/
-    missing map imposes no restriction. Unsatisfiable if no resource was
-    supplied.
+    {"status": "published"} for a resource-state-scoped grant), be one of
+    the values of an {"in": [...]} expected value, or be contained in it
+    when the resource's field is a set (see _matches). An empty/missing map
+    imposes no restriction. Unsatisfiable if no resource was supplied.
     """
 
     def evaluate(self, condition_value, user_email, resource, context) -> bool:
@@ -16,4 +85,16 @@ class ResourceAttributesCondition(ConditionHandler):
             return True
         if resource is None:
             return False
-        return all(get_field(resource, field) == expected_value for field, expected_value in condition_value.items())
+        return all(
+            _matches(get_field(resource, field), expected_value) for field, expected_value in condition_value.items()
+        )
+
+    def resource_fields(self, condition_value) -> frozenset[str] | None:
+        """The fields it compares, and nothing else: the expected values
+        are the policy's own. A malformed (non-mapping) value is left
+        context-dependent rather than guessed at."""
+        if not condition_value:
+            return frozenset()
+        if not isinstance(condition_value, dict):
+            return None
+        return frozenset(condition_value)
@@ -18,3 +18,6 @@ class SelfOnlyCondition(ConditionHandler):
             return False
         owner_email = get_field(resource, "email")
         return owner_email == user_email
+
+    def resource_fields(self, condition_value) -> frozenset[str] | None:
+        return frozenset({"email"}) if condition_value else frozenset()
@@ -4,7 +4,7 @@ from zoneinfo import ZoneInfo
 
 from ....logging.logging_config import get_logger
 from ..clock import resolve_current_datetime
-from ..condition_handler import ConditionHandler
+from ..condition_handler import CompiledCondition, ConditionHandler, unsatisfiable
 
 logger = get_logger(__name__)
 
@@ -22,28 +22,43 @@ class TimeCondition(ConditionHandler):
 
     Fails safe by denying if start/end are missing, either value is not a
     valid "HH:MM" time, or the timezone name is invalid.
+
+    Compiled (see ConditionHandler.compile) once per loaded policy: the
+    timezone is resolved and both bounds parsed up front, so a check only
+    reads the clock and compares.
     """
 
     def evaluate(self, condition_value, user_email, resource, context) -> bool:
+        return self.compile(condition_value)(user_email, resource, context)
+
+    def compile(self, condition_value) -> CompiledCondition:
         try:
             start_str = condition_value.get("start")
             end_str = condition_value.get("end")
             if not start_str or not end_str:
-                return False
+                return unsatisfiable
 
             tz = ZoneInfo(condition_value.get("timezone") or "UTC")
             start = dt_time.fromisoformat(start_str)
             end = dt_time.fromisoformat(end_str)
-            current = resolve_current_datetime(context, tz).time()
-
-            if start <= end:
-                return start <= current <= end
-            # Overnight range: wraps past midnight
-            return current >= start or current <= end
         except Exception:
             # Fails safe (see class docstring): a malformed time/timezone
             # value denies rather than raising, but logged so a
             # misconfigured policy doesn't silently deny forever with no
             # trail an operator can find.
-            logger.warning("time condition failed to evaluate, denying:\n%s", traceback.format_exc())
-            return False
+            logger.warning("time condition failed to compile, denying:\n%s", traceback.format_exc())
+            return unsatisfiable
+
+        def compiled(user_email, resource, context) -> bool:
+            try:
+                current = resolve_current_datetime(context, tz).time()
+                if start <= end:
+                    return start <= current <= end
+                # Overnight range: wraps past midnight
+                return current >= start or current <= end
+            except Exception:
+                # E.g. a malformed "current_time" override (see clock.py).
+                logger.warning("time condition failed to evaluate, denying:\n%s", traceback.format_exc())
+                return False
+
+        return compiled
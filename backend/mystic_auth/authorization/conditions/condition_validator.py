@@ -3,6 +3,8 @@ from datetime import date
 from datetime import time as dt_time
 from zoneinfo import available_timezones
 
+from .condition_types.resource_attributes_condition import MEMBERSHIP_OPERATOR
+
 
 class ConditionValidationError(ValueError):
     """
@@ -83,7 +85,36 @@ def _validate_self_only(value) -> list[str]:
 def _validate_resource_attributes(value) -> list[str]:
     if not isinstance(value, dict) or not value:
         return ["'resource_attributes' must be a non-empty object"]
-    return []
+
+    # An object-valued field is an operator, and "in" is the only one
+    # ResourceAttributesCondition understands: anything else would silently
+    # never match, so it's rejected here instead.
+    errors: list[str] = []
+    for field, expected in value.items():
+        if isinstance(expected, list):
+            # A plain list is compared by equality (never membership), and
+            # can't be looked up in a set-valued field at all: almost
+            # always a misspelled {"in": [...]}.
+            errors.append(
+                f"'resource_attributes.{field}' must be a plain value or "
+                f"{{'{MEMBERSHIP_OPERATOR}': [...]}}, got a list; use {{'{MEMBERSHIP_OPERATOR}': [...]}} "
+                f"to match any of several values"
+            )
+            continue
+        if not isinstance(expected, dict):
+            continue
+        if set(expected) != {MEMBERSHIP_OPERATOR}:
+            errors.append(
+                f"'resource_attributes.{field}' must be a plain value or "
+                f"{{'{MEMBERSHIP_OPERATOR}': [...]}}, got keys {sorted(expected)}"
+            )
+            continue
+        members = expected[MEMBERSHIP_OPERATOR]
+        if not isinstance(members, list) or not members:
+            errors.append(f"'resource_attributes.{field}.{MEMBERSHIP_OPERATOR}' must be a non-empty list")
+        elif any(isinstance(member, (dict, list)) for member in members):
+            errors.append(f"'resource_attributes.{field}.{MEMBERSHIP_OPERATOR}' entries must be plain values")
+    return errors
 
 
 def _validate_context_attributes(value) -> list[str]:
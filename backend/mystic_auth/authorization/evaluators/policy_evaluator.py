@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from datetime import UTC, datetime
 
 # This engine delegates condition-key logic to the condition-handler layer:
@@ -9,6 +10,10 @@ from ..conditions.condition_evaluation_service import condition_evaluation_servi
 from ..models.policy_model import Policy
 from .authorization_decision import AuthorizationDecision
 
+# A user's policies as the repository hands them out: indexed by
+# (resource_type, action), see policy_set.py. Plain lists still work.
+from .policy_set import DecisionOutcome, PolicySet
+
 
 class PolicyEvaluationEngine:
     """
@@ -39,7 +44,7 @@ class PolicyEvaluationEngine:
 
     @staticmethod
     def evaluate(
-        policies: list[Policy],
+        policies: PolicySet | list[Policy],
         action: str,
         resource_type: str,
         user_email: str,
@@ -60,25 +65,65 @@ class PolicyEvaluationEngine:
         satisfied conditions, False (default-deny) otherwise, including
         when `policies` is empty.
 
-        Thin wrapper over evaluate_detailed's `.allowed`; this is the fast
-        path every real authorize() call goes through; evaluate_detailed's
-        extra explainability bookkeeping (failed_conditions,
-        denial_reason, ...) is cheap relative to a DB round trip, so there
-        is one evaluation code path, not two. This keeps the hot path fast
-        without duplicating permission logic.
+        The fast path, for callers that only need the bool: it returns at
+        the first policy whose conditions pass, checks each policy's
+        conditions only until one key fails, and builds none of
+        evaluate_detailed's explanation (name lists, failed_conditions,
+        denial_reason, timestamp). Decision logic is the same two steps
+        (candidate_policies, then conditions), so it always agrees with
+        evaluate_detailed(...).allowed: a property the tests in
+        test_policy_evaluator_properties_unit.py check on generated
+        policies. Anything that records or explains a decision (the audit
+        trail, the inspection endpoint) uses evaluate_detailed instead.
+
+        Answers from a PolicySet's memo when evaluate_detailed already
+        memoized this check (see policy_set.py), but doesn't add to it: it
+        never computes the full outcome that the memo holds.
         """
-        return PolicyEvaluationEngine.evaluate_detailed(
-            policies, action, resource_type, user_email, resource, context
-        ).allowed
+        if isinstance(policies, PolicySet):
+            memo_key = policies.decision_key(action, resource_type, user_email, resource)
+            outcome = policies.memoized_outcome(memo_key) if memo_key is not None else None
+            if outcome is not None:
+                return bool(outcome[0])
+
+        compiled_for = policies.compiled_conditions if isinstance(policies, PolicySet) else None
+        for policy in PolicyEvaluationEngine.candidate_policies(policies, action, resource_type):
+            compiled = compiled_for(policy) if compiled_for is not None else None
+            if compiled is None:
+                if condition_evaluation_service.evaluate(policy.conditions, user_email, resource, context):
+                    return True
+            elif condition_evaluation_service.is_satisfied_compiled(compiled, user_email, resource, context):
+                return True
+        return False
+
+    @staticmethod
+    def candidate_policies(
+        policies: PolicySet | list[Policy], action: str, resource_type: str
+    ) -> Sequence[Policy]:
+        """The policies that could grant `action` on `resource_type` at all,
+        before any condition is looked at: the same action/resource_type
+        match evaluate_detailed applies first. Computed once by callers
+        checking one action against many resources (see
+        AuthorizationService.authorize_many) and passed back in as
+        `candidates`. An index lookup for a PolicySet, a scan of a plain
+        list."""
+        if isinstance(policies, PolicySet):
+            return policies.candidates(action, resource_type)
+        return [
+            policy
+            for policy in policies
+            if policy.resource_type in (resource_type, "*") and action in (policy.actions or [])
+        ]
 
     @staticmethod
     def evaluate_detailed(
-        policies: list[Policy],
+        policies: PolicySet | list[Policy],
         action: str,
         resource_type: str,
         user_email: str,
         resource: dict | object | None = None,
         context: dict | None = None,
+        candidates: Sequence[Policy] | None = None,
     ) -> AuthorizationDecision:
         """
         Same inputs as evaluate(), but returns a full AuthorizationDecision
@@ -88,29 +133,45 @@ class PolicyEvaluationEngine:
         policies were even in play, which of those actually granted it,
         which failed and on what condition, and a machine-readable reason
         when denied.
-        """
-        evaluated_policies: list[str] = [policy.name for policy in policies]
-        matched_policies: list[str] = []
-        rejected_policies: list[str] = []
-        failed_conditions: dict[str, list[str]] = {}
-
-        for policy in policies:
-            # Resource type must match (or the policy is resource-agnostic)
-            if policy.resource_type not in (resource_type, "*"):
-                continue
-
-            if action not in (policy.actions or []):
-                continue
-
-            condition_result = condition_evaluation_service.evaluate_detailed(
-                policy.conditions, user_email, resource, context
-            )
-            if condition_result["satisfied"]:
-                matched_policies.append(policy.name)
-            else:
-                rejected_policies.append(policy.name)
-                failed_conditions[policy.name] = condition_result["failed_keys"]
 
+        `candidates`, when given, is candidate_policies(policies, action,
+        resource_type) already computed by the caller, so only those have
+        their conditions checked; `policies` is still the full list, since
+        evaluated_policies (and with it denial_reason) describes everything
+        the user held, not just what could have matched. Given a PolicySet
+        (what the repository returns), both come from its precomputed index
+        and names instead of a scan of the list, and each candidate's
+        conditions are the ones it compiled at load time.
+
+        When every candidate is context-free, a PolicySet also memoizes the
+        outcome (which policies matched, which were rejected and on what),
+        so a repeat of the same check on a resource with the same relevant
+        fields skips the conditions entirely (see policy_set.py). Each
+        decision still gets its own lists and timestamp.
+        """
+        if isinstance(policies, PolicySet):
+            evaluated_policies: list[str] = list(policies.names)
+        else:
+            evaluated_policies = [policy.name for policy in policies]
+
+        memo_key = None
+        outcome = None
+        if isinstance(policies, PolicySet) and (
+            candidates is None or candidates is policies.candidates(action, resource_type)
+        ):
+            memo_key = policies.decision_key(action, resource_type, user_email, resource)
+            outcome = policies.memoized_outcome(memo_key) if memo_key is not None else None
+
+        if outcome is None:
+            if candidates is None:
+                candidates = PolicyEvaluationEngine.candidate_policies(policies, action, resource_type)
+            outcome = PolicyEvaluationEngine._condition_outcome(policies, candidates, user_email, resource, context)
+            if isinstance(policies, PolicySet) and memo_key is not None:
+                policies.memoize_outcome(memo_key, outcome)
+
+        matched_policies = list(outcome[0])
+        rejected_policies = list(outcome[1])
+        failed_conditions = {name: list(keys) for name, keys in outcome[2]}
         allowed = len(matched_policies) > 0
 
         return AuthorizationDecision(
@@ -128,6 +189,37 @@ class PolicyEvaluationEngine:
             evaluation_timestamp=datetime.now(UTC).isoformat(),
         )
 
+    @staticmethod
+    def _condition_outcome(
+        policies: PolicySet | list[Policy],
+        candidates: Sequence[Policy],
+        user_email: str,
+        resource: dict | object | None,
+        context: dict | None,
+    ) -> DecisionOutcome:
+        """Every candidate's conditions checked: (matched names, rejected
+        names, (name, failed keys) per rejected policy), in candidate
+        order."""
+        matched: list[str] = []
+        rejected: list[str] = []
+        failed: list[tuple[str, tuple[str, ...]]] = []
+        for policy in candidates:
+            compiled = policies.compiled_conditions(policy) if isinstance(policies, PolicySet) else None
+            if compiled is None:
+                condition_result = condition_evaluation_service.evaluate_detailed(
+                    policy.conditions, user_email, resource, context
+                )
+            else:
+                condition_result = condition_evaluation_service.evaluate_compiled(
+                    compiled, user_email, resource, context
+                )
+            if condition_result["satisfied"]:
+                matched.append(policy.name)
+            else:
+                rejected.append(policy.name)
+                failed.append((policy.name, tuple(condition_result["failed_keys"])))
+        return tuple(matched), tuple(rejected), tuple(failed)
+
     @staticmethod
     def _denial_reason(
         evaluated_policies: list[str],
@@ -0,0 +1,183 @@
+"""
+A user's active policies, indexed for evaluation.
+
+PolicyEvaluationEngine answers every check by finding the policies whose
+resource_type is the requested one (or "*") and whose actions include the
+requested action. Over a plain list that's a scan of every policy plus a
+linear `action in policy.actions` per policy, repeated for every check a
+request makes; an admin holding dozens of broad policies pays it on every
+route.
+
+PolicySet does that matching once, when the list is loaded: each policy is
+filed under every (resource_type, action) pair it grants, so finding the
+candidates for a check is two dict lookups (the exact resource_type and
+"*"), memoized per (action, resource_type) for the life of the set. The
+names evaluate_detailed reports as evaluated_policies are precomputed too,
+and every policy's conditions are compiled (ConditionEvaluationService.compile)
+so a check evaluates them without re-parsing their config.
+
+It is built where a user's list enters the process (the repository's
+database read, the Redis cache's deserialization) and then shared by the
+request memo and the in-process L1 cache, so the indexing cost is paid once
+per load, not per check. Immutable, so sharing it is safe; it is a
+Sequence of the same Policy objects in the same order, so everything that
+iterates a user's policies (current_user's permission set, the app's scope
+compilation) keeps working unchanged, and candidates come back in list
+order, keeping matched_policies/rejected_policies exactly what a scan of
+the list would produce.
+
+It also memoizes decisions, but only where that can't change an answer.
+Each policy is classified when the set is built as context-free (its
+conditions read only the acting user's email and certain resource fields:
+self_only, resource_attributes, or none at all) or context-dependent (time,
+date_range, network, security_context, context_attributes, or any key
+whose handler doesn't say otherwise, see
+ConditionHandler.resource_fields). When every candidate for a check is
+context-free, the outcome depends only on (user, action, resource_type,
+those fields' values), so evaluate_detailed stores it here under that key
+(decision_key) and later checks with the same key reuse it. Any
+context-dependent candidate disables it for that (action, resource_type).
+The memo lives and dies with the set, and the set is replaced by every
+change that could alter a decision: the user's own invalidation, a
+policy edit reaching its holders, and a policy-generation bump, which
+clears every worker's L1.
+"""
+
+from collections.abc import Iterable, Sequence
+
+from ..conditions.condition_evaluation_service import CompiledConditions, condition_evaluation_service
+from ..conditions.resource_field import get_field
+from ..models.policy_model import Policy
+
+_WILDCARD_RESOURCE_TYPE = "*"
+
+# Per-set bound on memoized outcomes. A set lives for one request, or a few
+# seconds in the L1, so this only guards against a single set seeing an
+# unbounded number of distinct resources (a large authorize_many). Cleared
+# wholesale when full, since recomputing an outcome is never wrong.
+_DECISION_MEMO_MAX = 512
+
+# What evaluate_detailed memoizes for a context-free check: the matched and
+# rejected policy names, and each rejected policy's failed condition keys.
+# That is everything in a decision except what's derived from them
+# (allowed, denial_reason) and its timestamp.
+DecisionOutcome = tuple[tuple[str, ...], tuple[str, ...], tuple[tuple[str, tuple[str, ...]], ...]]
+
+
+class PolicySet(Sequence[Policy]):
+    __slots__ = (
+        "_policies", "_names", "_index", "_candidates", "_compiled", "_resource_fields", "_decision_fields", "_decisions"
+    )
+
+    def __init__(self, policies: Iterable[Policy] = ()) -> None:
+        self._policies: tuple[Policy, ...] = tuple(policies)
+        self._names: tuple[str, ...] = tuple(policy.name for policy in self._policies)
+
+        # (resource_type, action) -> positions in _policies, ascending. A
+        # policy listing the same action twice is filed once.
+        index: dict[tuple[str, str], list[int]] = {}
+        for position, policy in enumerate(self._policies):
+            for action in dict.fromkeys(policy.actions or []):
+                index.setdefault((policy.resource_type, action), []).append(position)
+        self._index: dict[tuple[str, str], tuple[int, ...]] = {key: tuple(value) for key, value in index.items()}
+        self._candidates: dict[tuple[str, str], tuple[Policy, ...]] = {}
+
+        # id(policy) -> its conditions block, compiled (CIDRs, timezones and
+        # dates parsed, handlers resolved) once here rather than per check.
+        # Keyed by identity: the policies are held in _policies, so their
+        # ids can't be reused while this set exists.
+        self._compiled: dict[int, CompiledConditions] = {
+            id(policy): condition_evaluation_service.compile(policy.conditions) for policy in self._policies
+        }
+
+        # id(policy) -> the resource fields its conditions read, or None if
+        # it's context-dependent (ConditionEvaluationService.resource_fields).
+        self._resource_fields: dict[int, frozenset[str] | None] = {
+            id(policy): condition_evaluation_service.resource_fields(policy.conditions) for policy in self._policies
+        }
+        self._decision_fields: dict[tuple[str, str], tuple[str, ...] | None] = {}
+        self._decisions: dict[tuple, DecisionOutcome] = {}
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return self._names
+
+    def candidates(self, action: str, resource_type: str) -> tuple[Policy, ...]:
+        """The policies that could grant `action` on `resource_type`, in
+        list order: exactly PolicyEvaluationEngine.candidate_policies over
+        the plain list."""
+        key = (action, resource_type)
+        found = self._candidates.get(key)
+        if found is None:
+            positions = set(self._index.get((resource_type, action), ()))
+            positions.update(self._index.get((_WILDCARD_RESOURCE_TYPE, action), ()))
+            found = tuple(self._policies[position] for position in sorted(positions))
+            self._candidates[key] = found
+        return found
+
+    def compiled_conditions(self, policy: Policy) -> CompiledConditions | None:
+        """`policy`'s conditions as compiled when this set was built, or
+        None for a policy that isn't one of this set's own."""
+        return self._compiled.get(id(policy))
+
+    def decision_fields(self, action: str, resource_type: str) -> tuple[str, ...] | None:
+        """The resource fields that decide a check of `action` on
+        `resource_type`, if every candidate for it is context-free, else
+        None. Memoized per (action, resource_type), like candidates."""
+        key = (action, resource_type)
+        if key in self._decision_fields:
+            return self._decision_fields[key]
+        fields: set[str] = set()
+        context_dependent = False
+        for policy in self.candidates(action, resource_type):
+            policy_fields = self._resource_fields.get(id(policy))
+            if policy_fields is None:
+                context_dependent = True
+                break
+            fields.update(policy_fields)
+        found = None if context_dependent else tuple(sorted(fields))
+        self._decision_fields[key] = found
+        return found
+
+    def decision_key(
+        self, action: str, resource_type: str, user_email: str, resource: dict | object | None
+    ) -> tuple | None:
+        """
+        The key a context-free check's outcome is memoized under: (action,
+        resource_type, user, the values of decision_fields on `resource`),
+        or None when the check mustn't be memoized: a context-dependent
+        candidate, or a field value that can't be a dict key (a list, a
+        dict) or can't be read. Whether there is a resource at all is part
+        of the key, since self_only and resource_attributes deny without
+        one.
+        """
+        fields = self.decision_fields(action, resource_type)
+        if fields is None:
+            return None
+        try:
+            values = None if resource is None else tuple(get_field(resource, field) for field in fields)
+            key = (action, resource_type, user_email, values)
+            hash(key)
+        except Exception:
+            return None
+        return key
+
+    def memoized_outcome(self, key: tuple) -> DecisionOutcome | None:
+        return self._decisions.get(key)
+
+    def memoize_outcome(self, key: tuple, outcome: DecisionOutcome) -> None:
+        if len(self._decisions) >= _DECISION_MEMO_MAX:
+            self._decisions.clear()
+        self._decisions[key] = outcome
+
+    def __getitem__(self, index):
+        return self._policies[index]
+
+    def __len__(self) -> int:
+        return len(self._policies)
+
+    def __iter__(self):
+        return iter(self._policies)
+
+    def __repr__(self) -> str:
+        return f"PolicySet({list(self._names)!r})"
@@ -39,6 +39,14 @@ class AuthorizationAuditLog(Base):
             text("created_at DESC"),
             text("id DESC"),
         ),
+        # The B-tree index above only helps exact-email lookups; the audit
+        # log's substring `search` needs pg_trgm, see migration b4d8f2a6c0e3.
+        Index(
+            "ix_authorization_audit_log_user_email_trgm",
+            "user_email",
+            postgresql_using="gin",
+            postgresql_ops={"user_email": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -79,4 +87,11 @@ class AuthorizationAuditLog(Base):
     # Whatever the caller supplied as `context` (e.g. request metadata, IP)
     context: Mapped[dict | None] = mapped_column(JSONB)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Part of the primary key because the table is range-partitioned on it
+    # by month (migration f1b3d5e7a9c2, database/partitions.py): a
+    # partitioned table's unique constraints must include the partition
+    # key. id alone is still unique, since every partition draws it from
+    # the one sequence.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True, primary_key=True
+    )
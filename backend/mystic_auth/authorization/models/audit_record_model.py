@@ -0,0 +1,95 @@
+"""
+The authorization audit trail as the listing API reads it: every
+authorization_audit_log row and every authorization_audit_rollup counter,
+as one read-only UNION ALL mapped like a table.
+
+With AUTHORIZATION_AUDIT_MODE="aggregate_allows", one minute of a user's
+routine reads is a single rollup counter while a denial in that same minute
+is a full row. Listing the two tables separately would make a caller merge
+and re-page them by hand; mapping the union instead lets the repository's
+filters, sorting and fetch_page pagination work over both unchanged. Postgres
+pushes the WHERE into each branch and, for the default newest-first order,
+merges the two branches' index scans, so neither table is read beyond the
+page.
+
+`kind` says which table a record came from ("decision" or "rollup"), and
+(kind, id) is the identity, since the two tables number their ids
+independently. A decision reads as decision_count=1 with first_seen_at equal
+to created_at. A rollup has no per-decision detail (resource_identifier and
+context are null, the policy-name lists are empty) and reports its
+last_seen_at as created_at, so it sorts by its newest counted decision.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, cast, literal_column, null, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped
+
+from ...database.base import Base
+from .audit_log_model import AuthorizationAuditLog
+from .audit_rollup_model import AuthorizationAuditRollup
+
+# Constants rendered inline rather than bound: asyncpg can't infer a type for
+# an untyped bind parameter in a UNION's select list.
+_EMPTY_NAMES = literal_column("'{}'::varchar[]", ARRAY(String))
+
+_records = union_all(
+    select(
+        literal_column("'decision'", String).label("kind"),
+        AuthorizationAuditLog.id,
+        AuthorizationAuditLog.user_email,
+        AuthorizationAuditLog.action,
+        AuthorizationAuditLog.resource_type,
+        AuthorizationAuditLog.resource_identifier,
+        AuthorizationAuditLog.allowed,
+        AuthorizationAuditLog.candidate_policy_names,
+        AuthorizationAuditLog.granting_policy_names,
+        AuthorizationAuditLog.failed_conditions,
+        AuthorizationAuditLog.context,
+        AuthorizationAuditLog.created_at,
+        AuthorizationAuditLog.created_at.label("first_seen_at"),
+        literal_column("1").label("decision_count"),
+    ),
+    select(
+        literal_column("'rollup'", String),
+        AuthorizationAuditRollup.id,
+        AuthorizationAuditRollup.user_email,
+        AuthorizationAuditRollup.action,
+        AuthorizationAuditRollup.resource_type,
+        cast(null(), String),
+        AuthorizationAuditRollup.allowed,
+        _EMPTY_NAMES,
+        _EMPTY_NAMES,
+        cast(null(), JSONB),
+        cast(null(), JSONB),
+        AuthorizationAuditRollup.last_seen_at,
+        AuthorizationAuditRollup.first_seen_at,
+        AuthorizationAuditRollup.decision_count,
+    ),
+).subquery("authorization_audit_records")
+
+
+class AuthorizationAuditRecord(Base):
+    """One listed audit record, either kind (see module docstring). Mapped
+    onto a subquery, not a table: never written, and invisible to alembic
+    (nothing is added to Base.metadata). The annotations below only type the
+    attributes; each maps to the subquery column of the same name."""
+
+    __table__ = _records
+    __mapper_args__ = {"primary_key": [_records.c.kind, _records.c.id]}
+
+    kind: Mapped[str]
+    id: Mapped[int]
+    user_email: Mapped[str]
+    action: Mapped[str]
+    resource_type: Mapped[str]
+    resource_identifier: Mapped[str | None]
+    allowed: Mapped[bool]
+    candidate_policy_names: Mapped[list[str]]
+    granting_policy_names: Mapped[list[str]]
+    failed_conditions: Mapped[dict | None]
+    context: Mapped[dict | None]
+    created_at: Mapped[datetime]
+    first_seen_at: Mapped[datetime]
+    decision_count: Mapped[int]
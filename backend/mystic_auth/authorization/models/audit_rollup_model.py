@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ...database.base import Base
+
+
+class AuthorizationAuditRollup(Base):
+    """
+    Routine allowed decisions, counted rather than logged one row each:
+    one row per (user_email, action, resource_type, allowed) per minute,
+    with how many decisions fell in that minute and when the first and last
+    of them happened. Written instead of authorization_audit_log rows only
+    when AUTHORIZATION_AUDIT_MODE is "aggregate_allows", and only for
+    decisions services/audit_policy.py doesn't require in full (denials and
+    sensitive actions never land here).
+
+    Same snapshot rules as AuthorizationAuditLog: user_email is a plain
+    string, not a foreign key, so the counts outlive a purged user.
+    `allowed` is part of the key even though only allows are rolled up
+    today, so a policy that someday aggregates something else can't merge
+    allows and denials into one counter.
+    """
+
+    __tablename__ = "authorization_audit_rollup"
+    __table_args__ = (
+        # The upsert target (audit_log_repository.upsert_rollups): one
+        # counter per key per minute.
+        Index(
+            "uq_authorization_audit_rollup_key",
+            "user_email",
+            "action",
+            "resource_type",
+            "allowed",
+            "bucket_start",
+            unique=True,
+        ),
+        # Mirrors authorization_audit_log's indexes, so the listing's
+        # per-user and user_email-search filters stay index-driven on both
+        # halves of the merged listing (see audit_record_model.py).
+        Index(
+            "ix_audit_rollup_user_email_last_seen_at",
+            "user_email",
+            text("last_seen_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_authorization_audit_rollup_user_email_trgm",
+            "user_email",
+            postgresql_using="gin",
+            postgresql_ops={"user_email": "gin_trgm_ops"},
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_email: Mapped[str]
+    action: Mapped[str] = mapped_column(index=True)
+    resource_type: Mapped[str]
+    allowed: Mapped[bool]
+
+    # The minute (UTC, seconds zeroed) the counted decisions fall in
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    decision_count: Mapped[int]
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
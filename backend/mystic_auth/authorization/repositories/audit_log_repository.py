@@ -1,25 +1,51 @@
-from sqlalchemy import Select, asc, desc, func
+from sqlalchemy import Select, asc, desc, func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql.elements import UnaryExpression
 
+from ...database.pagination import Page, fetch_page
+from ...database.text_search import similarity_rank, substring_match
 from ..models.audit_log_model import AuthorizationAuditLog
+from ..models.audit_record_model import AuthorizationAuditRecord
+from ..models.audit_rollup_model import AuthorizationAuditRollup
+
+# Everything below that reads (listing, counting) goes through
+# AuthorizationAuditRecord, the union of full decision rows and rollup
+# counters (see models/audit_record_model.py), so a listing shows both kinds
+# of record, filtered, sorted and paged as one sequence. Writes go to the
+# two tables themselves.
+_Record = AuthorizationAuditRecord
+
+# The rollup table's upsert key, in uq_authorization_audit_rollup_key's order
+_ROLLUP_KEY = ("user_email", "action", "resource_type", "allowed", "bucket_start")
 
 # See audit_log/audit_log_repository.py's identical constant for why this is
 # an allowlist rather than an arbitrary caller-supplied column name.
 _SORTABLE_COLUMNS = {
-    "created_at": AuthorizationAuditLog.created_at,
-    "user_email": AuthorizationAuditLog.user_email,
-    "action": AuthorizationAuditLog.action,
-    "resource_type": AuthorizationAuditLog.resource_type,
-    "allowed": AuthorizationAuditLog.allowed,
+    "created_at": _Record.created_at,
+    "user_email": _Record.user_email,
+    "action": _Record.action,
+    "resource_type": _Record.resource_type,
+    "allowed": _Record.allowed,
 }
 
 
-def _order_by(sort_by: str | None, sort_dir: str) -> list[UnaryExpression]:
-    column = _SORTABLE_COLUMNS.get(sort_by or "", AuthorizationAuditLog.created_at)
+def _order_by(sort_by: str | None, sort_dir: str, search: str | None = None) -> list[UnaryExpression]:
     direction = asc if sort_dir == "asc" else desc
-    return [direction(column), direction(AuthorizationAuditLog.id)]
+    if search and sort_by not in _SORTABLE_COLUMNS:
+        # A search with no explicit sort ranks the closest user_email first,
+        # then falls back to the usual newest-first order among equal matches.
+        return [
+            desc(similarity_rank(search, _Record.user_email)),
+            direction(_Record.created_at),
+            direction(_Record.id),
+            direction(_Record.kind),
+        ]
+    column = _SORTABLE_COLUMNS.get(sort_by or "", _Record.created_at)
+    # (id, kind) together are the unique tiebreak: each kind numbers its ids
+    # independently.
+    return [direction(column), direction(_Record.id), direction(_Record.kind)]
 
 
 def _apply_filters(
@@ -29,21 +55,21 @@ def _apply_filters(
     resource_type: str | None,
     allowed: bool | None,
 ) -> Select:
-    """Shared by get_all/get_for_user (row fetch) and count/count_for_user
-    (X-Total-Count), so a filtered page's total always matches what's
+    """Shared by get_all/get_for_user (row fetch), count/count_for_user, and
+    get_page/get_page_for_user (row fetch + X-Total-Count together), so a filtered page's total always matches what's
     actually being paged through. `search` is a substring match on
     user_email (a free-text field); `action`/`resource_type`/`allowed` are
     exact matches against fixed, finite vocabularies (Permission's action
     strings, this app's resource types, and a bool), the same distinction
     security_audit_log_repository.py draws for search vs. event_type/success."""
     if search:
-        stmt = stmt.where(AuthorizationAuditLog.user_email.ilike(f"%{search}%"))
+        stmt = stmt.where(substring_match(search, _Record.user_email))
     if action:
-        stmt = stmt.where(AuthorizationAuditLog.action == action)
+        stmt = stmt.where(_Record.action == action)
     if resource_type:
-        stmt = stmt.where(AuthorizationAuditLog.resource_type == resource_type)
+        stmt = stmt.where(_Record.resource_type == resource_type)
     if allowed is not None:
-        stmt = stmt.where(AuthorizationAuditLog.allowed == allowed)
+        stmt = stmt.where(_Record.allowed == allowed)
     return stmt
 
 
@@ -51,7 +77,9 @@ class AuditLogRepository:
     """
     Persistence layer for the authorization audit log. Append-only:
     entries are created by AuthorizationService.authorize_detailed and
-    never updated; only queried back for inspection.
+    never updated; only queried back for inspection. The one exception is
+    a rollup counter, which upsert_rollups adds to for as long as its
+    minute is still being written.
     """
 
     @staticmethod
@@ -62,6 +90,48 @@ class AuditLogRepository:
         await db.refresh(entry)
         return entry
 
+    @staticmethod
+    async def create_entries(data: list[dict], db: AsyncSession) -> None:
+        """
+        create_entry for many decisions at once (AuthorizationService's
+        authorize_many): one multi-row INSERT and one commit for the whole
+        list, instead of an INSERT, commit and refresh per row. Nothing is
+        read back, since no caller of the bulk path needs the rows' ids.
+        """
+        if not data:
+            return
+        await db.execute(insert(AuthorizationAuditLog), data)
+        await db.commit()
+
+    @staticmethod
+    async def upsert_rollups(data: list[dict], db: AsyncSession) -> None:
+        """
+        Adds counted decisions to their per-minute rollup rows: each dict is
+        _ROLLUP_KEY plus decision_count/first_seen_at/last_seen_at for the
+        decisions being added. One INSERT ... ON CONFLICT DO UPDATE and one
+        commit for the whole list. An existing row's count grows, its
+        first_seen_at keeps the earlier time and its last_seen_at the later
+        one, so flushing the same minute in several pieces (or from several
+        workers) adds up to the same row.
+
+        Rows are written in key order so two workers upserting overlapping
+        keys lock them in the same order and can't deadlock each other.
+        """
+        if not data:
+            return
+        rows = sorted(data, key=lambda row: tuple(row[column] for column in _ROLLUP_KEY))
+        stmt = pg_insert(AuthorizationAuditRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_ROLLUP_KEY),
+            set_={
+                "decision_count": AuthorizationAuditRollup.decision_count + stmt.excluded.decision_count,
+                "first_seen_at": func.least(AuthorizationAuditRollup.first_seen_at, stmt.excluded.first_seen_at),
+                "last_seen_at": func.greatest(AuthorizationAuditRollup.last_seen_at, stmt.excluded.last_seen_at),
+            },
+        )
+        await db.execute(stmt)
+        await db.commit()
+
     @staticmethod
     async def get_all(
         db: AsyncSession,
@@ -73,16 +143,35 @@ class AuditLogRepository:
         allowed: bool | None = None,
         sort_by: str | None = None,
         sort_dir: str = "desc",
-    ) -> list[AuthorizationAuditLog]:
+    ) -> list[AuthorizationAuditRecord]:
         """Fetch entries across all users. `search` is a case-insensitive
         substring match on user_email; `action`/`resource_type`/`allowed`
         are exact-match filters. `sort_by`/`sort_dir` default to
-        newest-first by created_at, same as before sorting existed."""
-        stmt = _apply_filters(select(AuthorizationAuditLog), search, action, resource_type, allowed)
-        stmt = stmt.order_by(*_order_by(sort_by, sort_dir)).limit(limit).offset(offset)
+        newest-first by created_at, same as before sorting existed; a
+        `search` without a `sort_by` ranks the closest user_email match
+        first instead (see database/text_search.py)."""
+        stmt = _apply_filters(select(_Record), search, action, resource_type, allowed)
+        stmt = stmt.order_by(*_order_by(sort_by, sort_dir, search)).limit(limit).offset(offset)
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        limit: int = 100,
+        offset: int = 0,
+        search: str | None = None,
+        action: str | None = None,
+        resource_type: str | None = None,
+        allowed: bool | None = None,
+        sort_by: str | None = None,
+        sort_dir: str = "desc",
+    ) -> Page[AuthorizationAuditRecord]:
+        """get_all's page plus count's total in one round trip (see
+        database/pagination.py), for list_audit_log's X-Total-Count."""
+        stmt = _apply_filters(select(_Record), search, action, resource_type, allowed)
+        return await fetch_page(stmt, db, order_by=_order_by(sort_by, sort_dir, search), limit=limit, offset=offset)
+
     @staticmethod
     async def get_for_user(
         user_email: str,
@@ -94,16 +183,33 @@ class AuditLogRepository:
         allowed: bool | None = None,
         sort_by: str | None = None,
         sort_dir: str = "desc",
-    ) -> list[AuthorizationAuditLog]:
+    ) -> list[AuthorizationAuditRecord]:
         """Same as get_all, scoped to a single user's decisions (no
         `search`: there's nothing left for a user-email search to narrow
         once already scoped to one user)."""
-        stmt = select(AuthorizationAuditLog).where(AuthorizationAuditLog.user_email == user_email)
+        stmt = select(_Record).where(_Record.user_email == user_email)
         stmt = _apply_filters(stmt, None, action, resource_type, allowed)
         stmt = stmt.order_by(*_order_by(sort_by, sort_dir)).limit(limit).offset(offset)
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_page_for_user(
+        user_email: str,
+        db: AsyncSession,
+        limit: int = 100,
+        offset: int = 0,
+        action: str | None = None,
+        resource_type: str | None = None,
+        allowed: bool | None = None,
+        sort_by: str | None = None,
+        sort_dir: str = "desc",
+    ) -> Page[AuthorizationAuditRecord]:
+        """get_for_user's page plus count_for_user's total in one round trip."""
+        stmt = select(_Record).where(_Record.user_email == user_email)
+        stmt = _apply_filters(stmt, None, action, resource_type, allowed)
+        return await fetch_page(stmt, db, order_by=_order_by(sort_by, sort_dir), limit=limit, offset=offset)
+
     @staticmethod
     async def count(
         db: AsyncSession,
@@ -116,7 +222,7 @@ class AuditLogRepository:
         a caller compute how many pages exist (see list_audit_log's
         X-Total-Count header)."""
         stmt = _apply_filters(
-            select(func.count()).select_from(AuthorizationAuditLog), search, action, resource_type, allowed
+            select(func.count()).select_from(_Record), search, action, resource_type, allowed
         )
         result = await db.execute(stmt)
         return result.scalar_one()
@@ -129,8 +235,8 @@ class AuditLogRepository:
         resource_type: str | None = None,
         allowed: bool | None = None,
     ) -> int:
-        stmt = select(func.count()).select_from(AuthorizationAuditLog).where(
-            AuthorizationAuditLog.user_email == user_email
+        stmt = select(func.count()).select_from(_Record).where(
+            _Record.user_email == user_email
         )
         stmt = _apply_filters(stmt, None, action, resource_type, allowed)
         result = await db.execute(stmt)
@@ -0,0 +1,54 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class PolicyChangeHook:
+    """
+    Lets an application built on this template keep its own data derived
+    from policy assignments (e.g. a materialized "which user can reach which
+    row" table) in step with them, without PolicyRepository knowing
+    anything about that data. Every method runs inside the repository's own
+    transaction, after its change is flushed and before it commits, so the
+    derived rows commit or roll back together with the change itself.
+
+    Defaults are no-ops: a hook overrides only what it cares about.
+    Revocation and policy deletion deliberately have no method: both delete
+    user_policies rows, so a derived table that references
+    user_policies(user_id, policy_id) with ON DELETE CASCADE follows them
+    for free, including deletions that never go through the repository
+    (a user being deleted, for instance).
+    """
+
+    async def policy_assigned(self, user_id: int, policy_id: int, db: AsyncSession) -> None:
+        """`policy_id` was just assigned to `user_id` (and wasn't before)."""
+
+    async def policy_changed(self, policy_id: int, db: AsyncSession) -> None:
+        """`policy_id`'s definition (actions, resource_type, conditions,
+        is_active, ...) was just edited or rolled back. Holders are found
+        through user_policies."""
+
+
+class PolicyChangeHooks:
+    """
+    The registered PolicyChangeHooks, called in registration order. Same
+    extension shape as conditions/condition_registry.py: a downstream
+    application registers its hook on the module-level instance below at
+    import time, and nothing in the authorization module changes.
+    """
+
+    def __init__(self) -> None:
+        self._hooks: list[PolicyChangeHook] = []
+
+    def register(self, hook: PolicyChangeHook) -> None:
+        if hook not in self._hooks:
+            self._hooks.append(hook)
+
+    async def policy_assigned(self, user_id: int, policy_id: int, db: AsyncSession) -> None:
+        for hook in self._hooks:
+            await hook.policy_assigned(user_id, policy_id, db)
+
+    async def policy_changed(self, policy_id: int, db: AsyncSession) -> None:
+        for hook in self._hooks:
+            await hook.policy_changed(policy_id, db)
+
+
+policy_change_hooks = PolicyChangeHooks()
@@ -7,8 +7,17 @@ from ...user_table.user_model import User
 # docstring for exactly what is (and deliberately isn't) cached, and why.
 # Every mutation below invalidates whatever it could have made stale.
 from ..caching.authorization_cache_service import authorization_cache_service
+
+# Per-request memo in front of that cache: one fetch per user per request,
+# however many authorization entry points ask, see request_policy_memo.py.
+from ..caching.request_policy_memo import request_policy_memo
+from ..evaluators.policy_set import PolicySet
 from ..models.policy_model import Policy, UserPolicy
 
+# Application-registered hooks keeping data derived from assignments in the
+# same transaction as each change, see policy_change_hooks.py.
+from .policy_change_hooks import policy_change_hooks
+
 # Every create/update/delete below also stages a policy_history row in the
 # same transaction, policy versioning writes history rows in the same transaction:
 # every policy mutation must be traceable and reversible.
@@ -106,6 +115,9 @@ class PolicyRepository:
         only difference is how the resulting
         history entry is labeled; the mutation logic is identical either
         way, so rollback reuses this method rather than duplicating it.
+
+        When any field actually changed, registered policy_change_hooks run
+        before the commit (see policy_change_hooks.py).
         """
         previous_definition = _definition_snapshot(db_obj)
 
@@ -124,6 +136,9 @@ class PolicyRepository:
         # entry: the caller explicitly asked for this change, and an
         # empty changed_fields list is itself meaningful information
         # (e.g. rolling back to a version identical to the current one).
+        if changed_fields:
+            await policy_change_hooks.policy_changed(db_obj.id, db)
+
         policy_history_repository.add_entry(
             {
                 "policy_id": db_obj.id,
@@ -138,15 +153,16 @@ class PolicyRepository:
             db,
         )
 
+        # Read inside the transaction, so a failure here rolls the edit back
+        # rather than committing it with its holders' caches left stale.
+        holder_emails = await PolicyRepository.get_holder_emails(db_obj.id, db)
+
         await db.commit()
         await db.refresh(db_obj)
 
-        # This policy's definition changed: every user who holds it may
-        # now have a stale cached effective-policy set (see
-        # AuthorizationCacheService.invalidate_all_user_policies's own
-        # docstring for why this is a full-namespace flush rather than a
-        # targeted one).
-        await authorization_cache_service.invalidate_all_user_policies()
+        # This policy's definition changed: every user who holds it, and
+        # only them, may now have a stale cached effective-policy set.
+        await authorization_cache_service.invalidate_users_policies(holder_emails)
 
         return db_obj
 
@@ -173,15 +189,31 @@ class PolicyRepository:
             db,
         )
 
+        # Before the delete: its ON DELETE CASCADE takes the user_policies
+        # rows that say who held it.
+        holder_emails = await PolicyRepository.get_holder_emails(db_obj.id, db)
+
         await db.delete(db_obj)
         await db.commit()
 
         # See update()'s own comment: deleting a policy can strand every
         # holder's cached effective-policy set just as editing one can.
-        await authorization_cache_service.invalidate_all_user_policies()
+        await authorization_cache_service.invalidate_users_policies(holder_emails)
 
     @staticmethod
-    async def get_active_policies_for_user(user_email: str, db: AsyncSession) -> list[Policy]:
+    def active_policies_statement(user_email: str):
+        """get_active_policies_for_user's query, on its own so the startup
+        warm-up (core/startup_warmup.py) can compile and prepare exactly
+        the statement requests will run."""
+        return (
+            select(Policy)
+            .join(UserPolicy, UserPolicy.policy_id == Policy.id)
+            .join(User, User.id == UserPolicy.user_id)
+            .where(User.email == user_email, Policy.is_active.is_(True))
+        )
+
+    @staticmethod
+    async def get_active_policies_for_user(user_email: str, db: AsyncSession) -> PolicySet:
         """
         The query the authorization/evaluation path actually runs: every
         *active* policy assigned to the user with this email. Filtering
@@ -194,21 +226,30 @@ class PolicyRepository:
         falls through to the database and populates the cache for next
         time. A cache read failure is indistinguishable from a miss here
         by design (see AuthorizationCacheService's "fail closed" note).
+
+        In front of all that, the current request's memo (see
+        request_policy_memo.py): get_current_user, require_authorization
+        and the route's own checks all land here for the same user, and
+        only the first of them goes on to Redis/the database.
+
+        Returned as a PolicySet (evaluators/policy_set.py): indexed once
+        here or in the cache layer, then shared by every check that reuses
+        it.
         """
+        memoized = request_policy_memo.get(user_email)
+        if memoized is not None:
+            return memoized
+
         cached = await authorization_cache_service.get_user_policies(user_email)
         if cached is not None:
+            request_policy_memo.set(user_email, cached)
             return cached
 
-        stmt = (
-            select(Policy)
-            .join(UserPolicy, UserPolicy.policy_id == Policy.id)
-            .join(User, User.id == UserPolicy.user_id)
-            .where(User.email == user_email, Policy.is_active.is_(True))
-        )
-        result = await db.execute(stmt)
-        policies = list(result.scalars().all())
+        result = await db.execute(PolicyRepository.active_policies_statement(user_email))
+        policies = PolicySet(result.scalars().all())
 
         await authorization_cache_service.set_user_policies(user_email, policies)
+        request_policy_memo.set(user_email, policies)
         return policies
 
     @staticmethod
@@ -225,6 +266,23 @@ class PolicyRepository:
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_holder_emails(policy_id: int, db: AsyncSession) -> list[str]:
+        """
+        The email of every user this policy is assigned to (whatever its
+        is_active flag): exactly the users whose cached effective-policy set
+        an edit or delete of it can make stale, so update()/delete() hand
+        this list to the cache instead of flushing everyone's. The cache is
+        keyed by email, hence emails rather than user ids. Served by
+        user_policies' policy_id index.
+        """
+        result = await db.execute(
+            select(User.email)
+            .join(UserPolicy, UserPolicy.user_id == User.id)
+            .where(UserPolicy.policy_id == policy_id)
+        )
+        return list(result.scalars().all())
+
     @staticmethod
     async def count_assignments(policy_id: int, db: AsyncSession) -> int:
         """
@@ -278,6 +336,8 @@ class PolicyRepository:
 
         assignment = UserPolicy(user_id=user_id, policy_id=policy_id, assigned_by=assigned_by)
         db.add(assignment)
+        await db.flush()  # hooks may join against the new user_policies row
+        await policy_change_hooks.policy_assigned(user_id, policy_id, db)
         await db.commit()
         await db.refresh(assignment)
 
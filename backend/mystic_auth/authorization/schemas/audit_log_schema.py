@@ -1,12 +1,18 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict
 
 
 class AuditLogEntryRead(BaseModel):
     """Schema returned by the audit log query API : mirrors
-    AuthorizationAuditLog (see models/audit_log_model.py)."""
+    AuthorizationAuditRecord (see models/audit_record_model.py), i.e. an
+    AuthorizationAuditLog row (kind "decision") or a per-minute rollup
+    counter of routine allows (kind "rollup", decision_count decisions
+    between first_seen_at and created_at, with no per-decision detail).
+    (kind, id) identifies a record; id alone doesn't."""
 
+    kind: Literal["decision", "rollup"] = "decision"
     id: int
     user_email: str
     action: str
@@ -18,5 +24,7 @@ class AuditLogEntryRead(BaseModel):
     failed_conditions: dict[str, list[str]] | None
     context: dict | None
     created_at: datetime
+    first_seen_at: datetime | None = None
+    decision_count: int = 1
 
     model_config = ConfigDict(from_attributes=True)
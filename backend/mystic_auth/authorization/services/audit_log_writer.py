@@ -0,0 +1,287 @@
+"""
+Write-behind pipeline for authorization audit rows.
+
+Every real authorization decision is audited (AuthorizationService.
+_log_decision / authorize_many). Written inline, that costs the request an
+INSERT, a COMMIT and a refresh on its own session, once per decision: a
+route with three checks pays it three times, a 50-item batch check fifty
+times, and every one of them sits on the request's critical path for a row
+the request never reads.
+
+AuditLogWriter takes those rows off the request path: submit() appends
+them to an in-memory queue and returns, and a background task started in
+the app's lifespan writes them in batches (_BATCH_SIZE rows, or whatever
+is queued every _FLUSH_INTERVAL_SECONDS, whichever comes first) as one
+multi-row INSERT and one commit on its own session
+(audit_log_repository.create_entries).
+
+Durability policy, deliberately explicit:
+- created_at is stamped at submit time, so rows record when the decision
+  was made, not when they happened to be flushed.
+- A graceful shutdown (lifespan exit) stops the task and drains the whole
+  queue before the DB pool is disposed, so a normal restart or deploy
+  loses nothing.
+- A hard crash (SIGKILL, OOM) loses at most what was queued since the last
+  flush: about _FLUSH_INTERVAL_SECONDS of decisions. That's the trade for
+  not making every request wait on the audit write.
+- A failed flush (DB unreachable) puts the batch back at the front of the
+  queue and retries on the next tick, so a transient outage delays rows
+  rather than dropping them.
+
+Backpressure policy: the queue is bounded at _MAX_PENDING rows. A submit
+that finds it full flushes inline before returning, so the submitting
+request pays for the write (exactly the old inline cost, amortized over a
+whole batch) instead of memory growing without bound. Rows are only ever
+dropped when a *failed* batch can't be put back without exceeding that
+bound (the database has been unreachable long enough to fill it), and each
+such drop is logged at ERROR with the count.
+
+When the background task isn't running (scripts, tests, anything that
+never entered the app's lifespan), submit() writes inline on the caller's
+session exactly as before this existed, so nothing is ever queued with no
+one to flush it.
+
+Under AUTHORIZATION_AUDIT_MODE="aggregate_allows", submit() first asks
+audit_policy.py which rows must be written in full. The rest are only
+counted: an in-memory counter per (user, action, resource_type, allowed,
+minute), flushed after the full rows as one upsert into
+authorization_audit_rollup (audit_log_repository.upsert_rollups). Counters
+follow the same rules as rows. They count toward _MAX_PENDING. A failed
+upsert merges them back in. They are drained at shutdown. Anything dropped
+is logged with the number of decisions it covered.
+"""
+
+import asyncio
+import traceback
+from collections import deque
+from contextlib import suppress
+from datetime import UTC, datetime
+
+from ...database.connection import database
+from ...logging.logging_config import get_logger
+from ..repositories.audit_log_repository import audit_log_repository
+from .audit_policy import audit_policy
+
+logger = get_logger(__name__)
+
+# Rows per INSERT. Large enough that a busy worker writes a handful of
+# statements a second rather than hundreds, small enough that one statement
+# stays well within asyncpg's bind-parameter limit (10 columns per row).
+_BATCH_SIZE = 500
+
+# Upper bound on how long a decision waits to be written, and so on what a
+# hard crash can lose.
+_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Rows held in memory before submit() applies backpressure (see module
+# docstring). A few seconds of heavy traffic; each row is a small dict.
+_MAX_PENDING = 10_000
+
+# (user_email, action, resource_type, allowed, minute) -> [decision count,
+# first decision time, last decision time]
+type _RollupKey = tuple[str, str, str, bool, datetime]
+type _Rollups = dict[_RollupKey, list]
+
+
+def _count_into(rollups: _Rollups, entries: list[dict], at: datetime) -> None:
+    bucket_start = at.replace(second=0, microsecond=0)
+    for entry in entries:
+        key = (entry["user_email"], entry["action"], entry["resource_type"], entry["allowed"], bucket_start)
+        counter = rollups.get(key)
+        if counter is None:
+            rollups[key] = [1, at, at]
+        else:
+            counter[0] += 1
+            counter[1] = min(counter[1], at)
+            counter[2] = max(counter[2], at)
+
+
+def _rollup_rows(items: list[tuple[_RollupKey, list]]) -> list[dict]:
+    return [
+        {
+            "user_email": user_email,
+            "action": action,
+            "resource_type": resource_type,
+            "allowed": allowed,
+            "bucket_start": bucket_start,
+            "decision_count": count,
+            "first_seen_at": first_seen_at,
+            "last_seen_at": last_seen_at,
+        }
+        for (user_email, action, resource_type, allowed, bucket_start), (count, first_seen_at, last_seen_at) in items
+    ]
+
+
+class AuditLogWriter:
+    def __init__(
+        self,
+        batch_size: int = _BATCH_SIZE,
+        flush_interval_seconds: float = _FLUSH_INTERVAL_SECONDS,
+        max_pending: int = _MAX_PENDING,
+    ) -> None:
+        self._batch_size = batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_pending = max_pending
+        self._pending: deque[dict] = deque()
+        self._rollups: _Rollups = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._written = 0
+        self._failed_flushes = 0
+        self._inline_flushes = 0
+        self._dropped = 0
+        self._rolled_up = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def submit(self, entries: list[dict], db) -> None:
+        """
+        Records audit rows (AuthorizationService._audit_entry dicts), each
+        either in full or only counted, as audit_policy decides. Queued
+        for the background task when it's running; otherwise written inline
+        on `db`, as before this pipeline existed. Never raises for a
+        queued write; an inline write raises like the repository does, and
+        callers already treat audit failures as non-fatal.
+        """
+        if not entries:
+            return
+        full = [entry for entry in entries if audit_policy.logs_in_full(entry)]
+        counted = [entry for entry in entries if not audit_policy.logs_in_full(entry)]
+        submitted_at = datetime.now(UTC)
+
+        if not self.running:
+            if len(full) == 1:
+                await audit_log_repository.create_entry(full[0], db)
+            elif full:
+                await audit_log_repository.create_entries(full, db)
+            if counted:
+                rollups: _Rollups = {}
+                _count_into(rollups, counted, submitted_at)
+                await audit_log_repository.upsert_rollups(_rollup_rows(list(rollups.items())), db)
+            return
+
+        for entry in full:
+            entry.setdefault("created_at", submitted_at)
+        self._pending.extend(full)
+        _count_into(self._rollups, counted, submitted_at)
+
+        if len(self._pending) + len(self._rollups) >= self._max_pending:
+            self._inline_flushes += 1
+            await self.flush()
+        elif len(self._pending) >= self._batch_size or len(self._rollups) >= self._batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Writes everything queued, one batch at a time, each on its own
+        session: full rows first, then rollup counters. Stops at the first
+        failed batch (which goes back on the queue), leaving the rest for
+        the next attempt."""
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+                try:
+                    async with database.async_session() as session:
+                        await audit_log_repository.create_entries(batch, session)
+                except Exception:
+                    self._failed_flushes += 1
+                    logger.warning("Authorization audit flush failed, will retry:\n%s", traceback.format_exc())
+                    self._requeue(batch)
+                    return
+                self._written += len(batch)
+
+            items = list(self._rollups.items())
+            self._rollups = {}
+            for start in range(0, len(items), self._batch_size):
+                batch_items = items[start : start + self._batch_size]
+                try:
+                    async with database.async_session() as session:
+                        await audit_log_repository.upsert_rollups(_rollup_rows(batch_items), session)
+                except Exception:
+                    self._failed_flushes += 1
+                    logger.warning("Authorization audit rollup flush failed, will retry:\n%s", traceback.format_exc())
+                    self._merge_rollups(items[start:])
+                    return
+                self._rolled_up += sum(counter[0] for _, counter in batch_items)
+
+    def _requeue(self, batch: list[dict]) -> None:
+        self._pending.extendleft(reversed(batch))
+        overflow = len(self._pending) - self._max_pending
+        if overflow > 0:
+            # The newest rows go: the oldest have already waited longest
+            # and are the ones a reader is most likely to be missing.
+            for _ in range(overflow):
+                self._pending.pop()
+            self._dropped += overflow
+            logger.error("Authorization audit queue full while the database is failing: dropped %d row(s)", overflow)
+
+    def _merge_rollups(self, items: list[tuple[_RollupKey, list]]) -> None:
+        """Puts unwritten counters back, adding to any counted since for the
+        same key. A key with no counter left is only re-added while there's
+        room under _max_pending; the rest are dropped, like _requeue's
+        overflow."""
+        dropped = 0
+        for key, (count, first_seen_at, last_seen_at) in items:
+            counter = self._rollups.get(key)
+            if counter is not None:
+                counter[0] += count
+                counter[1] = min(counter[1], first_seen_at)
+                counter[2] = max(counter[2], last_seen_at)
+            elif len(self._pending) + len(self._rollups) < self._max_pending:
+                self._rollups[key] = [count, first_seen_at, last_seen_at]
+            else:
+                dropped += count
+        if dropped:
+            self._dropped += dropped
+            logger.error(
+                "Authorization audit queue full while the database is failing: dropped %d counted decision(s)", dropped
+            )
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval_seconds)
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Starts the background flusher (main.py's lifespan startup)."""
+        if self.running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the flusher and drains the queue (lifespan shutdown, before
+        the DB pool is disposed). Lets an in-progress flush finish rather
+        than cancelling it mid-INSERT."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        if self._pending or self._rollups:
+            logger.error(
+                "Authorization audit queue not fully drained at shutdown: %d row(s) and %d counted decision(s) lost",
+                len(self._pending),
+                sum(counter[0] for counter in self._rollups.values()),
+            )
+
+    def stats(self) -> dict[str, int | bool]:
+        return {
+            "pending": len(self._pending),
+            "pending_rollups": len(self._rollups),
+            "written": self._written,
+            "failed_flushes": self._failed_flushes,
+            "inline_flushes": self._inline_flushes,
+            "dropped": self._dropped,
+            "rolled_up": self._rolled_up,
+            "running": self.running,
+        }
+
+
+audit_log_writer = AuditLogWriter()
@@ -0,0 +1,56 @@
+"""
+Which authorization decisions are audited in full, and which are only
+counted.
+
+With AUTHORIZATION_AUDIT_MODE="full" (the default) every decision gets its
+own authorization_audit_log row, as always. With "aggregate_allows", a
+routine allow (the same user reading the same kind of resource over and
+over, which is nearly every decision a busy deployment makes) is instead
+added to a per-minute counter in authorization_audit_rollup: who, what
+action, what resource type, how many times, first and last time. Nobody
+reads those rows one at a time, and they're most of the table's growth.
+
+What is never aggregated, whatever the mode:
+- Denials. A denial is the decision someone actually investigates, and its
+  failed_conditions explanation is only in the full row.
+- Permission's own actions (identity and authorization management: user
+  administration, policy edits and assignment, the security audit read).
+  The same vocabulary AuthorizationService's escalation guard treats as
+  sensitive, so a grant of one of them is always traceable to the exact
+  request, resource and policy that allowed it.
+- Anything listed in AUTHORIZATION_AUDIT_FULL_ACTIONS, for an app's own
+  sensitive business actions.
+
+Applied by AuditLogWriter.submit, the one place every audit row passes
+through, so AuthorizationService's callers record decisions the same way in
+either mode.
+"""
+
+from collections.abc import Iterable
+
+from ...core.settings import settings
+from ..permissions import Permission
+
+
+class AuditPolicy:
+    def __init__(self, aggregate_allows: bool, full_actions: Iterable[str] = ()) -> None:
+        self._aggregate_allows = aggregate_allows
+        self._full_actions = frozenset(permission.value for permission in Permission) | frozenset(full_actions)
+
+    @property
+    def aggregate_allows(self) -> bool:
+        return self._aggregate_allows
+
+    def logs_in_full(self, entry: dict) -> bool:
+        """True if `entry` (an AuthorizationService._audit_entry dict) must
+        be written as its own authorization_audit_log row; False if it is
+        only counted in its minute's rollup."""
+        if not self._aggregate_allows or not entry["allowed"]:
+            return True
+        return entry["action"] in self._full_actions
+
+
+audit_policy = AuditPolicy(
+    aggregate_allows=settings.AUTHORIZATION_AUDIT_MODE == "aggregate_allows",
+    full_actions=settings.authorization_audit_full_actions,
+)
@@ -14,9 +14,12 @@ from ..evaluators.policy_evaluator import policy_evaluation_engine
 # The app's own fixed, known-sensitive action vocabulary: see
 # assert_authorized_to_grant for why only these are escalation-guarded.
 from ..permissions import Permission
-from ..repositories.audit_log_repository import audit_log_repository
 from ..repositories.policy_repository import policy_repository
 
+# Every audit row goes through the write-behind writer: queued and batch-
+# inserted off the request path when the app is running, inline otherwise.
+from .audit_log_writer import audit_log_writer
+
 logger = get_logger(__name__)
 
 # Actions this app itself defines and knows to be sensitive (identity and
@@ -58,10 +61,12 @@ class AuthorizationService:
         role; role must never drive an authorization decision here.
 
         Delegates entirely to authorize_with_decision (computes the
-        decision and logs it) and returns just `.allowed`, a thin bool
-        wrapper, mirroring PolicyEvaluationEngine.evaluate being a thin
-        wrapper over evaluate_detailed. One compute-and-log code path, not
-        two: the batch endpoint's authorize_batch reuses this same path
+        decision and logs it) and returns just `.allowed`. Deliberately not
+        PolicyEvaluationEngine.evaluate's short-circuiting fast path, even
+        though only a bool comes back: every real decision is audited with
+        its explanation (candidate/granting policies, failed_conditions),
+        which only evaluate_detailed produces. One compute-and-log code
+        path, not two: the batch endpoint's authorize_batch reuses this same path
         per check (see below), so a single check and a batch-of-one check
         always produce and log an identical decision.
         """
@@ -209,6 +214,117 @@ class AuthorizationService:
 
         return decisions
 
+    @staticmethod
+    async def authorize_many(
+        user_email: str,
+        action: str,
+        resource_type: str,
+        resources: list[dict | object],
+        db: AsyncSession,
+        context: dict | None = None,
+    ) -> list[bool]:
+        """
+        authorize() for one action against many resources (e.g. "which of
+        these companies may this user read?"), returning one bool per
+        resource, aligned with `resources`. What app code checking N
+        resources in a loop should call instead of N authorize() calls.
+
+        Three things are done once rather than per resource: the policy
+        fetch (as authorize_batch does), narrowing that list to the
+        policies that could grant `action` on `resource_type` at all
+        (PolicyEvaluationEngine.candidate_policies, so each resource only
+        has those policies' conditions checked), and the audit write: every
+        decision still gets its own audit row, identical to the one
+        authorize() would have written, but all of them are handed to
+        audit_log_writer in one submit (one bulk INSERT when written
+        inline).
+
+        Each resource's decision is the same evaluate_detailed call
+        authorize() makes, so authorize_many(..., [r])[0] always equals
+        authorize(..., resource=r). Fails closed per resource, like
+        authorize_batch: a resource whose evaluation raises is denied
+        ("evaluation_error") without affecting the others.
+        """
+        if not resources:
+            return []
+
+        policies = await policy_repository.get_active_policies_for_user(user_email, db)
+        candidates = policy_evaluation_engine.candidate_policies(policies, action, resource_type)
+
+        decisions: list[AuthorizationDecision] = []
+        for resource in resources:
+            try:
+                decision = policy_evaluation_engine.evaluate_detailed(
+                    policies=policies,
+                    action=action,
+                    resource_type=resource_type,
+                    user_email=user_email,
+                    resource=resource,
+                    context=context,
+                    candidates=candidates,
+                )
+            except Exception:
+                logger.warning(
+                    "Bulk authorization check failed to evaluate (action=%s, resource_type=%s):\n%s",
+                    action, resource_type, traceback.format_exc(),
+                )
+                decision = AuthorizationDecision(
+                    allowed=False,
+                    action=action,
+                    resource_type=resource_type,
+                    user=user_email,
+                    denial_reason="evaluation_error",
+                    evaluation_timestamp=datetime.now(UTC).isoformat(),
+                )
+            decisions.append(decision)
+
+        try:
+            await audit_log_writer.submit(
+                [
+                    AuthorizationService._audit_entry(user_email, action, resource_type, resource, context, decision)
+                    for resource, decision in zip(resources, decisions, strict=True)
+                ],
+                db,
+            )
+        except Exception:
+            logger.warning("Failed to write authorization audit log entries:\n%s", traceback.format_exc())
+
+        return [decision.allowed for decision in decisions]
+
+    @staticmethod
+    def _audit_entry(
+        user_email: str,
+        action: str,
+        resource_type: str,
+        resource: dict | object | None,
+        context: dict | None,
+        decision: AuthorizationDecision,
+    ) -> dict:
+        """The audit row for one decision, shared by _log_decision (one row)
+        and authorize_many (many rows in one insert) so both record
+        exactly the same thing."""
+        # resource is often an arbitrary dict/object with no guaranteed
+        # key, so this is a best-effort identifier for the log entry.
+        resource_identifier = None
+        if isinstance(resource, dict):
+            resource_identifier = resource.get("email") or resource.get("id")
+        elif resource is not None:
+            resource_identifier = getattr(resource, "email", None) or getattr(resource, "id", None)
+        if resource_identifier is not None:
+            resource_identifier = str(resource_identifier)
+
+        return {
+            "user_email": user_email,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_identifier": resource_identifier,
+            "allowed": decision.allowed,
+            "candidate_policy_names": decision.matched_policies + decision.rejected_policies,
+            "granting_policy_names": decision.matched_policies,
+            "failed_conditions": decision.failed_conditions or None,
+            "context": context,
+        }
+
     @staticmethod
     async def _log_decision(
         user_email: str,
@@ -232,30 +348,14 @@ class AuthorizationService:
         never re-raised. The route/caller that asked for this decision has
         already gotten (or will get) its answer regardless of whether the
         audit write succeeded.
+
+        Handed to audit_log_writer (see audit_log_writer.py): in the running
+        app the row is queued and batch-written off the request path, so
+        the request no longer pays an INSERT/COMMIT/refresh per decision.
         """
         try:
-            # resource is often an arbitrary dict/object with no guaranteed
-            # key, so this is a best-effort identifier for the log entry.
-            resource_identifier = None
-            if isinstance(resource, dict):
-                resource_identifier = resource.get("email") or resource.get("id")
-            elif resource is not None:
-                resource_identifier = getattr(resource, "email", None) or getattr(resource, "id", None)
-            if resource_identifier is not None:
-                resource_identifier = str(resource_identifier)
-
-            await audit_log_repository.create_entry(
-                {
-                    "user_email": user_email,
-                    "action": action,
-                    "resource_type": resource_type,
-                    "resource_identifier": resource_identifier,
-                    "allowed": decision.allowed,
-                    "candidate_policy_names": decision.matched_policies + decision.rejected_policies,
-                    "granting_policy_names": decision.matched_policies,
-                    "failed_conditions": decision.failed_conditions or None,
-                    "context": context,
-                },
+            await audit_log_writer.submit(
+                [AuthorizationService._audit_entry(user_email, action, resource_type, resource, context, decision)],
                 db,
             )
         except Exception:
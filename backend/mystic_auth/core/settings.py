@@ -27,6 +27,18 @@ class Settings(BaseSettings):
     REDIS_URL: str
     CACHE_DEFAULT_TTL: int                          # Default TTL for Redis cache keys, in seconds
 
+    PAGINATION_EXACT_COUNT_LIMIT: int = 10000       # Paginated lists count matching rows exactly up to this many; past it X-Total-Count is the planner's estimate (X-Total-Count-Estimated: true). See database/pagination.py.
+
+    AUTHORIZATION_AUDIT_MODE: str = "full"          # "full" (default): one authorization_audit_log row per decision. "aggregate_allows": routine allows roll up into per-minute counters instead; denials and sensitive actions are still logged in full. See authorization/services/audit_policy.py.
+    AUTHORIZATION_AUDIT_FULL_ACTIONS: str = ""      # Optional, comma-separated actions always logged in full under "aggregate_allows", on top of Permission's own (always-full) vocabulary, e.g. an app's own sensitive business actions.
+    AUTHORIZATION_AUDIT_RETENTION_MONTHS: int = 0   # Whole months of authorization_audit_log kept before the current one; older monthly partitions are dropped. 0 (default) = keep forever. See database/partitions.py.
+    SECURITY_AUDIT_RETENTION_MONTHS: int = 0        # Same, for security_audit_log.
+
+    STARTUP_WARMUP_ENABLED: bool = False            # Warm DB/Redis connections, hot SQL and recently active users' cached policies at startup, holding /health/ready until done. See core/startup_warmup.py.
+    STARTUP_WARMUP_DB_CONNECTIONS: int = 5          # Pool connections opened by the warm-up (capped at the pool's size).
+    STARTUP_WARMUP_POLICY_USERS: int = 200          # Most recently active users (by live user_sessions) whose policy lists the warm-up caches; 0 = none.
+    STARTUP_WARMUP_TIMEOUT_SECONDS: int = 30        # Readiness is released after this long even if the warm-up hasn't finished.
+
     FROM_EMAIL: str                                 # Email address used to send verification/password-reset emails
     GMAIL_APP_PASSWORD: str                         # Gmail App password for the FROM_EMAIL account
     SUPPORT_EMAIL: str = ""                         # Reply-to/contact address shown in email footers (defaults to FROM_EMAIL if unset)
@@ -78,6 +90,32 @@ class Settings(BaseSettings):
             raise ValueError("SECRET_KEY must be at least 32 characters long")
         return value
 
+    @field_validator("AUTHORIZATION_AUDIT_MODE")
+    @classmethod
+    def _known_authorization_audit_mode(cls, value: str) -> str:
+        # A typo here would otherwise silently mean "full" (or worse, be
+        # read as aggregation being on when it isn't); fail at startup.
+        if value not in ("full", "aggregate_allows"):
+            raise ValueError('AUTHORIZATION_AUDIT_MODE must be "full" or "aggregate_allows"')
+        return value
+
+    @field_validator("AUTHORIZATION_AUDIT_RETENTION_MONTHS", "SECURITY_AUDIT_RETENTION_MONTHS")
+    @classmethod
+    def _non_negative_retention(cls, value: int) -> int:
+        # Negative would read as "drop partitions from the future".
+        if value < 0:
+            raise ValueError("Audit retention must be 0 (keep forever) or a positive number of months")
+        return value
+
+    @field_validator(
+        "STARTUP_WARMUP_DB_CONNECTIONS", "STARTUP_WARMUP_POLICY_USERS", "STARTUP_WARMUP_TIMEOUT_SECONDS"
+    )
+    @classmethod
+    def _non_negative_warmup_limit(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("Startup warm-up limits must be 0 or positive")
+        return value
+
     @property
     def cors_allowed_origins(self) -> list[str]:
         """
@@ -97,5 +135,13 @@ class Settings(BaseSettings):
         # itself (allow_origins is checked as an unordered set of matches).
         return list(dict.fromkeys([self.FRONTEND_BASE_URL, *(o for o in extra if o)]))
 
+    @property
+    def authorization_audit_full_actions(self) -> frozenset[str]:
+        """AUTHORIZATION_AUDIT_FULL_ACTIONS parsed, same comma-separated
+        convention as FRONTEND_ADDITIONAL_BASE_URLS above."""
+        return frozenset(
+            action.strip() for action in self.AUTHORIZATION_AUDIT_FULL_ACTIONS.split(",") if action.strip()
+        )
+
 
 settings = Settings()
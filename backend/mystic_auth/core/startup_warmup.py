@@ -0,0 +1,178 @@
+"""
+Optional warm-up stage run from main.py's lifespan (STARTUP_WARMUP_ENABLED).
+
+A freshly started worker pays several one-off costs on its first requests:
+opening database connections (TCP + TLS + auth) one request at a time,
+opening its Redis connection, SQLAlchemy compiling each hot statement
+(and, under asyncpg, every connection preparing it), and a policy-list
+cache miss for whoever it serves first if the cache was flushed or bumped
+by the deploy. Each is small, but together they land on the first requests
+of every worker on every rollout, as a latency spike.
+
+StartupWarmup pays them up front instead:
+- opens STARTUP_WARMUP_DB_CONNECTIONS pool connections at once (capped at
+  the pool's size, since overflow connections are closed on return) and
+  runs the hot request-path statements on each of them: that compiles
+  them into the engine's statement cache and prepares them on every
+  connection;
+- pings Redis, opening its pooled connection;
+- loads the policy lists of the STARTUP_WARMUP_POLICY_USERS most recently
+  active users (by live user_sessions rows) through the normal
+  cache-aside path, so whichever are missing from Redis are put back.
+
+It runs in the background: /health (liveness) answers immediately, while
+/health/ready reports the warm-up as "pending" (503) until it finishes, so
+a rolling deploy doesn't route traffic to a worker still warming up. It is
+best-effort throughout: a failed step is logged and the rest still run,
+and after STARTUP_WARMUP_TIMEOUT_SECONDS the worker is released regardless.
+Readiness then rests on its own database/Redis checks, as without this.
+"""
+
+import asyncio
+import time
+import traceback
+from contextlib import suppress
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from ..authorization.repositories.policy_repository import policy_repository
+from ..database.connection import database
+from ..logging.logging_config import get_logger
+from ..redis.client import redis_client
+from ..user_crud.user_crud_collector import user_crud
+from ..user_session.session_model import UserSession
+from ..user_table.user_model import User
+from .settings import settings
+
+logger = get_logger(__name__)
+
+# Bound into the hot statements when only compiling/preparing them: the
+# reserved .invalid TLD can't match a real account, so nothing is loaded.
+_PROBE_EMAIL = "startup-warmup@example.invalid"
+
+
+async def _run_hot_statements(db: AsyncSession) -> None:
+    """The statements behind every authenticated request: the current
+    user's row (get_current_user) and their active policies on a cache miss."""
+    await user_crud.get_by_email(_PROBE_EMAIL, db)
+    await db.execute(policy_repository.active_policies_statement(_PROBE_EMAIL))
+
+
+def _pool_connections(requested: int) -> int:
+    size = getattr(database.engine.pool, "size", None)
+    return min(requested, size()) if callable(size) else requested
+
+
+async def warm_database(connections: int) -> int:
+    """Opens `connections` pool connections concurrently and runs the hot
+    statements on each. Returns how many were opened."""
+    opened = await asyncio.gather(
+        *(database.engine.connect().start() for _ in range(_pool_connections(connections))),
+        return_exceptions=True,
+    )
+    live = [connection for connection in opened if isinstance(connection, AsyncConnection)]
+    try:
+        for connection in live:
+            async with AsyncSession(bind=connection) as session:
+                await _run_hot_statements(session)
+    finally:
+        for connection in live:
+            with suppress(Exception):
+                await connection.close()
+    if len(live) < len(opened):
+        logger.warning("Startup warm-up opened %d of %d database connection(s)", len(live), len(opened))
+    return len(live)
+
+
+async def recently_active_users(limit: int, db: AsyncSession) -> list[str]:
+    """Emails of the `limit` active users with the most recently used live
+    session, most recent first."""
+    result = await db.execute(
+        select(User.email)
+        .join(UserSession, UserSession.user_id == User.id)
+        .where(
+            User.is_active.is_(True),
+            UserSession.revoked_at.is_(None),
+            UserSession.expires_at > func.now(),
+        )
+        .group_by(User.email)
+        .order_by(func.max(UserSession.last_used_at).desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def preload_policies(limit: int) -> int:
+    """Loads the policy lists of the `limit` most recently active users
+    through get_active_policies_for_user, which caches any that were
+    missing. Returns how many users were loaded."""
+    if limit <= 0:
+        return 0
+    async with database.async_session() as session:
+        emails = await recently_active_users(limit, session)
+        for email in emails:
+            await policy_repository.get_active_policies_for_user(email, session)
+    return len(emails)
+
+
+class StartupWarmup:
+    """The warm-up's state, read by /health/ready, and its background task
+    (started and stopped by main.py's lifespan)."""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self._finished = False
+        self._report: dict[str, object] = {}
+
+    @property
+    def state(self) -> str | None:
+        """None if no warm-up was started in this process, else "pending"
+        until it has finished (successfully or not), then "ok"."""
+        if self._task is None:
+            return None
+        return "ok" if self._finished else "pending"
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancels a warm-up still running at shutdown."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    async def _step(self, name: str, step) -> None:
+        try:
+            self._report[name] = await step
+        except Exception:
+            self._report[name] = "error"
+            logger.warning("Startup warm-up step %s failed:\n%s", name, traceback.format_exc())
+
+    async def _warm(self) -> None:
+        await self._step("database_connections", warm_database(settings.STARTUP_WARMUP_DB_CONNECTIONS))
+        await self._step("redis", redis_client.ping())
+        await self._step("policy_users", preload_policies(settings.STARTUP_WARMUP_POLICY_USERS))
+
+    async def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._warm(), timeout=settings.STARTUP_WARMUP_TIMEOUT_SECONDS)
+            logger.info("Startup warm-up finished in %.2fs: %s", time.perf_counter() - started, self._report)
+        except TimeoutError:
+            logger.warning(
+                "Startup warm-up timed out after %ss, marking ready anyway: %s",
+                settings.STARTUP_WARMUP_TIMEOUT_SECONDS,
+                self._report,
+            )
+        finally:
+            self._finished = True
+
+    def stats(self) -> dict[str, object]:
+        return {"state": self.state, **self._report}
+
+
+startup_warmup = StartupWarmup()
@@ -0,0 +1,37 @@
+"""
+Shared "column is one of these values" predicate for every query whose value
+list varies per request (a user's scoped company ids, a bulk request's
+tickers, ...).
+
+SQLAlchemy renders `column.in_(values)` as an "expanding" parameter: at
+execution time it becomes `IN ($1, $2, ..., $n)`, one bind per value. Every
+distinct list length is therefore a distinct SQL string, and asyncpg's
+prepared-statement cache (keyed on that string) misses on each new length:
+a user scoped to 317 companies and one scoped to 318 each pay a fresh
+parse/plan, and each leaves its own entry behind in a cache that holds only
+a few hundred statements per connection. At thousands of ids the parse of
+the statement text itself becomes a measurable share of the request.
+
+any_of renders `column = ANY($1::<type>[])` instead: one array parameter,
+the same SQL string for 1 value or 10,000, so the statement is prepared
+once per connection and reused. Postgres plans `= ANY(array)` exactly like
+the IN list it replaces (an index/bitmap scan on the column), see
+tests/backend/app/performance/test_company_scope_filter_performance.py for
+the measured difference.
+
+Fixed, code-defined lists (e.g. the audit log's login event types) don't
+need this: their length never varies, so `in_` already produces one
+statement.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import ColumnElement, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def any_of(column, values: Iterable) -> ColumnElement[bool]:
+    """`column = ANY(:values)` with `values` bound as one array of the
+    column's own type (sets/frozensets welcome, they're listed here). An
+    empty list matches nothing, same as an empty `in_`."""
+    return column == any_(bindparam(None, list(values), type_=ARRAY(column.type)))
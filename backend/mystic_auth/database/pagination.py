@@ -0,0 +1,117 @@
+"""
+Shared "one page of rows plus the total" helper behind every paginated list
+endpoint's X-Total-Count header (GET /users/, both audit logs, and the app's
+own GET /companies/).
+
+Each of those used to run two statements per request: the filtered page,
+then a separate COUNT(*) with the same filters. fetch_page folds the count
+into the page query as an uncorrelated scalar subquery, so Postgres
+evaluates it once (an InitPlan) and every returned row carries the same
+total: one round trip instead of two, with the page and its total read from
+the same snapshot.
+
+Why a scalar subquery rather than COUNT(*) OVER (): a window over the
+filtered set has to materialize every matching row before LIMIT can discard
+all but one page of them, which is exactly what an ORDER BY ... LIMIT served
+from an index avoids. The subquery counts independently of the page, so the
+page half keeps its own index-ordered early-exit plan.
+
+Exact counts stop being worth it on very large filtered sets (a bare
+audit-log listing over millions of rows), where counting is most of the
+request's cost and nobody pages to the end anyway. The subquery therefore
+stops counting at settings.PAGINATION_EXACT_COUNT_LIMIT + 1 rows; past that,
+the total falls back to the planner's own row estimate for the filtered
+query (one EXPLAIN, no execution) and the Page is flagged as an estimate so
+the route can say so in X-Total-Count-Estimated.
+"""
+
+import json
+from dataclasses import dataclass
+
+from fastapi import Response
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.settings import settings
+
+
+@dataclass(frozen=True)
+class Page[T]:
+    items: list[T]
+    total: int
+    # True when total came from the planner's row estimate rather than a
+    # count, see module docstring.
+    total_is_estimate: bool = False
+
+
+async def _estimated_row_count(stmt: Select, db: AsyncSession) -> int:
+    """The planner's top-level "Plan Rows" for `stmt`, from EXPLAIN alone
+    (the query itself is never run). Bound parameters are inlined because
+    EXPLAIN can't take a parameter list through asyncpg's prepared-statement
+    path; every value reaching here is a typed filter value SQLAlchemy
+    already bound, never raw SQL from a caller, and it's rendered with the
+    live connection's dialect so string escaping matches the server's
+    standard_conforming_strings setting.
+
+    Sent with exec_driver_sql, as-is, never through text(): text() would
+    re-parse the rendered SQL and take a ":word" inside an inlined search
+    term (e.g. "acme :corp") for a bind parameter of its own."""
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    connection = await db.connection()
+    plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar_one()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def fetch_page[T](
+    stmt: Select,
+    db: AsyncSession,
+    *,
+    order_by: list,
+    limit: int,
+    offset: int,
+    exact_count_limit: int | None = None,
+) -> Page[T]:
+    """
+    `stmt` is the fully filtered single-entity select (e.g.
+    `select(User).where(...)`) with no ORDER BY/LIMIT of its own yet; the
+    page's ordering and window are passed separately since the count must
+    not see them.
+
+    An empty page past offset 0 carries no row to read the total from, so
+    that one case falls back to a standalone count; it's also the one case
+    (a client paging beyond the end) where an extra round trip is harmless.
+    """
+    cap = settings.PAGINATION_EXACT_COUNT_LIMIT if exact_count_limit is None else exact_count_limit
+
+    matching: Select = stmt.with_only_columns(literal_column("1"), maintain_column_froms=True).order_by(None)
+    capped = matching.limit(cap + 1)
+    total_subquery = select(func.count()).select_from(capped.subquery()).scalar_subquery()
+
+    page_stmt = stmt.add_columns(total_subquery.label("total")).order_by(*order_by).limit(limit).offset(offset)
+    rows = (await db.execute(page_stmt)).all()
+
+    if rows:
+        total = rows[0].total
+    elif offset == 0:
+        total = 0
+    else:
+        total = await db.scalar(select(func.count()).select_from(capped.subquery()))
+
+    items = [row[0] for row in rows]
+    if total <= cap:
+        return Page(items=items, total=total)
+
+    # At least cap + 1 rows are known to exist, so never report fewer even
+    # if the planner's statistics lag behind a recent bulk insert.
+    estimate = await _estimated_row_count(matching, db)
+    return Page(items=items, total=max(estimate, cap + 1), total_is_estimate=True)
+
+
+def set_total_count_headers(response: Response, page: Page) -> None:
+    """X-Total-Count for every paginated list route, plus
+    X-Total-Count-Estimated when the total is a planner estimate. The
+    header is always present ("true"/"false") so clients can key off it
+    without a missing-header special case."""
+    response.headers["X-Total-Count"] = str(page.total)
+    response.headers["X-Total-Count-Estimated"] = "true" if page.total_is_estimate else "false"
@@ -0,0 +1,235 @@
+"""
+Monthly partitions for the two append-only audit tables,
+authorization_audit_log and security_audit_log.
+
+Both tables are range-partitioned on created_at, one partition per calendar
+month (UTC), by migration f1b3d5e7a9c2. That keeps newest-first listings and
+date-bounded reads like get_login_trend confined to the last partition or
+two however large the history gets. It also makes retention a metadata
+operation: an expired month is detached and dropped as a whole table in
+O(1), instead of a DELETE that rewrites index entries row by row and leaves
+the table bloated for VACUUM to clean up.
+
+Partitions have to exist before rows arrive for their month. maintain_partitions()
+creates the current month and the next _MONTHS_AHEAD, and drops the months
+that fall entirely outside each table's retention window
+(AUTHORIZATION_AUDIT_RETENTION_MONTHS / SECURITY_AUDIT_RETENTION_MONTHS,
+0 = keep forever). It's run:
+- from main.py's lifespan, at startup and every
+  _MAINTENANCE_INTERVAL_SECONDS after, by run_partition_maintenance(); and
+- on demand by `python -m mystic_auth.scripts.maintain_audit_partitions`,
+  for cron or before turning retention on.
+
+Every run is idempotent, and concurrent runs from several workers serialize
+on a transaction-scoped advisory lock: whoever loses just skips.
+
+Each table also has a DEFAULT partition, a safety net so an insert never
+fails for a month nobody created (only possible if maintenance hasn't run
+for _MONTHS_AHEAD months). Rows landing there are reported at WARNING, since
+Postgres refuses to create a month's partition while the default still
+holds rows for it; move them out by hand before the next run.
+"""
+
+import asyncio
+import re
+import traceback
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+
+from sqlalchemy import exists, func, select, text
+from sqlalchemy import table as sql_table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.settings import settings
+from ..logging.logging_config import get_logger
+from .connection import database
+
+logger = get_logger(__name__)
+
+# Future months kept ready, so a missed run (or several) never leaves the
+# next month without a partition.
+_MONTHS_AHEAD = 3
+
+_MAINTENANCE_INTERVAL_SECONDS = 6 * 60 * 60
+
+# pg_try_advisory_xact_lock key serializing maintenance across workers.
+_MAINTENANCE_LOCK_KEY = 0x61756474  # "audt"
+
+# DETACH/DROP need a brief ACCESS EXCLUSIVE lock on the parent table. Behind
+# a long-running read they'd queue, and every insert would queue behind them,
+# so give up quickly instead and retry on the next run.
+_LOCK_TIMEOUT = "5s"
+
+# Partition names end in _pYYYY_MM (the month whose rows they hold).
+_MONTH_SUFFIX_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    name: str
+    # Whole months of history kept before the current one; 0 keeps
+    # everything.
+    retention_months: int
+
+
+def partitioned_audit_tables() -> tuple[PartitionedTable, ...]:
+    return (
+        PartitionedTable("authorization_audit_log", settings.AUTHORIZATION_AUDIT_RETENTION_MONTHS),
+        PartitionedTable("security_audit_log", settings.SECURITY_AUDIT_RETENTION_MONTHS),
+    )
+
+
+def add_months(month: date, months: int) -> date:
+    """The first day of the month `months` after `month`'s (negative for
+    earlier)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_month(table: str, name: str) -> date | None:
+    """The month a partition of `table` named by partition_name() holds, or
+    None for any other child (the DEFAULT partition, or anything attached by
+    hand, which maintenance never touches)."""
+    if not name.startswith(f"{table}_p"):
+        return None
+    match = _MONTH_SUFFIX_RE.search(name)
+    if match is None or match.start() != len(table):
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expired_partitions(table: PartitionedTable, names: list[str], today: date) -> list[str]:
+    """The partitions of `table` whose whole month falls before the
+    retention window: with retention_months=12 in October 2026, everything
+    up to and including September 2025 goes."""
+    if table.retention_months <= 0:
+        return []
+    cutoff = add_months(today.replace(day=1), -table.retention_months)
+    expired = []
+    for name in names:
+        month = partition_month(table.name, name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def _checked_identifiers(table: str, partitions: list[str] | None = None) -> None:
+    """Raises ValueError unless `table` is one of partitioned_audit_tables()
+    and every name in `partitions` is one of its monthly partitions.
+    Identifiers can't be bound parameters, so the DDL below interpolates
+    them; checking them against those fixed names first means nothing
+    else ever reaches that SQL."""
+    if table not in {audit_table.name for audit_table in partitioned_audit_tables()}:
+        raise ValueError(f"{table!r} is not a partitioned audit table")
+    for name in partitions or []:
+        if partition_month(table, name) is None:
+            raise ValueError(f"{name!r} is not a monthly partition of {table}")
+
+
+async def _partition_names(table: str, db: AsyncSession) -> list[str]:
+    result = await db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table)"
+        ),
+        {"table": table},
+    )
+    return list(result.scalars().all())
+
+
+async def _ensure_partitions(table: str, existing: list[str], db: AsyncSession, today: date) -> list[str]:
+    _checked_identifiers(table)
+    created = []
+    current = today.replace(day=1)
+    for offset in range(_MONTHS_AHEAD + 1):
+        month = add_months(current, offset)
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        # Identifiers come from partitioned_audit_tables() and partition_name(),
+        # never from a caller (see _checked_identifiers); the bounds are
+        # explicit UTC midnights so they don't depend on the session's TimeZone.
+        await db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def _drop_partitions(table: str, names: list[str], db: AsyncSession) -> None:
+    _checked_identifiers(table, names)
+    for name in names:
+        await db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+        await db.execute(text(f'DROP TABLE "{name}"'))
+
+
+async def _warn_if_default_partition_has_rows(table: str, db: AsyncSession) -> None:
+    _checked_identifiers(table)
+    has_rows = await db.scalar(select(exists().select_from(sql_table(f"{table}_default"))))
+    if has_rows:
+        logger.warning(
+            "Rows have landed in %s_default: a monthly partition was missing when they were written. "
+            "Move them into their month's partition (see database/partitions.py).",
+            table,
+        )
+
+
+async def maintain_table(table: PartitionedTable, db: AsyncSession, today: date) -> dict[str, list[str]] | None:
+    """
+    One table's maintenance, in `db`'s current transaction: creates the
+    missing months from `today`'s through _MONTHS_AHEAD ahead, and drops
+    expired ones. Returns what it created and dropped, or None if another
+    worker holds the maintenance lock (nothing done).
+    """
+    await db.execute(text(f"SET LOCAL lock_timeout = '{_LOCK_TIMEOUT}'"))
+    if not await db.scalar(select(func.pg_try_advisory_xact_lock(_MAINTENANCE_LOCK_KEY))):
+        return None
+
+    existing = await _partition_names(table.name, db)
+    created = await _ensure_partitions(table.name, existing, db, today)
+    dropped = expired_partitions(table, existing, today)
+    await _drop_partitions(table.name, dropped, db)
+    await _warn_if_default_partition_has_rows(table.name, db)
+    return {"created": created, "dropped": dropped}
+
+
+async def maintain_partitions(today: date | None = None) -> dict[str, dict[str, list[str]] | None]:
+    """Runs maintain_table for every partitioned audit table, each in its
+    own transaction, so a lock timeout on one doesn't undo the other's
+    work. Returns the per-table results."""
+    today = today or datetime.now(UTC).date()
+    results: dict[str, dict[str, list[str]] | None] = {}
+    for table in partitioned_audit_tables():
+        async with database.async_session() as session, session.begin():
+            results[table.name] = await maintain_table(table, session, today)
+        result = results[table.name]
+        if result and (result["created"] or result["dropped"]):
+            logger.info(
+                "Audit partitions for %s: created %s, dropped %s", table.name, result["created"], result["dropped"]
+            )
+    return results
+
+
+async def run_partition_maintenance(interval_seconds: float = _MAINTENANCE_INTERVAL_SECONDS) -> None:
+    """
+    maintain_partitions() at startup and then every `interval_seconds`,
+    for main.py's lifespan. A failed run (database unreachable, lock
+    timeout) is logged and retried on the next tick; with _MONTHS_AHEAD
+    months already created there's plenty of slack for that. Runs until
+    cancelled at shutdown.
+    """
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception:
+            logger.warning("Audit partition maintenance failed, will retry:\n%s", traceback.format_exc())
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,55 @@
+"""
+Shared free-text search helpers for every list endpoint's `search` param
+(users, both audit logs, and the app's own companies list).
+
+All of them are case-insensitive substring matches, which is what the UI's
+search boxes have always promised. A plain B-tree index can't serve
+`ILIKE '%term%'` (no fixed prefix to seek on), so each searched column also
+carries a pg_trgm GIN index (`gin_trgm_ops`, see migration
+b4d8f2a6c0e3): Postgres then answers the ILIKE from the trigram index
+instead of a sequential scan, provided the term is at least three
+characters long (shorter terms have no complete trigram to look up and fall
+back to a scan, which on a term that short would match most rows anyway).
+
+The match itself stays a real ILIKE rather than pg_trgm's fuzzy `%`
+operator: a search for "acme" must keep returning exactly the rows that
+contain "acme", not also ones that merely look similar. Similarity is only
+used to *order* those matches, so the closest hit (an exact email, a
+ticker typed in full) comes first instead of wherever the default sort
+happened to put it.
+"""
+
+from sqlalchemy import ColumnElement, func, literal, or_
+
+# Backslash is Postgres's default LIKE escape character too; passed
+# explicitly anyway so the intent survives anyone changing
+# standard_conforming_strings or the dialect's defaults.
+_LIKE_ESCAPE = "\\"
+
+
+def _escape_like(term: str) -> str:
+    """`%` and `_` typed into a search box are literal characters to the
+    user, not wildcards."""
+    return term.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2).replace("%", r"\%").replace("_", r"\_")
+
+
+def substring_match(term: str, *columns) -> ColumnElement[bool]:
+    """Case-insensitive "`term` appears somewhere in any of `columns`",
+    shaped so each column's trigram index can serve it (one ILIKE per
+    column, OR'd: Postgres BitmapOr's the per-index matches)."""
+    pattern = f"%{_escape_like(term)}%"
+    return or_(*(column.ilike(pattern, escape=_LIKE_ESCAPE) for column in columns))
+
+
+def similarity_rank(term: str, *columns) -> ColumnElement[float]:
+    """
+    pg_trgm similarity (0..1) of `term` to the best-matching of `columns`,
+    for ordering substring_match's results best-first. Meant to be sorted
+    descending, followed by the endpoint's usual keys as tiebreakers.
+
+    GREATEST skips NULLs, so a nullable column (e.g. security_audit_log's
+    user_email) just doesn't contribute rather than nulling out the rank.
+    """
+    term_literal = literal(term)
+    scores = [func.similarity(column, term_literal) for column in columns]
+    return scores[0] if len(scores) == 1 else func.greatest(*scores)
@@ -0,0 +1,35 @@
+import asyncio
+
+from ..database.partitions import maintain_partitions
+from ..logging.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def maintain_audit_partitions():
+    """
+    One run of the audit tables' partition maintenance (see
+    database/partitions.py): creates the current and next few months'
+    partitions, and drops months outside AUTHORIZATION_AUDIT_RETENTION_MONTHS /
+    SECURITY_AUDIT_RETENTION_MONTHS. The running app already does this at
+    startup and every few hours; this is for cron on deployments that would
+    rather schedule it themselves, and for seeing what a retention setting
+    would drop right now.
+
+    Safe to run at any time, alongside the app: idempotent, and serialized
+    with the app's own runs by the same advisory lock.
+
+    Run:
+        python -m mystic_auth.scripts.maintain_audit_partitions
+    """
+    results = await maintain_partitions()
+    for table, result in results.items():
+        if result is None:
+            print(f" {table}: skipped, another maintenance run holds the lock.")
+            continue
+        print(f" {table}: created {result['created'] or 'nothing'}, dropped {result['dropped'] or 'nothing'}.")
+    logger.info("Audit partition maintenance run via CLI: %s", results)
+
+
+if __name__ == "__main__":
+    asyncio.run(maintain_audit_partitions())
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..database.pagination import Page
 from ..user_table.user_model import User, UserRole
 from .user_crud_modules.user_base_crud import UserBaseCRUD, UserStatus
 from .user_crud_modules.user_email_crud import UserEmailCRUD
@@ -46,6 +47,30 @@ class UserCRUDCollector:
             sort_dir=sort_dir,
         )
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int = 1000,
+        offset: int = 0,
+        search: str | None = None,
+        role: UserRole | None = None,
+        is_verified: bool | None = None,
+        status: UserStatus | None = None,
+        sort_by: str | None = None,
+        sort_dir: str = "asc",
+    ) -> Page:
+        return await self.base.get_page(
+            db,
+            limit=limit,
+            offset=offset,
+            search=search,
+            role=role,
+            is_verified=is_verified,
+            status=status,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+        )
+
     async def count(
         self,
         db: AsyncSession,
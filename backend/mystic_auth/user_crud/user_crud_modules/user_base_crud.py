@@ -1,9 +1,11 @@
 from typing import Literal
 
-from sqlalchemy import asc, desc, func, or_
+from sqlalchemy import asc, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from ...database.pagination import Page, fetch_page
+from ...database.text_search import similarity_rank, substring_match
 from ...emails.email_normalization import normalize_email
 from ...user_table.user_model import UserRole
 
@@ -31,10 +33,10 @@ class UserBaseCRUD:
         # Case-insensitive substring match against name or email, mirroring
         # UsersPage's old client-side filter now that pagination means the
         # frontend can no longer just filter an already-fully-loaded list.
+        # Served by the users table's pg_trgm indexes, see text_search.py.
         if not search:
             return None
-        pattern = f"%{search}%"
-        return or_(self.model.name.ilike(pattern), self.model.email.ilike(pattern))
+        return substring_match(search, self.model.name, self.model.email)
 
     def _status_filter(self, status: UserStatus | None):
         """Status is a UI-level label derived from two real columns, not a
@@ -70,11 +72,15 @@ class UserBaseCRUD:
             stmt = stmt.where(status_condition)
         return stmt
 
-    def _order_by(self, sort_by: str | None, sort_dir: str):
+    def _order_by(self, sort_by: str | None, sort_dir: str, search: str | None = None):
         column = getattr(self.model, sort_by, None) if sort_by in _SORTABLE_COLUMN_NAMES else None
+        direction = asc if sort_dir == "asc" else desc
+        if column is None and search:
+            # No explicit sort on a search: best match first (an exact email
+            # ahead of every address merely containing it), id breaking ties.
+            return [desc(similarity_rank(search, self.model.name, self.model.email)), direction(self.model.id)]
         if column is None:
             column = self.model.id
-        direction = asc if sort_dir == "asc" else desc
         # id as a secondary key for stable ordering (e.g. many rows sharing
         # the same role), same reasoning as the audit log repositories.
         return [direction(column), direction(self.model.id)]
@@ -95,10 +101,29 @@ class UserBaseCRUD:
         # history) bounds its query the same way; this one previously read
         # the whole table unconditionally.
         stmt = self._apply_filters(select(self.model), search, role, is_verified, status)
-        stmt = stmt.order_by(*self._order_by(sort_by, sort_dir)).limit(limit).offset(offset)
+        stmt = stmt.order_by(*self._order_by(sort_by, sort_dir, search)).limit(limit).offset(offset)
         result = await db.execute(stmt)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int = 1000,
+        offset: int = 0,
+        search: str | None = None,
+        role: UserRole | None = None,
+        is_verified: bool | None = None,
+        status: UserStatus | None = None,
+        sort_by: str | None = None,
+        sort_dir: str = "asc",
+    ) -> Page:
+        """get_all's page and count's total in one round trip (see
+        database/pagination.py), for list_all_users' X-Total-Count."""
+        stmt = self._apply_filters(select(self.model), search, role, is_verified, status)
+        return await fetch_page(
+            stmt, db, order_by=self._order_by(sort_by, sort_dir, search), limit=limit, offset=offset
+        )
+
     async def count(
         self,
         db: AsyncSession,
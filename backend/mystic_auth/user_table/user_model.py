@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum
+from sqlalchemy import DateTime, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -32,6 +32,13 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        # pg_trgm GIN indexes backing the users list's substring `search` on
+        # name/email (UserBaseCRUD._search_filter). Plain B-tree indexes can't
+        # serve an unanchored ILIKE; see migration b4d8f2a6c0e3.
+        Index("ix_users_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
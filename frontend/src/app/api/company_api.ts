@@ -20,6 +20,8 @@ export interface CompanyStats {
     total: number;
     group_roots: number;
     subsidiaries: number;
+    with_balance_sheets: number;
+    without_balance_sheets: number;
 }
 
 export interface CompanyCreatePayload {
@@ -1,6 +1,12 @@
 import api from "./axiosInstance";
 
 export interface AuthorizationAuditLogEntryRead {
+    /** "decision": one authorization_audit_log row. "rollup": a per-minute
+     * counter of routine allows (decision_count of them between
+     * first_seen_at and created_at), logged that way when the backend's
+     * AUTHORIZATION_AUDIT_MODE is "aggregate_allows". Ids are only unique
+     * per kind. */
+    kind: "decision" | "rollup";
     id: number;
     user_email: string;
     action: string;
@@ -12,6 +18,8 @@ export interface AuthorizationAuditLogEntryRead {
     failed_conditions: Record<string, string[]> | null;
     context: Record<string, unknown> | null;
     created_at: string;
+    first_seen_at: string | null;
+    decision_count: number;
 }
 
 export interface SecurityAuditLogEntryRead {
@@ -55,7 +55,7 @@ const AllAuthorizationLogSection: React.FC = () => {
             <DataTable
                 columns={authorizationColumns}
                 rows={data?.rows}
-                rowKey={(e) => e.id}
+                rowKey={(e) => `${e.kind}:${e.id}`}
                 isLoading={isLoading}
                 isError={isError}
                 emptyMessage={search ? "No authorization decisions match that search" : "No authorization decisions match these filters"}
@@ -37,7 +37,7 @@ const MyAuthorizationLogSection: React.FC = () => {
             <DataTable
                 columns={authorizationColumns}
                 rows={data?.rows}
-                rowKey={(e) => e.id}
+                rowKey={(e) => `${e.kind}:${e.id}`}
                 isLoading={isLoading}
                 isError={isError}
                 emptyMessage="No authorization decisions match these filters"
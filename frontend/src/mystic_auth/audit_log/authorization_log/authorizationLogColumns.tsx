@@ -18,7 +18,11 @@ export const authorizationColumns: DataTableColumn<AuthorizationAuditLogEntryRea
         header: "Result",
         width: "120px",
         render: (e) => (
-            <Badge colorPalette={e.allowed ? "green" : "red"} size="md">{e.allowed ? "Allowed" : "Denied"}</Badge>
+            <Badge colorPalette={e.allowed ? "green" : "red"} size="md">
+                {e.allowed ? "Allowed" : "Denied"}
+                {/* A rollup counts many decisions; show how many. */}
+                {e.kind === "rollup" && ` ×${e.decision_count}`}
+            </Badge>
         ),
         sortable: true,
     },
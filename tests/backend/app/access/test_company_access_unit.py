@@ -0,0 +1,82 @@
+# tests/backend/app/access/test_company_access_unit.py
+#
+# app/access/company_access.py keeps user_company_access in step with
+# policy assignments through mystic-auth's policy_change_hooks. The wiring
+# (the hook is registered on import and forwards to the right rebuild) and
+# the per-company action vocabulary are checked here without a DB; the
+# table's actual contents after assignments, edits, revocation and company
+# moves are covered in test_company_access_boundaries.py.
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.app.access import company_access
+from backend.app.access.permissions import COMPANY_CREATE, COMPANY_READ, RESOURCE_COMPANY
+from backend.mystic_auth.authorization.repositories.policy_change_hooks import policy_change_hooks
+from sqlalchemy.dialects import postgresql
+
+MODULE = "backend.app.access.company_access"
+
+
+def test_hook_is_registered_with_mystic_auth_on_import():
+    assert company_access.company_access_hook in policy_change_hooks._hooks
+
+
+def test_company_create_is_not_materialized():
+    # Nothing to scope a create to; every other app action is per company.
+    assert COMPANY_CREATE not in company_access.SCOPED_ACTIONS
+    assert company_access.SCOPED_ACTIONS[COMPANY_READ] == RESOURCE_COMPANY
+
+
+@pytest.mark.asyncio
+async def test_assignment_hook_adds_rows_for_that_assignment_only(mocker):
+    add_mock = mocker.patch(f"{MODULE}.add_assignment_access", new_callable=AsyncMock)
+
+    await company_access.company_access_hook.policy_assigned(4, 9, db="session")
+
+    add_mock.assert_awaited_once_with(4, 9, "session")
+
+
+@pytest.mark.asyncio
+async def test_policy_edit_hook_rebuilds_that_policys_rows(mocker):
+    rebuild_mock = mocker.patch(f"{MODULE}.rebuild_policy_access", new_callable=AsyncMock)
+
+    await company_access.company_access_hook.policy_changed(9, db="session")
+
+    rebuild_mock.assert_awaited_once_with(9, "session")
+
+
+def test_non_integer_attribute_values_are_guarded_before_the_cast():
+    sql = str(company_access._derived_access().compile(dialect=postgresql.dialect()))
+
+    # Every cast of a resource_attributes value sits inside a CASE WHEN
+    # that has already checked it's an integer.
+    assert sql.count("CAST(") == sql.count("CASE WHEN") == 3
+    assert "jsonb_typeof" in sql
+
+
+@pytest.mark.asyncio
+async def test_access_holders_are_grouped_per_user_in_query_order():
+    db = MagicMock()
+    db.execute = AsyncMock(
+        return_value=[
+            (1, "a@example.com", "A", COMPANY_READ, 10, "group_read"),
+            (1, "a@example.com", "A", COMPANY_READ, 11, "company_read"),
+            (2, "b@example.com", "B", COMPANY_READ, 10, "group_read"),
+        ]
+    )
+
+    holders = await company_access.list_company_access_holders(7, db)
+
+    assert [holder["email"] for holder in holders] == ["a@example.com", "b@example.com"]
+    assert [grant["policy_name"] for grant in holders[0]["grants"]] == ["group_read", "company_read"]
+    sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+    assert "user_company_access.company_id = %(company_id_1)s" in sql
+
+
+def test_in_operator_grants_are_checked_as_jsonb_array_containment():
+    sql = str(company_access._derived_access().compile(dialect=postgresql.dialect()))
+
+    # One membership test per condition key, each guarded so a malformed
+    # {"in": 7} can't match the way scalar `@>` scalar would.
+    assert sql.count("@> to_jsonb(") == 3
+    assert sql.count("jsonb_build_object(") == 3
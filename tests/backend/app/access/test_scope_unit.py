@@ -3,12 +3,14 @@
 # Pure unit coverage for app/access/scope.py's get_company_scope. No DB, no
 # app, just Policy objects in and a CompanyScope out, mirroring how
 # mystic_auth's own policy_evaluator is unit-tested (Policy objects in, bool
-# out, no DB dependency).
+# out, no DB dependency). The compiled-scope cache in front of it is patched
+# out by default (every test here reuses the same email) and exercised on
+# its own at the bottom.
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
-from backend.app.access.scope import get_company_scope
+from backend.app.access.scope import CompanyScope, get_company_scope
 
 MODULE = "backend.app.access.scope"
 
@@ -17,6 +19,15 @@ def _policy(actions, resource_type="*", conditions=None):
     return SimpleNamespace(actions=actions, resource_type=resource_type, conditions=conditions)
 
 
+@pytest.fixture(autouse=True)
+def scope_cache(mocker):
+    get_mock = mocker.patch(
+        f"{MODULE}.authorization_cache_service.get_user_derived", new_callable=AsyncMock, return_value=None
+    )
+    set_mock = mocker.patch(f"{MODULE}.authorization_cache_service.set_user_derived", new_callable=AsyncMock)
+    return SimpleNamespace(get=get_mock, set=set_mock)
+
+
 @pytest.mark.asyncio
 async def test_unrestricted_when_a_matching_policy_has_no_conditions(mocker):
     mocker.patch(
@@ -63,6 +74,51 @@ async def test_group_root_id_condition_scopes_to_the_whole_group(mocker):
     assert scope.group_root_ids == frozenset({7})
 
 
+@pytest.mark.asyncio
+async def test_subtree_root_id_condition_scopes_to_that_subtree(mocker):
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new=AsyncMock(
+            return_value=[_policy(["company:read"], conditions={"resource_attributes": {"subtree_root_id": 3}})]
+        ),
+    )
+
+    scope = await get_company_scope("user@example.com", "company:read", "company", db=object())
+
+    assert scope.unrestricted is False
+    assert scope.subtree_root_ids == frozenset({3})
+    assert scope.company_ids == frozenset()
+    assert scope.is_empty() is False
+
+
+@pytest.mark.asyncio
+async def test_in_operator_scopes_one_policy_to_many_companies(mocker):
+    conditions = {"resource_attributes": {"company_id": {"in": [3, 7, 12]}, "subtree_root_id": {"in": [40]}}}
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new=AsyncMock(return_value=[_policy(["company:read"], conditions=conditions)]),
+    )
+
+    scope = await get_company_scope("user@example.com", "company:read", "company", db=object())
+
+    assert scope.company_ids == frozenset({3, 7, 12})
+    assert scope.subtree_root_ids == frozenset({40})
+
+
+@pytest.mark.asyncio
+async def test_non_integer_ids_never_reach_the_sql_filter(mocker):
+    conditions = {"resource_attributes": {"company_id": {"in": [3, "7", True]}, "group_root_id": {"in": 5}}}
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new=AsyncMock(return_value=[_policy(["company:read"], conditions=conditions)]),
+    )
+
+    scope = await get_company_scope("user@example.com", "company:read", "company", db=object())
+
+    assert scope.company_ids == frozenset({3})
+    assert scope.group_root_ids == frozenset()
+
+
 @pytest.mark.asyncio
 async def test_policy_for_a_different_action_is_ignored(mocker):
     mocker.patch(
@@ -97,3 +153,75 @@ async def test_no_policies_at_all_yields_empty_scope(mocker):
     scope = await get_company_scope("user@example.com", "company:read", "company", db=object())
 
     assert scope.is_empty() is True
+
+
+# ---------------------------- Compiled-scope cache ----------------------------
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_the_policy_list(mocker, scope_cache):
+    scope_cache.get.return_value = {
+        "unrestricted": False,
+        "company_ids": [7],
+        "group_root_ids": [],
+        "subtree_root_ids": [3],
+    }
+    repo_mock = mocker.patch(f"{MODULE}.policy_repository.get_active_policies_for_user", new=AsyncMock())
+
+    scope = await get_company_scope("user@example.com", "company:read", "company", db=object())
+
+    assert scope == CompanyScope(
+        unrestricted=False, company_ids=frozenset({7}), group_root_ids=frozenset(), subtree_root_ids=frozenset({3})
+    )
+    repo_mock.assert_not_awaited()
+    scope_cache.get.assert_awaited_once_with("user@example.com", "company_scope:company:read:company")
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_compiles_and_stores_the_scope(mocker, scope_cache):
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new=AsyncMock(
+            return_value=[_policy(["company:read"], conditions={"resource_attributes": {"group_root_id": 9}})]
+        ),
+    )
+
+    scope = await get_company_scope("user@example.com", "company:read", "company", db=object())
+
+    scope_cache.set.assert_awaited_once_with(
+        "user@example.com", "company_scope:company:read:company", scope.to_dict()
+    )
+    assert scope.group_root_ids == frozenset({9})
+
+
+@pytest.mark.asyncio
+async def test_malformed_cache_entry_is_recompiled(mocker, scope_cache):
+    scope_cache.get.return_value = {"unexpected": True}
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new=AsyncMock(return_value=[_policy(["company:read"], conditions=None)]),
+    )
+
+    scope = await get_company_scope("user@example.com", "company:read", "company", db=object())
+
+    assert scope.unrestricted is True
+    scope_cache.set.assert_awaited_once()
+
+
+def test_fingerprint_is_order_independent_and_distinguishes_scopes():
+    a = CompanyScope(unrestricted=False, company_ids=frozenset({3, 1, 2}), group_root_ids=frozenset())
+    b = CompanyScope(unrestricted=False, company_ids=frozenset({2, 3, 1}), group_root_ids=frozenset())
+    # Same ids, but granted as groups rather than companies: a different scope.
+    c = CompanyScope(unrestricted=False, company_ids=frozenset(), group_root_ids=frozenset({1, 2, 3}))
+
+    assert a.fingerprint == b.fingerprint
+    assert a.fingerprint != c.fingerprint
+    assert CompanyScope(unrestricted=True, company_ids=frozenset({1}), group_root_ids=frozenset()).fingerprint == "all"
+
+
+def test_to_dict_round_trips():
+    scope = CompanyScope(
+        unrestricted=False, company_ids=frozenset({5, 4}), group_root_ids=frozenset({1}), subtree_root_ids=frozenset()
+    )
+
+    assert CompanyScope.from_dict(scope.to_dict()) == scope
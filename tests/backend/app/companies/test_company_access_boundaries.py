@@ -9,16 +9,18 @@ import uuid
 
 import pytest
 import pytest_asyncio
+from backend.app.access.company_access_model import UserCompanyAccess
 from backend.app.access.permissions import COMPANY_CREATE, COMPANY_READ, COMPANY_UPDATE
-from backend.app.companies.company_crud import create_company
-from backend.app.companies.company_model import Company
-from backend.app.companies.company_schema import CompanyCreate
+from backend.app.companies.company_crud import create_company, get_company_by_ticker, update_company
+from backend.app.companies.company_model import Company, CompanyClosure
+from backend.app.companies.company_schema import CompanyCreate, CompanyUpdate
 from backend.mystic_auth.auth.verify_account.account_verification_service import account_verification_service
 from backend.mystic_auth.authorization.policies.default_policies import SELF_SERVICE_POLICY_NAME
 from backend.mystic_auth.authorization.repositories.policy_repository import policy_repository
 from backend.mystic_auth.database.connection import database
 from backend.mystic_auth.redis.client import redis_client
 from backend.mystic_auth.user_crud.user_crud_collector import user_crud
+from sqlalchemy import select
 
 PASSWORD = "StrongPass123!"
 
@@ -339,19 +341,259 @@ async def test_a_company_cannot_be_set_as_its_own_parent(client, created_emails,
 
 
 @pytest.mark.asyncio
-async def test_reparenting_a_company_with_subsidiaries_is_a_clean_400(client, created_emails, created_company_ids):
+async def test_reparenting_a_company_moves_its_whole_subtree(client, created_emails, created_company_ids):
     async with database.async_session() as session:
         parent = await create_company(CompanyCreate(name="Parent Co", ticker=_unique("PARENT")), session)
         child = await create_company(
             CompanyCreate(name="Child Co", ticker=_unique("CHILD"), parent_company_id=parent.id), session
         )
+        grandchild = await create_company(
+            CompanyCreate(name="Grandchild Co", ticker=_unique("GRAND"), parent_company_id=child.id), session
+        )
         new_parent = await create_company(CompanyCreate(name="New Parent Co", ticker=_unique("NEWPARENT")), session)
-    created_company_ids.extend([parent.id, child.id, new_parent.id])
+    created_company_ids.extend([grandchild.id, child.id, parent.id, new_parent.id])
 
     email = _unique("updater5") + "@example.com"
     await _create_verified_user_with_policy(client, created_emails, email, [COMPANY_UPDATE], "company_id", parent.id)
 
     resp = await client.patch(f"/companies/{parent.id}", json={"parent_company_id": new_parent.id})
 
+    assert resp.status_code == 200
+    assert resp.json()["group_root_id"] == new_parent.id
+    async with database.async_session() as session:
+        for company_id in (child.id, grandchild.id):
+            moved = await session.get(Company, company_id)
+            assert moved.group_root_id == new_parent.id
+        paths = await session.execute(
+            select(CompanyClosure.ancestor_id, CompanyClosure.depth).where(
+                CompanyClosure.descendant_id == grandchild.id
+            )
+        )
+        assert dict(paths.all()) == {grandchild.id: 0, child.id: 1, parent.id: 2, new_parent.id: 3}
+
+
+@pytest.mark.asyncio
+async def test_moving_a_company_under_its_own_descendant_is_a_clean_400(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        parent = await create_company(CompanyCreate(name="Parent Co", ticker=_unique("PARENT")), session)
+        child = await create_company(
+            CompanyCreate(name="Child Co", ticker=_unique("CHILD"), parent_company_id=parent.id), session
+        )
+    created_company_ids.extend([child.id, parent.id])
+
+    email = _unique("updater6") + "@example.com"
+    await _create_verified_user_with_policy(client, created_emails, email, [COMPANY_UPDATE], "company_id", parent.id)
+
+    resp = await client.patch(f"/companies/{parent.id}", json={"parent_company_id": child.id})
+
+    assert resp.status_code == 400
+    assert "own subsidiaries" in resp.json()["detail"]
+
+
+async def _create_user_allowed_to_create(client, created_emails, email):
+    # Same unconditional-grant setup as
+    # test_user_with_create_permission_can_create_a_company.
+    await _create_verified_user_with_policy(client, created_emails, email, [COMPANY_CREATE], "company_id", -1)
+    async with database.async_session() as session:
+        policies = await policy_repository.get_all(session)
+        policy = next(p for p in policies if p.name.startswith("test_policy_company_scope"))
+        await policy_repository.update(policy, {"conditions": None}, session)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_builds_the_forest_in_one_request(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        existing = await create_company(CompanyCreate(name="Existing Group", ticker=_unique("EXISTING")), session)
+    created_company_ids.append(existing.id)
+
+    email = _unique("bulkcreator") + "@example.com"
+    await _create_user_allowed_to_create(client, created_emails, email)
+
+    root, child, grandchild, attached = (_unique(prefix) for prefix in ("ROOT", "CHILD", "GRAND", "ATTACHED"))
+    resp = await client.post(
+        "/companies/bulk",
+        json={
+            "companies": [
+                {"name": "Grandchild Co", "ticker": grandchild, "parent_ticker": child},
+                {"name": "Child Co", "ticker": child, "parent_ticker": root},
+                {"name": "Root Co", "ticker": root},
+                {"name": "Attached Co", "ticker": attached, "parent_ticker": existing.ticker},
+            ]
+        },
+    )
+
+    assert resp.status_code == 201
+    body = resp.json()
+    created_company_ids.extend(company["id"] for company in body)
+    # Returned in request order, whatever order the levels were inserted in.
+    assert [company["ticker"] for company in body] == [grandchild, child, root, attached]
+    by_ticker = {company["ticker"]: company for company in body}
+    root_id = by_ticker[root]["id"]
+    assert by_ticker[root]["group_root_id"] == root_id
+    assert by_ticker[child]["parent_company_id"] == root_id
+    assert by_ticker[grandchild]["group_root_id"] == root_id
+    assert by_ticker[attached]["parent_company_id"] == existing.id
+    assert by_ticker[attached]["group_root_id"] == existing.id
+
+    async with database.async_session() as session:
+        paths = await session.execute(
+            select(CompanyClosure.ancestor_id, CompanyClosure.depth).where(
+                CompanyClosure.descendant_id == by_ticker[grandchild]["id"]
+            )
+        )
+        assert dict(paths.all()) == {by_ticker[grandchild]["id"]: 0, by_ticker[child]["id"]: 1, root_id: 2}
+        attached_row = await session.get(Company, by_ticker[attached]["id"])
+        assert attached_row.parent_name == "Existing Group"
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_every_bad_row_and_writes_nothing(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        taken = await create_company(CompanyCreate(name="Taken Co", ticker=_unique("TAKEN")), session)
+    created_company_ids.append(taken.id)
+
+    email = _unique("bulkcreator2") + "@example.com"
+    await _create_user_allowed_to_create(client, created_emails, email)
+
+    fresh = _unique("FRESH")
+    resp = await client.post(
+        "/companies/bulk",
+        json={
+            "companies": [
+                {"name": "Fresh Co", "ticker": fresh},
+                {"name": "Duplicate Co", "ticker": taken.ticker},
+                {"name": "Orphan Co", "ticker": _unique("ORPHAN"), "parent_ticker": _unique("MISSING")},
+            ]
+        },
+    )
+
     assert resp.status_code == 400
-    assert "subsidiary" in resp.json()["detail"]
+    errors = resp.json()["detail"]["errors"]
+    assert [error["index"] for error in errors] == [1, 2]
+    assert "already exists" in errors[0]["error"]
+    assert "does not exist" in errors[1]["error"]
+    async with database.async_session() as session:
+        assert await get_company_by_ticker(fresh, session) is None
+
+
+@pytest.mark.asyncio
+async def test_subtree_scoped_user_sees_the_subtree_but_not_its_siblings(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        reliance = await create_company(CompanyCreate(name="Reliance Industries", ticker=_unique("RELIANCE")), session)
+        retail = await create_company(
+            CompanyCreate(name="Reliance Retail", ticker=_unique("RETAIL"), parent_company_id=reliance.id), session
+        )
+        grocery = await create_company(
+            CompanyCreate(name="Reliance Fresh", ticker=_unique("FRESH"), parent_company_id=retail.id), session
+        )
+        jio = await create_company(
+            CompanyCreate(name="Jio Platforms", ticker=_unique("JIO"), parent_company_id=reliance.id), session
+        )
+    created_company_ids.extend([grocery.id, retail.id, jio.id, reliance.id])
+
+    email = _unique("vertical_head") + "@example.com"
+    await _create_verified_user_with_policy(
+        client, created_emails, email, [COMPANY_READ], "subtree_root_id", retail.id
+    )
+
+    list_resp = await client.get("/companies/")
+    assert list_resp.status_code == 200
+    assert {c["id"] for c in list_resp.json()} == {retail.id, grocery.id}
+
+    assert (await client.get(f"/companies/{grocery.id}")).status_code == 200
+    assert (await client.get(f"/companies/{jio.id}")).status_code == 403
+    assert (await client.get(f"/companies/{reliance.id}")).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_user_company_access_follows_grants_and_hierarchy_changes(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        group = await create_company(CompanyCreate(name="Group Root", ticker=_unique("GROUP")), session)
+        member = await create_company(
+            CompanyCreate(name="Member Co", ticker=_unique("MEMBER"), parent_company_id=group.id), session
+        )
+        outsider = await create_company(CompanyCreate(name="Outsider Co", ticker=_unique("OUTSIDER")), session)
+    created_company_ids.extend([member.id, group.id, outsider.id])
+
+    email = _unique("materialized") + "@example.com"
+    await _create_verified_user_with_policy(client, created_emails, email, [COMPANY_READ], "group_root_id", group.id)
+
+    async def visible():
+        async with database.async_session() as session:
+            user = await user_crud.get_by_email(email, session)
+            rows = await session.scalars(
+                select(UserCompanyAccess.company_id).where(
+                    UserCompanyAccess.user_id == user.id, UserCompanyAccess.action == COMPANY_READ
+                )
+            )
+            return set(rows.all())
+
+    assert await visible() == {group.id, member.id}
+
+    async with database.async_session() as session:
+        newcomer = await create_company(
+            CompanyCreate(name="Newcomer Co", ticker=_unique("NEWCOMER"), parent_company_id=group.id), session
+        )
+    created_company_ids.insert(0, newcomer.id)
+    assert await visible() == {group.id, member.id, newcomer.id}
+
+    async with database.async_session() as session:
+        moved = await session.get(Company, member.id)
+        await update_company(moved, CompanyUpdate(parent_company_id=outsider.id), session)
+    assert await visible() == {group.id, newcomer.id}
+
+    async with database.async_session() as session:
+        policies = await policy_repository.get_policies_for_user(email, session)
+        policy = next(p for p in policies if p.name.startswith("test_policy_company_scope"))
+        policy = await policy_repository.get_by_name(policy.name, session)
+        await policy_repository.update(
+            policy, {"conditions": {"resource_attributes": {"company_id": outsider.id}}}, session
+        )
+    assert await visible() == {outsider.id}
+
+    async with database.async_session() as session:
+        user = await user_crud.get_by_email(email, session)
+        await policy_repository.remove_policy_from_user(user.id, policy.id, session)
+    assert await visible() == set()
+
+
+@pytest.mark.asyncio
+async def test_company_access_lists_every_holder_with_the_granting_policy(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        group = await create_company(CompanyCreate(name="Reviewed Group", ticker=_unique("REVIEWED")), session)
+        member = await create_company(
+            CompanyCreate(name="Reviewed Member", ticker=_unique("RMEMBER"), parent_company_id=group.id), session
+        )
+        outsider = await create_company(CompanyCreate(name="Unreviewed Co", ticker=_unique("UNREVIEWED")), session)
+    created_company_ids.extend([member.id, group.id, outsider.id])
+
+    group_email = _unique("groupholder") + "@example.com"
+    await _create_verified_user_with_policy(
+        client, created_emails, group_email, [COMPANY_READ, COMPANY_UPDATE], "group_root_id", group.id
+    )
+    outsider_email = _unique("outsiderholder") + "@example.com"
+    await _create_verified_user_with_policy(client, created_emails, outsider_email, [COMPANY_READ], "company_id", outsider.id)
+
+    # Without POLICIES_READ, a company-scoped user can't run a review.
+    denied = await client.get(f"/companies/{member.id}/access")
+    assert denied.status_code == 403
+
+    reviewer_email = _unique("reviewer") + "@example.com"
+    await _create_verified_user_with_policy(client, created_emails, reviewer_email, ["policies:read"], "company_id", -1)
+    async with database.async_session() as session:
+        policies = await policy_repository.get_policies_for_user(reviewer_email, session)
+        policy = next(p for p in policies if p.name.startswith("test_policy_company_scope"))
+        policy = await policy_repository.get_by_name(policy.name, session)
+        await policy_repository.update(policy, {"conditions": None}, session)
+
+    resp = await client.get(f"/companies/{member.id}/access")
+    assert resp.status_code == 200
+    holders = {holder["email"]: holder for holder in resp.json()}
+    assert outsider_email not in holders
+    assert reviewer_email not in holders
+    grants = holders[group_email]["grants"]
+    assert sorted(grant["action"] for grant in grants) == [COMPANY_READ, COMPANY_UPDATE]
+    assert all(grant["policy_name"].startswith("test_policy_company_scope") for grant in grants)
+
+    missing = await client.get("/companies/2147483647/access")
+    assert missing.status_code == 404
@@ -0,0 +1,86 @@
+# tests/backend/app/companies/test_company_bulk_create_unit.py
+#
+# POST /companies/bulk inserts a ticker-keyed forest level by level (see
+# company_crud.py's bulk_create_companies). How the rows split into levels,
+# and which forests are rejected before any SQL runs (repeated tickers,
+# self-parents, cycles), are pure functions of the request body, so they're
+# covered here without a DB; the inserts themselves live in
+# test_company_access_boundaries.py.
+import pytest
+from backend.app.companies.company_crud import BulkCreateError, bulk_create_companies, plan_bulk_levels
+from backend.app.companies.company_schema import CompanyBulkCreate, CompanyBulkItem
+from pydantic import ValidationError
+
+
+def _item(ticker, parent_ticker=None):
+    return CompanyBulkItem(name=f"{ticker} Ltd", ticker=ticker, parent_ticker=parent_ticker)
+
+
+def test_rows_are_grouped_into_levels_parents_first():
+    items = [
+        _item("GRANDCHILD", "CHILD"),
+        _item("CHILD", "ROOT"),
+        _item("ROOT"),
+        _item("SIBLING", "ROOT"),
+    ]
+
+    levels, errors = plan_bulk_levels(items)
+
+    assert errors == []
+    assert levels == [[2], [1, 3], [0]]
+
+
+def test_a_parent_outside_the_request_puts_the_row_in_the_first_level():
+    # EXISTING isn't a row of this request: it must already be in the DB,
+    # which bulk_create_companies checks, not the planner.
+    levels, errors = plan_bulk_levels([_item("NEWSUB", "EXISTING"), _item("NEWROOT")])
+
+    assert errors == []
+    assert levels == [[0, 1]]
+
+
+def test_a_repeated_ticker_is_reported_against_the_later_row():
+    levels, errors = plan_bulk_levels([_item("ROOT"), _item("CHILD", "ROOT"), _item("ROOT")])
+
+    assert levels == []
+    assert [(error.index, error.ticker) for error in errors] == [(2, "ROOT")]
+    assert "row 0" in errors[0].error
+
+
+def test_self_parent_and_cycles_are_reported_per_row():
+    items = [_item("ROOT"), _item("SELF", "SELF"), _item("A", "B"), _item("B", "A"), _item("UNDER_A", "A")]
+
+    levels, errors = plan_bulk_levels(items)
+
+    assert levels == []
+    by_index = {error.index: error.error for error in errors}
+    assert set(by_index) == {1, 2, 3, 4}
+    assert by_index[1] == "A company cannot be its own parent"
+    assert "cycle" in by_index[2]
+
+
+def test_bulk_create_error_is_a_value_error_carrying_every_row():
+    _, errors = plan_bulk_levels([_item("A", "B"), _item("B", "A")])
+
+    exc = BulkCreateError(errors)
+
+    assert isinstance(exc, ValueError)
+    assert exc.errors == errors
+    assert "2 of the submitted companies" in str(exc)
+
+
+@pytest.mark.asyncio
+async def test_an_inconsistent_forest_is_rejected_before_touching_the_db():
+    # No DB session needed: the planner's errors short-circuit before the
+    # hierarchy lock or any lookup.
+    data = CompanyBulkCreate(companies=[_item("A", "A")])
+
+    with pytest.raises(BulkCreateError):
+        await bulk_create_companies(data, db=None)
+
+
+def test_empty_and_oversized_requests_are_rejected_by_the_schema():
+    with pytest.raises(ValidationError):
+        CompanyBulkCreate(companies=[])
+    with pytest.raises(ValidationError):
+        CompanyBulkCreate(companies=[_item(f"T{i}") for i in range(1001)])
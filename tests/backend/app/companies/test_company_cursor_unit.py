@@ -0,0 +1,92 @@
+# tests/backend/app/companies/test_company_cursor_unit.py
+#
+# GET /companies/'s keyset mode hands clients an opaque cursor (company_crud.py's
+# encode_company_cursor) and trusts nothing about it on the way back in. The
+# round trip, the sort-mismatch guard, and malformed input are all pure
+# functions of the cursor string, so they're covered here without a DB; the
+# end-to-end page walk lives in test_company_pagination.py.
+import base64
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from backend.app.companies.company_crud import (
+    InvalidCursorError,
+    decode_company_cursor,
+    encode_company_cursor,
+    is_similarity_ranked,
+)
+
+
+def _company(**overrides):
+    fields = {
+        "id": 17,
+        "name": "Jio Platforms",
+        "ticker": "JIO.NS",
+        "parent_name": None,
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC),
+    }
+    return SimpleNamespace(**{**fields, **overrides})
+
+
+@pytest.mark.parametrize(
+    "sort_by,expected_value",
+    [
+        ("name", "Jio Platforms"),
+        ("ticker", "JIO.NS"),
+        ("parent", None),
+        ("created_at", datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)),
+        (None, None),
+    ],
+)
+def test_cursor_round_trips_sort_value_and_id(sort_by, expected_value):
+    cursor = encode_company_cursor(_company(), sort_by, "asc")
+
+    assert decode_company_cursor(cursor, sort_by, "asc") == (expected_value, 17)
+
+
+def test_unknown_sort_by_is_treated_like_the_id_fallback():
+    cursor = encode_company_cursor(_company(), "not_a_column", "desc")
+
+    assert decode_company_cursor(cursor, None, "desc") == (None, 17)
+
+
+def test_cursor_issued_for_another_sort_is_rejected():
+    cursor = encode_company_cursor(_company(), "name", "asc")
+
+    with pytest.raises(InvalidCursorError):
+        decode_company_cursor(cursor, "ticker", "asc")
+    with pytest.raises(InvalidCursorError):
+        decode_company_cursor(cursor, "name", "desc")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!!", "eyJmb28iOiAxfQ", "bnVsbA"])
+def test_malformed_cursor_raises_invalid_cursor_error(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_company_cursor(cursor, "name", "asc")
+
+
+@pytest.mark.parametrize("value", [5, None, ["Acme"]])
+def test_sort_value_of_the_wrong_type_is_malformed(value):
+    # name is NOT NULL and compared as a string, so anything else in "v"
+    # would only fail later, in the database.
+    payload = json.dumps({"s": "name", "d": "asc", "v": value, "id": 17}).encode()
+    cursor = base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    with pytest.raises(InvalidCursorError):
+        decode_company_cursor(cursor, "name", "asc")
+
+
+def test_invalid_cursor_error_is_a_value_error():
+    # The route's single except-ValueError branch turns it into a 400.
+    assert issubclass(InvalidCursorError, ValueError)
+
+
+def test_only_a_search_without_an_explicit_sort_is_similarity_ranked():
+    # The route withholds X-Next-Cursor for exactly these pages.
+    assert is_similarity_ranked("acme", None) is True
+    assert is_similarity_ranked("acme", "bogus") is True
+    assert is_similarity_ranked("acme", "name") is False
+    assert is_similarity_ranked(None, None) is False
+    assert is_similarity_ranked("", None) is False
@@ -5,16 +5,17 @@
 # list_companies_in_scope), since an admin-scoped user can see every company
 # in the system, unlike e.g. mystic_auth's own PoliciesPage. This covers the
 # paging mechanics themselves, plus the "root"/"subsidiary" hierarchy filter,
-# the parent_name join, and GET /companies/stats. The older
+# the denormalized parent_name, keyset (cursor) mode, and GET /companies/stats. The older
 # access-boundary tests exercise.
 import uuid
 
 import pytest
 import pytest_asyncio
 from backend.app.access.permissions import COMPANY_READ
-from backend.app.companies.company_crud import create_company
+from backend.app.balance_sheets.balance_sheet_model import BalanceSheet
+from backend.app.companies.company_crud import create_company, update_company
 from backend.app.companies.company_model import Company
-from backend.app.companies.company_schema import CompanyCreate
+from backend.app.companies.company_schema import CompanyCreate, CompanyUpdate
 from backend.mystic_auth.auth.verify_account.account_verification_service import account_verification_service
 from backend.mystic_auth.authorization.policies.default_policies import SELF_SERVICE_POLICY_NAME
 from backend.mystic_auth.authorization.repositories.policy_repository import policy_repository
@@ -112,6 +113,7 @@ async def test_list_companies_paginates_and_reports_total_count(client, created_
     page1 = await client.get("/companies/", params={"limit": 2, "offset": 0, "sort_by": "name", "sort_dir": "asc"})
     assert page1.status_code == 200
     assert page1.headers["X-Total-Count"] == "3"
+    assert page1.headers["X-Total-Count-Estimated"] == "false"
     assert len(page1.json()) == 2
 
     page2 = await client.get("/companies/", params={"limit": 2, "offset": 2, "sort_by": "name", "sort_dir": "asc"})
@@ -122,6 +124,11 @@ async def test_list_companies_paginates_and_reports_total_count(client, created_
     all_ids_across_pages = {c["id"] for c in page1.json()} | {c["id"] for c in page2.json()}
     assert all_ids_across_pages == {reliance.id, jio.id, retail.id}
 
+    # Past the end: no row to read the total from, still reported.
+    past_end = await client.get("/companies/", params={"limit": 2, "offset": 10})
+    assert past_end.json() == []
+    assert past_end.headers["X-Total-Count"] == "3"
+
 
 @pytest.mark.asyncio
 async def test_list_companies_includes_parent_name(client, created_emails, created_company_ids):
@@ -185,6 +192,11 @@ async def test_company_stats_scoped_to_caller(client, created_emails, created_co
             session,
         )
         unrelated = await create_company(CompanyCreate(name="Unrelated Co", ticker=_unique("UNREL")), session)
+        # Two years for one company: still one company "with balance sheets".
+        session.add(BalanceSheet(company_id=jio.id, year=2023, total_assets=1.0))
+        session.add(BalanceSheet(company_id=jio.id, year=2024, total_assets=2.0))
+        session.add(BalanceSheet(company_id=unrelated.id, year=2024, total_assets=3.0))
+        await session.commit()
     created_company_ids.extend([reliance.id, jio.id, retail.id, unrelated.id])
 
     exec_email = _unique("groupexec") + "@example.com"
@@ -195,4 +207,131 @@ async def test_company_stats_scoped_to_caller(client, created_emails, created_co
     resp = await client.get("/companies/stats")
     assert resp.status_code == 200
     stats = resp.json()
-    assert stats == {"total": 3, "group_roots": 1, "subsidiaries": 2}
+    assert stats == {
+        "total": 3,
+        "group_roots": 1,
+        "subsidiaries": 2,
+        "with_balance_sheets": 1,
+        "without_balance_sheets": 2,
+    }
+
+    # Cached per scope, but create_company's invalidation retires the entry.
+    async with database.async_session() as session:
+        extra = await create_company(
+            CompanyCreate(name="Reliance Jewels", ticker=_unique("RJ"), parent_company_id=reliance.id), session
+        )
+    created_company_ids.append(extra.id)
+
+    resp = await client.get("/companies/stats")
+    assert resp.json()["subsidiaries"] == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by,sort_dir", [("name", "asc"), ("parent", "asc"), ("parent", "desc"), (None, "desc")])
+async def test_cursor_pagination_walks_every_row_exactly_once(
+    client, created_emails, created_company_ids, sort_by, sort_dir
+):
+    async with database.async_session() as session:
+        reliance = await create_company(
+            CompanyCreate(name="Reliance Industries", ticker=_unique("RELIANCE")), session
+        )
+        children = [
+            await create_company(
+                CompanyCreate(name=f"Vertical {i}", ticker=_unique(f"V{i}"), parent_company_id=reliance.id), session
+            )
+            for i in range(4)
+        ]
+    created_company_ids.extend([c.id for c in children] + [reliance.id])
+
+    exec_email = _unique("groupexec") + "@example.com"
+    await _create_verified_user_with_policy(
+        client, created_emails, exec_email, [COMPANY_READ], "group_root_id", reliance.id
+    )
+
+    params = {"limit": 2, "sort_dir": sort_dir}
+    if sort_by is not None:
+        params["sort_by"] = sort_by
+    seen: list[int] = []
+    cursor = None
+    for _ in range(10):
+        resp = await client.get("/companies/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200
+        if cursor is not None:
+            assert "X-Total-Count" not in resp.headers
+        seen.extend(c["id"] for c in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted([reliance.id] + [c.id for c in children])
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.asyncio
+async def test_cursor_from_a_different_sort_is_rejected(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        reliance = await create_company(
+            CompanyCreate(name="Reliance Industries", ticker=_unique("RELIANCE")), session
+        )
+        jio = await create_company(
+            CompanyCreate(name="Jio Platforms", ticker=_unique("JIO"), parent_company_id=reliance.id), session
+        )
+    created_company_ids.extend([jio.id, reliance.id])
+
+    exec_email = _unique("groupexec") + "@example.com"
+    await _create_verified_user_with_policy(
+        client, created_emails, exec_email, [COMPANY_READ], "group_root_id", reliance.id
+    )
+
+    first = await client.get("/companies/", params={"limit": 1, "sort_by": "name"})
+    cursor = first.headers["X-Next-Cursor"]
+
+    resp = await client.get("/companies/", params={"limit": 1, "sort_by": "ticker", "cursor": cursor})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_similarity_ranked_search_pages_carry_no_cursor(client, created_emails, created_company_ids):
+    # A cursor can only resume id order, so handing one out for a page
+    # ranked by similarity would skip or repeat rows on the next page.
+    async with database.async_session() as session:
+        reliance = await create_company(
+            CompanyCreate(name="Reliance Industries", ticker=_unique("RELIANCE")), session
+        )
+        children = [
+            await create_company(
+                CompanyCreate(name=f"Reliance Vertical {i}", ticker=_unique(f"RV{i}"), parent_company_id=reliance.id),
+                session,
+            )
+            for i in range(3)
+        ]
+    created_company_ids.extend([c.id for c in children] + [reliance.id])
+
+    exec_email = _unique("groupexec") + "@example.com"
+    await _create_verified_user_with_policy(
+        client, created_emails, exec_email, [COMPANY_READ], "group_root_id", reliance.id
+    )
+
+    ranked = await client.get("/companies/", params={"limit": 2, "search": "reliance"})
+    assert ranked.status_code == 200
+    assert len(ranked.json()) == 2
+    assert "X-Next-Cursor" not in ranked.headers
+
+    sorted_search = await client.get("/companies/", params={"limit": 2, "search": "reliance", "sort_by": "name"})
+    assert "X-Next-Cursor" in sorted_search.headers
+
+
+@pytest.mark.asyncio
+async def test_renaming_a_parent_updates_its_childrens_parent_name(client, created_emails, created_company_ids):
+    async with database.async_session() as session:
+        reliance = await create_company(
+            CompanyCreate(name="Reliance Industries", ticker=_unique("RELIANCE")), session
+        )
+        jio = await create_company(
+            CompanyCreate(name="Jio Platforms", ticker=_unique("JIO"), parent_company_id=reliance.id), session
+        )
+        await update_company(reliance, CompanyUpdate(name="Reliance Group"), session)
+    created_company_ids.extend([jio.id, reliance.id])
+
+    async with database.async_session() as session:
+        assert (await session.get(Company, jio.id)).parent_name == "Reliance Group"
@@ -0,0 +1,37 @@
+# tests/backend/app/companies/test_company_scope_clause_unit.py
+#
+# _scope_clause is the WHERE every scoped company query shares (list, count,
+# keyset pages, stats, tree). Its id sets go in as array parameters (see
+# mystic_auth/database/array_params.py), so the statement text, and with it
+# asyncpg's prepared-statement cache entry, must not depend on how many
+# companies a user is scoped to. Server-side timings are in
+# tests/backend/app/performance/test_company_scope_filter_performance.py.
+from backend.app.access.scope import CompanyScope
+from backend.app.companies.company_crud import _scope_clause
+from backend.app.companies.company_model import Company
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+def _compile(size: int):
+    scope = CompanyScope(
+        unrestricted=False,
+        company_ids=frozenset(range(size)),
+        group_root_ids=frozenset(range(size)),
+        subtree_root_ids=frozenset(range(size)),
+    )
+    compiled = select(Company.id).where(_scope_clause(scope)).compile(dialect=postgresql.asyncpg.dialect())
+    return str(compiled), compiled.params
+
+
+def test_scope_clause_is_one_statement_for_every_scope_size():
+    (small_sql, _), (large_sql, large_params) = _compile(1), _compile(10_000)
+
+    assert small_sql == large_sql
+    assert small_sql.count("= ANY ($") == 3
+    assert "IN (__[POSTCOMPILE" not in small_sql
+    assert sorted(len(value) for value in large_params.values()) == [10_000] * 3
+
+
+def test_unrestricted_scope_adds_no_clause():
+    assert _scope_clause(CompanyScope(unrestricted=True, company_ids=frozenset(), group_root_ids=frozenset())) is None
@@ -0,0 +1,121 @@
+# tests/backend/app/companies/test_company_tree_unit.py
+#
+# GET /companies/tree assembles one flat scoped query into nested nodes in
+# Python (company_crud.py's build_company_tree), so the shape of the tree,
+# which rows become roots, and the visible-only subsidiary counts are pure
+# functions of the input rows and can be covered without a database. The
+# cache short-circuits in get_company_tree_in_scope and
+# get_company_stats_in_scope are covered the same way, with company_cache's
+# get/set patched out.
+from unittest.mock import AsyncMock
+
+import pytest
+from backend.app.access.scope import CompanyScope
+from backend.app.companies.company_crud import build_company_tree, get_company_stats_in_scope, get_company_tree_in_scope
+
+MODULE = "backend.app.companies.company_crud"
+
+
+def _row(company_id, parent_id=None, name=None):
+    return {
+        "id": company_id,
+        "name": name or f"Company {company_id}",
+        "ticker": f"T{company_id}",
+        "parent_company_id": parent_id,
+        "group_root_id": company_id if parent_id is None else 1,
+        "latest_metrics": None,
+    }
+
+
+def test_nests_children_under_their_parents_and_counts_descendants():
+    tree = build_company_tree([_row(1), _row(2, 1), _row(3, 1), _row(4, 2)])
+
+    assert [node["id"] for node in tree] == [1]
+    root = tree[0]
+    assert [child["id"] for child in root["children"]] == [2, 3]
+    assert root["subsidiary_count"] == 2
+    assert root["descendant_count"] == 3
+    assert root["children"][0]["subsidiary_count"] == 1
+    assert root["children"][0]["descendant_count"] == 1
+    assert root["children"][1]["descendant_count"] == 0
+
+
+def test_child_listed_before_its_parent_is_still_attached():
+    tree = build_company_tree([_row(2, 1), _row(1)])
+
+    assert [node["id"] for node in tree] == [1]
+    assert [child["id"] for child in tree[0]["children"]] == [2]
+
+
+def test_company_whose_parent_is_out_of_scope_becomes_a_root():
+    # A CEO scoped to one subsidiary: its parent (id 1) isn't in the rows.
+    tree = build_company_tree([_row(2, 1), _row(4, 2)])
+
+    assert [node["id"] for node in tree] == [2]
+    assert tree[0]["subsidiary_count"] == 1
+
+
+def test_deep_chain_does_not_recurse():
+    depth = 5000
+    rows = [_row(1)] + [_row(i, i - 1) for i in range(2, depth + 1)]
+
+    tree = build_company_tree(rows)
+
+    assert tree[0]["descendant_count"] == depth - 1
+
+
+@pytest.mark.asyncio
+async def test_empty_scope_short_circuits_without_touching_cache_or_db(mocker):
+    get_cached = mocker.patch(f"{MODULE}.get_cached", new=AsyncMock())
+    db = AsyncMock()
+
+    result = await get_company_tree_in_scope(
+        CompanyScope(unrestricted=False, company_ids=frozenset(), group_root_ids=frozenset()), db
+    )
+
+    assert result == []
+    get_cached.assert_not_awaited()
+    db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_the_query(mocker):
+    cached_tree = [{"id": 1, "children": []}]
+    mocker.patch(f"{MODULE}.get_cached", new=AsyncMock(return_value=(cached_tree, "3")))
+    db = AsyncMock()
+
+    result = await get_company_tree_in_scope(
+        CompanyScope(unrestricted=True, company_ids=frozenset(), group_root_ids=frozenset()), db
+    )
+
+    assert result == cached_tree
+    db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stats_for_empty_scope_are_all_zero_without_a_query(mocker):
+    get_cached = mocker.patch(f"{MODULE}.get_cached", new=AsyncMock())
+    db = AsyncMock()
+
+    stats = await get_company_stats_in_scope(
+        CompanyScope(unrestricted=False, company_ids=frozenset(), group_root_ids=frozenset()), db
+    )
+
+    assert set(stats.values()) == {0}
+    assert set(stats) == {"total", "group_roots", "subsidiaries", "with_balance_sheets", "without_balance_sheets"}
+    get_cached.assert_not_awaited()
+    db.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stats_cache_hit_skips_the_query(mocker):
+    cached_stats = {"total": 4, "group_roots": 1, "subsidiaries": 3, "with_balance_sheets": 2, "without_balance_sheets": 2}
+    mocker.patch(f"{MODULE}.get_cached", new=AsyncMock(return_value=(cached_stats, "7")))
+    db = AsyncMock()
+
+    stats = await get_company_stats_in_scope(
+        CompanyScope(unrestricted=True, company_ids=frozenset(), group_root_ids=frozenset()), db
+    )
+
+    assert stats == cached_stats
+    db.execute.assert_not_awaited()
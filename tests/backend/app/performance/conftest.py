@@ -0,0 +1,50 @@
+# tests/backend/app/performance/conftest.py
+#
+# The app-layer counterpart to tests/backend/mystic_auth/performance/
+# conftest.py: bulk-seeds companies with direct SQL, since creating 100k
+# rows through create_company (advisory lock, closure rows, one commit
+# each) would take longer than anything these tests measure. Excluded
+# from CI's unit step and run alongside mystic_auth's performance suite
+# instead, see .github/workflows/ci.yml.
+import uuid
+
+from backend.mystic_auth.database.connection import database
+from sqlalchemy import text
+
+
+def unique_tag() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+async def bulk_seed_root_companies(count: int, tag: str) -> None:
+    """`count` root companies named "Perf Company <tag> <i>" with ticker
+    "PERF<tag><i>". Roots only, each its own group and closure self-path:
+    what the benchmarks here exercise is text search, not the hierarchy."""
+    async with database.async_session() as session:
+        await session.execute(
+            text(
+                "INSERT INTO companies (name, ticker, group_root_id, created_at, updated_at) "
+                "SELECT 'Perf Company ' || :tag || ' ' || i, 'PERF' || upper(:tag) || i, 0, now(), now() "
+                "FROM generate_series(0, :count - 1) AS i"
+            ),
+            {"tag": tag, "count": count},
+        )
+        await session.execute(
+            text("UPDATE companies SET group_root_id = id WHERE ticker LIKE :pattern"),
+            {"pattern": f"PERF{tag.upper()}%"},
+        )
+        await session.execute(
+            text(
+                "INSERT INTO company_closure (ancestor_id, descendant_id, depth) "
+                "SELECT id, id, 0 FROM companies WHERE ticker LIKE :pattern"
+            ),
+            {"pattern": f"PERF{tag.upper()}%"},
+        )
+        await session.execute(text("ANALYZE companies"))
+        await session.commit()
+
+
+async def cleanup_perf_companies(tag: str) -> None:
+    async with database.async_session() as session:
+        await session.execute(text("DELETE FROM companies WHERE ticker LIKE :pattern"), {"pattern": f"PERF{tag.upper()}%"})
+        await session.commit()
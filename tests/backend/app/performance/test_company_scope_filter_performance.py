@@ -0,0 +1,88 @@
+# tests/backend/app/performance/test_company_scope_filter_performance.py
+#
+# Benchmark for _scope_clause's array-parameter predicates (see
+# backend/mystic_auth/database/array_params.py): a company-id scope
+# compiled as `id = ANY($1::INTEGER[])` against the `id IN ($1, ..., $n)`
+# form it replaced, at scope sizes from 1 to 10k, over 20k companies.
+#
+# Measured on the raw asyncpg connection so the numbers are the server's
+# own work, not SQLAlchemy's: `prepare` is the parse/analyze round trip a
+# prepared-statement cache miss costs, and EXPLAIN's "Planning Time" the
+# planner's share. Run with -s to see the table. Assertions stay generous:
+# the shape (one statement for every size, index-served at small sizes) is
+# the contract, and the IN form is only required to be no faster at 10k ids.
+import json
+import time
+
+import pytest
+from backend.app.access.scope import CompanyScope
+from backend.app.companies.company_crud import _scope_clause
+from backend.app.companies.company_model import Company
+from backend.mystic_auth.database.connection import database
+from sqlalchemy import select
+
+from .conftest import bulk_seed_root_companies, cleanup_perf_companies, unique_tag
+
+_ROW_COUNT = 20_000
+_SCOPE_SIZES = (1, 10, 100, 1_000, 10_000)
+
+
+def _compiled(stmt, dialect):
+    """(sql, positional args) exactly as asyncpg receives them."""
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    return str(compiled), [compiled.params[name] for name in compiled.positiontup]
+
+
+async def _prepare_and_plan_seconds(driver, sql: str, args: list) -> tuple[float, float]:
+    start = time.perf_counter()
+    await driver.prepare(sql)
+    prepare_seconds = time.perf_counter() - start
+    plan = json.loads(await driver.fetchval(f"EXPLAIN (SUMMARY, FORMAT JSON) {sql}", *args))
+    return prepare_seconds, plan[0]["Planning Time"] / 1000
+
+
+@pytest.mark.asyncio
+async def test_scope_filter_is_one_statement_for_every_scope_size():
+    tag = unique_tag()
+    await bulk_seed_root_companies(_ROW_COUNT, tag)
+    try:
+        async with database.async_session() as session:
+            ids = list(
+                await session.scalars(
+                    select(Company.id).where(Company.ticker.like(f"PERF{tag.upper()}%")).order_by(Company.id)
+                )
+            )
+            connection = await session.connection()
+            dialect = connection.dialect
+            driver = (await connection.get_raw_connection()).driver_connection
+
+            statements = set()
+            rows = []
+            for size in _SCOPE_SIZES:
+                scope = CompanyScope(unrestricted=False, company_ids=frozenset(ids[:size]), group_root_ids=frozenset())
+                any_sql, any_args = _compiled(select(Company.id).where(_scope_clause(scope)), dialect)
+                in_sql, in_args = _compiled(select(Company.id).where(Company.id.in_(ids[:size])), dialect)
+                statements.add(any_sql)
+
+                any_prepare, any_plan = await _prepare_and_plan_seconds(driver, any_sql, any_args)
+                in_prepare, in_plan = await _prepare_and_plan_seconds(driver, in_sql, in_args)
+                rows.append((size, any_prepare, any_plan, in_prepare, in_plan))
+                if size == 100:
+                    # A small scope over a large table: must be an index
+                    # lookup (at 10k of 20k rows a seq scan is legitimately
+                    # cheaper, so that size isn't checked).
+                    plan = "\n".join(row[0] for row in await driver.fetch(f"EXPLAIN {any_sql}", *any_args))
+
+        print("\nscope size | ANY prepare / plan (ms) | IN prepare / plan (ms)")
+        for size, any_prepare, any_plan, in_prepare, in_plan in rows:
+            print(
+                f"{size:>10} | {any_prepare * 1000:8.2f} / {any_plan * 1000:8.2f} "
+                f"| {in_prepare * 1000:8.2f} / {in_plan * 1000:8.2f}"
+            )
+
+        assert len(statements) == 1, statements
+        assert "companies_pkey" in plan, plan
+        _, any_prepare_max, _, in_prepare_max, _ = rows[-1]
+        assert any_prepare_max <= in_prepare_max, rows[-1]
+    finally:
+        await cleanup_perf_companies(tag)
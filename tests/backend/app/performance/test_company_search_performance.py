@@ -0,0 +1,54 @@
+# tests/backend/app/performance/test_company_search_performance.py
+#
+# GET /companies/'s `search` goes through the shared trigram helpers (see
+# backend/mystic_auth/database/text_search.py) against the companies
+# table's name/ticker pg_trgm indexes. Same two checks as mystic_auth's
+# test_trigram_search_performance.py, at 100k companies: the planner picks
+# the trigram indexes, and a ranked search stays inside a generous budget.
+import time
+
+import pytest
+from backend.app.access.scope import CompanyScope
+from backend.app.companies.company_crud import count_companies_in_scope, list_companies_in_scope
+from backend.mystic_auth.database.connection import database
+from sqlalchemy import text
+
+from .conftest import bulk_seed_root_companies, cleanup_perf_companies, unique_tag
+
+_ROW_COUNT = 100_000
+_SEARCH_MAX_SECONDS = 1.0
+
+_UNRESTRICTED = CompanyScope(unrestricted=True, company_ids=frozenset(), group_root_ids=frozenset())
+
+
+@pytest.mark.asyncio
+async def test_company_search_uses_trigram_indexes_and_ranks_exact_ticker_first():
+    tag = unique_tag()
+    await bulk_seed_root_companies(_ROW_COUNT, tag)
+    try:
+        ticker = f"PERF{tag.upper()}3133"
+
+        async with database.async_session() as session:
+            result = await session.execute(
+                text(
+                    "EXPLAIN SELECT id FROM companies "
+                    "WHERE name ILIKE :pattern ESCAPE '\\' OR ticker ILIKE :pattern ESCAPE '\\'"
+                ),
+                {"pattern": f"%{ticker}%"},
+            )
+            plan = "\n".join(row[0] for row in result)
+        assert "ix_companies_ticker_trgm" in plan, plan
+
+        async with database.async_session() as session:
+            start = time.perf_counter()
+            companies = await list_companies_in_scope(_UNRESTRICTED, session, limit=20, search=ticker.lower())
+            total = await count_companies_in_scope(_UNRESTRICTED, session, search=ticker.lower())
+            elapsed = time.perf_counter() - start
+
+        # ...3133 itself plus ...31330 through ...31339; the exact ticker is
+        # the closest match, so similarity ranking must put it first.
+        assert total == 11
+        assert companies[0].ticker == ticker
+        assert elapsed < _SEARCH_MAX_SECONDS, f"took {elapsed:.3f}s over {_ROW_COUNT} companies"
+    finally:
+        await cleanup_perf_companies(tag)
@@ -9,6 +9,7 @@
 # must write a row automatically, with no route needing to opt in, and the
 # query API itself must be PBAC-gated.
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import pytest
 import pytest_asyncio
@@ -20,6 +21,9 @@ from backend.mystic_auth.authorization.policies.default_policies import (
     SYSTEM_SUPERUSER_POLICY_NAME,
     USER_ADMINISTRATION_POLICY_NAME,
 )
+from backend.mystic_auth.authorization.repositories.audit_log_repository import (
+    audit_log_repository,
+)
 from backend.mystic_auth.authorization.repositories.policy_repository import (
     policy_repository,
 )
@@ -82,6 +86,10 @@ async def _cleanup_audit_log(created_emails):
             text("DELETE FROM authorization_audit_log WHERE user_email = ANY(:emails)"),
             {"emails": created_emails},
         )
+        await session.execute(
+            text("DELETE FROM authorization_audit_rollup WHERE user_email = ANY(:emails)"),
+            {"emails": created_emails},
+        )
         await session.commit()
 
 
@@ -285,3 +293,55 @@ async def test_global_audit_log_filters_by_action_and_allowed(client, created_em
     denied_entries = denied_only_resp.json()
     assert denied_entries
     assert all(e["action"] == "users:list_all" and e["allowed"] is False for e in denied_entries)
+
+
+# ---------------------------- Aggregated allows ----------------------------
+
+@pytest.mark.asyncio
+async def test_rollups_accumulate_and_list_alongside_full_rows(client, created_emails):
+    # Under AUTHORIZATION_AUDIT_MODE="aggregate_allows" routine allows are
+    # upserted into per-minute counters: two flushes of the same minute must
+    # add up to one counter, and the listing must return it next to the
+    # user's full decision rows, newest first across both kinds.
+    target_email = _unique_email("target")
+    system_email = _unique_email("system")
+    await _create_verified_user(client, created_emails, target_email, [SELF_SERVICE_POLICY_NAME])
+    # One full users:read_own row for the target (a Permission action, so
+    # never aggregated in any mode).
+    assert (await client.get("/users/me")).status_code == 200
+    await _create_system_user(client, created_emails, system_email)
+
+    minute = datetime.now(UTC).replace(second=0, microsecond=0) + timedelta(days=1)
+    key = {
+        "user_email": target_email,
+        "action": "companies:read",
+        "resource_type": "companies",
+        "allowed": True,
+        "bucket_start": minute,
+    }
+    async with database.async_session() as session:
+        await audit_log_repository.upsert_rollups(
+            [{**key, "decision_count": 3, "first_seen_at": minute + timedelta(seconds=5),
+              "last_seen_at": minute + timedelta(seconds=20)}],
+            session,
+        )
+        await audit_log_repository.upsert_rollups(
+            [{**key, "decision_count": 2, "first_seen_at": minute + timedelta(seconds=1),
+              "last_seen_at": minute + timedelta(seconds=40)}],
+            session,
+        )
+
+    resp = await client.get(f"/authorization/audit-log/users/{target_email}")
+    assert resp.status_code == 200
+    entries = resp.json()
+
+    rollup = entries[0]
+    assert rollup["kind"] == "rollup"
+    assert rollup["decision_count"] == 5
+    assert rollup["action"] == "companies:read"
+    assert datetime.fromisoformat(rollup["first_seen_at"]) == minute + timedelta(seconds=1)
+    assert datetime.fromisoformat(rollup["created_at"]) == minute + timedelta(seconds=40)
+    assert rollup["granting_policy_names"] == []
+    assert all(e["kind"] == "decision" and e["decision_count"] == 1 for e in entries[1:])
+    assert len(entries) > 1
+    assert int(resp.headers["X-Total-Count"]) == len(entries)
@@ -0,0 +1,62 @@
+# tests/backend/mystic_auth/integration/audit_log/test_audit_partitions_integration.py
+#
+# Both audit tables are range-partitioned by month (migration f1b3d5e7a9c2)
+# and kept that way by database/partitions.py. Against the real, migrated
+# PostgreSQL: the tables really are partitioned, maintenance keeps the
+# coming months ready and is idempotent, and a row lands in its own month's
+# partition rather than the DEFAULT one.
+from datetime import UTC, datetime
+
+import pytest
+from backend.mystic_auth.database import partitions
+from backend.mystic_auth.database.connection import database
+from sqlalchemy import text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("table", ["authorization_audit_log", "security_audit_log"])
+async def test_audit_tables_are_partitioned_by_created_at(table):
+    async with database.async_session() as session:
+        strategy = await session.scalar(
+            text("SELECT partstrat FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+            {"table": table},
+        )
+
+    assert strategy == "r"
+
+
+@pytest.mark.asyncio
+async def test_maintenance_keeps_the_coming_months_ready_and_is_idempotent():
+    await partitions.maintain_partitions()
+    second = await partitions.maintain_partitions()
+
+    today = datetime.now(UTC).date().replace(day=1)
+    async with database.async_session() as session:
+        for table in ("authorization_audit_log", "security_audit_log"):
+            assert second[table] is None or second[table]["created"] == []
+            names = set(await partitions._partition_names(table, session))
+            for offset in range(partitions._MONTHS_AHEAD + 1):
+                assert partitions.partition_name(table, partitions.add_months(today, offset)) in names
+
+
+@pytest.mark.asyncio
+async def test_a_new_row_lands_in_its_months_partition():
+    await partitions.maintain_partitions()
+    marker = f"partition-check-{datetime.now(UTC).timestamp()}@example.com"
+
+    async with database.async_session() as session:
+        await session.execute(
+            text(
+                "INSERT INTO security_audit_log (user_email, event_type, success) "
+                "VALUES (:email, 'login_success', true)"
+            ),
+            {"email": marker},
+        )
+        partition = await session.scalar(
+            text("SELECT tableoid::regclass::text FROM security_audit_log WHERE user_email = :email"),
+            {"email": marker},
+        )
+        await session.execute(text("DELETE FROM security_audit_log WHERE user_email = :email"), {"email": marker})
+        await session.commit()
+
+    assert partition == partitions.partition_name("security_audit_log", datetime.now(UTC).date().replace(day=1))
@@ -75,3 +75,42 @@ async def cleanup_perftest_rows(tag: str) -> None:
             text("DELETE FROM policies WHERE name LIKE :pattern"), {"pattern": f"perftest_policy_{tag}_%"}
         )
         await session.commit()
+
+
+async def bulk_seed_authorization_audit_rows(count: int, tag: str) -> None:
+    """`count` authorization_audit_log rows spread across `count // 10`
+    distinct perftest user_emails, roughly the shape of real traffic (many
+    decisions per user). Not tied to real users rows: the audit log has no
+    foreign key to users, see its model docstring."""
+    async with database.async_session() as session:
+        await session.execute(
+            text(
+                "INSERT INTO authorization_audit_log (user_email, action, resource_type, allowed, "
+                "candidate_policy_names, granting_policy_names, created_at) "
+                "SELECT 'perftest_' || :tag || '_' || (i / 10) || '@example.com', 'perftest:action', "
+                "'perftest_resource', (i % 2 = 0), ARRAY[]::varchar[], ARRAY[]::varchar[], "
+                "now() - (i || ' seconds')::interval "
+                "FROM generate_series(0, :count - 1) AS i"
+            ),
+            {"tag": tag, "count": count},
+        )
+        await session.commit()
+
+
+async def cleanup_perftest_audit_rows(tag: str) -> None:
+    async with database.async_session() as session:
+        await session.execute(
+            text("DELETE FROM authorization_audit_log WHERE user_email LIKE :pattern"),
+            {"pattern": f"perftest_{tag}_%"},
+        )
+        await session.commit()
+
+
+async def explain_plan(sql: str, params: dict) -> str:
+    """The planner's chosen plan for `sql`, as text, after refreshing table
+    statistics so a freshly bulk-seeded table isn't planned as if empty."""
+    async with database.async_session() as session:
+        await session.execute(text("ANALYZE users"))
+        await session.execute(text("ANALYZE authorization_audit_log"))
+        result = await session.execute(text(f"EXPLAIN {sql}"), params)
+        return "\n".join(row[0] for row in result)
@@ -0,0 +1,84 @@
+# tests/backend/mystic_auth/performance/test_trigram_search_performance.py
+#
+# Every list endpoint's `search` is an unanchored, case-insensitive
+# substring match, which only a pg_trgm GIN index can serve (see
+# backend/mystic_auth/database/text_search.py and migration b4d8f2a6c0e3).
+# These seed 100k+ rows, then check two things: that the planner actually
+# picks the trigram index for the exact predicate the repositories build
+# (the real regression alarm; a dropped index or a helper change back to a
+# non-indexable form flips this straight back to a Seq Scan), and that the
+# ranked search stays well inside a generous wall-clock budget.
+import time
+
+import pytest
+from backend.mystic_auth.authorization.repositories.audit_log_repository import audit_log_repository
+from backend.mystic_auth.database.connection import database
+from backend.mystic_auth.user_crud.user_crud_collector import user_crud
+
+from .conftest import (
+    bulk_seed_authorization_audit_rows,
+    bulk_seed_users,
+    cleanup_perftest_audit_rows,
+    cleanup_perftest_rows,
+    explain_plan,
+    unique_tag,
+)
+
+_ROW_COUNT = 100_000
+
+# Generous on purpose, same as test_authorization_performance.py: an indexed
+# trigram lookup on 100k rows is single-digit milliseconds; a sequential
+# scan with a per-row ILIKE and similarity() is what this would catch.
+_SEARCH_MAX_SECONDS = 1.0
+
+
+@pytest.mark.asyncio
+async def test_user_search_uses_trigram_index_and_ranks_exact_match_first():
+    tag = unique_tag()
+    await bulk_seed_users(_ROW_COUNT, tag)
+    try:
+        target = f"perftest_{tag}_54321@example.com"
+
+        plan = await explain_plan(
+            "SELECT id FROM users WHERE name ILIKE :pattern ESCAPE '\\' OR email ILIKE :pattern ESCAPE '\\'",
+            {"pattern": f"%{target}%"},
+        )
+        assert "ix_users_email_trgm" in plan, plan
+
+        async with database.async_session() as session:
+            start = time.perf_counter()
+            rows = await user_crud.get_all(session, limit=20, search=f"{tag}_54321")
+            elapsed = time.perf_counter() - start
+
+        # "_54321" also matches _543210.._543219 etc.; the exact address is
+        # the most similar, so ranking must put it first.
+        assert rows[0].email == target
+        assert elapsed < _SEARCH_MAX_SECONDS, f"took {elapsed:.3f}s over {_ROW_COUNT} users"
+    finally:
+        await cleanup_perftest_rows(tag)
+
+
+@pytest.mark.asyncio
+async def test_audit_log_search_uses_trigram_index():
+    tag = unique_tag()
+    await bulk_seed_authorization_audit_rows(_ROW_COUNT, tag)
+    try:
+        needle = f"perftest_{tag}_4242@"
+
+        plan = await explain_plan(
+            "SELECT id FROM authorization_audit_log WHERE user_email ILIKE :pattern ESCAPE '\\'",
+            {"pattern": f"%{needle}%"},
+        )
+        assert "ix_authorization_audit_log_user_email_trgm" in plan, plan
+
+        async with database.async_session() as session:
+            start = time.perf_counter()
+            rows = await audit_log_repository.get_all(session, limit=50, search=needle)
+            total = await audit_log_repository.count(session, search=needle)
+            elapsed = time.perf_counter() - start
+
+        assert total == 10
+        assert {row.user_email for row in rows} == {f"{needle}example.com"}
+        assert elapsed < _SEARCH_MAX_SECONDS, f"took {elapsed:.3f}s over {_ROW_COUNT} audit rows"
+    finally:
+        await cleanup_perftest_audit_rows(tag)
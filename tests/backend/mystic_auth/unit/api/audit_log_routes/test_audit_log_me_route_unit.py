@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 from backend.mystic_auth.api.pbac_routes.pbac_audit_log_routes import list_my_audit_log
+from backend.mystic_auth.database.pagination import Page
 from fastapi import Response
 
 MODULE = "backend.mystic_auth.api.pbac_routes.pbac_audit_log_routes"
@@ -21,12 +22,14 @@ async def test_list_my_audit_log_scopes_to_caller_email(mocker):
     current_user = {"email": "caller@example.com", "name": "Caller"}
     expected_entries = [object(), object()]
     get_for_user_mock = mocker.patch(
-        f"{MODULE}.audit_log_repository.get_for_user", new_callable=AsyncMock, return_value=expected_entries
+        f"{MODULE}.audit_log_repository.get_page_for_user",
+        new_callable=AsyncMock,
+        return_value=Page(items=expected_entries, total=2),
     )
-    mocker.patch(f"{MODULE}.audit_log_repository.count_for_user", new_callable=AsyncMock, return_value=2)
 
+    response = Response()
     result = await list_my_audit_log(
-        response=Response(),
+        response=response,
         limit=50,
         offset=10,
         action=None,
@@ -50,15 +53,16 @@ async def test_list_my_audit_log_scopes_to_caller_email(mocker):
         sort_dir="desc",
     )
     assert result == expected_entries
+    assert response.headers["X-Total-Count"] == "2"
+    assert response.headers["X-Total-Count-Estimated"] == "false"
 
 
 @pytest.mark.asyncio
 async def test_list_my_audit_log_default_paging(mocker):
     current_user = {"email": "someone@example.com", "name": "Someone"}
     get_for_user_mock = mocker.patch(
-        f"{MODULE}.audit_log_repository.get_for_user", new_callable=AsyncMock, return_value=[]
+        f"{MODULE}.audit_log_repository.get_page_for_user", new_callable=AsyncMock, return_value=Page(items=[], total=0)
     )
-    mocker.patch(f"{MODULE}.audit_log_repository.count_for_user", new_callable=AsyncMock, return_value=0)
 
     await list_my_audit_log(
         response=Response(),
@@ -92,9 +96,8 @@ async def test_list_my_audit_log_passes_field_filters_through(mocker):
     unchanged, the same way limit/offset/sort already do."""
     current_user = {"email": "caller@example.com", "name": "Caller"}
     get_for_user_mock = mocker.patch(
-        f"{MODULE}.audit_log_repository.get_for_user", new_callable=AsyncMock, return_value=[]
+        f"{MODULE}.audit_log_repository.get_page_for_user", new_callable=AsyncMock, return_value=Page(items=[], total=0)
     )
-    mocker.patch(f"{MODULE}.audit_log_repository.count_for_user", new_callable=AsyncMock, return_value=0)
 
     await list_my_audit_log(
         response=Response(),
@@ -56,3 +56,21 @@ async def test_health_ready_returns_503_when_redis_is_down(mocker):
     assert response.status_code == 503
     body = json.loads(response.body.decode())
     assert body == {"status": "error", "checks": {"database": "ok", "redis": "error"}}
+
+
+@pytest.mark.asyncio
+async def test_health_ready_holds_readiness_while_the_startup_warmup_is_pending(mocker):
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=None)
+    mocker.patch(f"{MODULE}.redis_client.ping", new_callable=AsyncMock, return_value=True)
+    warmup = mocker.patch(f"{MODULE}.startup_warmup")
+
+    warmup.state = "pending"
+    response = await health_ready(db=db)
+    assert response.status_code == 503
+    assert json.loads(response.body.decode())["checks"] == {"database": "ok", "redis": "ok", "warmup": "pending"}
+
+    warmup.state = "ok"
+    response = await health_ready(db=db)
+    assert response.status_code == 200
+    assert json.loads(response.body.decode())["checks"] == {"database": "ok", "redis": "ok", "warmup": "ok"}
@@ -28,6 +28,16 @@ ROUTES_MODULE = "backend.mystic_auth.api.pbac_routes.policy_history_routes"
 SERVICE_MODULE = "backend.mystic_auth.authorization.services.authorization_service"
 
 
+# Registered policy-change hooks (the app's user_company_access maintenance)
+# would issue SQL against the mocked session; their dispatch has its own tests.
+@pytest.fixture(autouse=True)
+def hooks(mocker):
+    return mocker.patch(
+        f"{REPO_MODULE}.policy_change_hooks",
+        new=MagicMock(policy_assigned=AsyncMock(), policy_changed=AsyncMock()),
+    )
+
+
 # ---------------------------- Helpers ----------------------------
 def _make_policy(**overrides):
     policy = MagicMock()
@@ -84,13 +94,14 @@ async def test_create_policy_writes_created_history_entry(mocker):
 @pytest.mark.asyncio
 async def test_update_policy_writes_updated_history_with_changed_fields(mocker):
     db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock())
     db.flush = AsyncMock()
     db.commit = AsyncMock()
     db.refresh = AsyncMock()
     policy = _make_policy()
     mock_history_repo = mocker.patch(f"{REPO_MODULE}.policy_history_repository")
     mocker.patch(f"{REPO_MODULE}.authorization_cache_service", new=MagicMock(
-        invalidate_all_user_policies=AsyncMock()
+        invalidate_users_policies=AsyncMock()
     ))
 
     await PolicyRepository.update(
@@ -112,13 +123,14 @@ async def test_update_policy_writes_updated_history_with_changed_fields(mocker):
 @pytest.mark.asyncio
 async def test_update_policy_can_be_labeled_as_rolled_back(mocker):
     db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock())
     db.flush = AsyncMock()
     db.commit = AsyncMock()
     db.refresh = AsyncMock()
     policy = _make_policy()
     mock_history_repo = mocker.patch(f"{REPO_MODULE}.policy_history_repository")
     mocker.patch(f"{REPO_MODULE}.authorization_cache_service", new=MagicMock(
-        invalidate_all_user_policies=AsyncMock()
+        invalidate_users_policies=AsyncMock()
     ))
 
     await PolicyRepository.update(
@@ -136,12 +148,13 @@ async def test_update_policy_can_be_labeled_as_rolled_back(mocker):
 @pytest.mark.asyncio
 async def test_delete_policy_writes_deleted_history_entry(mocker):
     db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock())
     db.delete = AsyncMock()
     db.commit = AsyncMock()
     policy = _make_policy()
     mock_history_repo = mocker.patch(f"{REPO_MODULE}.policy_history_repository")
     mocker.patch(f"{REPO_MODULE}.authorization_cache_service", new=MagicMock(
-        invalidate_all_user_policies=AsyncMock()
+        invalidate_users_policies=AsyncMock()
     ))
 
     await PolicyRepository.delete(policy, db, changed_by="admin@example.com", change_reason="cleanup")
@@ -8,7 +8,9 @@ import json
 from unittest.mock import AsyncMock
 
 import pytest
+from backend.mystic_auth.authorization.caching import authorization_cache_service as cache_module
 from backend.mystic_auth.authorization.caching.authorization_cache_service import (
+    _user_derived_key,
     _user_policies_key,
     authorization_cache_service,
 )
@@ -17,6 +19,13 @@ from backend.mystic_auth.authorization.models.policy_model import Policy
 MODULE = "backend.mystic_auth.authorization.caching.authorization_cache_service"
 
 
+@pytest.fixture
+def pinned_generation(mocker):
+    # For tests that mock redis_client.get/set/delete themselves: keeps the
+    # policy-generation read off those mocks and pins the keys' generation.
+    return mocker.patch(f"{MODULE}._policy_generation", new_callable=AsyncMock, return_value=0)
+
+
 def _policy(name="self_service", actions=None, resource_type="users", conditions=None, is_active=True):
     return Policy(
         name=name,
@@ -31,7 +40,7 @@ def _policy(name="self_service", actions=None, resource_type="users", conditions
 # ---------------------------- Cache hit ----------------------------
 
 @pytest.mark.asyncio
-async def test_get_user_policies_cache_hit_returns_deserialized_policies(mocker):
+async def test_get_user_policies_cache_hit_returns_deserialized_policies(mocker, pinned_generation):
     payload = json.dumps([
         {
             "name": "self_service", "description": "d", "actions": ["users:read_own"],
@@ -51,7 +60,7 @@ async def test_get_user_policies_cache_hit_returns_deserialized_policies(mocker)
 # ---------------------------- Cache miss ----------------------------
 
 @pytest.mark.asyncio
-async def test_get_user_policies_cache_miss_returns_none(mocker):
+async def test_get_user_policies_cache_miss_returns_none(mocker, pinned_generation):
     mocker.patch(f"{MODULE}.redis_client.get", new_callable=AsyncMock, return_value=None)
 
     result = await authorization_cache_service.get_user_policies("user@example.com")
@@ -62,14 +71,14 @@ async def test_get_user_policies_cache_miss_returns_none(mocker):
 # ---------------------------- Set / round-trip ----------------------------
 
 @pytest.mark.asyncio
-async def test_set_user_policies_writes_serialized_payload_with_ttl(mocker):
+async def test_set_user_policies_writes_serialized_payload_with_ttl(mocker, pinned_generation):
     set_mock = mocker.patch(f"{MODULE}.redis_client.set", new_callable=AsyncMock)
 
     await authorization_cache_service.set_user_policies("user@example.com", [_policy()])
 
     set_mock.assert_awaited_once()
     args, kwargs = set_mock.await_args
-    assert args[0] == _user_policies_key("user@example.com")
+    assert args[0] == _user_policies_key("user@example.com", 0)
     stored = json.loads(args[1])
     assert stored[0]["name"] == "self_service"
     assert kwargs["ex"] > 0
@@ -78,28 +87,128 @@ async def test_set_user_policies_writes_serialized_payload_with_ttl(mocker):
 # ---------------------------- Invalidate one user ----------------------------
 
 @pytest.mark.asyncio
-async def test_invalidate_user_policies_deletes_that_users_key(mocker):
+async def test_invalidate_user_policies_deletes_that_users_keys(mocker, pinned_generation):
     delete_mock = mocker.patch(f"{MODULE}.redis_client.delete", new_callable=AsyncMock)
 
     await authorization_cache_service.invalidate_user_policies("user@example.com")
 
-    delete_mock.assert_awaited_once_with(_user_policies_key("user@example.com"))
+    # The policy list and everything derived from it, in one DEL.
+    delete_mock.assert_awaited_once_with(
+        _user_policies_key("user@example.com", 0), _user_derived_key("user@example.com", 0)
+    )
 
 
-# ---------------------------- Invalidate all users ----------------------------
+# ---------------------------- Invalidate a policy's holders ----------------------------
 
 @pytest.mark.asyncio
-async def test_invalidate_all_user_policies_deletes_every_matching_key(mocker):
-    async def _fake_scan_iter(match):
-        for key in ["authz:user_policies:a@example.com", "authz:user_policies:b@example.com"]:
-            yield key
+async def test_invalidate_users_policies_drops_only_those_users_keys():
+    # Real (test) Redis: which keys survive the pipelined DELs is the
+    # behavior under test.
+    holders = ["holder-a@example.com", "holder-b@example.com"]
+    bystander = "bystander@example.com"
+    for email in [*holders, bystander]:
+        await authorization_cache_service.set_user_policies(email, [_policy()])
+        await authorization_cache_service.set_user_derived(email, "scope:a", [1])
 
-    mocker.patch(f"{MODULE}.redis_client.scan_iter", side_effect=_fake_scan_iter)
-    delete_mock = mocker.patch(f"{MODULE}.redis_client.delete", new_callable=AsyncMock)
+    await authorization_cache_service.invalidate_users_policies(holders)
+
+    for email in holders:
+        assert await authorization_cache_service.get_user_policies(email) is None
+        assert await authorization_cache_service.get_user_derived(email, "scope:a") is None
+    assert await authorization_cache_service.get_user_policies(bystander) is not None
+    assert await authorization_cache_service.get_user_derived(bystander, "scope:a") == [1]
+    await authorization_cache_service.invalidate_user_policies(bystander)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_users_policies_names_few_holders_and_flushes_l1s_for_many(mocker):
+    mocker.patch(f"{MODULE}._TARGETED_PUBLISH_LIMIT", 2)
+    publish_one = mocker.patch(f"{MODULE}.publish_policy_invalidation", new_callable=AsyncMock)
+    publish_many = mocker.patch(f"{MODULE}.publish_policy_invalidations", new_callable=AsyncMock)
+
+    await authorization_cache_service.invalidate_users_policies(["a@example.com", "b@example.com"])
+    publish_many.assert_awaited_once_with(["a@example.com", "b@example.com"])
+    publish_one.assert_not_called()
+
+    await authorization_cache_service.invalidate_users_policies(["a@example.com", "b@example.com", "c@example.com"])
+    publish_one.assert_awaited_once_with(None)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_users_policies_with_no_holders_touches_nothing(mocker):
+    pipeline_mock = mocker.patch(f"{MODULE}.redis_client.pipeline")
+    publish_one = mocker.patch(f"{MODULE}.publish_policy_invalidation", new_callable=AsyncMock)
+
+    await authorization_cache_service.invalidate_users_policies([])
+
+    pipeline_mock.assert_not_called()
+    publish_one.assert_not_called()
+
+
+# ---------------------------- Invalidate all users ----------------------------
+
+@pytest.mark.asyncio
+async def test_invalidate_all_user_policies_is_one_incr_that_retires_every_key(mocker):
+    # Real (test) Redis: the generation bump is the behavior under test.
+    email = "generation-flush@example.com"
+    await authorization_cache_service.set_user_policies(email, [_policy()])
+    await authorization_cache_service.set_user_derived(email, "scope:a", [1])
+    before = await cache_module._policy_generation()
+    delete_spy = mocker.spy(cache_module.redis_client, "delete")
+    scan_spy = mocker.spy(cache_module.redis_client, "scan_iter")
 
     await authorization_cache_service.invalidate_all_user_policies()
 
-    assert delete_mock.await_count == 2
+    assert await cache_module._policy_generation() == before + 1
+    assert await authorization_cache_service.get_user_policies(email) is None
+    assert await authorization_cache_service.get_user_derived(email, "scope:a") is None
+    delete_spy.assert_not_called()
+    scan_spy.assert_not_called()
+
+    # The new generation is an ordinary, writable namespace.
+    await authorization_cache_service.set_user_policies(email, [_policy()])
+    assert await authorization_cache_service.get_user_policies(email) is not None
+    await authorization_cache_service.invalidate_user_policies(email)
+
+
+# ---------------------------- Derived values ----------------------------
+
+@pytest.mark.asyncio
+async def test_user_derived_round_trips_through_the_users_hash():
+    # Real (test) Redis rather than mocks: the hash + TTL pipeline is the
+    # behavior under test.
+    email = "derived-roundtrip@example.com"
+    await authorization_cache_service.invalidate_user_policies(email)
+
+    assert await authorization_cache_service.get_user_derived(email, "scope:a") is None
+    await authorization_cache_service.set_user_derived(email, "scope:a", {"ids": [1, 2]})
+
+    assert await authorization_cache_service.get_user_derived(email, "scope:a") == {"ids": [1, 2]}
+    assert await authorization_cache_service.get_user_derived(email, "scope:b") is None
+
+    await authorization_cache_service.invalidate_user_policies(email)
+    assert await authorization_cache_service.get_user_derived(email, "scope:a") is None
+
+
+@pytest.mark.asyncio
+async def test_get_user_derived_falls_back_to_none_when_redis_is_unavailable(mocker):
+    mocker.patch(f"{MODULE}.redis_client.hget", new_callable=AsyncMock, side_effect=ConnectionError("redis down"))
+
+    assert await authorization_cache_service.get_user_derived("user@example.com", "scope:a") is None
+
+
+@pytest.mark.asyncio
+async def test_get_user_derived_corrupt_payload_returns_none(mocker, pinned_generation):
+    mocker.patch(f"{MODULE}.redis_client.hget", new_callable=AsyncMock, return_value="not-json{{")
+
+    assert await authorization_cache_service.get_user_derived("user@example.com", "scope:a") is None
+
+
+@pytest.mark.asyncio
+async def test_set_user_derived_swallows_redis_errors_without_raising(mocker):
+    mocker.patch(f"{MODULE}.redis_client.pipeline", side_effect=ConnectionError("redis down"))
+
+    await authorization_cache_service.set_user_derived("user@example.com", "scope:a", {"ids": []})  # must not raise
 
 
 # ---------------------------- Redis-unavailable fallback ----------------------------
@@ -128,7 +237,7 @@ async def test_invalidate_user_policies_swallows_redis_errors_without_raising(mo
 
 
 @pytest.mark.asyncio
-async def test_get_user_policies_corrupt_payload_returns_none_not_a_crash(mocker):
+async def test_get_user_policies_corrupt_payload_returns_none_not_a_crash(mocker, pinned_generation):
     mocker.patch(f"{MODULE}.redis_client.get", new_callable=AsyncMock, return_value="not-valid-json{{{")
 
     result = await authorization_cache_service.get_user_policies("user@example.com")
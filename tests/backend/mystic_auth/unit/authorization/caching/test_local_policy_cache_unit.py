@@ -0,0 +1,203 @@
+# tests/backend/mystic_auth/unit/authorization/caching/test_local_policy_cache_unit.py
+#
+# Unit coverage for the in-process L1 policy cache: LRU/TTL bookkeeping and
+# counters, the "only while subscribed" switch, the generation check against
+# reads racing an invalidation, AuthorizationCacheService serving from it
+# without touching Redis, and the pub/sub listener applying other workers'
+# invalidations.
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.mystic_auth.authorization.caching import local_policy_cache as module
+from backend.mystic_auth.authorization.caching.authorization_cache_service import authorization_cache_service
+from backend.mystic_auth.authorization.caching.local_policy_cache import LocalPolicyCache
+from backend.mystic_auth.authorization.evaluators.policy_set import PolicySet
+
+CACHE_MODULE = "backend.mystic_auth.authorization.caching.authorization_cache_service"
+L1_MODULE = "backend.mystic_auth.authorization.caching.local_policy_cache"
+
+
+def _listening_cache(**kwargs):
+    cache = LocalPolicyCache(**kwargs)
+    cache.set_listening(True)
+    return cache
+
+
+def test_get_returns_the_stored_policy_set_and_counts_hits_and_misses():
+    cache = _listening_cache()
+    policies = PolicySet([MagicMock()])
+
+    assert cache.get("a@example.com") is None
+    cache.put("a@example.com", policies, cache.generation)
+    result = cache.get("a@example.com")
+
+    assert result is policies
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = _listening_cache(max_entries=2)
+    cache.put("a", PolicySet(), cache.generation)
+    cache.put("b", PolicySet(), cache.generation)
+    cache.get("a")
+    cache.put("c", PolicySet(), cache.generation)
+
+    assert cache.get("b") is None
+    assert len(cache.get("a")) == 0
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses(mocker):
+    clock = mocker.patch(f"{L1_MODULE}.time.monotonic", return_value=100.0)
+    cache = _listening_cache(ttl_seconds=5)
+    cache.put("a", PolicySet(), cache.generation)
+
+    clock.return_value = 105.0
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_nothing_is_served_or_stored_unless_listening():
+    cache = LocalPolicyCache()
+    cache.put("a", PolicySet(), cache.generation)
+    assert cache.get("a") is None
+
+    cache = _listening_cache()
+    cache.put("a", PolicySet(), cache.generation)
+    cache.set_listening(False)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_put_is_dropped_if_an_invalidation_landed_since_the_read():
+    cache = _listening_cache()
+    generation = cache.generation
+    cache.invalidate("someone-else@example.com")
+
+    cache.put("a", PolicySet(), generation)
+
+    assert cache.get("a") is None
+
+
+def test_policy_generation_mirror_follows_the_entries_rules():
+    cache = LocalPolicyCache()
+    cache.set_policy_generation(3, cache.generation)
+    assert cache.policy_generation is None  # not listening
+
+    cache.set_listening(True)
+    stale_read = cache.generation
+    cache.invalidate_all()
+    cache.set_policy_generation(3, stale_read)
+    assert cache.policy_generation is None  # raced a drop-everything message
+
+    cache.set_policy_generation(4, cache.generation)
+    assert cache.policy_generation == 4
+    cache.invalidate("a@example.com")
+    assert cache.policy_generation == 4  # one user's invalidation leaves it alone
+    cache.invalidate_all()
+    assert cache.policy_generation is None
+
+
+def test_policy_generation_mirror_expires_like_an_entry(mocker):
+    # A worker that missed a bump's "*" message must still go back to Redis
+    # for the generation within the TTL.
+    clock = mocker.patch(f"{L1_MODULE}.time.monotonic", return_value=100.0)
+    cache = _listening_cache(ttl_seconds=5)
+    cache.set_policy_generation(4, cache.generation)
+
+    clock.return_value = 104.9
+    assert cache.policy_generation == 4
+    clock.return_value = 105.0
+    assert cache.policy_generation is None
+    assert cache.stats()["policy_generation"] is None
+
+
+@pytest.mark.asyncio
+async def test_service_serves_l1_hits_without_redis(mocker):
+    l1 = _listening_cache()
+    l1.set_policy_generation(0, l1.generation)
+    mocker.patch(f"{CACHE_MODULE}.local_policy_cache", l1)
+    get_mock = mocker.patch(
+        f"{CACHE_MODULE}.redis_client.get",
+        new_callable=AsyncMock,
+        return_value='[{"name": "p", "actions": ["a"], "resource_type": "r"}]',
+    )
+
+    first = await authorization_cache_service.get_user_policies("a@example.com")
+    second = await authorization_cache_service.get_user_policies("a@example.com")
+
+    get_mock.assert_awaited_once()
+    assert second is first
+    assert first.names == ("p",)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_the_local_entry_and_publishes(mocker):
+    l1 = _listening_cache()
+    l1.put("a@example.com", PolicySet(), l1.generation)
+    mocker.patch(f"{CACHE_MODULE}.local_policy_cache", l1)
+    mocker.patch(f"{CACHE_MODULE}.redis_client.delete", new_callable=AsyncMock)
+    publish = mocker.patch(f"{L1_MODULE}.redis_client.publish", new_callable=AsyncMock)
+
+    await authorization_cache_service.invalidate_user_policies("a@example.com")
+
+    assert l1.get("a@example.com") is None
+    publish.assert_awaited_once_with(module._INVALIDATION_CHANNEL, "a@example.com")
+
+
+@pytest.mark.asyncio
+async def test_holder_invalidation_drops_only_the_holders_and_publishes_one_message_each(mocker):
+    l1 = _listening_cache()
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        l1.put(email, PolicySet(), l1.generation)
+    mocker.patch(f"{CACHE_MODULE}.local_policy_cache", l1)
+    pipe = MagicMock(execute=AsyncMock())
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=None)
+    mocker.patch(f"{CACHE_MODULE}.redis_client.pipeline", return_value=pipe)
+    mocker.patch(f"{L1_MODULE}.redis_client.pipeline", return_value=pipe)
+
+    await authorization_cache_service.invalidate_users_policies(["a@example.com", "b@example.com"])
+
+    assert l1.get("a@example.com") is None
+    assert l1.get("b@example.com") is None
+    assert l1.get("c@example.com") is not None
+    assert [call.args for call in pipe.publish.call_args_list] == [
+        (module._INVALIDATION_CHANNEL, "a@example.com"),
+        (module._INVALIDATION_CHANNEL, "b@example.com"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_listener_applies_published_invalidations(mocker):
+    l1 = LocalPolicyCache()
+    mocker.patch(f"{L1_MODULE}.local_policy_cache", l1)
+    applied = asyncio.Event()
+
+    async def listen():
+        yield {"type": "subscribe", "data": 1}
+        l1.put("a@example.com", PolicySet(), l1.generation)
+        l1.put("b@example.com", PolicySet(), l1.generation)
+        yield {"type": "message", "data": "a@example.com"}
+        assert l1.get("a@example.com") is None
+        assert l1.get("b@example.com") is not None
+        yield {"type": "message", "data": "*"}
+        assert l1.stats()["size"] == 0
+        applied.set()
+        await asyncio.Event().wait()
+
+    pubsub = MagicMock(subscribe=AsyncMock(), aclose=AsyncMock(), listen=listen)
+    mocker.patch(f"{L1_MODULE}.redis_client.pubsub", return_value=pubsub)
+
+    task = asyncio.create_task(module.listen_for_policy_invalidations())
+    await asyncio.wait_for(applied.wait(), timeout=1)
+    assert l1.stats()["listening"] is True
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    pubsub.subscribe.assert_awaited_once_with(module._INVALIDATION_CHANNEL)
+    assert l1.stats()["listening"] is False
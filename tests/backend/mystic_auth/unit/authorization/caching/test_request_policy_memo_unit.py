@@ -0,0 +1,112 @@
+# tests/backend/mystic_auth/unit/authorization/caching/test_request_policy_memo_unit.py
+#
+# Unit coverage for the per-request policy memo: within one request every
+# get_active_policies_for_user call after the first is answered without
+# touching Redis or the database, invalidation drops the request's own copy,
+# and nothing is memoized outside a request.
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.mystic_auth.authorization.caching.authorization_cache_service import authorization_cache_service
+from backend.mystic_auth.authorization.caching.request_policy_memo import (
+    RequestPolicyMemoMiddleware,
+    request_policy_memo,
+)
+from backend.mystic_auth.authorization.repositories.policy_repository import PolicyRepository
+
+REPO_MODULE = "backend.mystic_auth.authorization.repositories.policy_repository"
+CACHE_MODULE = "backend.mystic_auth.authorization.caching.authorization_cache_service"
+
+
+async def _in_request(handler, scope_type="http"):
+    """Runs `handler()` as the body of a request passed through
+    RequestPolicyMemoMiddleware, returning what it returned."""
+    outcome = {}
+
+    async def app(scope, receive, send):
+        outcome["value"] = await handler()
+
+    await RequestPolicyMemoMiddleware(app)({"type": scope_type, "method": "GET", "path": "/x"}, None, None)
+    return outcome["value"]
+
+
+def _mock_cache(mocker, policies):
+    cache = MagicMock()
+    cache.get_user_policies = AsyncMock(return_value=policies)
+    cache.set_user_policies = AsyncMock()
+    mocker.patch(f"{REPO_MODULE}.authorization_cache_service", cache)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_repeated_fetches_in_one_request_hit_the_cache_once(mocker):
+    policies = [MagicMock()]
+    cache = _mock_cache(mocker, policies)
+    before = request_policy_memo.stats()
+
+    async def handler():
+        results = [await PolicyRepository.get_active_policies_for_user("user@example.com", MagicMock()) for _ in range(3)]
+        return results, request_policy_memo.current_stats()
+
+    results, current = await _in_request(handler)
+
+    assert all(result is policies for result in results)
+    cache.get_user_policies.assert_awaited_once_with("user@example.com")
+    assert current == {"hits": 2, "misses": 1}
+    after = request_policy_memo.stats()
+    assert after["hits"] - before["hits"] == 2
+    assert after["misses"] - before["misses"] == 1
+    assert after["requests"] - before["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memo_is_per_user_and_per_request(mocker):
+    cache = _mock_cache(mocker, [MagicMock()])
+
+    async def handler():
+        await PolicyRepository.get_active_policies_for_user("a@example.com", MagicMock())
+        await PolicyRepository.get_active_policies_for_user("b@example.com", MagicMock())
+
+    await _in_request(handler)
+    await _in_request(handler)
+
+    assert cache.get_user_policies.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_no_memo_outside_a_request(mocker):
+    cache = _mock_cache(mocker, [MagicMock()])
+
+    await PolicyRepository.get_active_policies_for_user("user@example.com", MagicMock())
+    await PolicyRepository.get_active_policies_for_user("user@example.com", MagicMock())
+
+    assert cache.get_user_policies.await_count == 2
+    assert request_policy_memo.current_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_non_http_scopes_get_no_memo():
+    async def handler():
+        return request_policy_memo.current_stats()
+
+    assert await _in_request(handler, scope_type="lifespan") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_the_requests_own_copy(mocker):
+    mocker.patch(f"{CACHE_MODULE}.redis_client.delete", new_callable=AsyncMock)
+    mocker.patch(f"{CACHE_MODULE}.redis_client.incr", new_callable=AsyncMock, return_value=1)
+
+    async def handler():
+        request_policy_memo.set("a@example.com", [MagicMock()])
+        request_policy_memo.set("b@example.com", [MagicMock()])
+        await authorization_cache_service.invalidate_user_policies("a@example.com")
+        after_one = (request_policy_memo.get("a@example.com"), request_policy_memo.get("b@example.com"))
+        await authorization_cache_service.invalidate_all_user_policies()
+        return after_one, request_policy_memo.get("b@example.com")
+
+    (a_after_one, b_after_one), b_after_all = await _in_request(handler)
+
+    assert a_after_one is None
+    assert b_after_one is not None
+    assert b_after_all is None
@@ -45,6 +45,12 @@ def test_resource_attributes_canonical_shape_is_accepted_by_both_layers():
     assert ResourceAttributesCondition().evaluate({"status": "active"}, "u@example.com", {"status": "active"}, None) is True
 
 
+def test_resource_attributes_in_operator_is_accepted_by_both_layers():
+    condition = {"status": {"in": ["active", "pending"]}}
+    validate_conditions({"resource_attributes": condition})
+    assert ResourceAttributesCondition().evaluate(condition, "u@example.com", {"status": "pending"}, None) is True
+
+
 def test_context_attributes_canonical_shape_is_accepted_by_both_layers():
     payload = {"context_attributes": {"department": "finance"}}
     validate_conditions(payload)
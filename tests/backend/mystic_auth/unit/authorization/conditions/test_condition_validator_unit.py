@@ -59,6 +59,24 @@ def test_resource_attributes_rejects_empty_object():
     assert any("resource_attributes" in e for e in errors)
 
 
+def test_resource_attributes_accepts_in_operator():
+    validate_conditions({"resource_attributes": {"company_id": {"in": [1, 2, 3]}, "status": "active"}})
+
+
+@pytest.mark.parametrize(
+    "expected",
+    [{"in": []}, {"in": 3}, {"in": [[1]]}, {"not_in": [1]}, {"in": [1], "eq": 2}],
+)
+def test_resource_attributes_rejects_malformed_operator(expected):
+    errors = _errors({"resource_attributes": {"company_id": expected}})
+    assert any("resource_attributes.company_id" in e for e in errors)
+
+
+def test_resource_attributes_rejects_a_list_plain_value_pointing_at_in():
+    errors = _errors({"resource_attributes": {"subtree_root_id": [1, 2]}})
+    assert any("resource_attributes.subtree_root_id" in e and "'in'" in e for e in errors)
+
+
 def test_context_attributes_valid():
     validate_conditions({"context_attributes": {"department": "finance"}})
 
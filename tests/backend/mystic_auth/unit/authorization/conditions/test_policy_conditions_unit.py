@@ -5,6 +5,9 @@
 # -> Condition Handlers. Each handler is tested in isolation (no DB, no
 # evaluator), plus the service's dispatch/AND/fail-safe-on-unknown-key
 # behavior, plus the registry itself.
+import ipaddress
+from zoneinfo import ZoneInfo
+
 from backend.mystic_auth.authorization.conditions.condition_evaluation_service import (
     ConditionEvaluationService,
 )
@@ -23,6 +26,7 @@ from backend.mystic_auth.authorization.conditions.condition_types.network_condit
 )
 from backend.mystic_auth.authorization.conditions.condition_types.resource_attributes_condition import (
     ResourceAttributesCondition,
+    membership_set,
 )
 from backend.mystic_auth.authorization.conditions.condition_types.security_context_condition import (
     SecurityContextCondition,
@@ -34,6 +38,8 @@ from backend.mystic_auth.authorization.conditions.condition_types.time_condition
     TimeCondition,
 )
 
+TIME_MODULE = "backend.mystic_auth.authorization.conditions.condition_types.time_condition"
+
 # ==================================================================
 # SelfOnlyCondition
 # ==================================================================
@@ -77,6 +83,53 @@ def test_resource_attributes_denies_when_no_resource_supplied():
     assert handler.evaluate({"status": "draft"}, "u@example.com", None, None) is False
 
 
+def test_resource_attributes_matches_set_valued_resource_field_by_membership():
+    handler = ResourceAttributesCondition()
+    resource = {"ancestor_id": frozenset({1, 7, 42})}
+    assert handler.evaluate({"ancestor_id": 7}, "u@example.com", resource, None) is True
+    assert handler.evaluate({"ancestor_id": 8}, "u@example.com", resource, None) is False
+
+
+def test_resource_attributes_unhashable_expected_value_against_set_valued_field_fails_safe():
+    # e.g. {"subtree_root_id": [1, 2]} written where {"in": [1, 2]} was
+    # meant, checked against the frozenset company_resource_scope builds.
+    handler = ResourceAttributesCondition()
+    resource = {"subtree_root_id": frozenset({1, 2})}
+    assert handler.evaluate({"subtree_root_id": [1, 2]}, "u@example.com", resource, None) is False
+
+
+def test_resource_attributes_list_valued_resource_field_still_uses_equality():
+    handler = ResourceAttributesCondition()
+    assert handler.evaluate({"tags": 1}, "u@example.com", {"tags": [1, 2]}, None) is False
+    assert handler.evaluate({"tags": [1, 2]}, "u@example.com", {"tags": [1, 2]}, None) is True
+
+
+
+def test_resource_attributes_in_operator_matches_any_listed_value():
+    handler = ResourceAttributesCondition()
+    condition = {"company_id": {"in": [3, 7, 12]}}
+    assert handler.evaluate(condition, "u@example.com", {"company_id": 7}, None) is True
+    assert handler.evaluate(condition, "u@example.com", {"company_id": 8}, None) is False
+
+
+def test_resource_attributes_in_operator_against_set_valued_field_matches_on_overlap():
+    handler = ResourceAttributesCondition()
+    condition = {"ancestor_id": {"in": [5, 42]}}
+    assert handler.evaluate(condition, "u@example.com", {"ancestor_id": frozenset({1, 42})}, None) is True
+    assert handler.evaluate(condition, "u@example.com", {"ancestor_id": frozenset({1, 2})}, None) is False
+
+
+def test_resource_attributes_in_operator_reuses_one_frozenset_per_list():
+    values = [1, 2, 3]
+    assert membership_set(values) is membership_set(values)
+
+
+def test_resource_attributes_malformed_operator_fails_safe():
+    handler = ResourceAttributesCondition()
+    for condition in ({"id": {"in": 7}}, {"id": {"not_in": [7]}}, {"id": {"in": [[7]]}}):
+        assert handler.evaluate(condition, "u@example.com", {"id": 7}, None) is False
+
+
 # ==================================================================
 # ContextAttributesCondition
 # ==================================================================
@@ -252,6 +305,30 @@ def test_network_denies_when_allowed_ips_empty():
     assert handler.evaluate({"allowed_ips": []}, "u@example.com", None, {"ip_address": "10.0.0.1"}) is False
 
 
+def test_network_compiled_ranges_match_per_entry_checks():
+    """The compiled lookup (collapsed, bisected ranges per IP version)
+    must agree with testing each entry directly, across overlapping
+    ranges, single IPs, range edges and both IP versions."""
+    entries = ["10.0.0.0/8", "10.1.0.0/16", "192.168.1.10", "192.168.1.12", "172.16.0.0/30", "2001:db8::/32"]
+    compiled = NetworkCondition().compile({"allowed_ips": entries})
+    candidates = [
+        "9.255.255.255", "10.0.0.0", "10.255.255.255", "11.0.0.0", "192.168.1.10", "192.168.1.11",
+        "192.168.1.12", "172.16.0.3", "172.16.0.4", "2001:db8::1", "2001:db9::", "::ffff:10.0.0.1",
+    ]
+    for ip in candidates:
+        address = ipaddress.ip_address(ip)
+        expected = any(address in ipaddress.ip_network(entry, strict=False) for entry in entries)
+        assert compiled("u@example.com", None, {"ip_address": ip}) is expected, ip
+
+
+def test_network_malformed_entry_only_denies_callers_not_matched_before_it():
+    condition = {"allowed_ips": ["10.0.0.0/8", "not-a-cidr/33", "192.168.0.0/16"]}
+    handler = NetworkCondition()
+
+    assert handler.evaluate(condition, "u@example.com", None, {"ip_address": "10.1.2.3"}) is True
+    assert handler.evaluate(condition, "u@example.com", None, {"ip_address": "192.168.1.1"}) is False
+
+
 # ==================================================================
 # SecurityContextCondition
 # ==================================================================
@@ -328,3 +405,38 @@ def test_service_fails_safe_on_unrecognized_condition_key():
     satisfied."""
     service = ConditionEvaluationService(default_condition_registry)
     assert service.evaluate({"totally_made_up_condition": True}, "u@example.com", None, None) is False
+
+
+def test_compiled_conditions_decide_like_evaluate_and_parse_config_once(mocker):
+    """ConditionEvaluationService.compile (what PolicySet runs when a
+    user's policies are loaded) must decide exactly as evaluate_detailed
+    on the raw block, with the config parsed only at compile time."""
+    service = ConditionEvaluationService(default_condition_registry)
+    conditions = {
+        "time": {"start": "09:00", "end": "17:00", "timezone": "UTC"},
+        "date_range": {"start": "2026-01-01", "end": "2026-12-31"},
+        "network": {"allowed_ips": ["10.0.0.0/8"]},
+        "totally_made_up_condition": True,
+    }
+    raw = {key: conditions[key] for key in ("time", "date_range", "network")}
+    contexts = [
+        {"ip_address": "10.0.0.1", "current_time": "2026-06-01T10:00:00+00:00"},
+        {"ip_address": "10.0.0.1", "current_time": "2026-06-01T18:00:00+00:00"},
+        {"ip_address": "10.0.0.1", "current_time": "2027-01-01T10:00:00+00:00"},
+        {"ip_address": "192.168.0.1", "current_time": "2026-06-01T10:00:00+00:00"},
+        {"ip_address": "10.0.0.1", "current_time": "not-a-time"},
+    ]
+    expected = [service.evaluate_detailed(raw, "u@example.com", None, context) for context in contexts]
+
+    zone_info = mocker.patch(f"{TIME_MODULE}.ZoneInfo", wraps=ZoneInfo)
+    compiled = service.compile(raw)
+    unknown = service.compile(conditions)
+    zone_info.reset_mock()
+
+    for context, decision in zip(contexts, expected, strict=True):
+        assert service.evaluate_compiled(compiled, "u@example.com", None, context) == decision
+        failed = service.evaluate_compiled(unknown, "u@example.com", None, context)["failed_keys"]
+        assert "totally_made_up_condition" in failed
+
+    # The compiled checks above never re-resolved the timezone.
+    zone_info.assert_not_called()
@@ -19,6 +19,7 @@ from backend.mystic_auth.authorization.services.authorization_service import (
 from fastapi import HTTPException
 
 MODULE = "backend.mystic_auth.authorization.services.authorization_service"
+WRITER_MODULE = "backend.mystic_auth.authorization.services.audit_log_writer"
 
 
 def _policy(actions, resource_type="users", conditions=None, name=None):
@@ -125,7 +126,7 @@ async def test_require_raises_a_generic_error_never_leaking_policy_details(mocke
         new_callable=AsyncMock,
         return_value=[_policy(["users:read_own"], name="self_service")],
     )
-    mocker.patch(f"{MODULE}.audit_log_repository.create_entry", new_callable=AsyncMock)
+    mocker.patch(f"{WRITER_MODULE}.audit_log_repository.create_entry", new_callable=AsyncMock)
 
     with pytest.raises(HTTPException) as exc_info:
         await authorization_service.require("user@example.com", "users:list_all", "users", db=None)
@@ -0,0 +1,162 @@
+# tests/backend/mystic_auth/unit/authorization/evaluators/test_policy_evaluator_properties_unit.py
+#
+# Property-based tests for PolicyEvaluationEngine's two paths. evaluate() is
+# the short-circuiting fast path (first granting policy wins, first failing
+# condition key rejects, no explanation built); evaluate_detailed() checks
+# everything and explains it. They must never disagree on whether access is
+# allowed, for any policy list, check, resource or context, whether the
+# policies come as a plain list or as a compiled PolicySet.
+#
+# Hypothesis generates the policy lists from a deliberately small vocabulary
+# (a few actions/resource types, every registered condition type plus an
+# unknown key, values that both pass and fail), so generated checks actually
+# hit matching policies and passing/failing conditions rather than
+# overwhelmingly producing "no_matching_policy".
+from backend.mystic_auth.authorization.evaluators.policy_evaluator import PolicyEvaluationEngine
+from backend.mystic_auth.authorization.evaluators.policy_set import PolicySet
+from backend.mystic_auth.authorization.models.policy_model import Policy
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+_ACTIONS = ["companies:read", "companies:update", "balance_sheets:read"]
+_RESOURCE_TYPES = ["companies", "balance_sheets", "*"]
+_USER = "user@example.com"
+
+_condition_entries = st.one_of(
+    st.tuples(st.just("self_only"), st.booleans()),
+    st.tuples(
+        st.just("resource_attributes"),
+        st.dictionaries(
+            st.sampled_from(["company_id", "status"]),
+            st.one_of(
+                st.integers(1, 4),
+                st.sampled_from(["draft", "published"]),
+                st.builds(lambda values: {"in": values}, st.lists(st.integers(1, 4), min_size=1, max_size=3)),
+            ),
+            max_size=2,
+        ),
+    ),
+    st.tuples(st.just("context_attributes"), st.fixed_dictionaries({"mfa": st.booleans()})),
+    st.tuples(
+        st.just("time"),
+        st.fixed_dictionaries(
+            {"start": st.sampled_from(["00:00", "09:00", "22:00"]), "end": st.sampled_from(["06:00", "17:00", "23:59"])}
+        ),
+    ),
+    st.tuples(
+        st.just("date_range"),
+        st.fixed_dictionaries(
+            {},
+            optional={"start": st.sampled_from(["2026-01-01", "2027-01-01"]), "end": st.sampled_from(["2026-06-30"])},
+        ),
+    ),
+    st.tuples(
+        st.just("network"),
+        st.fixed_dictionaries(
+            {"allowed_ips": st.lists(st.sampled_from(["10.0.0.0/8", "192.168.1.7", "2001:db8::/32"]), max_size=2)}
+        ),
+    ),
+    st.tuples(st.just("made_up_condition"), st.just(True)),
+)
+
+_conditions = st.one_of(st.none(), st.lists(_condition_entries, max_size=3).map(dict))
+
+_policy_specs = st.lists(
+    st.tuples(
+        st.lists(st.sampled_from(_ACTIONS), max_size=3),
+        st.sampled_from(_RESOURCE_TYPES),
+        _conditions,
+    ),
+    max_size=8,
+)
+
+_resources = st.one_of(
+    st.none(),
+    st.fixed_dictionaries(
+        {
+            "email": st.sampled_from([_USER, "other@example.com"]),
+            "company_id": st.integers(1, 4),
+            "status": st.sampled_from(["draft", "published"]),
+        }
+    ),
+)
+
+_contexts = st.one_of(
+    st.none(),
+    st.fixed_dictionaries(
+        {
+            "mfa": st.booleans(),
+            "ip_address": st.sampled_from(["10.1.2.3", "192.168.1.7", "8.8.8.8", "2001:db8::1"]),
+            "current_time": st.sampled_from(
+                ["2026-03-01T08:00:00+00:00", "2026-03-01T12:00:00+00:00", "2026-09-01T23:00:00+00:00"]
+            ),
+        }
+    ),
+)
+
+
+def _policies(specs) -> list[Policy]:
+    return [
+        Policy(name=f"p{index}", actions=actions, resource_type=resource_type, conditions=conditions, is_active=True)
+        for index, (actions, resource_type, conditions) in enumerate(specs)
+    ]
+
+
+@settings(max_examples=300, deadline=None)
+@given(
+    specs=_policy_specs,
+    action=st.sampled_from(_ACTIONS),
+    resource_type=st.sampled_from(_RESOURCE_TYPES),
+    resource=_resources,
+    context=_contexts,
+)
+def test_fast_and_detailed_paths_always_agree_on_allowed(specs, action, resource_type, resource, context):
+    policies = _policies(specs)
+
+    for candidate in (policies, PolicySet(policies)):
+        detailed = PolicyEvaluationEngine.evaluate_detailed(
+            candidate, action, resource_type, _USER, resource, context
+        )
+        fast = PolicyEvaluationEngine.evaluate(candidate, action, resource_type, _USER, resource, context)
+
+        assert fast is detailed.allowed
+
+
+@settings(max_examples=100, deadline=None)
+@given(specs=_policy_specs, action=st.sampled_from(_ACTIONS), resource_type=st.sampled_from(_RESOURCE_TYPES))
+def test_fast_path_allows_exactly_when_some_policy_is_granted(specs, action, resource_type):
+    """With no resource or context, the fast path's answer is exactly
+    whether any matching policy's conditions alone suffice, which is what
+    matched_policies lists."""
+    policies = _policies(specs)
+
+    detailed = PolicyEvaluationEngine.evaluate_detailed(policies, action, resource_type, _USER)
+
+    assert PolicyEvaluationEngine.evaluate(policies, action, resource_type, _USER) is bool(detailed.matched_policies)
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+    specs=_policy_specs,
+    checks=st.lists(
+        st.tuples(st.sampled_from(_ACTIONS), st.sampled_from(_RESOURCE_TYPES), _resources, _contexts),
+        min_size=1,
+        max_size=12,
+    ),
+)
+def test_a_memoizing_policy_set_decides_every_check_like_the_plain_list(specs, checks):
+    """One PolicySet for a whole sequence of checks, the way a request (or
+    the L1 cache) reuses it, so later checks may be answered from its
+    decision memo: every one must still match a fresh evaluation of the
+    plain list, whatever mix of context-free and context-dependent
+    conditions the policies carry."""
+    policies = _policies(specs)
+    policy_set = PolicySet(policies)
+
+    for action, resource_type, resource, context in checks:
+        expected = PolicyEvaluationEngine.evaluate_detailed(policies, action, resource_type, _USER, resource, context)
+        actual = PolicyEvaluationEngine.evaluate_detailed(policy_set, action, resource_type, _USER, resource, context)
+
+        assert actual.allowed is expected.allowed
+        assert actual.matched_policies == expected.matched_policies
+        assert actual.failed_conditions == expected.failed_conditions
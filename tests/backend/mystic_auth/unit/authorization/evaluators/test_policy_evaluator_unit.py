@@ -364,3 +364,23 @@ def test_evaluate_reuses_evaluate_detailed_and_agrees_with_it():
         ) == PolicyEvaluationEngine.evaluate_detailed(
             [policy], "documents:publish", "documents", "editor@example.com", resource=resource
         ).allowed
+
+
+def test_precomputed_candidates_give_the_same_decision_including_denial_reason():
+    policies = [
+        _policy(["documents:publish"], resource_type="documents", name="publish_drafts",
+                conditions={"resource_attributes": {"status": "draft"}}),
+        _policy(["users:read_own"], name="self_service"),
+    ]
+    candidates = PolicyEvaluationEngine.candidate_policies(policies, "documents:publish", "documents")
+
+    assert [policy.name for policy in candidates] == ["publish_drafts"]
+    for resource in ({"status": "draft"}, {"status": "published"}):
+        with_candidates = PolicyEvaluationEngine.evaluate_detailed(
+            policies, "documents:publish", "documents", "editor@example.com", resource=resource, candidates=candidates
+        )
+        without = PolicyEvaluationEngine.evaluate_detailed(
+            policies, "documents:publish", "documents", "editor@example.com", resource=resource
+        )
+        assert with_candidates.evaluated_policies == without.evaluated_policies == ["publish_drafts", "self_service"]
+        assert (with_candidates.allowed, with_candidates.denial_reason) == (without.allowed, without.denial_reason)
@@ -0,0 +1,182 @@
+# tests/backend/mystic_auth/unit/authorization/evaluators/test_policy_set_unit.py
+#
+# PolicySet is an index over a user's policy list, so the contract is that
+# evaluating against it decides exactly what evaluating against the plain
+# list decides. The differential test below checks that on a seeded random
+# corpus of policy lists and checks (wildcard resource types, duplicate and
+# missing actions, conditions that pass and fail), comparing every field of
+# the decision except its timestamp. The rest covers the decision memo: which
+# checks may be memoized, what the memo is keyed on, and that a memoized
+# check skips condition evaluation yet still gets a decision of its own.
+import random
+from dataclasses import asdict
+
+from backend.mystic_auth.authorization.evaluators.policy_evaluator import PolicyEvaluationEngine
+from backend.mystic_auth.authorization.evaluators.policy_set import PolicySet
+from backend.mystic_auth.authorization.models.policy_model import Policy
+
+_ACTIONS = ["companies:read", "companies:update", "balance_sheets:read", "users:read_own", "policies:read"]
+_RESOURCE_TYPES = ["companies", "balance_sheets", "users", "policies", "*"]
+_CONDITIONS = [
+    None,
+    {},
+    {"self_only": True},
+    {"resource_attributes": {"company_id": 1}},
+    {"resource_attributes": {"company_id": {"in": [2, 3]}}},
+    {"context_attributes": {"mfa": True}},
+]
+_RESOURCES = [None, {"company_id": 1}, {"company_id": 3}, {"email": "user@example.com"}, {"company_id": 9}]
+_CONTEXTS = [None, {"mfa": True}, {"mfa": False}]
+
+
+def _policy(name, actions, resource_type="companies", conditions=None):
+    return Policy(name=name, actions=actions, resource_type=resource_type, conditions=conditions, is_active=True)
+
+
+def _random_policies(rng: random.Random) -> list[Policy]:
+    return [
+        _policy(
+            name=f"p{index}",
+            actions=rng.choices(_ACTIONS, k=rng.randint(0, 3)),
+            resource_type=rng.choice(_RESOURCE_TYPES),
+            conditions=rng.choice(_CONDITIONS),
+        )
+        for index in range(rng.randint(0, 12))
+    ]
+
+
+def _comparable(decision) -> dict:
+    data = asdict(decision)
+    data.pop("evaluation_timestamp")
+    return data
+
+
+def test_candidates_are_exact_and_wildcard_matches_in_list_order():
+    policies = [
+        _policy("wild", ["companies:read"], resource_type="*"),
+        _policy("other_type", ["companies:read"], resource_type="users"),
+        _policy("exact", ["companies:read", "companies:read"]),
+        _policy("other_action", ["companies:update"]),
+    ]
+
+    candidates = PolicySet(policies).candidates("companies:read", "companies")
+
+    assert [policy.name for policy in candidates] == ["wild", "exact"]
+    assert candidates == tuple(PolicyEvaluationEngine.candidate_policies(policies, "companies:read", "companies"))
+
+
+def test_policy_set_is_a_sequence_of_the_same_policies():
+    policies = [_policy("a", ["companies:read"]), _policy("b", [])]
+    policy_set = PolicySet(policies)
+
+    assert list(policy_set) == policies
+    assert len(policy_set) == 2
+    assert policy_set[1] is policies[1]
+    assert policy_set.names == ("a", "b")
+
+
+def test_policy_set_decides_exactly_like_the_plain_list():
+    rng = random.Random(20261019)
+    for _ in range(300):
+        policies = _random_policies(rng)
+        policy_set = PolicySet(policies)
+        for _ in range(10):
+            args = (
+                rng.choice(_ACTIONS),
+                rng.choice(_RESOURCE_TYPES),
+                "user@example.com",
+                rng.choice(_RESOURCES),
+                rng.choice(_CONTEXTS),
+            )
+
+            expected = PolicyEvaluationEngine.evaluate_detailed(policies, *args)
+            actual = PolicyEvaluationEngine.evaluate_detailed(policy_set, *args)
+
+            assert _comparable(actual) == _comparable(expected), (policies, args)
+
+
+def test_a_reused_set_keeps_deciding_like_the_plain_list_as_its_memo_fills():
+    # The differential test above, but with every check repeated against one
+    # long-lived set, so most later checks are answered from its memo.
+    rng = random.Random(20261020)
+    for _ in range(100):
+        policies = _random_policies(rng)
+        policy_set = PolicySet(policies)
+        for _ in range(60):
+            args = (
+                rng.choice(_ACTIONS),
+                rng.choice(_RESOURCE_TYPES),
+                "user@example.com",
+                rng.choice(_RESOURCES),
+                rng.choice(_CONTEXTS),
+            )
+
+            expected = PolicyEvaluationEngine.evaluate_detailed(policies, *args)
+
+            assert _comparable(PolicyEvaluationEngine.evaluate_detailed(policy_set, *args)) == _comparable(expected)
+            assert PolicyEvaluationEngine.evaluate(policy_set, *args) is expected.allowed
+
+
+def test_only_checks_whose_candidates_are_all_context_free_are_memoizable():
+    policy_set = PolicySet([
+        _policy("unconditional", ["companies:read"]),
+        _policy("scoped", ["companies:read", "companies:update"], conditions={
+            "resource_attributes": {"company_id": {"in": [1, 2]}, "status": "published"},
+        }),
+        _policy("own", ["users:read_own"], resource_type="users", conditions={"self_only": True}),
+        _policy("mfa", ["companies:update"], conditions={"context_attributes": {"mfa": True}}),
+        _policy("typo", ["policies:read"], resource_type="policies", conditions={"made_up": True}),
+    ])
+
+    assert policy_set.decision_fields("companies:read", "companies") == ("company_id", "status")
+    assert policy_set.decision_fields("users:read_own", "users") == ("email",)
+    assert policy_set.decision_fields("balance_sheets:read", "balance_sheets") == ()
+    assert policy_set.decision_fields("companies:update", "companies") is None
+    assert policy_set.decision_fields("policies:read", "policies") is None
+
+
+def test_decision_key_covers_only_the_fields_that_decide_and_refuses_unhashable_values():
+    policy_set = PolicySet([
+        _policy("scoped", ["companies:read"], conditions={"resource_attributes": {"company_id": 1}}),
+    ])
+    key = policy_set.decision_key
+
+    assert key("companies:read", "companies", "u@x.com", {"company_id": 1, "name": "A"}) == key(
+        "companies:read", "companies", "u@x.com", {"company_id": 1, "name": "B"}
+    )
+    assert key("companies:read", "companies", "u@x.com", {"company_id": 1}) != key(
+        "companies:read", "companies", "u@x.com", {"company_id": 2}
+    )
+    assert key("companies:read", "companies", "u@x.com", None) != key(
+        "companies:read", "companies", "u@x.com", {"company_id": None}
+    )
+    assert key("companies:read", "companies", "u@x.com", {"company_id": [1]}) is None
+
+
+def test_memoized_checks_skip_condition_evaluation_but_get_fresh_decisions(mocker):
+    policy_set = PolicySet([
+        _policy("scoped", ["companies:read"], conditions={"resource_attributes": {"company_id": 1}}),
+    ])
+    outcome = mocker.spy(PolicyEvaluationEngine, "_condition_outcome")
+
+    first = PolicyEvaluationEngine.evaluate_detailed(policy_set, "companies:read", "companies", "u@x.com", {"company_id": 1})
+    second = PolicyEvaluationEngine.evaluate_detailed(policy_set, "companies:read", "companies", "u@x.com", {"company_id": 1})
+    PolicyEvaluationEngine.evaluate_detailed(policy_set, "companies:read", "companies", "u@x.com", {"company_id": 2})
+
+    assert outcome.call_count == 2
+    assert first.allowed and second.allowed
+    assert second.matched_policies == first.matched_policies
+    assert second.matched_policies is not first.matched_policies
+
+
+def test_context_dependent_checks_are_evaluated_every_time(mocker):
+    policy_set = PolicySet([
+        _policy("scoped", ["companies:read"], conditions={"resource_attributes": {"company_id": 1}}),
+        _policy("mfa", ["companies:read"], conditions={"context_attributes": {"mfa": True}}),
+    ])
+    outcome = mocker.spy(PolicyEvaluationEngine, "_condition_outcome")
+    args = ("companies:read", "companies", "u@x.com", {"company_id": 2})
+
+    assert PolicyEvaluationEngine.evaluate_detailed(policy_set, *args, {"mfa": True}).allowed
+    assert not PolicyEvaluationEngine.evaluate_detailed(policy_set, *args, {"mfa": False}).allowed
+    assert outcome.call_count == 2
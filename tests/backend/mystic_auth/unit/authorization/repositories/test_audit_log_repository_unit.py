@@ -0,0 +1,72 @@
+# tests/backend/mystic_auth/unit/authorization/repositories/test_audit_log_repository_unit.py
+#
+# The authorization audit listing reads full decision rows and rollup
+# counters as one UNION ALL, and rollups are written with an additive
+# upsert. What matters here is the SQL shape, checked by compiling against
+# the Postgres dialect; the round trip itself is covered by
+# tests/backend/mystic_auth/integration/audit_log/test_audit_log_integration.py.
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.mystic_auth.authorization.models.audit_record_model import AuthorizationAuditRecord
+from backend.mystic_auth.authorization.repositories import audit_log_repository as module
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_listing_filters_apply_to_both_kinds_of_record():
+    stmt = module._apply_filters(select(AuthorizationAuditRecord), "acme", "companies:read", None, True)
+
+    sql = _sql(stmt)
+
+    assert "FROM authorization_audit_log UNION ALL" in sql
+    assert "FROM authorization_audit_rollup" in sql
+    assert "authorization_audit_records.user_email ILIKE" in sql
+    assert "authorization_audit_records.action =" in sql
+    assert "authorization_audit_records.allowed =" in sql
+
+
+def test_listing_order_breaks_ties_on_id_and_kind():
+    order = module._order_by(None, "desc")
+
+    assert [_sql(clause) for clause in order] == [
+        "authorization_audit_records.created_at DESC",
+        "authorization_audit_records.id DESC",
+        "authorization_audit_records.kind DESC",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upsert_rollups_adds_to_existing_counters_in_key_order():
+    db = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+    minute = datetime(2026, 10, 19, 12, 30, tzinfo=UTC)
+
+    def row(email):
+        return {
+            "user_email": email,
+            "action": "companies:read",
+            "resource_type": "companies",
+            "allowed": True,
+            "bucket_start": minute,
+            "decision_count": 1,
+            "first_seen_at": minute,
+            "last_seen_at": minute,
+        }
+
+    await module.audit_log_repository.upsert_rollups([row("b@example.com"), row("a@example.com")], db)
+
+    stmt = db.execute.await_args.args[0]
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert "ON CONFLICT (user_email, action, resource_type, allowed, bucket_start) DO UPDATE" in sql
+    assert "decision_count = (authorization_audit_rollup.decision_count + excluded.decision_count)" in sql
+    assert "least(authorization_audit_rollup.first_seen_at, excluded.first_seen_at)" in sql
+    assert "greatest(authorization_audit_rollup.last_seen_at, excluded.last_seen_at)" in sql
+    emails = [value for key, value in compiled.params.items() if key.startswith("user_email")]
+    assert emails == ["a@example.com", "b@example.com"]
+    db.commit.assert_awaited_once()
@@ -0,0 +1,61 @@
+# tests/backend/mystic_auth/unit/authorization/repositories/test_policy_change_hooks_unit.py
+#
+# PolicyChangeHooks is the extension point an application uses to keep its
+# own assignment-derived data in step with PolicyRepository (see
+# policy_change_hooks.py). Registration and dispatch are plain Python, so
+# they're covered with a fresh registry and recording hooks; the
+# repository's own calls into it live in test_policy_repository_caching_unit.py.
+import pytest
+from backend.mystic_auth.authorization.repositories.policy_change_hooks import PolicyChangeHook, PolicyChangeHooks
+
+
+class _RecordingHook(PolicyChangeHook):
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    async def policy_assigned(self, user_id, policy_id, db):
+        self.calls.append((self.name, "assigned", user_id, policy_id))
+
+    async def policy_changed(self, policy_id, db):
+        self.calls.append((self.name, "changed", policy_id))
+
+
+@pytest.mark.asyncio
+async def test_hooks_run_in_registration_order():
+    calls = []
+    hooks = PolicyChangeHooks()
+    hooks.register(_RecordingHook("first", calls))
+    hooks.register(_RecordingHook("second", calls))
+
+    await hooks.policy_assigned(1, 2, db=None)
+    await hooks.policy_changed(2, db=None)
+
+    assert calls == [
+        ("first", "assigned", 1, 2),
+        ("second", "assigned", 1, 2),
+        ("first", "changed", 2),
+        ("second", "changed", 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_registering_the_same_hook_twice_runs_it_once():
+    calls = []
+    hook = _RecordingHook("only", calls)
+    hooks = PolicyChangeHooks()
+    hooks.register(hook)
+    hooks.register(hook)
+
+    await hooks.policy_changed(5, db=None)
+
+    assert calls == [("only", "changed", 5)]
+
+
+@pytest.mark.asyncio
+async def test_base_hook_methods_are_no_ops():
+    hooks = PolicyChangeHooks()
+    hooks.register(PolicyChangeHook())
+
+    await hooks.policy_assigned(1, 2, db=None)  # must not raise
+    await hooks.policy_changed(2, db=None)
@@ -29,17 +29,34 @@ def _make_policy(**overrides):
     return policy
 
 
+@pytest.fixture(autouse=True)
+def hooks(mocker):
+    # Whatever application hooks are registered in this process (the app's
+    # company-access hook, once its module is imported) need a real DB.
+    return mocker.patch(
+        f"{REPO_MODULE}.policy_change_hooks",
+        new=MagicMock(policy_assigned=AsyncMock(), policy_changed=AsyncMock()),
+    )
+
+
 def _mock_cache(mocker, get_return=None):
     cache = MagicMock(
         get_user_policies=AsyncMock(return_value=get_return),
         set_user_policies=AsyncMock(),
         invalidate_user_policies=AsyncMock(),
+        invalidate_users_policies=AsyncMock(),
         invalidate_all_user_policies=AsyncMock(),
     )
     mocker.patch(f"{REPO_MODULE}.authorization_cache_service", new=cache)
     return cache
 
 
+def _holders_result(emails):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = emails
+    return result
+
+
 # ---------------------------- Cache hit skips the database ----------------------------
 
 @pytest.mark.asyncio
@@ -71,16 +88,17 @@ async def test_get_active_policies_for_user_queries_db_and_populates_cache_on_mi
 
     result = await PolicyRepository.get_active_policies_for_user("user@example.com", db)
 
-    assert result == fetched_policies
+    assert list(result) == fetched_policies
     db.execute.assert_awaited_once()
-    cache.set_user_policies.assert_awaited_once_with("user@example.com", fetched_policies)
+    cache.set_user_policies.assert_awaited_once_with("user@example.com", result)
 
 
-# ---------------------------- Invalidation on policy update/delete (global) ----------------------------
+# ---------------------------- Invalidation on policy update/delete (holders only) ----------------------------
 
 @pytest.mark.asyncio
-async def test_update_policy_invalidates_all_user_policy_caches(mocker):
+async def test_update_policy_invalidates_only_its_holders_caches(mocker):
     db = MagicMock()
+    db.execute = AsyncMock(return_value=_holders_result(["a@example.com", "b@example.com"]))
     db.flush = AsyncMock()
     db.commit = AsyncMock()
     db.refresh = AsyncMock()
@@ -89,20 +107,25 @@ async def test_update_policy_invalidates_all_user_policy_caches(mocker):
 
     await PolicyRepository.update(_make_policy(), {"description": "new"}, db)
 
-    cache.invalidate_all_user_policies.assert_awaited_once()
+    cache.invalidate_users_policies.assert_awaited_once_with(["a@example.com", "b@example.com"])
+    cache.invalidate_all_user_policies.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_delete_policy_invalidates_all_user_policy_caches(mocker):
+async def test_delete_policy_reads_its_holders_before_the_cascade_removes_them(mocker):
+    calls = []
     db = MagicMock()
-    db.delete = AsyncMock()
+    db.execute = AsyncMock(side_effect=lambda *args: calls.append("holders") or _holders_result(["a@example.com"]))
+    db.delete = AsyncMock(side_effect=lambda *args: calls.append("delete"))
     db.commit = AsyncMock()
     mocker.patch(f"{REPO_MODULE}.policy_history_repository")
     cache = _mock_cache(mocker)
 
     await PolicyRepository.delete(_make_policy(), db)
 
-    cache.invalidate_all_user_policies.assert_awaited_once()
+    assert calls == ["holders", "delete"]
+    cache.invalidate_users_policies.assert_awaited_once_with(["a@example.com"])
+    cache.invalidate_all_user_policies.assert_not_called()
 
 
 # ---------------------------- Invalidation on assign/revoke (precise) ----------------------------
@@ -112,6 +135,7 @@ async def test_assign_policy_to_user_invalidates_only_that_users_cache_when_emai
     cache = _mock_cache(mocker)
     db = MagicMock()
     db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None)))
+    db.flush = AsyncMock()
     db.commit = AsyncMock()
     db.refresh = AsyncMock()
 
@@ -132,6 +156,7 @@ async def test_assign_policy_to_user_skips_invalidation_when_email_not_given(moc
     cache = _mock_cache(mocker)
     db = MagicMock()
     db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None)))
+    db.flush = AsyncMock()
     db.commit = AsyncMock()
     db.refresh = AsyncMock()
 
@@ -155,3 +180,50 @@ async def test_remove_policy_from_user_invalidates_only_that_users_cache_when_em
 
     assert removed is True
     cache.invalidate_user_policies.assert_awaited_once_with("target@example.com")
+
+
+# ---------------------------- Policy change hooks ----------------------------
+
+@pytest.mark.asyncio
+async def test_assign_policy_to_user_runs_hooks_before_commit(mocker, hooks):
+    _mock_cache(mocker)
+    calls = []
+    hooks.policy_assigned.side_effect = lambda *args: calls.append("hook")
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None)))
+    db.flush = AsyncMock()
+    db.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+    db.refresh = AsyncMock()
+
+    await PolicyRepository.assign_policy_to_user(user_id=1, policy_id=2, db=db, assigned_by="system")
+
+    hooks.policy_assigned.assert_awaited_once_with(1, 2, db)
+    assert calls == ["hook", "commit"]
+
+
+@pytest.mark.asyncio
+async def test_assigning_an_already_held_policy_runs_no_hooks(mocker, hooks):
+    _mock_cache(mocker)
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=MagicMock())))
+
+    await PolicyRepository.assign_policy_to_user(user_id=1, policy_id=2, db=db, assigned_by="system")
+
+    hooks.policy_assigned.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_policy_runs_hooks_only_when_something_changed(mocker, hooks):
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=_holders_result([]))
+    db.flush = AsyncMock()
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock()
+    mocker.patch(f"{REPO_MODULE}.policy_history_repository")
+    _mock_cache(mocker)
+
+    await PolicyRepository.update(_make_policy(), {"description": "baseline"}, db)
+    hooks.policy_changed.assert_not_called()
+
+    await PolicyRepository.update(_make_policy(), {"conditions": {"resource_attributes": {"company_id": 3}}}, db)
+    hooks.policy_changed.assert_awaited_once_with(1, db)
@@ -0,0 +1,201 @@
+# tests/backend/mystic_auth/unit/authorization/services/test_audit_log_writer_unit.py
+#
+# Unit coverage for the write-behind authorization audit pipeline: the
+# inline fallback when no flusher is running, queueing and batched flushes,
+# backpressure when the queue is full, a failed flush putting its batch back
+# (and dropping only beyond the bound), stop() draining the queue, and
+# routine allows being counted into per-minute rollups under
+# "aggregate_allows".
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.mystic_auth.authorization.services.audit_log_writer import AuditLogWriter
+from backend.mystic_auth.authorization.services.audit_policy import AuditPolicy
+
+MODULE = "backend.mystic_auth.authorization.services.audit_log_writer"
+
+
+def _entry(index: int) -> dict:
+    return {
+        "user_email": f"user{index}@example.com",
+        "action": "companies:read",
+        "resource_type": "companies",
+        "allowed": True,
+    }
+
+
+@pytest.fixture
+def create_entries(mocker):
+    session = MagicMock()
+    session_cm = MagicMock(__aenter__=AsyncMock(return_value=session), __aexit__=AsyncMock(return_value=False))
+    mocker.patch(f"{MODULE}.database.async_session", return_value=session_cm)
+    return mocker.patch(f"{MODULE}.audit_log_repository.create_entries", new_callable=AsyncMock)
+
+
+@pytest.mark.asyncio
+async def test_submit_writes_inline_on_the_callers_session_when_not_running(mocker, create_entries):
+    create_entry = mocker.patch(f"{MODULE}.audit_log_repository.create_entry", new_callable=AsyncMock)
+    writer = AuditLogWriter()
+    db = MagicMock()
+
+    await writer.submit([_entry(1)], db)
+    await writer.submit([_entry(2), _entry(3)], db)
+
+    create_entry.assert_awaited_once_with(_entry(1), db)
+    create_entries.assert_awaited_once_with([_entry(2), _entry(3)], db)
+    assert writer.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_running_writer_queues_stamped_rows_and_flushes_them_in_batches(create_entries):
+    writer = AuditLogWriter(batch_size=2, flush_interval_seconds=60)
+    writer.start()
+    try:
+        await writer.submit([_entry(1)], MagicMock())
+        queued = writer.stats()["pending"]
+
+        await writer.flush()
+    finally:
+        await writer.stop()
+
+    assert queued == 1
+    create_entries.assert_awaited_once()
+    [row] = create_entries.await_args.args[0]
+    assert row["created_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_flush_splits_the_queue_into_batch_sized_inserts(create_entries):
+    writer = AuditLogWriter(batch_size=2)
+    writer._pending.extend(_entry(index) for index in range(5))
+
+    await writer.flush()
+
+    assert [len(call.args[0]) for call in create_entries.await_args_list] == [2, 2, 1]
+    assert writer.stats()["written"] == 5
+
+
+@pytest.mark.asyncio
+async def test_a_full_queue_flushes_inline_before_submit_returns(create_entries):
+    writer = AuditLogWriter(batch_size=10, flush_interval_seconds=60, max_pending=3)
+    writer.start()
+    try:
+        await writer.submit([_entry(1), _entry(2), _entry(3)], MagicMock())
+
+        assert writer.stats()["pending"] == 0
+        assert writer.stats()["inline_flushes"] == 1
+    finally:
+        await writer.stop()
+    create_entries.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_puts_the_batch_back_in_order(create_entries):
+    create_entries.side_effect = [RuntimeError("db down"), None, None]
+    writer = AuditLogWriter(batch_size=2)
+    writer._pending.extend([_entry(1), _entry(2), _entry(3)])
+
+    await writer.flush()
+
+    assert list(writer._pending) == [_entry(1), _entry(2), _entry(3)]
+    assert writer.stats()["failed_flushes"] == 1
+
+    await writer.flush()
+    assert [call.args[0] for call in create_entries.await_args_list[1:]] == [[_entry(1), _entry(2)], [_entry(3)]]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_beyond_the_bound_drops_the_newest_rows(create_entries):
+    writer = AuditLogWriter(batch_size=2, max_pending=3)
+    writer._pending.extend([_entry(1), _entry(2), _entry(3)])
+
+    async def fail_after_more_rows_arrive(batch, session):
+        # Rows submitted while the failing INSERT was in flight.
+        writer._pending.extend([_entry(4), _entry(5)])
+        raise RuntimeError("db down")
+
+    create_entries.side_effect = fail_after_more_rows_arrive
+
+    await writer.flush()
+
+    assert list(writer._pending) == [_entry(1), _entry(2), _entry(3)]
+    assert writer.stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_everything_still_queued(create_entries):
+    writer = AuditLogWriter(batch_size=100, flush_interval_seconds=60)
+    writer.start()
+    await writer.submit([_entry(1), _entry(2)], MagicMock())
+
+    await writer.stop()
+
+    assert writer.running is False
+    assert writer.stats()["pending"] == 0
+    assert writer.stats()["written"] == 2
+
+
+@pytest.fixture
+def aggregate_allows(mocker):
+    mocker.patch(f"{MODULE}.audit_policy", AuditPolicy(aggregate_allows=True))
+
+
+@pytest.fixture
+def upsert_rollups(mocker):
+    return mocker.patch(f"{MODULE}.audit_log_repository.upsert_rollups", new_callable=AsyncMock)
+
+
+@pytest.mark.asyncio
+async def test_routine_allows_are_counted_per_key_and_denials_kept_in_full(
+    aggregate_allows, create_entries, upsert_rollups
+):
+    denial = {**_entry(9), "allowed": False}
+    writer = AuditLogWriter(flush_interval_seconds=60)
+    writer.start()
+    try:
+        await writer.submit([_entry(1), _entry(1), _entry(2), denial], MagicMock())
+        assert writer.stats()["pending"] == 1
+        assert writer.stats()["pending_rollups"] == 2
+    finally:
+        await writer.stop()
+
+    assert create_entries.await_args.args[0] == [denial]
+    rows = {row["user_email"]: row for row in upsert_rollups.await_args.args[0]}
+    assert rows["user1@example.com"]["decision_count"] == 2
+    assert rows["user2@example.com"]["decision_count"] == 1
+    assert rows["user1@example.com"]["bucket_start"].second == 0
+    assert rows["user1@example.com"]["first_seen_at"] <= rows["user1@example.com"]["last_seen_at"]
+    assert writer.stats()["rolled_up"] == 3
+
+
+@pytest.mark.asyncio
+async def test_counted_allows_are_upserted_inline_when_not_running(aggregate_allows, mocker, upsert_rollups):
+    create_entry = mocker.patch(f"{MODULE}.audit_log_repository.create_entry", new_callable=AsyncMock)
+    writer = AuditLogWriter()
+    db = MagicMock()
+
+    await writer.submit([_entry(1)], db)
+
+    create_entry.assert_not_awaited()
+    [row] = upsert_rollups.await_args.args[0]
+    assert row["decision_count"] == 1
+    assert upsert_rollups.await_args.args[1] is db
+
+
+@pytest.mark.asyncio
+async def test_failed_rollup_flush_merges_counts_back(aggregate_allows, create_entries, upsert_rollups):
+    upsert_rollups.side_effect = [RuntimeError("db down"), None]
+    writer = AuditLogWriter(flush_interval_seconds=60)
+    writer.start()
+    try:
+        await writer.submit([_entry(1), _entry(1)], MagicMock())
+        await writer.flush()
+        assert writer.stats()["failed_flushes"] == 1
+
+        await writer.submit([_entry(1)], MagicMock())
+    finally:
+        await writer.stop()
+
+    [row] = upsert_rollups.await_args.args[0]
+    assert row["decision_count"] == 3
+    assert writer.stats()["rolled_up"] == 3
@@ -0,0 +1,41 @@
+# tests/backend/mystic_auth/unit/authorization/services/test_audit_policy_unit.py
+#
+# Unit coverage for which authorization decisions are logged in full and
+# which are only counted: everything in full by default, and under
+# "aggregate_allows" only routine allows are counted, never a denial, one of
+# Permission's own actions, or a configured always-full action.
+import pytest
+from backend.mystic_auth.authorization.permissions import Permission
+from backend.mystic_auth.authorization.services.audit_policy import AuditPolicy
+
+
+def _entry(action="companies:read", allowed=True) -> dict:
+    return {"user_email": "a@example.com", "action": action, "resource_type": "companies", "allowed": allowed}
+
+
+def test_full_mode_logs_every_decision_in_full():
+    policy = AuditPolicy(aggregate_allows=False)
+
+    assert policy.logs_in_full(_entry()) is True
+    assert policy.logs_in_full(_entry(allowed=False)) is True
+
+
+def test_aggregate_mode_only_counts_routine_allows():
+    policy = AuditPolicy(aggregate_allows=True)
+
+    assert policy.logs_in_full(_entry()) is False
+    assert policy.logs_in_full(_entry(allowed=False)) is True
+
+
+@pytest.mark.parametrize("permission", list(Permission))
+def test_permission_actions_are_always_logged_in_full(permission):
+    policy = AuditPolicy(aggregate_allows=True)
+
+    assert policy.logs_in_full(_entry(action=permission.value)) is True
+
+
+def test_configured_actions_are_always_logged_in_full():
+    policy = AuditPolicy(aggregate_allows=True, full_actions={"balance_sheets:delete"})
+
+    assert policy.logs_in_full(_entry(action="balance_sheets:delete")) is True
+    assert policy.logs_in_full(_entry(action="balance_sheets:read")) is False
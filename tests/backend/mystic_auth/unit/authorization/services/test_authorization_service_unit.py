@@ -17,6 +17,7 @@ from backend.mystic_auth.authorization.services.authorization_service import (
 from fastapi import HTTPException
 
 MODULE = "backend.mystic_auth.authorization.services.authorization_service"
+WRITER_MODULE = "backend.mystic_auth.authorization.services.audit_log_writer"
 
 
 def _policy(actions, resource_type="users", conditions=None, name=None):
@@ -31,7 +32,7 @@ def _mock_audit_log(mocker):
     audit trail itself, rather than relying on _log_decision's own
     try/except (which would otherwise silently swallow the AttributeError
     from calling db.add() on the db=None these tests pass)."""
-    return mocker.patch(f"{MODULE}.audit_log_repository.create_entry", new_callable=AsyncMock)
+    return mocker.patch(f"{WRITER_MODULE}.audit_log_repository.create_entry", new_callable=AsyncMock)
 
 
 @pytest.mark.asyncio
@@ -328,7 +329,7 @@ async def test_authorize_still_returns_correctly_even_if_audit_logging_fails(moc
         return_value=[_policy(["users:list_all"])],
     )
     mocker.patch(
-        f"{MODULE}.audit_log_repository.create_entry",
+        f"{WRITER_MODULE}.audit_log_repository.create_entry",
         new_callable=AsyncMock,
         side_effect=Exception("db is down"),
     )
@@ -478,3 +479,110 @@ async def test_authorize_batch_empty_checks_returns_empty_decisions(mocker):
     decisions = await authorization_service.authorize_batch("admin@example.com", [], db=None)
 
     assert decisions == []
+
+
+# ---------------------------- authorize_many ----------------------------
+# One action, many resources: one policy fetch, one candidate pre-filter,
+# one bulk audit insert, and a result vector aligned with the input.
+
+def _company_policies():
+    return [
+        _policy(["companies:read"], resource_type="companies", name="acme_only",
+                conditions={"resource_attributes": {"company_id": 1}}),
+        _policy(["companies:read"], resource_type="companies", name="many",
+                conditions={"resource_attributes": {"company_id": {"in": [2, 3]}}}),
+        _policy(["users:list_all"], name="unrelated"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_authorize_many_returns_results_aligned_with_the_input(mocker):
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new_callable=AsyncMock,
+        return_value=_company_policies(),
+    )
+    mocker.patch(f"{WRITER_MODULE}.audit_log_repository.create_entries", new_callable=AsyncMock)
+    resources = [{"company_id": 3}, {"company_id": 4}, {"company_id": 1}]
+
+    results = await authorization_service.authorize_many("u@example.com", "companies:read", "companies", resources, db=None)
+
+    assert results == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_authorize_many_fetches_once_and_writes_every_audit_row_in_one_insert(mocker):
+    get_policies_mock = mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new_callable=AsyncMock,
+        return_value=_company_policies(),
+    )
+    single_mock = _mock_audit_log(mocker)
+    bulk_mock = mocker.patch(f"{WRITER_MODULE}.audit_log_repository.create_entries", new_callable=AsyncMock)
+    resources = [{"id": 10, "company_id": 2}, {"id": 11, "company_id": 9}]
+
+    await authorization_service.authorize_many("u@example.com", "companies:read", "companies", resources, db=None)
+
+    get_policies_mock.assert_awaited_once()
+    single_mock.assert_not_called()
+    bulk_mock.assert_awaited_once()
+    rows = bulk_mock.await_args.args[0]
+    assert [(row["resource_identifier"], row["allowed"]) for row in rows] == [("10", True), ("11", False)]
+    # The unrelated policy was never a candidate, same as authorize() would record.
+    assert rows[1]["candidate_policy_names"] == ["acme_only", "many"]
+
+
+@pytest.mark.asyncio
+async def test_authorize_many_matches_individual_authorize_calls(mocker):
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new_callable=AsyncMock,
+        return_value=_company_policies(),
+    )
+    single_mock = _mock_audit_log(mocker)
+    bulk_mock = mocker.patch(f"{WRITER_MODULE}.audit_log_repository.create_entries", new_callable=AsyncMock)
+    resources = [{"company_id": company_id} for company_id in range(5)]
+
+    results = await authorization_service.authorize_many("u@example.com", "companies:read", "companies", resources, db=None)
+    individual = [
+        await authorization_service.authorize("u@example.com", "companies:read", "companies", db=None, resource=r)
+        for r in resources
+    ]
+
+    assert results == individual
+    assert bulk_mock.await_args.args[0] == [call.args[0] for call in single_mock.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_authorize_many_fails_closed_per_resource_and_survives_audit_failure(mocker):
+    mocker.patch(
+        f"{MODULE}.policy_repository.get_active_policies_for_user",
+        new_callable=AsyncMock,
+        return_value=_company_policies(),
+    )
+    mocker.patch(
+        f"{WRITER_MODULE}.audit_log_repository.create_entries", new_callable=AsyncMock, side_effect=Exception("db is down")
+    )
+
+    from backend.mystic_auth.authorization.evaluators.policy_evaluator import PolicyEvaluationEngine
+
+    def _side_effect(*args, **kwargs):
+        if kwargs["resource"]["company_id"] == 2:
+            raise RuntimeError("corrupt policy row")
+        return PolicyEvaluationEngine.evaluate_detailed(*args, **kwargs)
+
+    mocker.patch(f"{MODULE}.policy_evaluation_engine.evaluate_detailed", side_effect=_side_effect)
+
+    results = await authorization_service.authorize_many(
+        "u@example.com", "companies:read", "companies", [{"company_id": 2}, {"company_id": 3}], db=None
+    )
+
+    assert results == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_authorize_many_with_no_resources_does_nothing(mocker):
+    get_policies_mock = mocker.patch(f"{MODULE}.policy_repository.get_active_policies_for_user", new_callable=AsyncMock)
+
+    assert await authorization_service.authorize_many("u@example.com", "companies:read", "companies", [], db=None) == []
+    get_policies_mock.assert_not_called()
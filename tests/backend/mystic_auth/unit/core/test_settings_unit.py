@@ -1,5 +1,7 @@
 # tests/backend/mystic_auth/unit/test_settings_unit.py
+import pytest
 from backend.mystic_auth.core.settings import Settings
+from pydantic import ValidationError
 
 _REQUIRED_FIELDS = {
     "BACKEND_BASE_URL": "http://localhost:8000",
@@ -181,3 +183,47 @@ def test_cors_allowed_origins_deduplicates_a_repeated_origin():
     settings = Settings(**payload)
 
     assert settings.cors_allowed_origins == ["http://localhost:5173", "https://www.example.com"]
+
+
+# ---------------------------- authorization audit mode ----------------------------
+
+
+def test_authorization_audit_mode_defaults_to_full_with_no_extra_actions():
+    settings = Settings(**_REQUIRED_FIELDS)
+
+    assert settings.AUTHORIZATION_AUDIT_MODE == "full"
+    assert settings.authorization_audit_full_actions == frozenset()
+
+
+def test_authorization_audit_mode_rejects_unknown_values():
+    with pytest.raises(ValidationError):
+        Settings(**{**_REQUIRED_FIELDS, "AUTHORIZATION_AUDIT_MODE": "aggregate"})
+
+
+def test_authorization_audit_full_actions_are_parsed_like_other_comma_lists():
+    payload = {
+        **_REQUIRED_FIELDS,
+        "AUTHORIZATION_AUDIT_MODE": "aggregate_allows",
+        "AUTHORIZATION_AUDIT_FULL_ACTIONS": " balance_sheets:delete , ,companies:delete",
+    }
+
+    settings = Settings(**payload)
+
+    assert settings.authorization_audit_full_actions == {"balance_sheets:delete", "companies:delete"}
+
+
+def test_audit_retention_defaults_to_keeping_everything_and_rejects_negatives():
+    settings = Settings(**_REQUIRED_FIELDS)
+    assert settings.AUTHORIZATION_AUDIT_RETENTION_MONTHS == 0
+    assert settings.SECURITY_AUDIT_RETENTION_MONTHS == 0
+
+    with pytest.raises(ValidationError):
+        Settings(**{**_REQUIRED_FIELDS, "SECURITY_AUDIT_RETENTION_MONTHS": -1})
+
+
+def test_startup_warmup_is_off_by_default_and_rejects_negative_limits():
+    settings = Settings(**_REQUIRED_FIELDS)
+    assert settings.STARTUP_WARMUP_ENABLED is False
+
+    with pytest.raises(ValidationError):
+        Settings(**{**_REQUIRED_FIELDS, "STARTUP_WARMUP_POLICY_USERS": -1})
@@ -0,0 +1,97 @@
+# tests/backend/mystic_auth/unit/core/test_startup_warmup_unit.py
+#
+# Unit coverage for the startup warm-up's lifecycle, with its steps mocked:
+# readiness state from start to finish, a failed step not stopping the
+# rest, the timeout releasing readiness, and the pool-size cap. The steps'
+# SQL needs a real Postgres and is exercised by the integration suite.
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.mystic_auth.core import startup_warmup as module
+from backend.mystic_auth.core.startup_warmup import StartupWarmup
+
+MODULE = "backend.mystic_auth.core.startup_warmup"
+
+
+async def _never_finishes(*_args):
+    await asyncio.Event().wait()
+
+
+@pytest.fixture
+def steps(mocker):
+    return {
+        "database": mocker.patch(f"{MODULE}.warm_database", new_callable=AsyncMock, return_value=5),
+        "redis": mocker.patch(f"{MODULE}.redis_client.ping", new_callable=AsyncMock, return_value=True),
+        "policies": mocker.patch(f"{MODULE}.preload_policies", new_callable=AsyncMock, return_value=12),
+    }
+
+
+@pytest.mark.asyncio
+async def test_state_is_none_until_started_then_pending_until_finished(steps):
+    release = asyncio.Event()
+
+    async def slow_preload(_limit):
+        await release.wait()
+        return 12
+
+    steps["policies"].side_effect = slow_preload
+    warmup = StartupWarmup()
+    assert warmup.state is None
+
+    warmup.start()
+    await asyncio.sleep(0)
+    assert warmup.state == "pending"
+
+    release.set()
+    await warmup._task
+    assert warmup.state == "ok"
+    assert warmup.stats() == {"state": "ok", "database_connections": 5, "redis": True, "policy_users": 12}
+
+
+@pytest.mark.asyncio
+async def test_a_failed_step_is_reported_and_the_rest_still_run(steps):
+    steps["database"].side_effect = ConnectionError("db down")
+    warmup = StartupWarmup()
+
+    warmup.start()
+    await warmup._task
+
+    assert warmup.state == "ok"
+    assert warmup.stats()["database_connections"] == "error"
+    steps["policies"].assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_readiness_is_released_when_the_warmup_times_out(mocker, steps):
+    mocker.patch(f"{MODULE}.settings.STARTUP_WARMUP_TIMEOUT_SECONDS", 0.01)
+    steps["policies"].side_effect = _never_finishes
+    warmup = StartupWarmup()
+
+    warmup.start()
+    await warmup._task
+
+    assert warmup.state == "ok"
+    assert "policy_users" not in warmup.stats()
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_a_warmup_still_running(steps):
+    steps["database"].side_effect = _never_finishes
+    warmup = StartupWarmup()
+    warmup.start()
+    await asyncio.sleep(0)
+
+    await warmup.stop()
+
+    assert warmup._task.cancelled()
+
+
+def test_pool_connections_are_capped_at_the_pools_size(mocker):
+    mocker.patch(f"{MODULE}.database.engine", MagicMock(pool=MagicMock(size=lambda: 5)))
+    assert module._pool_connections(20) == 5
+    assert module._pool_connections(3) == 3
+
+    # Pools without a fixed size (NullPool) take the request as-is.
+    mocker.patch(f"{MODULE}.database.engine", MagicMock(pool=object()))
+    assert module._pool_connections(20) == 20
@@ -0,0 +1,30 @@
+# tests/backend/mystic_auth/unit/database/test_array_params_unit.py
+#
+# array_params.any_of exists so a variable-length value list doesn't change
+# the SQL text. Checked by compiling against the asyncpg dialect (the one
+# whose prepared-statement cache this is about); the server-side timings
+# are in tests/backend/app/performance/test_company_scope_filter_performance.py.
+from backend.mystic_auth.database.array_params import any_of
+from backend.mystic_auth.user_table.user_model import User
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+def _compile(stmt):
+    compiled = stmt.compile(dialect=postgresql.asyncpg.dialect())
+    return str(compiled), compiled.params
+
+
+def test_any_of_binds_one_typed_array():
+    sql, params = _compile(select(User.id).where(any_of(User.id, {3, 1, 2})))
+
+    assert "users.id = ANY ($1::INTEGER[])" in sql
+    assert [sorted(value) for value in params.values()] == [[1, 2, 3]]
+
+
+def test_any_of_sql_is_the_same_for_every_list_length():
+    statements = {_compile(select(User.id).where(any_of(User.email, ["a"] * size)))[0] for size in (1, 2, 500)}
+
+    assert len(statements) == 1
+    assert "VARCHAR[]" in statements.pop()
+
@@ -0,0 +1,132 @@
+# tests/backend/mystic_auth/unit/database/test_pagination_unit.py
+#
+# fetch_page is what every paginated list route's X-Total-Count now comes
+# from, so its branches matter more than its SQL: the total read off the
+# page's own rows, the empty-page cases, and the switch to a planner
+# estimate past the exact-count cap. Covered with a mocked session; the
+# statement shape is checked by compiling it for Postgres.
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.mystic_auth.database.pagination import Page, fetch_page, set_total_count_headers
+from backend.mystic_auth.database.text_search import substring_match
+from backend.mystic_auth.user_table.user_model import User
+from fastapi import Response
+from sqlalchemy import asc, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import asyncpg
+
+_ORDER_BY = [asc(User.id)]
+
+
+class _Row(tuple):
+    """(entity, total) the way SQLAlchemy's Row exposes it: by index and by label."""
+
+    def __new__(cls, item, total):
+        row = super().__new__(cls, (item, total))
+        row.total = total
+        return row
+
+
+def _db(*execute_results, scalar=None, explain=None):
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=list(execute_results))
+    db.scalar = AsyncMock(return_value=scalar)
+    # The dialect the app actually runs on (asyncpg), which the EXPLAIN is
+    # rendered for.
+    db.get_bind = MagicMock(return_value=SimpleNamespace(dialect=asyncpg.dialect()))
+    connection = MagicMock()
+    connection.exec_driver_sql = AsyncMock(return_value=explain)
+    db.connection = AsyncMock(return_value=connection)
+    return db
+
+
+def _rows_result(rows):
+    result = MagicMock()
+    result.all = MagicMock(return_value=rows)
+    return result
+
+
+def _explain_result(plan_rows):
+    result = MagicMock()
+    result.scalar_one = MagicMock(return_value=json.dumps([{"Plan": {"Plan Rows": plan_rows}}]))
+    return result
+
+
+@pytest.mark.asyncio
+async def test_page_and_total_come_from_one_query():
+    db = _db(_rows_result([_Row("a", 42), _Row("b", 42)]))
+
+    page = await fetch_page(select(User), db, order_by=_ORDER_BY, limit=2, offset=0, exact_count_limit=100)
+
+    assert page == Page(items=["a", "b"], total=42)
+    assert db.execute.await_count == 1
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    # The count is an uncorrelated scalar subquery capped at limit + 1 rows.
+    assert "count(*)" in sql
+    assert sql.count("LIMIT") == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_first_page_is_zero_without_another_query():
+    db = _db(_rows_result([]))
+
+    page = await fetch_page(select(User), db, order_by=_ORDER_BY, limit=10, offset=0, exact_count_limit=100)
+
+    assert page == Page(items=[], total=0)
+    db.scalar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_empty_page_past_the_end_still_reports_the_total():
+    db = _db(_rows_result([]), scalar=7)
+
+    page = await fetch_page(select(User), db, order_by=_ORDER_BY, limit=10, offset=50, exact_count_limit=100)
+
+    assert page == Page(items=[], total=7)
+
+
+@pytest.mark.asyncio
+async def test_total_past_the_cap_switches_to_the_planner_estimate():
+    db = _db(_rows_result([_Row("a", 101)]), explain=_explain_result(250_000))
+
+    page = await fetch_page(select(User), db, order_by=_ORDER_BY, limit=1, offset=0, exact_count_limit=100)
+
+    assert page == Page(items=["a"], total=250_000, total_is_estimate=True)
+    connection = await db.connection()
+    assert connection.exec_driver_sql.await_args.args[0].startswith("EXPLAIN")
+
+
+@pytest.mark.asyncio
+async def test_stale_low_estimate_never_undercuts_the_known_minimum():
+    db = _db(_rows_result([_Row("a", 101)]), explain=_explain_result(3))
+
+    page = await fetch_page(select(User), db, order_by=_ORDER_BY, limit=1, offset=0, exact_count_limit=100)
+
+    assert page.total == 101
+    assert page.total_is_estimate
+
+
+@pytest.mark.asyncio
+async def test_estimate_survives_a_colon_in_the_search_term():
+    # Inlined into the EXPLAIN, " :corp" must stay part of the literal
+    # rather than be read back as a bind parameter.
+    stmt = select(User).where(substring_match("acme :corp", User.name))
+    db = _db(_rows_result([_Row("a", 101)]), explain=_explain_result(5_000))
+
+    page = await fetch_page(stmt, db, order_by=_ORDER_BY, limit=1, offset=0, exact_count_limit=100)
+
+    assert page.total == 5_000
+    connection = await db.connection()
+    assert "acme :corp" in connection.exec_driver_sql.await_args.args[0]
+
+
+def test_headers_flag_estimates():
+    response = Response()
+
+    set_total_count_headers(response, Page(items=[], total=12_345, total_is_estimate=True))
+
+    assert response.headers["X-Total-Count"] == "12345"
+    assert response.headers["X-Total-Count-Estimated"] == "true"
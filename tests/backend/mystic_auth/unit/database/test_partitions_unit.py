@@ -0,0 +1,110 @@
+# tests/backend/mystic_auth/unit/database/test_partitions_unit.py
+#
+# partitions.py keeps the audit tables' monthly partitions ahead of time and
+# drops expired months. Covered here: the month arithmetic and naming, which
+# partitions a retention setting expires (never the DEFAULT partition or a
+# hand-attached one), and maintain_table's statements against a mocked
+# session, including skipping entirely when another worker holds the lock and
+# refusing any identifier that isn't one of the audit tables' own.
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.mystic_auth.database import partitions
+from backend.mystic_auth.database.partitions import PartitionedTable
+
+
+def test_add_months_crosses_year_boundaries_both_ways():
+    assert partitions.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert partitions.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partitions.add_months(date(2026, 10, 1), -24) == date(2024, 10, 1)
+
+
+def test_partition_names_round_trip_and_ignore_other_children():
+    name = partitions.partition_name("security_audit_log", date(2026, 3, 1))
+
+    assert name == "security_audit_log_p2026_03"
+    assert partitions.partition_month("security_audit_log", name) == date(2026, 3, 1)
+    assert partitions.partition_month("security_audit_log", "security_audit_log_default") is None
+    assert partitions.partition_month("security_audit_log", "security_audit_log_archive_p2026_03") is None
+    assert partitions.partition_month("authorization_audit_log", name) is None
+
+
+def test_only_months_wholly_before_the_retention_window_expire():
+    table = PartitionedTable("authorization_audit_log", retention_months=12)
+    names = [
+        "authorization_audit_log_p2025_08",
+        "authorization_audit_log_p2025_09",
+        "authorization_audit_log_p2025_10",
+        "authorization_audit_log_p2026_10",
+        "authorization_audit_log_default",
+    ]
+
+    expired = partitions.expired_partitions(table, names, today=date(2026, 10, 19))
+
+    assert expired == ["authorization_audit_log_p2025_08", "authorization_audit_log_p2025_09"]
+
+
+def test_zero_retention_never_expires_anything():
+    table = PartitionedTable("authorization_audit_log", retention_months=0)
+
+    assert partitions.expired_partitions(table, ["authorization_audit_log_p2000_01"], date(2026, 10, 19)) == []
+
+
+def _session(existing: list[str], locked: bool = True):
+    names_result = MagicMock()
+    names_result.scalars.return_value.all.return_value = existing
+    executed: list[str] = []
+
+    async def execute(statement, params=None):
+        executed.append(str(statement))
+        return names_result
+
+    session = MagicMock(execute=AsyncMock(side_effect=execute), scalar=AsyncMock(side_effect=[locked, False]))
+    return session, executed
+
+
+@pytest.mark.asyncio
+async def test_maintain_table_creates_missing_months_and_drops_expired_ones():
+    table = PartitionedTable("security_audit_log", retention_months=1)
+    existing = ["security_audit_log_p2026_08", "security_audit_log_p2026_10", "security_audit_log_default"]
+    session, executed = _session(existing)
+
+    result = await partitions.maintain_table(table, session, today=date(2026, 10, 19))
+
+    assert result == {
+        "created": ["security_audit_log_p2026_11", "security_audit_log_p2026_12", "security_audit_log_p2027_01"],
+        "dropped": ["security_audit_log_p2026_08"],
+    }
+    creates = [sql for sql in executed if sql.startswith("CREATE TABLE")]
+    assert creates[0] == (
+        'CREATE TABLE IF NOT EXISTS "security_audit_log_p2026_11" PARTITION OF "security_audit_log" '
+        "FOR VALUES FROM ('2026-11-01 00:00:00+00') TO ('2026-12-01 00:00:00+00')"
+    )
+    assert 'ALTER TABLE "security_audit_log" DETACH PARTITION "security_audit_log_p2026_08"' in executed
+    assert 'DROP TABLE "security_audit_log_p2026_08"' in executed
+
+
+@pytest.mark.asyncio
+async def test_maintain_table_does_nothing_without_the_lock():
+    table = PartitionedTable("security_audit_log", retention_months=1)
+    session, executed = _session([], locked=False)
+
+    result = await partitions.maintain_table(table, session, today=date(2026, 10, 19))
+
+    assert result is None
+    assert not any(sql.startswith(("CREATE", "ALTER", "DROP")) for sql in executed)
+
+
+@pytest.mark.asyncio
+async def test_maintenance_refuses_identifiers_outside_the_audit_tables():
+    # The DDL interpolates identifiers, so anything but the fixed audit
+    # tables and their monthly partitions is refused before reaching it.
+    table = PartitionedTable('users"; DROP TABLE users; --', retention_months=1)
+    session, executed = _session([])
+
+    with pytest.raises(ValueError):
+        await partitions.maintain_table(table, session, today=date(2026, 10, 19))
+    with pytest.raises(ValueError):
+        await partitions._drop_partitions("security_audit_log", ["security_audit_log_default"], session)
+    assert not any(sql.startswith(("CREATE", "ALTER", "DROP")) for sql in executed)
@@ -0,0 +1,47 @@
+# tests/backend/mystic_auth/unit/database/test_text_search_unit.py
+#
+# text_search.py builds the WHERE/ORDER BY fragments every list endpoint's
+# `search` param goes through. What matters here is the SQL shape: one
+# escaped ILIKE per column (the only form the pg_trgm indexes can serve)
+# and a rank that tolerates NULL columns. Checked by compiling against the
+# Postgres dialect; the real index usage is covered by
+# tests/backend/mystic_auth/performance/test_trigram_search_performance.py.
+from backend.mystic_auth.audit_log.audit_log_model import AuditLog
+from backend.mystic_auth.database.text_search import similarity_rank, substring_match
+from backend.mystic_auth.user_table.user_model import User
+from sqlalchemy.dialects import postgresql
+
+
+def _compile(clause):
+    compiled = clause.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_substring_match_is_one_ilike_per_column():
+    sql, params = _compile(substring_match("acme", User.name, User.email))
+
+    assert sql.count("ILIKE") == 2
+    assert "users.name" in sql and "users.email" in sql
+    assert set(params.values()) == {"%acme%"}
+
+
+def test_substring_match_escapes_like_wildcards():
+    # A user typing "100%" or "first_last" means those literal characters.
+    sql, params = _compile(substring_match("50%_off\\", User.name))
+
+    assert "ESCAPE" in sql
+    assert list(params.values()) == ["%50\\%\\_off\\\\%"]
+
+
+def test_similarity_rank_uses_greatest_across_columns():
+    sql, params = _compile(similarity_rank("acme", User.name, User.email))
+
+    assert sql.startswith("greatest(")
+    assert sql.count("similarity(") == 2
+    assert list(params.values()) == ["acme"]
+
+
+def test_similarity_rank_single_column_skips_greatest():
+    sql, _ = _compile(similarity_rank("acme", AuditLog.user_email))
+
+    assert sql.startswith("similarity(")
@@ -113,6 +113,24 @@ def test_order_by_uses_the_requested_allowlisted_column_and_direction():
     assert any("id" in c and "DESC" in c for c in compiled)
 
 
+def test_order_by_ranks_by_similarity_for_a_search_without_sort_by():
+    crud = UserBaseCRUD(_FakeModel)
+
+    clauses = crud._order_by(None, "asc", "someone")
+
+    compiled = [str(c) for c in clauses]
+    assert "similarity" in compiled[0] and "DESC" in compiled[0]
+    assert "id" in compiled[1]
+
+
+def test_order_by_explicit_sort_wins_over_search_ranking():
+    crud = UserBaseCRUD(_FakeModel)
+
+    clauses = crud._order_by("email", "asc", "someone")
+
+    assert all("similarity" not in str(c) for c in clauses)
+
+
 @pytest.mark.asyncio
 async def test_get_all_returns_the_rows_from_the_query():
     db = _make_db(scalars_all_return=["row1", "row2"])